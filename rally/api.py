@@ -19,6 +19,7 @@ import os
 import re
 import sys
 import time
+import traceback
 
 import jinja2
 import jinja2.meta
@@ -36,6 +37,7 @@ from rally import consts
 from rally import exceptions
 from rally.task import engine
 from rally.task import exporter as texporter
+from rally.task.processing import stats
 from rally.verification import context as vcontext
 from rally.verification import manager as vmanager
 from rally.verification import reporter as vreporter
@@ -220,6 +222,12 @@ class _Task(APIGroup):
     TASK_SCHEMA = objects.task.TASK_SCHEMA
 
     def list(self, **filters):
+        """Get the list of tasks ordered by creation.
+
+        :param filters: filters of tasks (status, deployment and tags) and
+            arguments of pagination: limit is the maximum number of tasks,
+            marker is UUID of the last task of the previous page
+        """
         return [task.to_dict() for task in objects.Task.list(**filters)]
 
     def get(self, task_id, detailed=False):
@@ -486,7 +494,13 @@ class _Task(APIGroup):
                 task_uuid, status=consts.TaskStatus.FINISHED)
 
     def import_results(self, deployment, task_results, tags=None):
-        """Import json results of a task into rally database"""
+        """Import json results of a task into rally database
+
+        Data of workloads can be any iterables, e.g. lazy arrays of
+        rally.common.io.json_stream. Iterations are validated and stored
+        chunk by chunk while they are iterated, so they are never kept in
+        memory all together.
+        """
         deployment = objects.Deployment.get(deployment)
         if deployment["status"] != consts.DeployStatus.DEPLOY_FINISHED:
             raise exceptions.DeploymentNotFinishedStatus(
@@ -497,48 +511,66 @@ class _Task(APIGroup):
         task_inst = objects.Task(env_uuid=deployment["uuid"],
                                  tags=tags)
         task_inst.update_status(consts.TaskStatus.RUNNING)
-        for subtask in task_results["subtasks"]:
-            subtask_obj = task_inst.add_subtask(title=subtask.get("title"))
-            for workload in subtask["workloads"]:
-                for data in workload["data"]:
-                    if not task_inst.result_has_valid_schema(data):
-                        raise exceptions.RallyException(
-                            "Task %s is trying to import "
-                            "results in wrong format" % task_inst["uuid"])
-
-                workload_obj = subtask_obj.add_workload(
-                    name=workload["name"], description=workload["description"],
-                    position=workload["position"], runner=workload["runner"],
-                    runner_type=workload["runner_type"],
-                    contexts=workload["contexts"], hooks=workload["hooks"],
-                    sla=workload["sla"], args=workload["args"])
-
-                chunk_size = CONF.raw_result_chunk_size
-                workload_data_count = 0
-                while len(workload["data"]) > chunk_size:
-                    results_chunk = workload["data"][:chunk_size]
-                    workload["data"] = workload["data"][chunk_size:]
-                    results_chunk.sort(key=lambda x: x["timestamp"])
-                    workload_obj.add_workload_data(workload_data_count,
-                                                   {"raw": results_chunk})
-                    workload_data_count += 1
-
-                workload_obj.add_workload_data(workload_data_count,
-                                               {"raw": workload["data"]})
-                workload_obj.set_results(
-                    sla_results=workload["sla_results"].get("sla"),
-                    hooks_results=workload["hooks"],
-                    start_time=workload["start_time"],
-                    full_duration=workload["full_duration"],
-                    load_duration=workload["load_duration"],
-                    contexts_results=workload["contexts_results"])
-            subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
+        try:
+            for subtask in task_results["subtasks"]:
+                subtask_obj = task_inst.add_subtask(
+                    title=subtask.get("title"))
+                for workload in subtask["workloads"]:
+                    self._import_workload(task_inst, subtask_obj, workload)
+                subtask_obj.update_status(consts.SubtaskStatus.FINISHED)
+        except Exception as e:
+            task_inst.set_failed(type(e).__name__, str(e),
+                                 json.dumps(traceback.format_exc()))
+            raise
         task_inst.update_status(consts.SubtaskStatus.FINISHED)
 
         LOG.info("Task results have been successfully imported.")
 
         return task_inst.to_dict()
 
+    @staticmethod
+    def _import_workload(task_inst, subtask_obj, workload):
+        workload_obj = subtask_obj.add_workload(
+            name=workload["name"], description=workload["description"],
+            position=workload["position"], runner=workload["runner"],
+            runner_type=workload["runner_type"],
+            contexts=workload["contexts"], hooks=workload["hooks"],
+            sla=workload["sla"], args=workload["args"])
+
+        def add_chunk(chunk_order, chunk):
+            chunk.sort(key=lambda x: x["timestamp"])
+            workload_obj.add_workload_data(
+                chunk_order, {"raw": chunk},
+                chunk_format=CONF.raw_result_chunk_format,
+                compression=CONF.raw_result_chunk_compression)
+
+        chunk_size = CONF.raw_result_chunk_size
+        workload_stats = stats.WorkloadStats()
+        workload_data_count = 0
+        results_chunk = []
+        for data in workload["data"]:
+            if not task_inst.result_has_valid_schema(data):
+                raise exceptions.RallyException(
+                    "Task %s is trying to import "
+                    "results in wrong format" % task_inst["uuid"])
+            workload_stats.add_iteration(data)
+            # NOTE: the last chunk is stored even if it is empty
+            if len(results_chunk) == chunk_size:
+                add_chunk(workload_data_count, results_chunk)
+                workload_data_count += 1
+                results_chunk = []
+            results_chunk.append(data)
+        add_chunk(workload_data_count, results_chunk)
+
+        workload_obj.set_results(
+            sla_results=workload["sla_results"].get("sla"),
+            hooks_results=workload["hooks"],
+            start_time=workload["start_time"],
+            full_duration=workload["full_duration"],
+            load_duration=workload["load_duration"],
+            contexts_results=workload["contexts_results"],
+            stats=workload_stats.to_dict())
+
     def export(self, tasks, output_type, output_dest=None):
         """Generate a report for a task or a few tasks.
 
@@ -553,7 +585,11 @@ class _Task(APIGroup):
             if isinstance(task, dict):
                 tasks_results.append(task)
             else:
-                tasks_results.append(self.get(task_id=task, detailed=True))
+                # NOTE: raw data of workloads is read from the database
+                #   while the report is building, so exporters do not need to
+                #   keep all the iterations in memory
+                tasks_results.append(objects.Task.get(
+                    task, detailed=True, stream_data=True).to_dict())
 
         errors = texporter.TaskExporter.validate(
             output_type, context={}, config={},
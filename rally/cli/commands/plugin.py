@@ -47,10 +47,18 @@ class PluginCommands(object):
     @plugins.ensure_plugins_are_loaded
     def show(self, api, name, platform=None):
         """Show detailed information about a Rally plugin."""
-        name_lw = name.lower()
-        all_plugins = plugin.Plugin.get_all(platform=platform)
-        found = [p for p in all_plugins if name_lw in p.get_name().lower()]
-        exact_match = [p for p in found if name_lw == p.get_name().lower()]
+        # NOTE: look up by the exact name first, it does not require
+        #   importing all plugins
+        exact_match = plugin.Plugin.get_all(name=name, platform=platform)
+        if exact_match:
+            found = exact_match
+        else:
+            name_lw = name.lower()
+            all_plugins = plugin.Plugin.get_all(platform=platform)
+            found = [p for p in all_plugins
+                     if name_lw in p.get_name().lower()]
+            exact_match = [p for p in found
+                           if name_lw == p.get_name().lower()]
 
         if not found:
             if platform:
@@ -30,6 +30,7 @@ import six
 from rally.cli import cliutils
 from rally.cli import envutils
 from rally.common import fileutils
+from rally.common.io import json_stream
 from rally.common import logging
 from rally.common import utils as rutils
 from rally.common import version
@@ -604,14 +605,21 @@ class TaskCommands(object):
                    help="Tags to filter tasks by.")
     @cliutils.args("--uuids-only", action="store_true",
                    dest="uuids_only", help="List task UUIDs only.")
+    @cliutils.args("--limit", type=int, dest="limit", required=False,
+                   help="The maximum number of tasks to list.")
+    @cliutils.args("--marker", type=str, dest="marker", metavar="<uuid>",
+                   required=False,
+                   help="UUID of the last task of the previous page. Only "
+                        "tasks created after it are listed.")
     @envutils.with_default_deployment(cli_arg_name="deployment")
     def list(self, api, deployment=None, all_deployments=False, status=None,
-             tags=None, uuids_only=False):
+             tags=None, uuids_only=False, limit=None, marker=None):
         """List tasks, started and finished.
 
         Displayed tasks can be filtered by status or deployment.  By
         default 'rally task list' will display tasks from the active
-        deployment without filtering by status.
+        deployment without filtering by status. Large lists can be shown
+        page by page with --limit and --marker.
         """
 
         filters = {}
@@ -632,6 +640,12 @@ class TaskCommands(object):
         if tags:
             filters["tags"] = tags
 
+        if limit is not None:
+            filters["limit"] = limit
+
+        if marker:
+            filters["marker"] = marker
+
         task_list = api.task.list(**filters)
 
         if uuids_only:
@@ -663,11 +677,21 @@ class TaskCommands(object):
                 print("There are no tasks. To run a new task, use:\n"
                       "\trally task start")
 
-    def _load_task_results_file(self, api, task_id):
-        """Load the json file which is created by `rally task results`"""
+    def _load_task_results_file(self, api, task_id, lazy_data=False):
+        """Load the json file which is created by `rally task results`
 
-        with open(os.path.expanduser(task_id)) as inp_js:
-            tasks_results = json.loads(inp_js.read())
+        :param lazy_data: whether to leave iterations of workloads of the
+            new format in the file. They are read while they are iterated.
+        """
+
+        if lazy_data:
+            tasks_results = json_stream.load(
+                os.path.expanduser(task_id),
+                ("tasks", json_stream.ANY, "subtasks", json_stream.ANY,
+                 "workloads", json_stream.ANY, "data"))
+        else:
+            with open(os.path.expanduser(task_id)) as inp_js:
+                tasks_results = json.loads(inp_js.read())
 
         if isinstance(tasks_results, list):
             # it is an old format:
@@ -770,7 +794,8 @@ class TaskCommands(object):
         elif isinstance(tasks_results, dict) and "tasks" in tasks_results:
             for task_result in tasks_results["tasks"]:
                 try:
-                    jsonschema.validate(task_result,
+                    jsonschema.validate(json_stream.stub(task_result)
+                                        if lazy_data else task_result,
                                         api.task.TASK_SCHEMA)
                 except jsonschema.ValidationError as e:
                     msg = six.text_type(e)
@@ -978,9 +1003,10 @@ class TaskCommands(object):
                 output_file = os.path.expanduser(path)
                 with open(output_file, "w+") as f:
                     f.write(report["files"][path])
-                if open_it:
-                    if "open" in report:
-                        webbrowser.open_new_tab(report["open"])
+        # NOTE: some exporters write files on their own and return only the
+        #   location to open.
+        if open_it and "open" in report:
+            webbrowser.open_new_tab(report["open"])
 
         if "print" in report:
             print(report["print"])
@@ -1022,7 +1048,8 @@ class TaskCommands(object):
         """Import json results of a test into rally database"""
 
         if os.path.exists(os.path.expanduser(task_file)):
-            tasks_results = self._load_task_results_file(api, task_file)
+            tasks_results = self._load_task_results_file(api, task_file,
+                                                         lazy_data=True)
             for task_results in tasks_results:
                 task = api.task.import_results(deployment=deployment,
                                                task_results=task_results,
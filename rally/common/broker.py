@@ -15,6 +15,8 @@
 
 import collections
 import threading
+import time
+import traceback
 
 from rally.common import logging
 
@@ -87,3 +89,135 @@ def run(publish, consume, consumers_count=1):
 
     for consumer in consumers:
         consumer.join()
+
+
+class _BoundedQueue(object):
+    """Queue with deque-like append() which blocks while the queue is full.
+
+    Consumers get items from the queue until the end of the stream is
+    reached, i.e. until all publishers have finished. If the queue is
+    aborted, e.g. because a consumer has died, pending items are dropped,
+    publishers are not blocked anymore and consumers stop.
+    """
+
+    def __init__(self, maxsize):
+        self._items = collections.deque()
+        self._maxsize = maxsize
+        self._cond = threading.Condition()
+        self._closed = False
+        self._aborted = False
+
+    def append(self, item):
+        with self._cond:
+            while len(self._items) >= self._maxsize and not self._aborted:
+                self._cond.wait()
+            if self._aborted:
+                # nobody is going to consume the item
+                return
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def close(self):
+        """Mark the end of the stream."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def abort(self):
+        """Drop pending items and wake up publishers and consumers."""
+        with self._cond:
+            self._aborted = True
+            self._items.clear()
+            self._cond.notify_all()
+
+    def get(self):
+        with self._cond:
+            while not (self._items or self._closed or self._aborted):
+                self._cond.wait()
+            if self._aborted or not self._items:
+                raise StopIteration
+            self._cond.notify_all()
+            return self._items.popleft()
+
+
+def _pipelined_consumer(consume, queue, results):
+    """Worker that consumes items from the queue until the end of stream.
+
+    :param consume: method that consumes an object got from the queue
+    :param queue: _BoundedQueue object
+    :param results: list to append results of jobs to
+    """
+    cache = {}
+    stopped = False
+    try:
+        while True:
+            try:
+                args = queue.get()
+            except StopIteration:
+                stopped = True
+                break
+            job = {"args": args, "started_at": time.time(),
+                   "finished_at": None, "error": None}
+            try:
+                consume(cache, args)
+            except Exception as e:
+                job["error"] = [e.__class__.__name__, str(e),
+                                traceback.format_exc()]
+                msg = "Failed to consume a task from the queue"
+                if logging.is_debug():
+                    LOG.exception(msg)
+                else:
+                    LOG.warning("%s: %s" % (msg, e))
+            job["finished_at"] = time.time()
+            results.append(job)
+    finally:
+        if not stopped:
+            # NOTE: the consumer is killed by an exception which is not
+            #   an Exception (e.g. ThreadTimeoutException). Publishers
+            #   would wait forever for it to free the bounded queue.
+            queue.abort()
+
+
+def run_pipelined(publish, consume, consumers_count=1, queue_size=None):
+    """Run broker with publishers and consumers working simultaneously.
+
+    Unlike run(), consumers are started together with publishers and
+    process elements as soon as they are put to the queue. The queue is
+    bounded, so publishers wait while consumers are busy.
+
+    :param publish: Function that puts values to the queue or a list of
+                    such functions. Every function is called in a separate
+                    thread
+    :param consume: Function that processes a single value from the queue
+    :param consumers_count: Number of consumers
+    :param queue_size: Max number of values in the queue. Defaults to the
+                       doubled number of consumers
+    :returns: list of dicts with values from the queue ("args"), start and
+              finish timestamps of their processing and errors (as
+              [type, message, traceback]) if any
+    """
+    if callable(publish):
+        publish = [publish]
+    queue = _BoundedQueue(queue_size or consumers_count * 2)
+    results = collections.deque()
+
+    consumers = []
+    for i in range(consumers_count):
+        consumer = threading.Thread(target=_pipelined_consumer,
+                                    args=(consume, queue, results))
+        consumer.start()
+        consumers.append(consumer)
+
+    publishers = []
+    for func in publish:
+        publisher = threading.Thread(target=_publisher, args=(func, queue))
+        publisher.start()
+        publishers.append(publisher)
+
+    for publisher in publishers:
+        publisher.join()
+    queue.close()
+    for consumer in consumers:
+        consumer.join()
+
+    return list(results)
@@ -42,6 +42,7 @@ these objects be simple dictionaries.
 
 import datetime as dt
 import functools
+import itertools
 import six
 import time
 
@@ -52,10 +53,12 @@ import sqlalchemy as sa
 import sqlalchemy.orm   # noqa
 
 from rally.common import cfg
+from rally.common.db import compact_data
 from rally.common.db import models
+from rally.common import utils
 from rally import consts
 from rally import exceptions
-from rally.task.processing import charts
+from rally.task.processing import stats as wstats
 
 
 CONF = cfg.CONF
@@ -64,6 +67,15 @@ db_options.set_defaults(CONF, connection="sqlite:////tmp/rally.sqlite")
 _FACADE = None
 _SESSION_MAKER = None
 
+# NOTE: started_at and finished_at of workload data chunks are stored with
+#   the accuracy of the DateTime type of the backend (seconds for MySQL), so
+#   two chunks are considered as overlapping ones if there is less than
+#   a second between them.
+_CHUNKS_GAP = dt.timedelta(seconds=1)
+_MERGE_BATCH_SIZE = 1000
+# the number of uuids per query of tags of several objects
+_TAGS_CHUNK_SIZE = 500
+
 
 def _create_facade_lazily():
     global _FACADE
@@ -101,11 +113,14 @@ def serialize(data):
     if isinstance(data, (six.integer_types,
                          six.string_types,
                          six.text_type,
+                         six.binary_type,
                          dt.date,
                          dt.time,
                          float,
                          )):
         return data
+    if isinstance(data, WorkloadDataStream):
+        return data
     if isinstance(data, models.RallyBase):
         result = data.as_dict()
         for k in result:
@@ -148,6 +163,25 @@ def tags_get(session, uuid, tag_type):
     return [t.tag for t in query.distinct().all()]
 
 
+def _tags_get_many(session, uuids, tag_type):
+    """Get tags of several objects.
+
+    :returns: a dict with sorted lists of tags per uuid of an object
+    """
+    tags = dict((uuid, set()) for uuid in uuids)
+    # NOTE: the number of bound parameters of a query is limited by some
+    #   backends, so uuids are passed in chunks
+    for i in range(0, len(uuids), _TAGS_CHUNK_SIZE):
+        query = (session.query(models.Tag.uuid, models.Tag.tag)
+                        .filter(models.Tag.type == tag_type,
+                                models.Tag.uuid.in_(
+                                    uuids[i:i + _TAGS_CHUNK_SIZE]))
+                        .distinct())
+        for uuid, tag in query.all():
+            tags[uuid].add(tag)
+    return dict((uuid, sorted(t)) for uuid, t in tags.items())
+
+
 def _uuids_by_tags_get(session, tag_type, tags):
     tags = (session.query(models.Tag.uuid)
                    .filter(models.Tag.type == tag_type,
@@ -155,17 +189,108 @@ def _uuids_by_tags_get(session, tag_type, tags):
     return [t.uuid for t in tags.all()]
 
 
+def _workload_data_raw(workload_data):
+    if workload_data.compact_chunk_data is not None:
+        return compact_data.decode(workload_data.compact_chunk_data)
+    return workload_data.chunk_data["raw"]
+
+
+def _workload_data_lanes(session, workload_uuid):
+    """Split chunks of a workload into lanes of non-overlapping chunks.
+
+    Iterations of each lane are ordered by timestamp if iterations of each
+    chunk are ordered, so lanes can be merged without loading all the chunks.
+
+    :returns: a list of lists with ids of chunks
+    """
+    chunks = (session.query(models.WorkloadData.id,
+                            models.WorkloadData.started_at,
+                            models.WorkloadData.finished_at)
+                     .filter_by(workload_uuid=workload_uuid)
+                     .order_by(models.WorkloadData.chunk_order.asc()))
+    lanes = []
+    for chunk in chunks:
+        for lane in lanes:
+            if (lane["finished_at"] is not None
+                    and chunk.started_at is not None
+                    and chunk.started_at - lane["finished_at"] >= _CHUNKS_GAP):
+                break
+        else:
+            lane = {"ids": []}
+            lanes.append(lane)
+        lane["ids"].append(chunk.id)
+        lane["finished_at"] = chunk.finished_at
+    return [lane["ids"] for lane in lanes]
+
+
+def _workload_data_lane(session, chunks_ids, counter):
+    for chunk_id in chunks_ids:
+        workload_data = (session.query(models.WorkloadData.chunk_data,
+                                       models.WorkloadData.compact_chunk_data)
+                                .filter_by(id=chunk_id).one())
+        raw = sorted(_workload_data_raw(workload_data),
+                     key=lambda x: x["timestamp"])
+        # NOTE: the counter makes items unique, so iterations with equal
+        #   timestamps are never compared with each other
+        yield [(itr["timestamp"], next(counter), itr) for itr in raw]
+
+
+def _workload_data_iterate(session, workload_uuid):
+    counter = itertools.count()
+    lanes = [_workload_data_lane(session, chunks_ids, counter)
+             for chunks_ids in _workload_data_lanes(session, workload_uuid)]
+    for items in utils.merge(_MERGE_BATCH_SIZE, *lanes):
+        for _timestamp, _idx, itr in items:
+            yield itr
+
+
+def _workload_data_count(session, workload_uuid):
+    count = (session.query(sa.func.sum(models.WorkloadData.iteration_count))
+                    .filter_by(workload_uuid=workload_uuid).scalar())
+    return int(count or 0)
+
+
 def _task_workload_data_get_all(session, workload_uuid):
-    results = (session.query(models.WorkloadData)
-                      .filter_by(workload_uuid=workload_uuid)
-                      .order_by(models.WorkloadData.chunk_order.asc()))
+    return list(_workload_data_iterate(session, workload_uuid))
+
+
+def workload_data_iterate(workload_uuid):
+    """Yield iterations of a workload one by one in timestamp order.
 
-    return sorted([raw for workload_data in results
-                   for raw in workload_data.chunk_data["raw"]],
-                  key=lambda x: x["timestamp"])
+    Chunks of raw data are read from the database only when they are
+    needed for the merge, so the memory consumption does not depend on the
+    total number of iterations.
 
+    :param workload_uuid: UUID of the workload
+    """
+    session = get_session()
+    try:
+        for itr in _workload_data_iterate(session, workload_uuid):
+            yield itr
+    finally:
+        session.close()
+
+
+class WorkloadDataStream(object):
+    """Lazy re-iterable view on raw data of a workload.
+
+    It is used instead of a list of iterations when a task is fetched with
+    stream_data=True. Each pass over the object reads the data from the
+    database via workload_data_iterate.
+    """
+
+    def __init__(self, workload_uuid, iteration_count):
+        self.workload_uuid = workload_uuid
+        self.iteration_count = iteration_count
 
-def _subtasks_get_all_by_task_uuid(session, task_uuid):
+    def __iter__(self):
+        return workload_data_iterate(self.workload_uuid)
+
+    def __len__(self):
+        return self.iteration_count
+
+
+def _subtasks_get_all_by_task_uuid(session, task_uuid, stream_data=False):
     result = session.query(models.Subtask).filter_by(task_uuid=task_uuid).all()
     subtasks = []
     for subtask in result:
@@ -175,15 +300,20 @@ def _subtasks_get_all_by_task_uuid(session, task_uuid):
                      filter_by(subtask_uuid=subtask["uuid"]).all())
         for workload in workloads:
             workload = workload.as_dict()
-            workload["data"] = _task_workload_data_get_all(
-                session, workload["uuid"])
+            if stream_data:
+                workload["data"] = WorkloadDataStream(
+                    workload["uuid"],
+                    _workload_data_count(session, workload["uuid"]))
+            else:
+                workload["data"] = _task_workload_data_get_all(
+                    session, workload["uuid"])
             subtask["workloads"].append(workload)
         subtasks.append(subtask)
     return subtasks
 
 
 @with_session
-def task_get(session, uuid=None, detailed=False):
+def task_get(session, uuid=None, detailed=False, stream_data=False):
 
     task = session.query(models.Task).filter_by(uuid=uuid).first()
     if not task:
@@ -193,7 +323,8 @@ def task_get(session, uuid=None, detailed=False):
     task["tags"] = sorted(tags_get(uuid, consts.TagType.TASK))
 
     if detailed:
-        task["subtasks"] = _subtasks_get_all_by_task_uuid(session, uuid)
+        task["subtasks"] = _subtasks_get_all_by_task_uuid(
+            session, uuid, stream_data=stream_data)
 
     return task
 
@@ -284,9 +415,23 @@ def task_update_status(session, uuid, status, allowed_statuses):
 
 
 @with_session
-def task_list(session, status=None, env=None, tags=None):
-    tasks = []
-    query = session.query(models.Task)
+def task_list(session, status=None, env=None, tags=None, limit=None,
+              marker=None):
+    """Get tasks ordered by creation.
+
+    Only columns shown by task listings are loaded, so the result does not
+    contain validation results of tasks.
+
+    :param limit: the maximum number of tasks to return
+    :param marker: uuid of the last task of the previous page. Only tasks
+        created after it are returned.
+    """
+    query = (session.query(models.Task)
+                    .options(sa.orm.load_only(
+                        "id", "uuid", "env_uuid", "title", "description",
+                        "task_duration", "pass_sla", "status", "created_at",
+                        "updated_at"))
+                    .order_by(models.Task.id))
 
     filters = {}
     if status is not None:
@@ -302,10 +447,21 @@ def task_list(session, status=None, env=None, tags=None):
             return []
         query = query.filter(models.Task.uuid.in_(uuids))
 
-    for task in query.all():
-        task = task.as_dict()
-        task["tags"] = sorted(tags_get(task["uuid"], consts.TagType.TASK))
-        tasks.append(task)
+    if marker is not None:
+        marker_task = (session.query(models.Task.id)
+                              .filter_by(uuid=marker).first())
+        if not marker_task:
+            raise exceptions.DBRecordNotFound(
+                criteria="uuid: %s" % marker, table="tasks")
+        query = query.filter(models.Task.id > marker_task.id)
+    if limit is not None:
+        query = query.limit(limit)
+
+    tasks = [task.as_dict() for task in query.all()]
+    tags = _tags_get_many(session, [task["uuid"] for task in tasks],
+                          consts.TagType.TASK)
+    for task in tasks:
+        task["tags"] = tags[task["uuid"]]
 
     return tasks
 
@@ -387,7 +543,15 @@ def workload_create(session, task_uuid, subtask_uuid, name, description,
 
 
 @with_session
-def workload_data_create(session, task_uuid, workload_uuid, chunk_order, data):
+def workload_data_create(session, task_uuid, workload_uuid, chunk_order, data,
+                         chunk_format="json", compression="zlib"):
+    """Store a chunk of raw workload data.
+
+    :param data: a dict with "raw" key which refers to a list of iterations
+    :param chunk_format: "json" to store iterations as is or "compact" to
+        use the format of rally.common.db.compact_data
+    :param compression: compression of the compact format
+    """
     workload_data = models.WorkloadData(task_uuid=task_uuid,
                                         workload_uuid=workload_uuid)
 
@@ -418,16 +582,28 @@ def workload_data_create(session, task_uuid, workload_uuid, chunk_order, data):
     if finished_at == 0:
         finished_at = now
 
+    if chunk_format == "compact":
+        compact_chunk_data, chunk_size = compact_data.encode(
+            raw_data, compression=compression)
+        chunk_data = {}
+        compressed_chunk_size = len(compact_chunk_data)
+    else:
+        compact_chunk_data = None
+        chunk_data = {"raw": raw_data}
+        # TODO(ikhudoshyn)
+        chunk_size = 0
+        compressed_chunk_size = 0
+
     workload_data.update({
         "task_uuid": task_uuid,
         "workload_uuid": workload_uuid,
         "chunk_order": chunk_order,
         "iteration_count": iter_count,
         "failed_iteration_count": failed_iter_count,
-        "chunk_data": {"raw": raw_data},
-        # TODO(ikhudoshyn)
-        "chunk_size": 0,
-        "compressed_chunk_size": 0,
+        "chunk_data": chunk_data,
+        "compact_chunk_data": compact_chunk_data,
+        "chunk_size": chunk_size,
+        "compressed_chunk_size": compressed_chunk_size,
         "started_at": dt.datetime.fromtimestamp(started_at),
         "finished_at": dt.datetime.fromtimestamp(finished_at)
     })
@@ -438,32 +614,19 @@ def workload_data_create(session, task_uuid, workload_uuid, chunk_order, data):
 @with_session
 def workload_set_results(session, workload_uuid, subtask_uuid, task_uuid,
                          load_duration, full_duration, start_time,
-                         sla_results, contexts_results, hooks_results=None):
-    workload_results = _task_workload_data_get_all(session, workload_uuid)
-
-    iter_count = len(workload_results)
-
-    failed_iter_count = 0
-    max_duration = None
-    min_duration = None
-
-    for d in workload_results:
-        if d.get("error"):
-            failed_iter_count += 1
-
-        duration = d.get("duration", 0)
-
-        if max_duration is None or duration > max_duration:
-            max_duration = duration
-
-        if min_duration is None or min_duration > duration:
-            min_duration = duration
-
-    durations_stat = charts.MainStatsTable(
-        {"total_iteration_count": iter_count})
-
-    for itr in workload_results:
-        durations_stat.add_iteration(itr)
+                         sla_results, contexts_results, hooks_results=None,
+                         stats=None):
+    """Save results of a workload.
+
+    :param stats: a dict with statistics of iterations (see
+        rally.task.processing.stats.WorkloadStats.to_dict). If it is not
+        specified, the statistics are calculated from the stored raw data.
+    """
+    if stats is None:
+        workload_stats = wstats.WorkloadStats()
+        for itr in _workload_data_iterate(session, workload_uuid):
+            workload_stats.add_iteration(itr)
+        stats = workload_stats.to_dict()
 
     sla = sla_results or []
     # NOTE(ikhudoshyn): we call it 'pass_sla'
@@ -479,12 +642,12 @@ def workload_set_results(session, workload_uuid, subtask_uuid, task_uuid,
             "hooks": hooks_results or [],
             "load_duration": load_duration,
             "full_duration": full_duration,
-            "min_duration": min_duration,
-            "max_duration": max_duration,
-            "total_iteration_count": iter_count,
-            "failed_iteration_count": failed_iter_count,
+            "min_duration": stats["min_duration"],
+            "max_duration": stats["max_duration"],
+            "total_iteration_count": stats["total_iteration_count"],
+            "failed_iteration_count": stats["failed_iteration_count"],
             "start_time": start_time,
-            "statistics": {"durations": durations_stat.to_dict()},
+            "statistics": stats["statistics"],
             "pass_sla": success}
     )
     task_values = {
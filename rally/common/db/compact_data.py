@@ -0,0 +1,281 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Compact binary format of raw workload data chunks.
+
+A chunk is stored column by column: timestamps, durations and idle
+durations of iterations are packed into arrays of doubles, atomic actions
+of all iterations are flattened into arrays (iteration, parent, name,
+started_at, finished_at, flags) with names interned into a table. All the
+rest (non-empty errors and output, iterations of unusual shape) goes to a
+small json document. The body is compressed afterwards.
+
+Layout of an encoded chunk::
+
+    b"RWD" | version (1 byte) | compression (1 byte) | compressed body
+
+where the body is::
+
+    iterations count, atomics count, json size (3 x uint32)
+    timestamps, durations, idle durations (iterations count x double each)
+    iteration, parent, name id (atomics count x int32 each)
+    started_at, finished_at (atomics count x double each)
+    flags (atomics count x byte)
+    json document
+"""
+
+import array
+import json
+import struct
+import sys
+import zlib
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:
+    lz4_frame = None
+
+import six
+
+from rally import exceptions
+
+
+MAGIC = b"RWD"
+VERSION = 1
+
+COMPRESSIONS = {
+    "none": b"n",
+    "zlib": b"z",
+    "lz4": b"l",
+}
+
+_HEADER = struct.Struct("<3sBc")
+_COUNTERS = struct.Struct("<III")
+
+_ITERATION_KEYS = {"timestamp", "duration", "idle_duration", "error",
+                   "output", "atomic_actions"}
+_ATOMIC_KEYS = {"name", "started_at", "finished_at", "children", "failed"}
+_FAILED = 1
+
+
+def _to_bytes(arr):
+    if sys.byteorder != "little":
+        arr = array.array(arr.typecode, arr)
+        arr.byteswap()
+    if hasattr(arr, "tobytes"):
+        return arr.tobytes()
+    return arr.tostring()
+
+
+def _from_bytes(typecode, data, offset, count):
+    arr = array.array(typecode)
+    size = arr.itemsize * count
+    chunk = data[offset:offset + size]
+    if hasattr(arr, "frombytes"):
+        arr.frombytes(chunk)
+    else:
+        arr.fromstring(chunk)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr, offset + size
+
+
+def _is_float(value):
+    return type(value) is float
+
+
+def _is_regular_atomic(action):
+    return (isinstance(action, dict)
+            and set(action).issubset(_ATOMIC_KEYS)
+            and isinstance(action.get("name"), six.string_types)
+            and _is_float(action.get("started_at"))
+            and _is_float(action.get("finished_at"))
+            and action.get("failed", True) is True
+            and isinstance(action.get("children"), list)
+            and all(_is_regular_atomic(c) for c in action["children"]))
+
+
+def _is_regular(iteration):
+    return (set(iteration) == _ITERATION_KEYS
+            and _is_float(iteration["timestamp"])
+            and _is_float(iteration["duration"])
+            and _is_float(iteration["idle_duration"])
+            and isinstance(iteration["atomic_actions"], list)
+            and all(_is_regular_atomic(a)
+                    for a in iteration["atomic_actions"]))
+
+
+def _empty_output():
+    return {"additive": [], "complete": []}
+
+
+def _compress(body, compression):
+    if compression == "zlib":
+        return zlib.compress(body)
+    elif compression == "lz4":
+        if lz4_frame is None:
+            raise exceptions.RallyException(
+                "lz4 compression of workload data requires 'lz4' library.")
+        return lz4_frame.compress(body)
+    return body
+
+
+def _decompress(body, code):
+    if code == COMPRESSIONS["zlib"]:
+        return zlib.decompress(body)
+    elif code == COMPRESSIONS["lz4"]:
+        if lz4_frame is None:
+            raise exceptions.RallyException(
+                "Workload data is compressed with lz4, but 'lz4' library is "
+                "not installed.")
+        return lz4_frame.decompress(body)
+    elif code == COMPRESSIONS["none"]:
+        return body
+    raise exceptions.RallyException(
+        "Unknown compression of workload data: %r" % code)
+
+
+def encode(raw, compression="zlib"):
+    """Encode a list of iteration results.
+
+    :param raw: list of iteration results
+    :param compression: one of COMPRESSIONS keys
+    :returns: a tuple of encoded data and size of the body before
+        compression
+    """
+    if compression not in COMPRESSIONS:
+        raise exceptions.RallyException(
+            "Unknown compression of workload data: %s" % compression)
+
+    timestamps = array.array("d")
+    durations = array.array("d")
+    idle_durations = array.array("d")
+
+    a_iterations = array.array("i")
+    a_parents = array.array("i")
+    a_names = array.array("i")
+    a_started = array.array("d")
+    a_finished = array.array("d")
+    a_flags = array.array("B")
+
+    names = []
+    name_ids = {}
+    extras = {}
+    irregular = {}
+
+    def add_atomics(iteration_idx, actions, parent):
+        for action in actions:
+            name = action["name"]
+            if name not in name_ids:
+                name_ids[name] = len(names)
+                names.append(name)
+            current = len(a_iterations)
+            a_iterations.append(iteration_idx)
+            a_parents.append(parent)
+            a_names.append(name_ids[name])
+            a_started.append(action["started_at"])
+            a_finished.append(action["finished_at"])
+            a_flags.append(_FAILED if action.get("failed") else 0)
+            add_atomics(iteration_idx, action["children"], current)
+
+    for i, itr in enumerate(raw):
+        if not _is_regular(itr):
+            irregular[str(i)] = itr
+            timestamps.append(0.0)
+            durations.append(0.0)
+            idle_durations.append(0.0)
+            continue
+        timestamps.append(itr["timestamp"])
+        durations.append(itr["duration"])
+        idle_durations.append(itr["idle_duration"])
+        rest = {}
+        if itr["error"] != []:
+            rest["error"] = itr["error"]
+        if itr["output"] != _empty_output():
+            rest["output"] = itr["output"]
+        if rest:
+            extras[str(i)] = rest
+        add_atomics(i, itr["atomic_actions"], -1)
+
+    doc = json.dumps({"names": names, "extras": extras,
+                      "irregular": irregular}).encode("utf-8")
+
+    body = b"".join([
+        _COUNTERS.pack(len(raw), len(a_iterations), len(doc)),
+        _to_bytes(timestamps), _to_bytes(durations),
+        _to_bytes(idle_durations),
+        _to_bytes(a_iterations), _to_bytes(a_parents), _to_bytes(a_names),
+        _to_bytes(a_started), _to_bytes(a_finished), _to_bytes(a_flags),
+        doc])
+    header = _HEADER.pack(MAGIC, VERSION, COMPRESSIONS[compression])
+    return header + _compress(body, compression), len(body)
+
+
+def decode(data):
+    """Decode data produced by encode() back into a list of iterations."""
+    magic, version, code = _HEADER.unpack_from(data)
+    if magic != MAGIC or version != VERSION:
+        raise exceptions.RallyException(
+            "Unsupported format of workload data.")
+    body = _decompress(data[_HEADER.size:], code)
+
+    count, atomics_count, doc_size = _COUNTERS.unpack_from(body)
+    offset = _COUNTERS.size
+    timestamps, offset = _from_bytes("d", body, offset, count)
+    durations, offset = _from_bytes("d", body, offset, count)
+    idle_durations, offset = _from_bytes("d", body, offset, count)
+    a_iterations, offset = _from_bytes("i", body, offset, atomics_count)
+    a_parents, offset = _from_bytes("i", body, offset, atomics_count)
+    a_names, offset = _from_bytes("i", body, offset, atomics_count)
+    a_started, offset = _from_bytes("d", body, offset, atomics_count)
+    a_finished, offset = _from_bytes("d", body, offset, atomics_count)
+    a_flags, offset = _from_bytes("B", body, offset, atomics_count)
+    doc = json.loads(body[offset:offset + doc_size].decode("utf-8"))
+
+    names = doc["names"]
+    extras = doc["extras"]
+    irregular = doc["irregular"]
+
+    raw = []
+    for i in range(count):
+        key = str(i)
+        if key in irregular:
+            raw.append(irregular[key])
+            continue
+        itr = {"timestamp": timestamps[i],
+               "duration": durations[i],
+               "idle_duration": idle_durations[i],
+               "error": [],
+               "output": _empty_output(),
+               "atomic_actions": []}
+        itr.update(extras.get(key, {}))
+        raw.append(itr)
+
+    actions = []
+    for j in range(atomics_count):
+        action = {"name": names[a_names[j]],
+                  "children": [],
+                  "started_at": a_started[j],
+                  "finished_at": a_finished[j]}
+        if a_flags[j] & _FAILED:
+            action["failed"] = True
+        parent = a_parents[j]
+        if parent == -1:
+            raw[a_iterations[j]]["atomic_actions"].append(action)
+        else:
+            actions[parent]["children"].append(action)
+        actions.append(action)
+
+    return raw
@@ -0,0 +1,45 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Add compact_chunk_data field to workload data
+
+Revision ID: 477389580340
+Revises: bc908ac9a1fc
+Create Date: 2018-03-12 17:21:46.132510
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+from rally.common.db import sa_types
+from rally import exceptions
+
+
+# revision identifiers, used by Alembic.
+revision = "477389580340"
+down_revision = "bc908ac9a1fc"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table("workloaddata") as batch_op:
+        batch_op.add_column(
+            sa.Column("compact_chunk_data", sa_types.LongBinary,
+                      nullable=True))
+
+
+def downgrade():
+    raise exceptions.DowngradeNotSupported()
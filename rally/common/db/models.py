@@ -286,6 +286,9 @@ class WorkloadData(BASE, RallyBase):
     chunk_order = sa.Column(sa.Integer, nullable=False)
     chunk_data = sa.Column(
         sa_types.MutableJSONEncodedDict, default={}, nullable=False)
+    # raw data in the compact format (see rally.common.db.compact_data).
+    # chunk_data is empty if it is set
+    compact_chunk_data = sa.Column(sa_types.LongBinary, nullable=True)
     # all these fields are not used
     iteration_count = sa.orm.deferred(sa.Column(sa.Integer, nullable=False))
     failed_iteration_count = sa.orm.deferred(sa.Column(
@@ -64,6 +64,22 @@ class LongText(sa_types.TypeDecorator):
             return dialect.type_descriptor(sa_types.Text)
 
 
+class LongBinary(sa_types.TypeDecorator):
+    """Represents binary data which can exceed 64kb.
+
+       The same as LongText, but for bytes: MySql LONGBLOB is used instead of
+       BLOB which is limited by 64kb.
+    """
+
+    impl = sa_types.LargeBinary
+
+    def load_dialect_impl(self, dialect):
+        if dialect.name == "mysql":
+            return dialect.type_descriptor(mysql_types.LONGBLOB)
+        else:
+            return dialect.type_descriptor(sa_types.LargeBinary)
+
+
 class JSONEncodedDict(LongText):
     """Represents an immutable structure as a json-encoded string."""
 
@@ -0,0 +1,298 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Incremental loading of large JSON documents.
+
+A document is loaded with all values except the arrays matching a pattern
+of paths. Such arrays are replaced by LazyArray objects, which read items
+from the file one by one when they are iterated, so the whole array is never
+kept in memory.
+
+Arrays are found by the first pass over the file, and they are read by the
+second sequential pass, which is continued while arrays are iterated in the
+order of the document.
+"""
+
+import json
+import re
+
+import six
+
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_READ_SIZE = 1024 * 1024
+
+ANY = "*"
+
+
+def _match(path, pattern):
+    for key, expected in zip(path, pattern):
+        if expected != ANY and key != expected:
+            return False
+    return True
+
+
+class _Buffer(object):
+    """Reads JSON values from a file through a sliding buffer."""
+
+    def __init__(self, fileobj):
+        self._file = fileobj
+        self._decoder = json.JSONDecoder()
+        self._data = ""
+        self._pos = 0
+        self._eof = False
+
+    def _read(self, size=_READ_SIZE):
+        chunk = self._file.read(size)
+        if not chunk:
+            self._eof = True
+        self._data = self._data[self._pos:] + chunk
+        self._pos = 0
+
+    def peek(self):
+        """Skip whitespaces and return the next character."""
+        while True:
+            self._pos = _WHITESPACE.match(self._data, self._pos).end()
+            if self._pos < len(self._data):
+                return self._data[self._pos]
+            if self._eof:
+                raise ValueError("Unexpected end of JSON data")
+            self._read()
+
+    def expect(self, chars):
+        char = self.peek()
+        if char not in chars:
+            raise ValueError("Expecting one of '%s', got '%s'"
+                             % (chars, char))
+        self._pos += 1
+        return char
+
+    def decode(self):
+        """Decode the next value."""
+        self.peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._data, self._pos)
+            except ValueError:
+                if self._eof:
+                    raise
+            else:
+                # a number can be continued by the next chunk of the file
+                if end < len(self._data) or self._eof:
+                    self._pos = end
+                    return value
+            # a value can be larger than the buffer
+            self._read(max(_READ_SIZE, len(self._data) - self._pos))
+
+
+class _Frame(object):
+    """A container which is being parsed."""
+
+    def __init__(self, path, value, is_dict):
+        self.path = path
+        self.value = value
+        self.is_dict = is_dict
+        self.count = 0
+
+
+class _Parser(object):
+    """Parses the document until lazy arrays.
+
+    :param fileobj: file to read the document from
+    :param pattern: pattern of paths of lazy arrays
+    :param make_array: function which is called with paths of lazy arrays
+        and returns their placeholders in the document. If it is None,
+        values are parsed without building the document.
+    """
+
+    def __init__(self, fileobj, pattern, make_array=None):
+        self._buffer = _Buffer(fileobj)
+        self._pattern = tuple(pattern)
+        self._make_array = make_array
+        self._build = make_array is not None
+        self._stack = None
+        self._in_array = False
+        self._array_count = 0
+        self.document = None
+
+    def _add(self, key, value):
+        if not self._build:
+            return
+        if not self._stack:
+            self.document = value
+        elif self._stack[-1].is_dict:
+            self._stack[-1].value[key] = value
+        else:
+            self._stack[-1].value.append(value)
+
+    def _start_value(self, path, key):
+        """Parse the value or start its container.
+
+        :returns: True if the value is a lazy array
+        """
+        char = self._buffer.peek()
+        if char == "[" and len(path) == len(self._pattern) and _match(
+                path, self._pattern):
+            self._buffer.expect("[")
+            if self._build:
+                self._add(key, self._make_array(path))
+            self._in_array = True
+            self._array_count = 0
+            return True
+        if char in "{[" and len(path) < len(self._pattern) and _match(
+                path, self._pattern):
+            self._buffer.expect(char)
+            value = None
+            if self._build:
+                value = {} if char == "{" else []
+            self._add(key, value)
+            self._stack.append(_Frame(path, value, is_dict=char == "{"))
+            return False
+        self._add(key, self._buffer.decode())
+        return False
+
+    def next_array(self):
+        """Parse the document until the next lazy array.
+
+        Items of the array can be read by items() until the next call.
+
+        :returns: the path of the array or None if the document is over
+        """
+        for item in self.items():
+            pass
+        if self._stack is None:
+            self._stack = []
+            if self._start_value((), None):
+                return ()
+        while self._stack:
+            frame = self._stack[-1]
+            closing = "}" if frame.is_dict else "]"
+            if frame.count == 0 and self._buffer.peek() == closing:
+                self._buffer.expect(closing)
+                self._stack.pop()
+                continue
+            if frame.count and self._buffer.expect("," + closing) != ",":
+                self._stack.pop()
+                continue
+            if frame.is_dict:
+                key = self._buffer.decode()
+                if not isinstance(key, six.string_types):
+                    raise ValueError("Expecting a string key, got %r" % key)
+                self._buffer.expect(":")
+            else:
+                key = frame.count
+            frame.count += 1
+            path = frame.path + (key,)
+            if self._start_value(path, key):
+                return path
+        return None
+
+    def items(self):
+        """Iterate over items of the current lazy array."""
+        while self._in_array:
+            if self._array_count == 0:
+                if self._buffer.peek() == "]":
+                    self._buffer.expect("]")
+                    self._in_array = False
+                    break
+            elif self._buffer.expect(",]") == "]":
+                self._in_array = False
+                break
+            self._array_count += 1
+            yield self._buffer.decode()
+
+
+class LazyArray(object):
+    """JSON array, items of which are read from the file on demand."""
+
+    def __init__(self, document, path):
+        self._document = document
+        self.path = path
+
+    def __iter__(self):
+        return self._document.iter_array(self.path)
+
+    def __repr__(self):
+        return "<LazyArray %s>" % "/".join(str(k) for k in self.path)
+
+
+class _Document(object):
+
+    def __init__(self, path, pattern):
+        self._path = path
+        self._pattern = pattern
+        self._arrays = []
+        self._file = None
+        self._parser = None
+        self._position = None
+
+    def load(self):
+        def make_array(path):
+            self._arrays.append(path)
+            return LazyArray(self, path)
+
+        with open(self._path) as f:
+            parser = _Parser(f, self._pattern, make_array)
+            # items of arrays are skipped
+            while parser.next_array() is not None:
+                pass
+        return parser.document
+
+    def _restart(self):
+        if self._file is not None:
+            self._file.close()
+        self._file = open(self._path)
+        self._parser = _Parser(self._file, self._pattern)
+        self._position = -1
+
+    def iter_array(self, path):
+        index = self._arrays.index(path)
+        if self._parser is None or self._position >= index:
+            self._restart()
+        while self._position < index:
+            self._parser.next_array()
+            self._position += 1
+        for item in self._parser.items():
+            yield item
+        if self._position == len(self._arrays) - 1:
+            self._file.close()
+            self._file = self._parser = None
+
+
+def load(path, pattern):
+    """Load JSON document from the file, leaving matching arrays in it.
+
+    :param path: path to the file
+    :param pattern: path of arrays which should not be loaded, as a tuple of
+        keys of objects and indexes of arrays. ANY matches any key or index.
+        For example, ("tasks", ANY, "data") matches "data" arrays of all
+        objects of the "tasks" array.
+    :returns: the document where matching arrays are LazyArray objects
+    """
+    return _Document(path, tuple(pattern)).load()
+
+
+def stub(document):
+    """Return a copy of the document with lazy arrays replaced by lists.
+
+    The copy can be checked by jsonschema without reading lazy arrays.
+    """
+    if isinstance(document, LazyArray):
+        return []
+    if isinstance(document, dict):
+        return dict((k, stub(v)) for k, v in document.items())
+    if isinstance(document, list):
+        return [stub(v) for v in document]
+    return document
@@ -14,6 +14,8 @@
 #    under the License.
 #
 
+import collections
+
 from subunit import v2
 
 from rally.common import logging
@@ -60,6 +62,9 @@ class SubunitV2StreamResult(object):
     def __init__(self, expected_failures=None, skipped_tests=None, live=False,
                  logger_name=None):
         self._tests = {}
+        # IDs of tests by their statuses, which are updated with every event,
+        # so totals and filtering of tests do not iterate over all tests.
+        self._statuses = collections.defaultdict(set)
         self._expected_failures = expected_failures or {}
         self._skipped_tests = skipped_tests or {}
 
@@ -80,26 +85,46 @@ class SubunitV2StreamResult(object):
     def _get_test_name(test_id):
         return test_id.split("[")[0] if test_id.find("[") > -1 else test_id
 
+    @staticmethod
+    def _get_prefixes(test_id):
+        """Yield IDs of entities which the test belongs to and its own ID."""
+        pos = test_id.find(".")
+        while pos > -1:
+            yield test_id[:pos]
+            pos = test_id.find(".", pos + 1)
+        yield test_id
+
+    def _add_test(self, test_id, test):
+        if test_id in self._tests:
+            self._statuses[self._tests[test_id]["status"]].discard(test_id)
+        self._tests[test_id] = test
+        self._statuses[test["status"]].add(test_id)
+
+    def _set_status(self, test_id, status):
+        self._statuses[self._tests[test_id]["status"]].discard(test_id)
+        self._tests[test_id]["status"] = status
+        self._statuses[status].add(test_id)
+
     def _check_expected_failure(self, test_id):
         if (test_id in self._expected_failures or
                 self._get_test_name(test_id) in self._expected_failures):
             if self._tests[test_id]["status"] == "fail":
-                self._tests[test_id]["status"] = "xfail"
+                self._set_status(test_id, "xfail")
                 if self._expected_failures[test_id]:
                     self._tests[test_id]["reason"] = (
                         self._expected_failures[test_id])
             elif self._tests[test_id]["status"] == "success":
-                self._tests[test_id]["status"] = "uxsuccess"
+                self._set_status(test_id, "uxsuccess")
 
     def _process_skipped_tests(self):
         for t_id in self._skipped_tests.copy():
             if t_id not in self._tests:
                 status = "skip"
                 name = self._get_test_name(t_id)
-                self._tests[t_id] = {"status": status,
-                                     "name": name,
-                                     "duration": "%.3f" % 0,
-                                     "tags": _parse_test_tags(t_id)}
+                self._add_test(t_id, {"status": status,
+                                      "name": name,
+                                      "duration": "%.3f" % 0,
+                                      "tags": _parse_test_tags(t_id)})
                 if self._skipped_tests[t_id]:
                     self._tests[t_id]["reason"] = self._skipped_tests[t_id]
                     status += ": %s" % self._tests[t_id]["reason"]
@@ -112,14 +137,19 @@ class SubunitV2StreamResult(object):
         # NOTE(andreykurilin): When whole test class is marked as skipped or
         # failed, there is only one event with reason and status. So we should
         # modify all tests of test class manually.
+        # Tests are found by prefixes of their IDs instead of matching every
+        # test against every unknown entity.
+        known_test_ids = collections.defaultdict(list)
+        if self._unknown_entities:
+            for t_id in self._tests:
+                for prefix in self._get_prefixes(t_id):
+                    if prefix in self._unknown_entities:
+                        known_test_ids[prefix].append(t_id)
         for test_id in self._unknown_entities:
-            known_test_ids = filter(lambda t:
-                                    t == test_id or t.startswith(
-                                        "%s." % test_id), self._tests)
-            for t_id in known_test_ids:
+            for t_id in known_test_ids[test_id]:
                 if self._tests[t_id]["status"] == "init":
-                    self._tests[t_id]["status"] = (
-                        self._unknown_entities[test_id]["status"])
+                    self._set_status(
+                        t_id, self._unknown_entities[test_id]["status"])
 
                 if self._unknown_entities[test_id].get("reason"):
                     self._tests[t_id]["reason"] = (
@@ -151,13 +181,15 @@ class SubunitV2StreamResult(object):
         if self._first_timestamp:
             td = (self._last_timestamp - self._first_timestamp).total_seconds()
 
-        return {"tests_count": len(self.tests),
+        if not self._is_parsed:
+            self._parse()
+        return {"tests_count": len(self._tests),
                 "tests_duration": "%.3f" % td,
-                "failures": len(self.filter_tests("fail")),
-                "skipped": len(self.filter_tests("skip")),
-                "success": len(self.filter_tests("success")),
-                "unexpected_success": len(self.filter_tests("uxsuccess")),
-                "expected_failures": len(self.filter_tests("xfail"))}
+                "failures": len(self._statuses["fail"]),
+                "skipped": len(self._statuses["skip"]),
+                "success": len(self._statuses["success"]),
+                "unexpected_success": len(self._statuses["uxsuccess"]),
+                "expected_failures": len(self._statuses["xfail"])}
 
     @prepare_input_args
     def status(self, test_id=None, test_status=None, timestamp=None, tags=None,
@@ -169,10 +201,10 @@ class SubunitV2StreamResult(object):
             self._last_timestamp = timestamp
 
         if test_status == "exists":
-            self._tests[test_id] = {"status": "init",
-                                    "name": self._get_test_name(test_id),
-                                    "duration": "%.3f" % 0,
-                                    "tags": tags if tags else []}
+            self._add_test(test_id, {"status": "init",
+                                     "name": self._get_test_name(test_id),
+                                     "duration": "%.3f" % 0,
+                                     "tags": tags if tags else []})
         elif test_id in self._tests:
             if test_status == "inprogress":
                 # timestamp of test start
@@ -182,7 +214,7 @@ class SubunitV2StreamResult(object):
             elif test_status:
                 self._tests[test_id]["duration"] = "%.3f" % (
                     timestamp - self._timestamps[test_id]).total_seconds()
-                self._tests[test_id]["status"] = test_status
+                self._set_status(test_id, test_status)
 
                 self._check_expected_failure(test_id)
             else:
@@ -227,12 +259,9 @@ class SubunitV2StreamResult(object):
 
     def filter_tests(self, status):
         """Filter tests by given status."""
-        filtered_tests = {}
-        for test in self.tests:
-            if self.tests[test]["status"] == status:
-                filtered_tests[test] = self.tests[test]
-
-        return filtered_tests
+        tests = self.tests
+        return dict((test_id, tests[test_id])
+                    for test_id in self._statuses[status])
 
 
 def parse(stream, expected_failures=None, skipped_tests=None, live=False,
@@ -14,7 +14,6 @@
 #    under the License.
 
 import collections
-import copy
 import datetime as dt
 import six
 import uuid
@@ -268,6 +267,71 @@ TASK_SCHEMA = {
 }
 
 
+# NOTE(boris-42): We can't use here jsonschema, this function is called
+#                 to check every iteration result schema. And this
+#                 function works 200 times faster then jsonschema
+#                 which totally makes sense.
+_RESULT_FIELDS = [("duration", float), ("timestamp", float),
+                  ("idle_duration", float), ("output", dict),
+                  ("atomic_actions", list), ("error", list)]
+
+
+def validate_result(result):
+    """Check the schema of the iteration result.
+
+    The result is not modified, so atomic actions are walked without
+    copying them.
+
+    :param result: the iteration result
+    :returns: the message about the first found error or None if the result
+        is valid
+    """
+    for key, proper_type in _RESULT_FIELDS:
+        if key not in result:
+            return "'%s' is not result" % key
+        if not isinstance(result[key], proper_type):
+            return ("result['%(key)s'] has wrong type '%(actual_type)s', "
+                    "should be '%(proper_type)s'"
+                    % {"key": key,
+                       "actual_type": type(result[key]),
+                       "proper_type": proper_type.__name__})
+
+    # the list of references grows with children while it is iterated
+    actions_list = list(result["atomic_actions"])
+    for action in actions_list:
+        for key in ("name", "started_at", "finished_at", "children"):
+            if key not in action:
+                return ("Atomic action %(action)s missing key '%(key)s'"
+                        % {"action": action, "key": key})
+        for key in ("started_at", "finished_at"):
+            if not isinstance(action[key], float):
+                return ("Atomic action %(action)s has wrong type "
+                        "'%(type)s', should be 'float'"
+                        % {"action": action, "type": type(action[key])})
+        if action["children"]:
+            actions_list.extend(action["children"])
+
+    for e in result["error"]:
+        if not isinstance(e, (six.string_types, six.text_type)):
+            return "error value has wrong type '%s', should be 'str'" % type(e)
+
+    for key in ("additive", "complete"):
+        if key not in result["output"]:
+            return "Output missing key '%s'" % key
+
+        type_ = type(result["output"][key])
+        if type_ != list:
+            return ("Value of result['output']['%(key)s'] has wrong type "
+                    "'%(type)s', must be 'list'"
+                    % {"key": key, "type": type_.__name__})
+
+    for key in result["output"]:
+        for output_data in result["output"][key]:
+            message = charts.validate_output(key, output_data)
+            if message:
+                return message
+
+
 class Task(object):
     """Represents a task object.
 
@@ -322,9 +386,10 @@ class Task(object):
 
     def to_dict(self):
         db_task = self.task
-        deployment_name = db.env_get(self.task["env_uuid"])["name"]
+        if "deployment_name" not in db_task:
+            db_task["deployment_name"] = db.env_get(
+                self.task["env_uuid"])["name"]
         db_task["deployment_uuid"] = db_task["env_uuid"]
-        db_task["deployment_name"] = deployment_name
         self._serialize_dt(db_task)
         for subtask in db_task.get("subtasks", []):
             self._serialize_dt(subtask)
@@ -333,17 +398,28 @@ class Task(object):
         return db_task
 
     @classmethod
-    def get(cls, uuid, detailed=False):
-        return cls(db.api.task_get(uuid, detailed=detailed))
+    def get(cls, uuid, detailed=False, stream_data=False):
+        return cls(db.api.task_get(uuid, detailed=detailed,
+                                   stream_data=stream_data))
 
     @staticmethod
     def get_status(uuid):
         return db.task_get_status(uuid)
 
     @staticmethod
-    def list(status=None, deployment=None, tags=None):
-        return [Task(db_task) for db_task in db.task_list(
-            status, env=deployment, tags=tags)]
+    def list(status=None, deployment=None, tags=None, limit=None,
+             marker=None):
+        db_tasks = db.task_list(status, env=deployment, tags=tags,
+                                limit=limit, marker=marker)
+        # NOTE: tasks usually belong to a few deployments, so names of
+        #   deployments are not requested for every task by to_dict()
+        deployment_names = {}
+        for db_task in db_tasks:
+            env_uuid = db_task["env_uuid"]
+            if env_uuid not in deployment_names:
+                deployment_names[env_uuid] = db.env_get(env_uuid)["name"]
+            db_task["deployment_name"] = deployment_names[env_uuid]
+        return [Task(db_task) for db_task in db_tasks]
 
     @staticmethod
     def delete_by_uuid(uuid, status=None):
@@ -400,82 +476,11 @@ class Task(object):
 
     def result_has_valid_schema(self, result):
         """Check whatever result has valid schema or not."""
-        # NOTE(boris-42): We can't use here jsonschema, this method is called
-        #                 to check every iteration result schema. And this
-        #                 method works 200 times faster then jsonschema
-        #                 which totally makes sense.
-        _RESULT_SCHEMA = {
-            "fields": [("duration", float), ("timestamp", float),
-                       ("idle_duration", float), ("output", dict),
-                       ("atomic_actions", list), ("error", list)]
-        }
-        for key, proper_type in _RESULT_SCHEMA["fields"]:
-            if key not in result:
-                LOG.warning("'%s' is not result" % key)
-                return False
-            if not isinstance(result[key], proper_type):
-                LOG.warning(
-                    "Task %(uuid)s | result['%(key)s'] has wrong type "
-                    "'%(actual_type)s', should be '%(proper_type)s'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key,
-                       "actual_type": type(result[key]),
-                       "proper_type": proper_type.__name__})
-                return False
-
-        actions_list = copy.deepcopy(result["atomic_actions"])
-        for action in actions_list:
-            for key in ("name", "started_at", "finished_at", "children"):
-                if key not in action:
-                    LOG.warning(
-                        "Task %(uuid)s | Atomic action %(action)s "
-                        "missing key '%(key)s'"
-                        % {"uuid": self.task["uuid"],
-                           "action": action,
-                           "key": key})
-                    return False
-            for key in ("started_at", "finished_at"):
-                if not isinstance(action[key], float):
-                    LOG.warning(
-                        "Task %(uuid)s | Atomic action %(action)s has "
-                        "wrong type '%(type)s', should be 'float'"
-                        % {"uuid": self.task["uuid"],
-                           "action": action,
-                           "type": type(action[key])})
-                    return False
-            if action["children"]:
-                actions_list.extend(action["children"])
-
-        for e in result["error"]:
-            if not isinstance(e, (six.string_types, six.text_type)):
-                LOG.warning("error value has wrong type '%s', should be 'str'"
-                            % type(e))
-                return False
-
-        for key in ("additive", "complete"):
-            if key not in result["output"]:
-                LOG.warning("Task %(uuid)s | Output missing key '%(key)s'"
-                            % {"uuid": self.task["uuid"], "key": key})
-                return False
-
-            type_ = type(result["output"][key])
-            if type_ != list:
-                LOG.warning(
-                    "Task %(uuid)s | Value of result['output']['%(key)s'] "
-                    "has wrong type '%(type)s', must be 'list'"
-                    % {"uuid": self.task["uuid"],
-                       "key": key, "type": type_.__name__})
-                return False
-
-        for key in result["output"]:
-            for output_data in result["output"][key]:
-                message = charts.validate_output(key, output_data)
-                if message:
-                    LOG.warning("Task %(uuid)s | %(message)s"
-                                % {"uuid": self.task["uuid"],
-                                   "message": message})
-                    return False
-
+        message = validate_result(result)
+        if message:
+            LOG.warning("Task %(uuid)s | %(message)s"
+                        % {"uuid": self.task["uuid"], "message": message})
+            return False
         return True
 
 
@@ -523,13 +528,16 @@ class Workload(object):
     def __getitem__(self, key):
         return self.workload[key]
 
-    def add_workload_data(self, chunk_order, workload_data):
+    def add_workload_data(self, chunk_order, workload_data,
+                          chunk_format="json", compression="zlib"):
         db.workload_data_create(self.workload["task_uuid"],
                                 self.workload["uuid"], chunk_order,
-                                workload_data)
+                                workload_data, chunk_format=chunk_format,
+                                compression=compression)
 
     def set_results(self, load_duration, full_duration, start_time,
-                    sla_results, contexts_results, hooks_results=None):
+                    sla_results, contexts_results, hooks_results=None,
+                    stats=None):
         db.workload_set_results(workload_uuid=self.workload["uuid"],
                                 subtask_uuid=self.workload["subtask_uuid"],
                                 task_uuid=self.workload["task_uuid"],
@@ -538,7 +546,8 @@ class Workload(object):
                                 start_time=start_time,
                                 sla_results=sla_results,
                                 hooks_results=hooks_results,
-                                contexts_results=contexts_results)
+                                contexts_results=contexts_results,
+                                stats=stats)
 
     @classmethod
     def to_task(cls, workload):
@@ -16,8 +16,13 @@ import importlib
 
 from rally.common import cfg
 from rally.common import logging
+from rally.common.plugin import manifest
+from rally.plugins.common.exporters.elastic import client as elastic
 from rally.plugins.openstack.cfg import opts as openstack_opts
 from rally.task import engine
+from rally.task.processing import plot
+from rally.task import runner
+from rally.task import status_poller
 
 CONF = cfg.CONF
 
@@ -31,6 +36,11 @@ def list_opts():
 
     merged_opts["DEFAULT"].extend(logging.DEBUG_OPTS)
     merged_opts["DEFAULT"].extend(engine.TASK_ENGINE_OPTS)
+    merged_opts["DEFAULT"].extend(manifest.MANIFEST_OPTS)
+    merged_opts["DEFAULT"].extend(plot.REPORT_OPTS)
+    merged_opts["DEFAULT"].extend(status_poller.STATUS_POLLER_OPTS)
+    merged_opts["DEFAULT"].extend(runner.RUNNER_OPTS)
+    merged_opts["DEFAULT"].extend(elastic.ELASTIC_OPTS)
 
     return merged_opts.items()
 
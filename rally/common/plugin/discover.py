@@ -65,8 +65,12 @@ def import_modules_from_package(package):
                 sys.modules[module_name] = importlib.import_module(module_name)
 
 
-def import_modules_by_entry_point():
-    """Import plugins by entry-point 'rally_plugins'."""
+def import_modules_by_entry_point(import_modules=True):
+    """Import plugins by entry-point 'rally_plugins'.
+
+    :param import_modules: whether to import all modules of the packages or
+        only the modules which entry-points point to
+    """
     loaded_packages = []
 
     for package in pkg_resources.working_set:
@@ -81,14 +85,15 @@ def import_modules_by_entry_point():
             ep = entry_map["path"]
             try:
                 m = ep.load()
-                if hasattr(m, "__path__"):
-                    path = pkgutil.extend_path(m.__path__, m.__name__)
-                else:
-                    path = [m.__file__]
-                prefix = m.__name__ + "."
-                for loader, name, _is_pkg in pkgutil.walk_packages(
-                        path, prefix=prefix):
-                    sys.modules[name] = importlib.import_module(name)
+                if import_modules:
+                    if hasattr(m, "__path__"):
+                        path = pkgutil.extend_path(m.__path__, m.__name__)
+                    else:
+                        path = [m.__file__]
+                    prefix = m.__name__ + "."
+                    for loader, name, _is_pkg in pkgutil.walk_packages(
+                            path, prefix=prefix):
+                        sys.modules[name] = importlib.import_module(name)
             except Exception as e:
                 msg = ("\t Failed to load plugins from module '%(module)s' "
                        "(package: '%(package)s')" %
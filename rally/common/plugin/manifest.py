@@ -0,0 +1,183 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""On-disk manifest of plugins which allows to import them on demand.
+
+Importing all modules with plugins (and client libraries they use) takes
+most of the time of Rally start. The manifest maps names of plugins to
+modules where they are defined, so the modules are imported only when
+plugins are requested by name. The manifest is keyed by versions of plugin
+packages and modification times of their files; a stale manifest is
+regenerated after the full discovery.
+"""
+
+import hashlib
+import importlib
+import json
+import os
+import sys
+import threading
+
+from rally.common import cfg
+from rally.common import logging
+from rally.common.plugin import plugin
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+MANIFEST_OPTS = [
+    cfg.BoolOpt("lazy_plugins_loading", default=True,
+                help="Import modules with plugins only when the plugins are "
+                     "requested. Names of plugins are cached in the plugins "
+                     "manifest file."),
+    cfg.StrOpt("plugins_manifest_path",
+               default="~/.rally/plugins-manifest.json",
+               help="Path to the cache of names of plugins and modules "
+                    "where they are defined.")
+]
+
+FORMAT_VERSION = 1
+
+
+def _package_files(package):
+    module = importlib.import_module(package)
+    paths = getattr(module, "__path__", None) or [module.__file__]
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+            continue
+        for root, dirs, files in os.walk(path):
+            for filename in files:
+                if filename.endswith(".py"):
+                    yield os.path.join(root, filename)
+
+
+def fingerprint(packages, versions=None):
+    """Return a key which changes whenever any of packages changes.
+
+    :param packages: names of Python packages with plugins
+    :param versions: additional version strings of the packages
+    """
+    key = hashlib.sha1()
+    key.update(("%s\n%s\n" % (FORMAT_VERSION, sys.version)).encode("utf-8"))
+    for version in sorted(versions or []):
+        key.update(("%s\n" % version).encode("utf-8"))
+    for package in packages:
+        for path in sorted(_package_files(package)):
+            key.update(("%s %r\n" % (path, os.path.getmtime(path))
+                        ).encode("utf-8"))
+    return key.hexdigest()
+
+
+def collect(packages):
+    """Collect records of all loaded plugins from the given packages."""
+    prefixes = tuple("%s." % p for p in packages)
+    records = []
+    for p in plugin.Plugin.get_all(allow_hidden=True):
+        if p.__module__ in packages or p.__module__.startswith(prefixes):
+            base = p._get_base()
+            records.append({"base": "%s.%s" % (base.__module__,
+                                               base.__name__),
+                            "name": p.get_name(),
+                            "platform": p.get_platform(),
+                            "module": p.__module__})
+    return records
+
+
+def read(path, key):
+    """Return records of the manifest or None if it is missing or stale."""
+    try:
+        with open(path) as f:
+            manifest = json.load(f)
+    except (IOError, OSError, ValueError):
+        return None
+    if not isinstance(manifest, dict) or manifest.get("key") != key:
+        return None
+    return manifest.get("plugins")
+
+
+def write(path, key, records):
+    """Save the manifest. Failures are logged and ignored."""
+    tmp_path = "%s.%s.tmp" % (path, os.getpid())
+    try:
+        dirname = os.path.dirname(path)
+        if dirname and not os.path.isdir(dirname):
+            os.makedirs(dirname)
+        with open(tmp_path, "w") as f:
+            json.dump({"key": key, "plugins": records}, f)
+        os.rename(tmp_path, path)
+    except (IOError, OSError) as e:
+        LOG.debug("Failed to save plugins manifest to %s: %s" % (path, e))
+
+
+class LazyLoader(object):
+    """Imports modules from the manifest when their plugins are requested.
+
+    :param records: records of the manifest
+    :param import_all: callable which imports all modules with plugins
+    """
+
+    def __init__(self, records, import_all):
+        self._modules = {}
+        for record in records:
+            modules = self._modules.setdefault(record["name"], [])
+            if record["module"] not in modules:
+                modules.append(record["module"])
+        self._import_all = import_all
+        self._lock = threading.RLock()
+
+    def load(self, name):
+        with self._lock:
+            # NOTE: pop modules before importing them, since plugins are
+            #   looked up by name while the module is being imported.
+            for module in self._modules.pop(name, ()):
+                try:
+                    importlib.import_module(module)
+                except Exception as e:
+                    msg = "Failed to load module with plugins %s" % module
+                    if logging.is_debug():
+                        LOG.exception(msg)
+                    else:
+                        LOG.warning("%s: %s" % (msg, e))
+
+    def load_all(self):
+        with self._lock:
+            if self._import_all is None:
+                return
+            import_all, self._import_all = self._import_all, None
+            self._modules = {}
+            import_all()
+            plugin.set_lazy_loader(None)
+
+
+def load(packages, import_all, versions=None):
+    """Import plugins of the packages lazily if the manifest is up to date.
+
+    Otherwise, all modules are imported and the manifest is regenerated.
+
+    :param packages: names of Python packages with plugins
+    :param import_all: callable which imports all modules of the packages
+    :param versions: additional version strings of the packages
+    """
+    path = os.path.expanduser(CONF.plugins_manifest_path)
+    key = fingerprint(packages, versions)
+    records = read(path, key)
+    if records is None:
+        LOG.debug("Plugins manifest %s is stale. Loading all plugins." % path)
+        import_all()
+        write(path, key, collect(packages))
+    else:
+        plugin.set_lazy_loader(LazyLoader(records, import_all))
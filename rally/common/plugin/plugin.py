@@ -128,9 +128,102 @@ def deprecated(reason, rally_version):
     return decorator
 
 
+# NOTE: keys of plugin meta which affect plugin lookup. Any change of them
+#   invalidates the registry of plugins.
+_INDEXED_META_KEYS = ("name", "platform", "hidden")
+
+
+class _Registry(object):
+    """Index of configured plugins.
+
+    Walking the whole tree of subclasses on each lookup is expensive, since
+    there are hundreds of plugins loaded. The index of plugins is built once
+    per queried class and dropped when any plugin is (un)registered.
+    """
+
+    def __init__(self):
+        self._version = 0
+        self._indexes = {}
+        self.lazy_loader = None
+
+    def invalidate(self):
+        self._version += 1
+
+    def _build(self, cls):
+        plugins = []
+        by_name = {}
+        for p in discover.itersubclasses(cls):
+            if not issubclass(p, Plugin):
+                continue
+            if not p._meta_is_inited(raise_exc=False):
+                continue
+            plugins.append(p)
+            by_name.setdefault(p.get_name(), []).append(p)
+        return plugins, by_name
+
+    def lookup(self, cls, name=None):
+        """Return configured subclasses of cls, optionally filtered by name.
+
+        Results are ordered the same way as discover.itersubclasses does.
+        """
+        if self.lazy_loader is not None:
+            if name:
+                self.lazy_loader.load(name)
+            else:
+                self.lazy_loader.load_all()
+        version = self._version
+        index = self._indexes.get(cls)
+        if index is None or index[0] != version:
+            index = (version,) + self._build(cls)
+            self._indexes[cls] = index
+        if name:
+            return index[2].get(name, [])
+        return index[1]
+
+
+_registry = _Registry()
+
+
+def set_lazy_loader(loader):
+    """Set an object which imports modules with plugins on demand.
+
+    The loader should provide load(name) method which imports modules with
+    plugins of the given name and load_all() method which imports the rest
+    of modules. Pass None to unset the loader.
+    """
+    _registry.lazy_loader = loader
+    _registry.invalidate()
+
+
+def load_lazy_plugins():
+    """Import modules with plugins which are not imported yet.
+
+    Should be called before walking through subclasses of plugins directly
+    instead of using Plugin.get_all.
+    """
+    if _registry.lazy_loader is not None:
+        _registry.lazy_loader.load_all()
+
+
 class Plugin(meta.MetaMixin, info.InfoMixin):
     """Base class for all Plugins in Rally."""
 
+    @classmethod
+    def _meta_init(cls):
+        super(Plugin, cls)._meta_init()
+        _registry.invalidate()
+
+    @classmethod
+    def _meta_clear(cls):
+        super(Plugin, cls)._meta_clear()
+        _registry.invalidate()
+
+    @classmethod
+    def _meta_set(cls, key, value):
+        super(Plugin, cls)._meta_set(key, value)
+        if key in _INDEXED_META_KEYS:
+            _registry.invalidate()
+
     @classmethod
     def unregister(cls):
         """Removes all plugin meta information and makes it undiscoverable."""
@@ -177,13 +270,7 @@ class Plugin(meta.MetaMixin, info.InfoMixin):
         """
         plugins = []
 
-        for p in discover.itersubclasses(cls):
-            if not issubclass(p, Plugin):
-                continue
-            if not p._meta_is_inited(raise_exc=False):
-                continue
-            if name and name != p.get_name():
-                continue
+        for p in _registry.lookup(cls, name=name):
             if platform and platform != p.get_platform():
                 continue
             if not allow_hidden and p.is_hidden():
@@ -47,6 +47,19 @@ Upload file:
     ssh = sshclient.SSH("user", "example.com")
     ssh.run("cat > ~/upload/file.gz", stdin=open("/store/file.gz", "rb"))
 
+Execute command on many hosts in parallel:
+
+    hosts = [sshclient.SSH("user", ip) for ip in ips]
+    for result in sshclient.run_many(hosts, "uptime", timeout=60):
+        if isinstance(result, Exception):
+            print "failed: %s" % result
+        else:
+            status, out, err = result
+
+Connections are shared by SSH objects of a process with the same host, port,
+user and credentials, so they are not established for every SSH object and
+many commands can be executed at once over one connection.
+
 Eventlet:
 
     eventlet.monkey_patch(select=True, time=True)
@@ -57,19 +70,110 @@ Eventlet:
 
 """
 
+import codecs
+import collections
+import contextlib
 import os
 import select
 import socket
+import threading
 import time
 
 import paramiko
 import six
 
+from rally.common import broker
 from rally.common import logging
 from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+_BUFFER_SIZE = 64 * 1024
+
+# NOTE: OpenSSH servers refuse more sessions over one connection than their
+#   MaxSessions option, which is 10 by default.
+_MAX_SESSIONS = 10
+
+
+def _is_active(client):
+    transport = client.get_transport() if client else None
+    return transport is not None and transport.is_active()
+
+
+class _Connection(object):
+    """Paramiko client shared by SSH objects."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.client = None
+        self.sessions = 0
+        self.channels = threading.BoundedSemaphore(_MAX_SESSIONS)
+
+
+class _ConnectionPool(object):
+    """Connections of the process, which are reused by SSH objects.
+
+    Connections are identified by the host, the port, the user and the
+    credentials. When there are more than max_idle connections without
+    sessions, the least recently used of them are closed.
+    """
+
+    def __init__(self, max_idle=100):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._connections = collections.OrderedDict()
+
+    @contextlib.contextmanager
+    def use(self, key):
+        """Return the connection, which is not closed while it is used."""
+        with self._lock:
+            # the connection is moved to the end as the most recently used
+            connection = self._connections.pop(key, None) or _Connection()
+            self._connections[key] = connection
+            connection.sessions += 1
+        try:
+            yield connection
+        finally:
+            with self._lock:
+                connection.sessions -= 1
+                idle = [k for k, c in self._connections.items()
+                        if not c.sessions]
+                idle = [self._connections.pop(k)
+                        for k in idle[:max(0, len(idle) - self.max_idle)]]
+            for c in idle:
+                if c.client:
+                    c.client.close()
+
+    def discard(self, key, client):
+        """Remove the client from the pool unless it is used.
+
+        :returns: True if nobody else uses the client
+        """
+        with self._lock:
+            connection = self._connections.get(key)
+            if connection is None or connection.client is not client:
+                return True
+            if connection.sessions:
+                return False
+            del self._connections[key]
+            return True
+
+
+_pool = None
+_pool_pid = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool():
+    global _pool, _pool_pid
+
+    with _pool_lock:
+        # connections of the parent process can not be used after forking
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = _ConnectionPool()
+            _pool_pid = os.getpid()
+        return _pool
+
 
 class SSH(object):
     """Represent ssh connection."""
@@ -93,6 +197,7 @@ class SSH(object):
         self.password = password
         self.key_filename = key_filename
         self._client = False
+        self._key = (user, host, port, self.pkey, key_filename, password)
 
     def _get_pkey(self, key):
         if isinstance(key, six.string_types):
@@ -106,29 +211,69 @@ class SSH(object):
         raise exceptions.SSHError("Invalid pkey: %s" % (errors))
 
     def _get_client(self):
-        if self._client:
-            return self._client
+        with _get_pool().use(self._key) as connection:
+            with connection.lock:
+                if not _is_active(connection.client):
+                    connection.client = self._connect()
+                self._client = connection.client
+                return self._client
+
+    def _connect(self):
         try:
-            self._client = paramiko.SSHClient()
-            self._client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            self._client.connect(self.host, username=self.user,
-                                 port=self.port, pkey=self.pkey,
-                                 key_filename=self.key_filename,
-                                 password=self.password, timeout=1)
-            return self._client
+            client = paramiko.SSHClient()
+            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+            client.connect(self.host, username=self.user,
+                           port=self.port, pkey=self.pkey,
+                           key_filename=self.key_filename,
+                           password=self.password, timeout=1)
+            return client
         except Exception as e:
             message = ("Exception %(exception_type)s was raised "
                        "during connect to %(user)s@%(host)s:%(port)s. "
                        "Exception value is: %(exception)r")
-            self._client = False
             raise exceptions.SSHError(message % {"exception": e,
                                                  "user": self.user,
                                                  "host": self.host,
                                                  "port": self.port,
                                                  "exception_type": type(e)})
 
+    @contextlib.contextmanager
+    def _open_session(self):
+        """Open a session, at most _MAX_SESSIONS at once per connection."""
+        with _get_pool().use(self._key) as connection:
+            with connection.channels:
+                client = self._get_client()
+                extra_client = None
+                try:
+                    session = client.get_transport().open_session(timeout=10)
+                except paramiko.ChannelException as e:
+                    # NOTE: the server limits sessions of a connection more
+                    #   strictly than we do, the sessions which are already
+                    #   running over the shared one should not be broken.
+                    LOG.debug("Opening extra connection to %s@%s:%s: %s"
+                              % (self.user, self.host, self.port, e))
+                    extra_client = self._connect()
+                    session = extra_client.get_transport().open_session(
+                        timeout=10)
+                except (paramiko.SSHException, socket.error, EOFError) as e:
+                    if _is_active(client):
+                        raise
+                    # the shared connection is broken, e.g. by the server
+                    LOG.debug("Reconnecting to %s@%s:%s: %s"
+                              % (self.user, self.host, self.port, e))
+                    client.close()
+                    session = self._get_client().get_transport().open_session(
+                        timeout=10)
+                try:
+                    yield session
+                finally:
+                    session.close()
+                    if extra_client is not None:
+                        extra_client.close()
+
     def close(self):
-        self._client.close()
+        if self._client and _get_pool().discard(self._key, self._client):
+            self._client.close()
         self._client = False
 
     def run(self, cmd, stdin=None, stdout=None, stderr=None,
@@ -143,68 +288,78 @@ class SSH(object):
                                 then exception will be raised if non-zero code.
         :param timeout:         Timeout in seconds for command execution.
                                 Default 1 hour. No timeout if set to 0.
-        """
 
-        client = self._get_client()
+        :returns: tuple (exit_status, data), where data is the whole output
+                  of the command if stdout is not given and None otherwise
+        """
 
         if isinstance(stdin, six.string_types):
             stdin = six.moves.StringIO(stdin)
 
-        return self._run(client, cmd, stdin=stdin, stdout=stdout,
-                         stderr=stderr, raise_on_error=raise_on_error,
-                         timeout=timeout)
+        with self._open_session() as session:
+            return self._run(session, cmd, stdin=stdin, stdout=stdout,
+                             stderr=stderr, raise_on_error=raise_on_error,
+                             timeout=timeout)
 
-    def _run(self, client, cmd, stdin=None, stdout=None, stderr=None,
+    def _run(self, session, cmd, stdin=None, stdout=None, stderr=None,
              raise_on_error=True, timeout=3600):
 
         if isinstance(cmd, (list, tuple)):
             cmd = " ".join(six.moves.shlex_quote(str(p)) for p in cmd)
 
-        transport = client.get_transport()
-        session = transport.open_session()
         session.exec_command(cmd)
         start_time = time.time()
+        debug = logging.is_debug()
 
         data_to_send = ""
         stderr_data = None
+        stdout_decoder = codecs.getincrementaldecoder("utf8")()
+        stderr_decoder = codecs.getincrementaldecoder("utf8")()
 
-        # If we have data to be sent to stdin then `select' should also
-        # check for stdin availability.
+        # If we have data to be sent to stdin then `select' should not
+        # block for long.
         if stdin and not stdin.closed:
             writes = [session]
         else:
             writes = []
 
-        data = None
+        data = []
         while True:
-            # Block until data can be read/write.
-            r, w, e = select.select([session], writes, [session], 1)
+            # Block until data can be read. Channels can not be checked for
+            # writing by `select', so it waits a little while stdin is sent.
+            r, w, e = select.select([session], [], [session],
+                                    0.01 if writes else 1)
 
             if session.recv_ready():
-                data = session.recv(4096)
-                LOG.debug("stdout: %r" % data)
+                chunk = session.recv(_BUFFER_SIZE)
+                if debug:
+                    LOG.debug("stdout: %r" % chunk)
                 if stdout is not None:
-                    stdout.write(data.decode("utf8"))
+                    stdout.write(stdout_decoder.decode(chunk))
+                else:
+                    data.append(chunk)
                 continue
 
             if session.recv_stderr_ready():
-                stderr_data = session.recv_stderr(4096)
-                LOG.debug("stderr: %r" % stderr_data)
+                stderr_data = session.recv_stderr(_BUFFER_SIZE)
+                if debug:
+                    LOG.debug("stderr: %r" % stderr_data)
                 if stderr is not None:
-                    stderr.write(stderr_data.decode("utf8"))
+                    stderr.write(stderr_decoder.decode(stderr_data))
                 continue
 
             if session.send_ready():
                 if stdin is not None and not stdin.closed:
                     if not data_to_send:
-                        data_to_send = stdin.read(4096)
+                        data_to_send = stdin.read(_BUFFER_SIZE)
                         if not data_to_send:
                             stdin.close()
                             session.shutdown_write()
                             writes = []
                             continue
                     sent_bytes = session.send(data_to_send)
-                    LOG.debug("sent: %s" % data_to_send[:sent_bytes])
+                    if debug:
+                        LOG.debug("sent: %s" % data_to_send[:sent_bytes])
                     data_to_send = data_to_send[sent_bytes:]
 
             if session.exit_status_ready():
@@ -225,7 +380,9 @@ class SSH(object):
             if stderr_data:
                 details += " Last stderr data: '%s'." % stderr_data
             raise exceptions.SSHError(details)
-        return exit_status, data
+        if stdout is not None:
+            return exit_status, None
+        return exit_status, b"".join(data)
 
     def execute(self, cmd, stdin=None, timeout=3600):
         """Execute the specified command on the server.
@@ -260,13 +417,14 @@ class SSH(object):
                                             self.host)
 
     def _put_file_sftp(self, localpath, remotepath, mode=None):
-        client = self._get_client()
-
-        with client.open_sftp() as sftp:
-            sftp.put(localpath, remotepath)
-            if mode is None:
-                mode = 0o777 & os.stat(localpath).st_mode
-            sftp.chmod(remotepath, mode)
+        with _get_pool().use(self._key) as connection:
+            with connection.channels:
+                client = self._get_client()
+                with client.open_sftp() as sftp:
+                    sftp.put(localpath, remotepath)
+                    if mode is None:
+                        mode = 0o777 & os.stat(localpath).st_mode
+                    sftp.chmod(remotepath, mode)
 
     def _put_file_shell(self, localpath, remotepath, mode=None):
         cmd = ["cat > %s" % remotepath]
@@ -289,3 +447,37 @@ class SSH(object):
             self._put_file_sftp(localpath, remotepath, mode=mode)
         except (paramiko.SSHException, socket.error):
             self._put_file_shell(localpath, remotepath, mode=mode)
+
+
+def run_many(hosts, cmd, stdin=None, timeout=3600, concurrency=100):
+    """Execute the command on many hosts in parallel.
+
+    :param hosts: list of SSH objects
+    :param cmd: Command to be executed, can be a list.
+    :param stdin: String to pass to stdin of every command.
+    :param timeout: Timeout in seconds for execution of the command on
+        every host. No timeout if set to 0.
+    :param concurrency: The max number of hosts to execute the command on
+        at the same time.
+
+    :returns: list of results for every host in the order of hosts. The
+        result is a tuple (exit_status, stdout, stderr) or the exception
+        raised while executing the command on the host.
+    """
+    results = [None] * len(hosts)
+
+    def publish(queue):
+        for i, ssh in enumerate(hosts):
+            queue.append((i, ssh))
+
+    def consume(cache, args):
+        i, ssh = args
+        try:
+            results[i] = ssh.execute(cmd, stdin=stdin, timeout=timeout)
+        except Exception as e:
+            LOG.debug("Failed to execute '%s' on host %s: %s"
+                      % (cmd, ssh.host, e))
+            results[i] = e
+
+    broker.run(publish, consume, max(1, min(concurrency, len(hosts))))
+    return results
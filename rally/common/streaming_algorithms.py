@@ -16,12 +16,11 @@
 from __future__ import division
 
 import abc
+import bisect
 import math
 
 import six
 
-from rally.task.processing import utils
-
 
 @six.add_metaclass(abc.ABCMeta)
 class StreamingAlgorithm(object):
@@ -153,34 +152,267 @@ class MaxComputation(StreamingAlgorithm):
         return self._value
 
 
+class QuantileSketch(object):
+    """Mergeable sketch of a stream of numbers for computing quantiles.
+
+    Values are counted in buckets with logarithmically growing bounds, so
+    each quantile is computed with the relative error not greater than
+    `relative_error` (DDSketch algorithm). The number of buckets grows
+    with the logarithm of the range of values, not with the number of
+    values, and it is limited by `max_buckets`: if the limit is exceeded,
+    the buckets of values closest to zero are collapsed, which affects
+    only the accuracy of the lowest quantiles.
+
+    Quantiles can be requested after every added value: the sorted order of
+    buckets is kept between calls and the position of the rank of each
+    requested quantile is moved along with added values, so buckets are
+    neither sorted nor walked on every call.
+    """
+
+    def __init__(self, relative_error=0.01, max_buckets=2048):
+        if not 0 < relative_error < 1:
+            raise ValueError("Unexpected relative error: %s" % relative_error)
+        self.relative_error = relative_error
+        self.max_buckets = max_buckets
+        self._gamma = (1 + relative_error) / (1 - relative_error)
+        self._log_gamma = math.log(self._gamma)
+        self._positive = {}
+        self._negative = {}
+        self._zeros = 0
+        self.count = 0
+        self._min = None
+        self._max = None
+        self._reset_cursors()
+
+    def _reset_cursors(self):
+        # sorted keys of non-empty buckets (see _key) or None if they should
+        # be sorted again
+        self._keys = None
+        # q -> [position of the bucket of rank of q-quantile in self._keys,
+        #       the number of values in buckets before it]
+        self._cursors = {}
+
+    def _index(self, value):
+        return int(math.ceil(math.log(value) / self._log_gamma))
+
+    def _value(self, index):
+        return 2 * self._gamma ** index / (self._gamma + 1)
+
+    @staticmethod
+    def _key(sign, idx):
+        # keys are ordered in the same way as values of buckets
+        return (sign, sign * idx)
+
+    def _key_count(self, key):
+        if key[0] > 0:
+            return self._positive[key[1]]
+        elif key[0] < 0:
+            return self._negative[-key[1]]
+        return self._zeros
+
+    def _key_value(self, key):
+        if key[0] > 0:
+            return self._value(key[1])
+        elif key[0] < 0:
+            return -self._value(-key[1])
+        return 0.0
+
+    def add(self, value, count=1):
+        if value > 0:
+            buckets = self._positive
+            sign = 1
+        elif value < 0:
+            buckets = self._negative
+            sign = -1
+        else:
+            buckets = None
+        if buckets is None:
+            is_new = not self._zeros
+            self._zeros += count
+            key = (0, 0)
+        else:
+            idx = self._index(abs(value))
+            is_new = idx not in buckets
+            buckets[idx] = buckets.get(idx, 0) + count
+            key = self._key(sign, idx)
+            if len(buckets) > self.max_buckets:
+                self._collapse(buckets)
+                self._reset_cursors()
+        if self._keys is not None:
+            if is_new:
+                bisect.insort(self._keys, key)
+            for cursor in self._cursors.values():
+                # the position is valid before insertion of the new key
+                if key < self._keys[cursor[0] + is_new]:
+                    cursor[0] += is_new
+                    cursor[1] += count
+        self.count += count
+        if self._min is None or value < self._min:
+            self._min = value
+        if self._max is None or value > self._max:
+            self._max = value
+
+    def _collapse(self, buckets):
+        indexes = sorted(buckets)
+        extra = len(buckets) - self.max_buckets
+        for idx in indexes[:extra]:
+            buckets[indexes[extra]] += buckets.pop(idx)
+
+    def merge(self, other):
+        if other.relative_error != self.relative_error:
+            raise ValueError("Sketches with different relative errors can "
+                             "not be merged: %s != %s"
+                             % (self.relative_error, other.relative_error))
+        for mine, theirs in ((self._positive, other._positive),
+                             (self._negative, other._negative)):
+            for idx, count in theirs.items():
+                mine[idx] = mine.get(idx, 0) + count
+            if len(mine) > self.max_buckets:
+                self._collapse(mine)
+        self._reset_cursors()
+        self._zeros += other._zeros
+        self.count += other.count
+        if other._min is not None and (self._min is None
+                                       or other._min < self._min):
+            self._min = other._min
+        if other._max is not None and (self._max is None
+                                       or other._max > self._max):
+            self._max = other._max
+
+    def _values_at_ranks(self, q, rank):
+        """Return values at the rank and at the next one."""
+        if self._keys is None:
+            keys = [self._key(-1, idx) for idx in self._negative]
+            if self._zeros:
+                keys.append((0, 0))
+            keys.extend(self._key(1, idx) for idx in self._positive)
+            self._keys = sorted(keys)
+            self._cursors = {}
+        cursor = self._cursors.setdefault(q, [0, 0])
+        pos, before = cursor
+        while rank < before:
+            pos -= 1
+            before -= self._key_count(self._keys[pos])
+        while rank >= before + self._key_count(self._keys[pos]):
+            before += self._key_count(self._keys[pos])
+            pos += 1
+        cursor[0], cursor[1] = pos, before
+
+        value = self._key_value(self._keys[pos])
+        if rank + 1 < before + self._key_count(self._keys[pos]):
+            return value, value
+        elif pos + 1 < len(self._keys):
+            return value, self._key_value(self._keys[pos + 1])
+        return value, self._max
+
+    def quantile(self, q):
+        """Return q-quantile (0 <= q <= 1) or None if there is no values.
+
+        The neighbour ranks are linearly interpolated in the same way as
+        for percentiles of a sorted list of values.
+        """
+        if not self.count:
+            return None
+        k = (self.count - 1) * q
+        f = math.floor(k)
+        c = math.ceil(k)
+        lower, upper = self._values_at_ranks(q, int(f))
+        if f == c:
+            result = lower
+        else:
+            result = lower * (c - k) + upper * (k - f)
+        return min(max(result, self._min), self._max)
+
+    def to_dict(self):
+        """Serialize the sketch into a JSON-friendly dict."""
+        return {"relative_error": self.relative_error,
+                "max_buckets": self.max_buckets,
+                "positive": dict((str(k), v)
+                                 for k, v in self._positive.items()),
+                "negative": dict((str(k), v)
+                                 for k, v in self._negative.items()),
+                "zeros": self._zeros,
+                "count": self.count,
+                "min": self._min,
+                "max": self._max}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a sketch serialized with to_dict()."""
+        sketch = cls(data["relative_error"], data["max_buckets"])
+        sketch._positive = dict((int(k), v)
+                                for k, v in data["positive"].items())
+        sketch._negative = dict((int(k), v)
+                                for k, v in data["negative"].items())
+        sketch._zeros = data["zeros"]
+        sketch.count = data["count"]
+        sketch._min = data["min"]
+        sketch._max = data["max"]
+        return sketch
+
+
 class PercentileComputation(StreamingAlgorithm):
-    """Compute percentile value from a stream of numbers."""
+    """Compute percentile value from a stream of numbers.
 
-    def __init__(self, percent, length):
+    Up to `exact_size` values are stored as is, so percentiles of short
+    streams are exact. After that the values are moved to QuantileSketch
+    and the memory usage does not grow anymore.
+    """
+
+    def __init__(self, percent, length=None, relative_error=0.01,
+                 exact_size=10000):
         """Init streaming computation.
 
         :param percent: numeric percent (from 0.00..1 to 0.999..)
-        :param length: count of the measurements
+        :param length: count of the measurements. It is not required
+            anymore and is left for backward compatibility only.
+        :param relative_error: relative accuracy of results for long streams
+        :param exact_size: maximum number of values to store as is
         """
         if not 0 < percent < 1:
             raise ValueError("Unexpected percent: %s" % percent)
         self._percent = percent
+        self._relative_error = relative_error
+        self._exact_size = exact_size
+        self._values = []
+        self._sketch = None
 
-        self._graph_zipper = utils.GraphZipper(length, 10000)
+    def _to_sketch(self):
+        self._sketch = QuantileSketch(self._relative_error)
+        for value in self._values:
+            self._sketch.add(value)
+        self._values = None
 
     def add(self, value):
-        self._graph_zipper.add_point(value)
+        if not isinstance(value, (int, float)):
+            value = 0
+        if self._sketch is not None:
+            self._sketch.add(value)
+            return
+        self._values.append(value)
+        if len(self._values) > self._exact_size:
+            self._to_sketch()
 
     def merge(self, other):
-        # TODO(ikhudoshyn): Implement me
-        raise NotImplementedError()
+        if self._sketch is None and other._sketch is None:
+            self._values.extend(other._values)
+            if len(self._values) > self._exact_size:
+                self._to_sketch()
+            return
+        if self._sketch is None:
+            self._to_sketch()
+        if other._sketch is None:
+            for value in other._values:
+                self._sketch.add(value)
+        else:
+            self._sketch.merge(other._sketch)
 
     def result(self):
-        results = list(
-            map(lambda x: x[1], self._graph_zipper.get_zipped_graph()))
-        if results:
+        if self._sketch is not None:
+            return self._sketch.quantile(self._percent)
+        if self._values:
             # NOTE(amaretskiy): Calculate percentile of a list of values
-            results.sort()
+            results = sorted(self._values)
             k = (len(results) - 1) * self._percent
             f = math.floor(k)
             c = math.ceil(k)
@@ -191,6 +423,26 @@ class PercentileComputation(StreamingAlgorithm):
             return (d0 + d1)
         return None
 
+    def to_dict(self):
+        """Serialize the computation into a JSON-friendly dict."""
+        return {"percent": self._percent,
+                "relative_error": self._relative_error,
+                "exact_size": self._exact_size,
+                "values": self._values,
+                "sketch": self._sketch and self._sketch.to_dict()}
+
+    @classmethod
+    def from_dict(cls, data):
+        """Restore a computation serialized with to_dict()."""
+        comp = cls(data["percent"], relative_error=data["relative_error"],
+                   exact_size=data["exact_size"])
+        if data["sketch"] is None:
+            comp._values = list(data["values"])
+        else:
+            comp._values = None
+            comp._sketch = QuantileSketch.from_dict(data["sketch"])
+        return comp
+
 
 class IncrementComputation(StreamingAlgorithm):
     """Simple incremental counter."""
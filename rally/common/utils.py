@@ -27,6 +27,7 @@ import shutil
 import string
 import sys
 import tempfile
+import threading
 import time
 import uuid
 
@@ -565,6 +566,19 @@ def terminate_thread(thread_ident, exc_type=exceptions.ThreadTimeoutException):
         ctypes.c_long(thread_ident), ctypes.py_object(exc_type))
 
 
+def cancel_thread_termination(thread_ident):
+    """Cancel termination of a python thread if it is not terminated yet.
+
+    Withdraws the exception set by terminate_thread while it is not raised
+    in the thread.
+
+    :param thread_ident: threading.Thread.ident value
+    """
+
+    ctypes.pythonapi.PyThreadState_SetAsyncExc(
+        ctypes.c_long(thread_ident), None)
+
+
 def timeout_thread(queue):
     """Terminate threads by timeout.
 
@@ -594,14 +608,38 @@ def timeout_thread(queue):
             # NOTE(rvasilets) Empty means that timeout was occurred.
             # ValueError means that timeout lower than 0.
             if thread.isAlive():
-                LOG.info("Thread %s is timed out. Terminating." % thread.ident)
-                terminate_thread(thread.ident)
+                thread_ident = thread.ident
+                LOG.info("Thread %s is timed out. Terminating." % thread_ident)
+                terminate_thread(thread_ident)
             all_threads.popleft()
 
         if next_thread == (None, None,):
             return
 
 
+def _lock(obj):
+    # NOTE: subclasses of dict (e.g. credentials) are objects with their own
+    #   behaviour, so they are kept as is.
+    if type(obj) == dict:
+        return LockedDict(obj)
+    elif type(obj) == collections.OrderedDict:
+        return LockedOrderedDict(obj)
+    elif isinstance(obj, list):
+        return LockedList([_lock(v) for v in obj])
+    return obj
+
+
+def _unlock(obj):
+    if isinstance(obj, LockedOrderedDict):
+        return collections.OrderedDict((k, _unlock(v))
+                                       for k, v in obj.items())
+    elif isinstance(obj, LockedDict):
+        return dict((k, _unlock(v)) for k, v in obj.items())
+    elif isinstance(obj, LockedList):
+        return [_unlock(v) for v in obj]
+    return obj
+
+
 class LockedDict(dict):
     """This represents dict which can be locked for updates.
 
@@ -612,23 +650,20 @@ class LockedDict(dict):
     d["spam"] = 42  # RuntimeError
     with d.unlocked():
          d["spam"] = 42  # Works
+
+    Nested dicts and lists are converted into read-only LockedDict and
+    LockedList objects.
     """
 
     def __init__(self, *args, **kwargs):
+        # NOTE: the dict is filled in while it is unlocked, since
+        #   OrderedDict.__init__ sets items one by one via __setitem__.
+        self._is_locked = False
+        self._is_ready_to_be_unlocked = False
         super(LockedDict, self).__init__(*args, **kwargs)
+        for k, v in self.items():
+            self[k] = _lock(v)
         self._is_locked = True
-        self._is_ready_to_be_unlocked = False
-
-        def lock(obj):
-            if isinstance(obj, dict):
-                return LockedDict(obj)
-            elif isinstance(obj, list):
-                return tuple([lock(v) for v in obj])
-            return obj
-
-        with self.unlocked():
-            for k, v in self.items():
-                self[k] = lock(v)
 
     def _check_is_unlocked(self):
         if self._is_locked:
@@ -639,15 +674,10 @@ class LockedDict(dict):
         return self
 
     def __deepcopy__(self, memo=None):
-        def unlock(obj):
-            if isinstance(obj, LockedDict):
-                obj = dict(obj)
-                for k, v in obj.items():
-                    obj[k] = unlock(v)
-            elif type(obj) == tuple:
-                obj = tuple([unlock(v) for v in obj])
-            return obj
-        return copy.deepcopy(unlock(self), memo=memo)
+        return copy.deepcopy(_unlock(self), memo=memo)
+
+    def __reduce__(self):
+        return self.__class__, (list(self.items()),)
 
     def __enter__(self, *args):
         if self._is_ready_to_be_unlocked:
@@ -686,6 +716,31 @@ class LockedDict(dict):
         return super(LockedDict, self).clear(*args, **kwargs)
 
 
+class LockedOrderedDict(LockedDict, collections.OrderedDict):
+    """LockedDict which keeps the order of items like OrderedDict."""
+
+    def move_to_end(self, *args, **kwargs):
+        self._check_is_unlocked()
+        return super(LockedOrderedDict, self).move_to_end(*args, **kwargs)
+
+
+class LockedList(list):
+    """Read-only list of locked values of LockedDict."""
+
+    def _readonly(self, *args, **kwargs):
+        raise RuntimeError("Trying to change read-only list %r" % self)
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _readonly
+    __setslice__ = __delslice__ = _readonly
+    append = extend = insert = pop = remove = reverse = sort = _readonly
+
+    def __deepcopy__(self, memo=None):
+        return copy.deepcopy(_unlock(self), memo=memo)
+
+    def __reduce__(self):
+        return LockedList, (list(self),)
+
+
 @logging.log_deprecated(message="Its not used elsewhere in Rally already.",
                         rally_version="0.11.2")
 def format_float_to_str(num):
@@ -712,6 +767,42 @@ class DequeAsQueue(object):
         return bool(self.deque)
 
 
+class WaitableDeque(collections.deque):
+    """collections.deque which allows consumers to wait for new items.
+
+    Instead of polling the deque with sleeps, a consumer blocks in wait()
+    and is woken up as soon as a producer appends an item or calls
+    notify_all() (e.g. to tell that there is nothing more to wait for).
+    """
+
+    def __init__(self, iterable=(), maxlen=None):
+        super(WaitableDeque, self).__init__(iterable, maxlen)
+        self._cond = threading.Condition()
+
+    def append(self, item):
+        with self._cond:
+            super(WaitableDeque, self).append(item)
+            self._cond.notify_all()
+
+    def notify_all(self):
+        """Wake up all waiters."""
+        with self._cond:
+            self._cond.notify_all()
+
+    def wait(self, stop_event=None, timeout=None):
+        """Wait until the deque has items.
+
+        :param stop_event: threading.Event which stops waiting once it is
+            set. The one who sets it should call notify_all() afterwards.
+        :param timeout: optional max time to wait in seconds
+        :returns: True if the deque has items
+        """
+        with self._cond:
+            if not self and not (stop_event and stop_event.is_set()):
+                self._cond.wait(timeout)
+            return bool(self)
+
+
 class Stopwatch(object):
     """Allows to sleep till specified time since start."""
 
@@ -48,6 +48,11 @@ def find_exception(response):
     """Discover a proper exception class based on response object."""
     global _exception_map
     if _exception_map is None:
+        # NOTE: plugin modules can define exceptions too. The module of
+        #   plugins imports this one, so it can not be imported on top.
+        from rally.common.plugin import plugin
+
+        plugin.load_lazy_plugins()
         _exception_map = dict(
             (e.error_code, e) for e in discover.itersubclasses(RallyException))
     exc_class = _exception_map.get(response.status_code, RallyException)
@@ -13,16 +13,42 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import os
 
 import decorator
 
+from rally.common import cfg
 from rally.common.plugin import discover
+from rally.common.plugin import manifest
 
 
+CONF = cfg.CONF
+
 PLUGINS_LOADED = False
 
 
+def _get_packages():
+    """Return names of in-tree packages with plugins to load."""
+    packages = ["rally.plugins.common"]
+    try:
+        import rally_openstack  # noqa
+    except ImportError:
+        discover.LOG.warning(
+            "OpenStack plugins moved to the separate package "
+            "(see https://pypi.org/project/rally-openstack). In-tree "
+            "OpenStack plugins will be removed from the Rally main package"
+            " soon.")
+        packages.extend(["rally.plugins.openstack", "rally.plugins.workload"])
+    return packages
+
+
+def _import_all(packages):
+    for package in packages:
+        discover.import_modules_from_package(package)
+    return discover.import_modules_by_entry_point()
+
+
 def load():
     global PLUGINS_LOADED
 
@@ -31,20 +57,23 @@ def load():
 
         opts.register()
 
-        discover.import_modules_from_package("rally.plugins.common")
-        try:
-            import rally_openstack  # noqa
-        except ImportError:
-            discover.LOG.warning(
-                "OpenStack plugins moved to the separate package "
-                "(see https://pypi.org/project/rally-openstack). In-tree "
-                "OpenStack plugins will be removed from the Rally main package"
-                " soon.")
-            discover.import_modules_from_package("rally.plugins.openstack")
-            discover.import_modules_from_package("rally.plugins.workload")
-
-        packages = discover.import_modules_by_entry_point()
-        for package in packages:
+        packages = _get_packages()
+        if CONF.lazy_plugins_loading:
+            # NOTE: import only the roots of packages from entry-points to
+            #   get their versions and options. The rest is imported on
+            #   demand or after the full discovery if the manifest is stale.
+            entry_points = discover.import_modules_by_entry_point(
+                import_modules=False)
+            manifest.load(
+                packages + [p["plugins_path"] for p in entry_points
+                            if "plugins_path" in p],
+                functools.partial(_import_all, packages),
+                versions=["%s %s" % (p["name"], p["version"])
+                          for p in entry_points])
+        else:
+            entry_points = _import_all(packages)
+
+        for package in entry_points:
             if "options" in package:
                 opts.register_options_from_path(package["options"])
 
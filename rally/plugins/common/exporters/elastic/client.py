@@ -13,26 +13,74 @@
 #    under the License.
 
 import copy
+import threading
+import time
+import zlib
 
 import json
 import requests
 import six
 
+from rally.common import cfg
 from rally.common import logging
 from rally import exceptions
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
+ELASTIC_OPTS = [
+    cfg.IntOpt("elastic_bulk_concurrency", default=4, min=1,
+               help="Number of bulk requests which the ElasticSearch "
+                    "exporter sends to the cluster simultaneously."),
+    cfg.IntOpt("elastic_bulk_retries", default=3, min=0,
+               help="Number of times the ElasticSearch exporter pushes "
+                    "documents again if the cluster rejects them because "
+                    "it is overloaded or unavailable."),
+    cfg.BoolOpt("elastic_bulk_compression", default=True,
+                help="Compress bodies of bulk requests with gzip. It is not "
+                     "used for ElasticSearch 2.x clusters, which accept "
+                     "compressed requests only if http.compression is "
+                     "enabled."),
+]
+
 
 class ElasticSearchClient(object):
-    """The helper class for communication with ElasticSearch 2.* and 5.*"""
+    """The helper class for communication with ElasticSearch 2.* and 5.*
+
+    :param url: url of the cluster. Defaults to http://localhost:9200
+    :param concurrency: number of simultaneous bulk requests. Defaults to
+        elastic_bulk_concurrency option
+    :param retries: number of retries of rejected documents. Defaults to
+        elastic_bulk_retries option
+    :param compression: whether to compress bodies of bulk requests.
+        Defaults to elastic_bulk_compression option
+    """
 
     # a number of documents to push to the cluster at once.
     CHUNK_LENGTH = 10000
+    # statuses of requests and documents which can be pushed again
+    RETRY_STATUSES = (429, 502, 503, 504)
+    # seconds to wait before the first retry, it is doubled for next ones
+    RETRY_INTERVAL = 1
 
-    def __init__(self, url):
+    def __init__(self, url, concurrency=None, retries=None,
+                 compression=None):
         self._url = url.rstrip("/") if url else "http://localhost:9200"
         self._version = None
+        self._concurrency = (CONF.elastic_bulk_concurrency
+                             if concurrency is None else concurrency)
+        self._retries = (CONF.elastic_bulk_retries
+                         if retries is None else retries)
+        self._compression = (CONF.elastic_bulk_compression
+                             if compression is None else compression)
+
+        # keep connections to the cluster opened for all requests
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_maxsize=self._concurrency)
+        self._session.mount("http://", adapter)
+        self._session.mount("https://", adapter)
 
     @staticmethod
     def _check_response(resp, action=None):
@@ -65,7 +113,7 @@ class ElasticSearchClient(object):
 
     def info(self):
         """Retrieve info about the ElasticSearch cluster."""
-        resp = requests.get(self._url)
+        resp = self._session.get(self._url)
         self._check_response(resp)
         err_msg = "Failed to retrieve info about the ElasticSearch cluster: %s"
         try:
@@ -88,26 +136,126 @@ class ElasticSearchClient(object):
     def push_documents(self, documents):
         """Push documents to the ElasticSearch cluster using bulk API.
 
-        :param documents: a list of documents to push
+        Documents are read by chunks, which are pushed by several requests
+        simultaneously. Documents, which the cluster rejects because it is
+        overloaded, are pushed again.
+
+        :param documents: an iterable of lines of bulk requests, i.e.
+            actions followed by documents to push
         """
-        LOG.debug("Pushing %s documents by chunks (up to %s documents at once)"
-                  " to ElasticSearch." %
+        LOG.debug("Pushing documents by chunks (up to %s documents at once,"
+                  " %s requests simultaneously) to ElasticSearch." %
                   # dividing numbers by two, since each documents has 2 lines
                   #     in `documents` (action and document itself).
-                  (len(documents) / 2, self.CHUNK_LENGTH / 2))
+                  (self.CHUNK_LENGTH // 2, self._concurrency))
+
+        compress = (self._compression
+                    and not self.version().startswith("2."))
+        # the generation of documents is suspended while all workers are
+        #   busy, so only a few chunks are kept in memory at once
+        queue = six.moves.queue.Queue(self._concurrency)
+        pushed = []
+        errors = []
+
+        def worker():
+            while True:
+                lines = queue.get()
+                if lines is None:
+                    break
+                if errors:
+                    # skip the rest of documents
+                    continue
+                try:
+                    pushed.append(self._push_chunk(lines, compress))
+                except Exception as e:
+                    errors.append(e)
+
+        workers = []
+        for i in six.moves.range(self._concurrency):
+            thread = threading.Thread(target=worker)
+            thread.start()
+            workers.append(thread)
 
-        for pos in six.moves.range(0, len(documents), self.CHUNK_LENGTH):
-            data = "\n".join(documents[pos:pos + self.CHUNK_LENGTH]) + "\n"
+        try:
+            lines = []
+            for line in documents:
+                lines.append(line)
+                if len(lines) == self.CHUNK_LENGTH:
+                    if errors:
+                        break
+                    queue.put(lines)
+                    lines = []
+            if lines and not errors:
+                queue.put(lines)
+        finally:
+            for thread in workers:
+                queue.put(None)
+            for thread in workers:
+                thread.join()
+
+        if errors:
+            raise errors[0]
+        LOG.debug("Successfully pushed %s documents." % sum(pushed))
+
+    def _post_bulk(self, lines, compress):
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+        headers = {}
+        if compress:
+            compressor = zlib.compressobj(6, zlib.DEFLATED,
+                                          16 + zlib.MAX_WBITS)
+            data = compressor.compress(data) + compressor.flush()
+            headers["Content-Encoding"] = "gzip"
+        return self._session.post(self._url + "/_bulk", data=data,
+                                  headers=headers)
+
+    def _push_chunk(self, lines, compress):
+        """Push a chunk of documents and retry rejected ones.
 
-            raw_resp = requests.post(self._url + "/_bulk", data=data)
-            self._check_response(raw_resp, action="push documents to")
+        :returns: number of pushed documents
+        """
+        pushed = 0
+        for attempt in six.moves.range(self._retries + 1):
+            if attempt:
+                time.sleep(self.RETRY_INTERVAL * 2 ** (attempt - 1))
+            resp = self._post_bulk(lines, compress)
+            if (resp.status_code in self.RETRY_STATUSES
+                    and attempt < self._retries):
+                LOG.debug("[HTTP %s] ElasticSearch cluster rejected %s "
+                          "documents. Retrying."
+                          % (resp.status_code, len(lines) // 2))
+                continue
+            self._check_response(resp, action="push documents to")
+
+            rejected = []
+            for i, item in enumerate(resp.json()["items"]):
+                # there is the only one action per item
+                result = list(item.values())[0]
+                status = result.get("status", 200)
+                if status in self.RETRY_STATUSES:
+                    rejected.extend(lines[i * 2:i * 2 + 2])
+                elif status not in (200, 201):
+                    reason = result.get("error", "n/a")
+                    if isinstance(reason, dict):
+                        reason = reason.get("reason", "n/a")
+                    raise exceptions.RallyException(
+                        "[HTTP %s] Failed to push the document %s to "
+                        "ElasticSearch cluster: %s"
+                        % (status, result.get("_id"), reason))
+                else:
+                    pushed += 1
+            if not rejected:
+                return pushed
+            LOG.debug("ElasticSearch cluster rejected %s of %s documents. "
+                      "Retrying." % (len(rejected) // 2, len(lines) // 2))
+            lines = rejected
 
-            LOG.debug("Successfully pushed %s documents." %
-                      len(raw_resp.json()["items"]))
+        raise exceptions.RallyException(
+            "Failed to push %s documents to ElasticSearch cluster: they are "
+            "rejected after %s retries." % (len(lines) // 2, self._retries))
 
     def list_indices(self):
         """List all indices."""
-        resp = requests.get(self._url + "/_cat/indices?v")
+        resp = self._session.get(self._url + "/_cat/indices?v")
         self._check_response(resp, "list the indices at")
 
         return resp.text.rstrip().split(" ")
@@ -135,7 +283,7 @@ class ElasticSearchClient(object):
 
         data = json.dumps({"mappings": {doc_type: {"properties": properties}}})
 
-        resp = requests.put(self._url + "/%s" % name, data=data)
+        resp = self._session.put(self._url + "/%s" % name, data=data)
         self._check_response(resp, "create index at")
 
     def check_document(self, index, doc_id, doc_type="data"):
@@ -145,11 +293,11 @@ class ElasticSearchClient(object):
         :param doc_id: The ID of a document
         :param doc_type: The type of a document (Defaults to data)
         """
-        resp = requests.head("%(url)s/%(index)s/%(type)s/%(id)s" %
-                             {"url": self._url,
-                              "index": index,
-                              "type": doc_type,
-                              "id": doc_id})
+        resp = self._session.head("%(url)s/%(index)s/%(type)s/%(id)s" %
+                                  {"url": self._url,
+                                   "index": index,
+                                   "type": doc_type,
+                                   "id": doc_id})
         if resp.status_code == 200:
             return True
         elif resp.status_code == 404:
@@ -136,7 +136,6 @@ class ElasticSearchExporter(exporter.TaskExporter):
         super(ElasticSearchExporter, self).__init__(tasks_results,
                                                     output_destination,
                                                     api=api)
-        self._report = []
         self._remote = (
             output_destination is None or (
                 output_destination.startswith("http://")
@@ -152,7 +151,7 @@ class ElasticSearchExporter(exporter.TaskExporter):
         return sorted(["%s=%s" % (k, v)
                        for k, v in morph.flatten(obj).items()])
 
-    def _add_index(self, index, body, doc_id=None, doc_type="data"):
+    def _make_index(self, index, body, doc_id=None, doc_type="data"):
         """Create a document for the specified index with specified id.
 
         :param index: The name of the index
@@ -160,17 +159,17 @@ class ElasticSearchExporter(exporter.TaskExporter):
             scenario, iteration and atomic action)
         :param doc_id: Document ID. Here we use task/subtask/workload uuid
         :param doc_type: The type of document
-
+        :returns: lines of the bulk request, i.e. the action and the document
         """
-        self._report.append(
+        return [
             json.dumps(
                 # use OrderedDict to make the report more unified
                 {"index": collections.OrderedDict([
                     ("_index", index),
                     ("_type", doc_type),
                     ("_id", doc_id)])},
-                sort_keys=False))
-        self._report.append(json.dumps(body))
+                sort_keys=False),
+            json.dumps(body)]
 
     def _ensure_indices(self):
         """Check available indices and create require ones if they missed."""
@@ -211,7 +210,7 @@ class ElasticSearchExporter(exporter.TaskExporter):
                                 itr, workload, workload_id,
                                 atomic_actions=None, _parent=None, _depth=0,
                                 _cache=None):
-        """Process atomic actions of an iteration
+        """Generate documents of atomic actions of an iteration
 
         :param atomic_actions: A list with an atomic actions
         :param itr: The iteration data
@@ -259,19 +258,21 @@ class ElasticSearchExporter(exporter.TaskExporter):
                 error=(itr["error"] if action.get("failed", False) else None)
             )
 
-            self._add_index(self.AA_INDEX, action_report,
-                            doc_id=act_id)
-
-            self._process_atomic_actions(
-                deployment_uuid=deployment_uuid,
-                deployment_name=deployment_name,
-                atomic_actions=action["children"],
-                itr=itr,
-                workload=workload,
-                workload_id=workload_id,
-                _parent=(act_id, action_report),
-                _depth=(_depth + 1),
-                _cache=cache)
+            for line in self._make_index(self.AA_INDEX, action_report,
+                                         doc_id=act_id):
+                yield line
+
+            for line in self._process_atomic_actions(
+                    deployment_uuid=deployment_uuid,
+                    deployment_name=deployment_name,
+                    atomic_actions=action["children"],
+                    itr=itr,
+                    workload=workload,
+                    workload_id=workload_id,
+                    _parent=(act_id, action_report),
+                    _depth=(_depth + 1),
+                    _cache=cache):
+                yield line
 
         if itr["error"] and (
                 # the case when it is a top level of the scenario and the
@@ -309,42 +310,39 @@ class ElasticSearchExporter(exporter.TaskExporter):
                 parent=_parent,
                 error=itr["error"]
             )
-            self._add_index(self.AA_INDEX, action_report, doc_id=act_id)
+            for line in self._make_index(self.AA_INDEX, action_report,
+                                         doc_id=act_id):
+                yield line
 
-    def generate(self):
-        if self._remote:
-            self._ensure_indices()
-
-        deployment_names = {}
-        for task in self.tasks_results:
-            deployment = task["deployment_uuid"]
-            if deployment not in deployment_names:
-                deployment_names[deployment] = (
-                    self.api.deployment.get(deployment)["name"])
+    def _generate_task_documents(self, deployment_names):
+        """Generate lines of bulk requests for documents of tasks.
 
+        :param deployment_names: a dict with names of deployments of tasks
+        """
         for task in self.tasks_results:
-            if self._remote:
-                if self._client.check_document(self.TASK_INDEX, task["uuid"]):
-                    raise exceptions.RallyException(
-                        "Failed to push the task %s to the ElasticSearch "
-                        "cluster. The document with such UUID already exists" %
-                        task["uuid"])
-
             deployment_uuid = task["deployment_uuid"]
-            deployment_name = deployment_names[deployment_uuid]
-
             task_report = {
                 "task_uuid": task["uuid"],
                 "deployment_uuid": deployment_uuid,
-                "deployment_name": deployment_name,
+                "deployment_name": deployment_names[deployment_uuid],
                 "title": task["title"],
                 "description": task["description"],
                 "status": task["status"],
                 "pass_sla": task["pass_sla"],
                 "tags": task["tags"]
             }
-            self._add_index(self.TASK_INDEX, task_report,
-                            doc_id=task["uuid"])
+            for line in self._make_index(self.TASK_INDEX, task_report,
+                                         doc_id=task["uuid"]):
+                yield line
+
+    def _generate_documents(self, deployment_names):
+        """Generate lines of bulk requests for workloads of tasks one by one.
+
+        :param deployment_names: a dict with names of deployments of tasks
+        """
+        for task in self.tasks_results:
+            deployment_uuid = task["deployment_uuid"]
+            deployment_name = deployment_names[deployment_uuid]
 
             # NOTE(andreykurilin): The subtasks do not have much logic now, so
             #   there is no reason to save the info about them.
@@ -384,8 +382,10 @@ class ElasticSearchExporter(exporter.TaskExporter):
                                     if not s["success"]]}
 
                 # do we need to store hooks ?!
-                self._add_index(self.WORKLOAD_INDEX, workload_report,
-                                doc_id=workload["uuid"])
+                for line in self._make_index(self.WORKLOAD_INDEX,
+                                             workload_report,
+                                             doc_id=workload["uuid"]):
+                    yield line
 
                 # Iterations
                 for idx, itr in enumerate(workload.get("data", []), 1):
@@ -393,23 +393,54 @@ class ElasticSearchExporter(exporter.TaskExporter):
                         "uuid": workload["uuid"],
                         "num": str(idx)}
 
-                    self._process_atomic_actions(
-                        deployment_uuid=deployment_uuid,
-                        deployment_name=deployment_name,
-                        itr=itr,
-                        workload=workload_report,
-                        workload_id=workload["uuid"])
+                    for line in self._process_atomic_actions(
+                            deployment_uuid=deployment_uuid,
+                            deployment_name=deployment_name,
+                            itr=itr,
+                            workload=workload_report,
+                            workload_id=workload["uuid"]):
+                        yield line
+
+    def generate(self):
+        if self._remote:
+            self._ensure_indices()
+
+        deployment_names = {}
+        for task in self.tasks_results:
+            deployment = task["deployment_uuid"]
+            if deployment not in deployment_names:
+                deployment_names[deployment] = (
+                    self.api.deployment.get(deployment)["name"])
+
+        if self._remote:
+            # check all tasks before pushing anything
+            for task in self.tasks_results:
+                if self._client.check_document(self.TASK_INDEX, task["uuid"]):
+                    raise exceptions.RallyException(
+                        "Failed to push the task %s to the ElasticSearch "
+                        "cluster. The document with such UUID already exists" %
+                        task["uuid"])
+
+        # documents are generated while they are pushed, so all of them are
+        #   never kept in memory at once
+        documents = self._generate_documents(deployment_names)
+        # NOTE: documents of tasks are pushed after all the rest, since
+        #   existing tasks are not exported again. If pushing fails, the
+        #   export can be retried and the pushed documents are overwritten.
+        task_documents = self._generate_task_documents(deployment_names)
         if self._remote:
             LOG.debug("The info of ElasticSearch cluster to which the results "
                       "will be exported: %s" % self._client.info())
-            self._client.push_documents(self._report)
+            self._client.push_documents(documents)
+            self._client.push_documents(task_documents)
 
             msg = ("Successfully exported results to ElasticSearch at url "
                    "'%s'" % self.output_destination)
             return {"print": msg}
         else:
             # a new line is required in the end of the file.
-            report = "\n".join(self._report) + "\n"
+            report = "".join("%s\n" % line for line in itertools.chain(
+                documents, task_documents))
             return {"files": {self.output_destination: report},
                     "open": "file://" + os.path.abspath(
                         self.output_destination)}
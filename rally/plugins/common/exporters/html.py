@@ -12,9 +12,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import io
 import itertools
 import os
 
+import six
+
 from rally.task import exporter
 from rally.task.processing import plot
 
@@ -54,3 +57,26 @@ class HTMLExporter(exporter.TaskExporter):
 class HTMLStaticExporter(HTMLExporter):
     """Generates task report in HTML format with embedded JS/CSS."""
     INCLUDE_LIBS = True
+
+
+@exporter.configure("html-stream")
+class HTMLStreamExporter(HTMLExporter):
+    """Generates task report in HTML format writing it workload by workload.
+
+    Suits reports of long tasks. Workloads are processed and written to the
+    destination file one at a time, identical tracebacks of failures are
+    stored once and per-iteration ("complete") output is included only for
+    the first iterations of each workload.
+    """
+
+    def generate(self):
+        results = self._generate_results()
+        if not self.output_destination:
+            out = six.StringIO()
+            plot.stream(results, out, include_libs=self.INCLUDE_LIBS)
+            return {"print": out.getvalue()}
+
+        path = os.path.abspath(os.path.expanduser(self.output_destination))
+        with io.open(path, "w", encoding="utf-8") as f:
+            plot.stream(results, f, include_libs=self.INCLUDE_LIBS)
+        return {"open": "file://" + path}
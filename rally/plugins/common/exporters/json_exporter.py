@@ -16,11 +16,25 @@ import collections
 import datetime as dt
 import json
 
+import six
+
+from rally.common import db
 from rally.common import version as rally_version
 from rally.task import exporter
 
 TIMEFORMAT = "%Y-%m-%dT%H:%M:%S"
 
+_ITEM_SEPARATOR = json.JSONEncoder(indent=4).item_separator
+
+
+def _encode_key(key):
+    """Convert the key of a dict to a string as json module does."""
+    if isinstance(key, six.string_types):
+        return key
+    if key is None or isinstance(key, six.integer_types + (float,)):
+        return json.dumps(key)
+    raise TypeError("key %r is not a string" % (key,))
+
 
 @exporter.configure("json")
 class JSONExporter(exporter.TaskExporter):
@@ -32,6 +46,51 @@ class JSONExporter(exporter.TaskExporter):
     #          workloads.
     REVISION = "1.1"
 
+    @classmethod
+    def _dumps(cls, results):
+        """Dump results to JSON, writing lazy workloads data item by item.
+
+        Workloads data can be a lazy stream of iterations (see
+        rally.common.db.api.WorkloadDataStream) which json module is not
+        able to dump, so the report is written by _iterencode, which dumps
+        such streams iteration by iteration and the whole data is never
+        loaded into memory. The output is the same as of
+        json.dumps(results, indent=4) for the materialized data.
+        """
+        return "".join(cls._iterencode(results))
+
+    @classmethod
+    def _iterencode(cls, obj, indent=""):
+        inner_indent = indent + " " * 4
+        if isinstance(obj, dict):
+            empty = True
+            for key, value in obj.items():
+                yield "{" if empty else _ITEM_SEPARATOR
+                yield "\n%s%s: " % (inner_indent,
+                                    json.dumps(_encode_key(key)))
+                for chunk in cls._iterencode(value, inner_indent):
+                    yield chunk
+                empty = False
+            yield "{}" if empty else "\n%s}" % indent
+        elif isinstance(obj, (list, tuple, db.WorkloadDataStream)):
+            is_stream = isinstance(obj, db.WorkloadDataStream)
+            empty = True
+            for item in obj:
+                yield "[" if empty else _ITEM_SEPARATOR
+                yield "\n" + inner_indent
+                if is_stream:
+                    # iterations do not contain streams
+                    yield json.dumps(item, sort_keys=False, indent=4
+                                     ).replace("\n", "\n" + inner_indent)
+                else:
+                    for chunk in cls._iterencode(item, inner_indent):
+                        yield chunk
+                empty = False
+            yield "[]" if empty else "\n%s]" % indent
+        else:
+            # raises TypeError for values which are not JSON serializable
+            yield json.dumps(obj)
+
     def _generate_tasks(self):
         tasks = []
         for task in self.tasks_results:
@@ -110,7 +169,7 @@ class JSONExporter(exporter.TaskExporter):
                             "format_version": self.REVISION},
                    "tasks": self._generate_tasks()}
 
-        results = json.dumps(results, sort_keys=False, indent=4)
+        results = self._dumps(results)
 
         if self.output_destination:
             return {"files": {self.output_destination: results},
@@ -20,12 +20,16 @@ import time
 
 from six.moves import queue as Queue
 
+from rally.common import logging
 from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally import exceptions
 from rally.task import runner
 from rally.task import utils as butils
 
+LOG = logging.getLogger(__name__)
+
 
 def _worker_process(queue, iteration_gen, timeout, concurrency, times,
                     context, cls, method_name, args, event_queue, aborted,
@@ -116,6 +120,124 @@ def _worker_process(queue, iteration_gen, timeout, concurrency, times,
         collector_thr_by_timeout.join()
 
 
+class _IterationWatcher(object):
+    """Thread-like view of a single iteration for `utils.timeout_thread`.
+
+    Threads of the pool outlive their iterations, so the timeout thread
+    should be able to interrupt only the iteration it was asked to watch
+    and never the next one started by the same thread.
+
+    The watcher terminates the thread by itself, under the same lock as
+    finish(), and finish() cancels the termination if the exception is not
+    raised yet. So once finish() has returned, the timeout of the iteration
+    can not be raised in the thread anymore.
+    """
+
+    def __init__(self):
+        self.ident = threading.current_thread().ident
+        self._lock = threading.Lock()
+        self._running = True
+        self._terminated = False
+
+    def isAlive(self):
+        # NOTE: `utils.timeout_thread` checks it when the deadline of the
+        #   iteration has expired, so the iteration is interrupted here.
+        #   False is always returned to keep `utils.timeout_thread` from
+        #   terminating the thread without the lock.
+        with self._lock:
+            if self._running:
+                LOG.info("Iteration of thread %s is timed out. Terminating."
+                         % self.ident)
+                utils.terminate_thread(self.ident)
+                self._running = False
+                self._terminated = True
+        return False
+
+    def finish(self):
+        with self._lock:
+            self._running = False
+            if self._terminated:
+                utils.cancel_thread_termination(self.ident)
+
+
+def _pool_worker_thread(queue, iteration_gen, times, timeout, timeout_queue,
+                        context, cls, method_name, args, event_queue,
+                        aborted):
+    """Run scenario iterations until there is no more of them to run.
+
+    :param timeout_queue: queue of `utils.timeout_thread` or None if
+                          iterations are not limited by timeout
+    """
+    while not aborted.is_set():
+        iteration = next(iteration_gen)
+        if iteration >= times:
+            break
+
+        scenario_context = runner._get_scenario_context(iteration, context)
+        watcher = _IterationWatcher()
+
+        result = None
+        try:
+            # NOTE: the timeout can expire at any moment after the watcher
+            #   is queued, so everything up to finish() is guarded.
+            if timeout_queue is not None:
+                timeout_queue.put((watcher, time.time() + timeout))
+            result = runner._run_scenario_once(
+                cls, method_name, scenario_context, args, event_queue)
+            watcher.finish()
+        except exceptions.ThreadTimeoutException as e:
+            # the exception can be raised outside of the scenario code if
+            # the timeout has expired right after the scenario had returned
+            watcher.finish()
+            if result is None:
+                result = runner.format_result_on_timeout(e, timeout)
+        if runner._check_result_in_worker(result, scenario_context):
+            queue.put(result)
+
+
+def _worker_process_with_pool(queue, iteration_gen, timeout, concurrency,
+                              times, context, cls, method_name, args,
+                              event_queue, aborted, info):
+    """Start the scenario within a fixed pool of threads.
+
+    Unlike `_worker_process`, it does not spawn a thread per iteration.
+    `concurrency` long-lived threads are started once and each of them
+    takes the next iteration number from the shared counter as soon as it
+    finishes the previous one, so the process simply waits for threads to
+    complete without polling them.
+
+    Parameters are the same as for `_worker_process`.
+    """
+    runner._log_worker_info(times=times, concurrency=concurrency,
+                            timeout=timeout, cls=cls, method_name=method_name,
+                            args=args)
+
+    timeout_queue = None
+    if timeout:
+        timeout_queue = Queue.Queue()
+        collector_thr_by_timeout = threading.Thread(
+            target=utils.timeout_thread,
+            args=(timeout_queue, )
+        )
+        collector_thr_by_timeout.start()
+
+    pool = []
+    for i in range(concurrency):
+        thread = threading.Thread(
+            target=_pool_worker_thread,
+            args=(queue, iteration_gen, times, timeout, timeout_queue,
+                  context, cls, method_name, args, event_queue, aborted))
+        thread.start()
+        pool.append(thread)
+
+    for thread in pool:
+        thread.join()
+
+    if timeout:
+        timeout_queue.put((None, None,))
+        collector_thr_by_timeout.join()
+
+
 @validation.configure("check_constant")
 class CheckConstantValidator(validation.Validator):
     """Additional schema validation for constant runner"""
@@ -168,6 +290,12 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
                 "minimum": 1,
                 "description": "The maximum number of processes to create load"
                                " from."
+            },
+            "thread_pool": {
+                "type": "boolean",
+                "description": "Run iterations in a fixed pool of long-lived"
+                               " threads of each process instead of starting"
+                               " a new thread per iteration."
             }
         },
         "additionalProperties": False
@@ -222,8 +350,13 @@ class ConstantScenarioRunner(runner.ScenarioRunner):
                 if concurrency_overhead:
                     concurrency_overhead -= 1
 
+        if self.config.get("thread_pool", False):
+            worker_process = _worker_process_with_pool
+        else:
+            worker_process = _worker_process
+
         process_pool = self._create_process_pool(
-            processes_to_start, _worker_process,
+            processes_to_start, worker_process,
             worker_args_gen(concurrency_overhead))
         self._join_processes(process_pool, result_queue, event_queue)
 
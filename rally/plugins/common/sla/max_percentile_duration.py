@@ -0,0 +1,71 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+"""
+SLA (Service-level agreement) is set of details for determining compliance
+with contracted values such as maximum error rate or minimum response time.
+"""
+
+from rally.common import streaming_algorithms
+from rally import consts
+from rally.task import sla
+
+
+@sla.configure(name="max_percentile_duration")
+class MaxPercentileDuration(sla.SLA):
+    """Maximum duration of successful iterations at the given percentile.
+
+    Durations are approximated by a quantile sketch with 1% relative error,
+    so the criterion does not depend on the number of iterations.
+    """
+    CONFIG_SCHEMA = {
+        "type": "object",
+        "$schema": consts.JSON_SCHEMA,
+        "properties": {
+            "percentile": {"type": "number", "minimum": 0.0,
+                           "exclusiveMinimum": True, "maximum": 100.0},
+            "max": {"type": "number", "minimum": 0.0,
+                    "exclusiveMinimum": True}
+        },
+        "required": ["percentile", "max"],
+        "additionalProperties": False
+    }
+
+    def __init__(self, criterion_value):
+        super(MaxPercentileDuration, self).__init__(criterion_value)
+        self.percentile = self.criterion_value["percentile"]
+        self.max_duration = self.criterion_value["max"]
+        self.duration = 0.0
+        self.sketch = streaming_algorithms.QuantileSketch()
+
+    def _update(self):
+        self.duration = self.sketch.quantile(self.percentile / 100.0) or 0.0
+        self.success = self.duration <= self.max_duration
+        return self.success
+
+    def add_iteration(self, iteration):
+        if not iteration.get("error"):
+            self.sketch.add(iteration["duration"])
+        return self._update()
+
+    def merge(self, other):
+        self.sketch.merge(other.sketch)
+        return self._update()
+
+    def details(self):
+        return ("%s%%ile duration of one iteration %.2fs <= %.2fs - %s" %
+                (self.percentile, self.duration, self.max_duration,
+                 self.status()))
@@ -48,5 +48,15 @@ OPTS = {"openstack": [
                  default=1.0,
                  deprecated_group="benchmark",
                  help="Interval between checks when waiting for image "
-                      "creation.")
+                      "creation."),
+    cfg.IntOpt("glance_image_cache_size",
+               default=2048,
+               min=0,
+               help="Max size in megabytes of the local cache of images, "
+                    "which are created from HTTP(S) URLs. Such images are "
+                    "downloaded to the cache once and uploaded to Glance "
+                    "from it. Zero disables the cache."),
+    cfg.StrOpt("glance_image_cache_dir",
+               default="~/.rally/image_cache",
+               help="Directory of the local cache of images.")
 ]}
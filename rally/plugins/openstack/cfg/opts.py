@@ -29,6 +29,7 @@ from rally.plugins.openstack.cfg import osclients
 from rally.plugins.openstack.cfg import profiler
 from rally.plugins.openstack.cfg import sahara
 from rally.plugins.openstack.cfg import senlin
+from rally.plugins.openstack.cfg import tenant_contexts
 from rally.plugins.openstack.cfg import vm
 from rally.plugins.openstack.cfg import watcher
 
@@ -48,7 +49,7 @@ def list_opts():
                    nova.OPTS, osclients.OPTS, profiler.OPTS, sahara.OPTS,
                    vm.OPTS, glance.OPTS, watcher.OPTS, tempest.OPTS,
                    keystone_roles.OPTS, keystone_users.OPTS, cleanup.OPTS,
-                   senlin.OPTS, neutron.OPTS):
+                   senlin.OPTS, neutron.OPTS, tenant_contexts.OPTS):
         for category, opt in l_opts.items():
             opts.setdefault(category, [])
             opts[category].extend(opt)
@@ -0,0 +1,26 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import cfg
+
+
+OPTS = {"openstack": [
+    cfg.IntOpt("tenant_contexts_resource_management_workers",
+               default=20,
+               min=1,
+               help="The number of concurrent threads to use for creating "
+                    "resources of tenants in contexts like servers, images "
+                    "and network."),
+]}
@@ -13,9 +13,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+import itertools
+import threading
 import time
 
-from rally.common import broker
+import six
+
+from rally.common import cfg
 from rally.common import logging
 from rally.common.plugin import discover
 from rally.common.plugin import plugin
@@ -25,6 +30,8 @@ from rally.plugins.openstack.cleanup import base
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
 
 class SeekAndDestroy(object):
 
@@ -116,33 +123,16 @@ class SeekAndDestroy(object):
             LOG.warning("Resource deletion failed, timeout occurred for "
                         "%(service)s.%(resource)s: %(uuid)s." % msg_kw)
 
-    def _publisher(self, queue):
-        """Publisher for deletion jobs.
-
-        This method iterates over all users, lists all resources
-        (using manager_cls) and puts jobs for deletion.
+    def _list_managers(self):
+        """Yield admin, user and resource manager for every listing.
 
-        Every deletion job contains tuple with two values: user and resource
-        uuid that should be deleted.
-
-        In case of tenant based resource, uuids are fetched only from one user
-        per tenant.
+        In case of tenant based resource, only one user per tenant is used.
         """
-        def _publish(admin, user, manager):
-            try:
-                for raw_resource in rutils.retry(3, manager.list):
-                    queue.append((admin, user, raw_resource))
-            except Exception:
-                LOG.exception(
-                    "Seems like %s.%s.list(self) method is broken. "
-                    "It shouldn't raise any exceptions."
-                    % (manager.__module__, type(manager).__name__))
-
         if self.admin and (not self.users
                            or self.manager_cls._perform_for_admin_only):
             manager = self.manager_cls(
                 admin=self._get_cached_client(self.admin))
-            _publish(self.admin, None, manager)
+            yield self.admin, None, manager
 
         else:
             visited_tenants = set()
@@ -157,7 +147,33 @@ class SeekAndDestroy(object):
                     admin=admin_client,
                     user=self._get_cached_client(user),
                     tenant_uuid=user["tenant_id"])
-                _publish(self.admin, user, manager)
+                yield self.admin, user, manager
+
+    def _publish(self, admin, user, manager, queue):
+        """Put jobs for deletion of resources listed by the manager."""
+        try:
+            for raw_resource in rutils.retry(3, manager.list):
+                queue.append((admin, user, raw_resource))
+        except Exception:
+            LOG.exception(
+                "Seems like %s.%s.list(self) method is broken. "
+                "It shouldn't raise any exceptions."
+                % (manager.__module__, type(manager).__name__))
+
+    def _publisher(self, queue):
+        """Publisher for deletion jobs.
+
+        This method iterates over all users, lists all resources
+        (using manager_cls) and puts jobs for deletion.
+
+        Every deletion job contains tuple with two values: user and resource
+        uuid that should be deleted.
+
+        In case of tenant based resource, uuids are fetched only from one user
+        per tenant.
+        """
+        for admin, user, manager in self._list_managers():
+            self._publish(admin, user, manager, queue)
 
     def _consumer(self, cache, args):
         """Method that consumes single deletion job."""
@@ -176,10 +192,235 @@ class SeekAndDestroy(object):
             self._delete_single_resource(manager)
 
     def exterminate(self):
-        """Delete all resources for passed users, admin and resource_mgr."""
+        """Delete all resources for passed users, admin and resource_mgr.
+
+        :returns: list with the timing of the cleanup like
+                  CleanupScheduler.run() returns
+        """
+        scheduler = CleanupScheduler(workers=self.manager_cls._threads)
+        scheduler.add(self)
+        return scheduler.run()
+
+
+class _CleanupNode(object):
+    """Cleanup of resources of one resource manager in one tenant."""
+
+    def __init__(self, destroyer, tenant_id, listers):
+        self.destroyer = destroyer
+        self.tenant_id = tenant_id
+        self.listers = listers
+        self.waits_for = 0
+        self.successors = []
+        self.jobs = 0
+        self.started_at = None
+        self.finished_at = None
+
+
+class _DeletionQueue(object):
+    """Queue-like object which schedules deletion of listed resources."""
+
+    def __init__(self, scheduler, node):
+        self.scheduler = scheduler
+        self.node = node
+
+    def append(self, args):
+        self.scheduler._schedule_deletion(self.node, args)
 
-        broker.run(self._publisher, self._consumer,
-                   consumers_count=self.manager_cls._threads)
+
+class CleanupScheduler(object):
+    """Runs cleanup of several resource managers concurrently.
+
+    Cleanup of resource managers is split by tenants and ordered by the
+    `order` of resource managers. Resources of a tenant are deleted after
+    resources of managers with lower order of the same tenant, so tenants
+    are cleaned up independently. Resource managers which work for admin
+    only wait for all managers with lower order and block all managers with
+    higher order. Managers with equal order do not wait for each other.
+
+    Listing and deletion of resources of all managers is done by one pool
+    of workers, deletion of resources starts as soon as they are listed.
+    Number of resources deleted simultaneously by one manager is still
+    limited by its `threads`.
+    """
+
+    def __init__(self, workers=None):
+        """Init scheduler.
+
+        :param workers: Number of workers. Defaults to the cleanup_threads
+                        option
+        """
+        self.workers = workers or CONF.openstack.cleanup_threads
+        self._destroyers = []
+        self._lock = threading.Lock()
+        self._queue = six.moves.queue.Queue()
+        self._state = {}
+        self._nodes_left = 0
+
+    def add(self, destroyer):
+        """Add SeekAndDestroy instance to run."""
+        self._destroyers.append(destroyer)
+
+    @staticmethod
+    def _link(predecessors, nodes):
+        for node in nodes:
+            node.waits_for += len(predecessors)
+        for predecessor in predecessors:
+            predecessor.successors.extend(nodes)
+
+    def _build(self):
+        """Build graph of cleanup nodes."""
+        nodes = []
+        # the latest nodes of tenants which following nodes should wait for
+        latest = {}
+        latest_admin = []
+        destroyers = sorted(self._destroyers,
+                            key=lambda d: d.manager_cls._order)
+        for _order, group in itertools.groupby(
+                destroyers, key=lambda d: d.manager_cls._order):
+            tenant_nodes = collections.OrderedDict()
+            admin_nodes = []
+            for destroyer in group:
+                listers = collections.OrderedDict()
+                for admin, user, manager in destroyer._list_managers():
+                    listers.setdefault(user and user["tenant_id"], []).append(
+                        (admin, user, manager))
+                for tenant_id, tenant_listers in listers.items():
+                    node = _CleanupNode(destroyer, tenant_id, tenant_listers)
+                    nodes.append(node)
+                    if tenant_id is None:
+                        admin_nodes.append(node)
+                    else:
+                        tenant_nodes.setdefault(tenant_id, []).append(node)
+
+            for tenant_id, t_nodes in tenant_nodes.items():
+                self._link(latest.get(tenant_id, latest_admin), t_nodes)
+            if admin_nodes:
+                predecessors = list(latest_admin)
+                for t_nodes in latest.values():
+                    predecessors.extend(t_nodes)
+                predecessors = list(collections.OrderedDict(
+                    (id(n), n) for n in predecessors).values())
+                self._link(predecessors, admin_nodes)
+                latest = dict((tenant_id, t_nodes + admin_nodes)
+                              for tenant_id, t_nodes in tenant_nodes.items())
+                latest_admin = admin_nodes
+            else:
+                latest.update(tenant_nodes)
+        return nodes
+
+    def _start(self, node):
+        node.started_at = time.time()
+        state = self._state[node.destroyer]
+        if state["started_at"] is None:
+            state["started_at"] = node.started_at
+            manager_cls = node.destroyer.manager_cls
+            LOG.debug("Cleaning up %(service)s %(resource)s objects"
+                      % {"service": manager_cls._service,
+                         "resource": manager_cls._resource})
+        node.jobs += 1
+        self._queue.put((node, None))
+
+    def _schedule_deletion(self, node, args):
+        with self._lock:
+            node.jobs += 1
+            state = self._state[node.destroyer]
+            if state["deleting"] < node.destroyer.manager_cls._threads:
+                state["deleting"] += 1
+                self._queue.put((node, args))
+            else:
+                state["backlog"].append((node, args))
+
+    def _finish_job(self, node, deletion):
+        with self._lock:
+            state = self._state[node.destroyer]
+            if deletion:
+                if state["backlog"]:
+                    self._queue.put(state["backlog"].popleft())
+                else:
+                    state["deleting"] -= 1
+            node.jobs -= 1
+            if node.jobs:
+                return
+            node.finished_at = time.time()
+            self._nodes_left -= 1
+            for successor in node.successors:
+                successor.waits_for -= 1
+                if not successor.waits_for:
+                    self._start(successor)
+            if not self._nodes_left:
+                for i in range(self.workers):
+                    self._queue.put(None)
+
+    def _worker(self):
+        cache = {}
+        while True:
+            job = self._queue.get()
+            if job is None:
+                break
+            node, args = job
+            try:
+                if args is None:
+                    for admin, user, manager in node.listers:
+                        node.destroyer._publish(admin, user, manager,
+                                                _DeletionQueue(self, node))
+                else:
+                    node.destroyer._consumer(cache, args)
+            except Exception as e:
+                msg = "Failed to run a cleanup job"
+                if logging.is_debug():
+                    LOG.exception(msg)
+                else:
+                    LOG.warning("%s: %s" % (msg, e))
+            finally:
+                self._finish_job(node, deletion=args is not None)
+
+    def run(self):
+        """Run cleanup.
+
+        :returns: list with names of resource managers and timestamps of
+                  start and finish of their cleanup. Timings of the cleanup
+                  in each tenant ("tenant_id" is None for resources of
+                  admin) are listed under the "nodes" key
+        """
+        nodes = self._build()
+        for destroyer in self._destroyers:
+            self._state[destroyer] = {"started_at": None, "nodes": [],
+                                      "deleting": 0,
+                                      "backlog": collections.deque()}
+        for node in nodes:
+            self._state[node.destroyer]["nodes"].append(node)
+        if nodes:
+            self._nodes_left = len(nodes)
+            with self._lock:
+                for node in nodes:
+                    if not node.waits_for:
+                        self._start(node)
+            workers = [threading.Thread(target=self._worker)
+                       for i in range(self.workers)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+
+        timings = []
+        for destroyer in self._destroyers:
+            state = self._state[destroyer]
+            if state["started_at"] is None:
+                continue
+            # NOTE: nodes of a manager can finish in any order, so the
+            #   cleanup of the manager is over when the last of them is.
+            d_nodes = [{"tenant_id": node.tenant_id,
+                        "started_at": node.started_at,
+                        "finished_at": node.finished_at}
+                       for node in state["nodes"]
+                       if node.started_at is not None]
+            timings.append(
+                {"name": "%s.%s" % (destroyer.manager_cls._service,
+                                    destroyer.manager_cls._resource),
+                 "started_at": state["started_at"],
+                 "finished_at": max(n["finished_at"] for n in d_nodes),
+                 "nodes": d_nodes})
+        return timings
 
 
 def list_resource_names(admin_required=None):
@@ -191,6 +432,7 @@ def list_resource_names(admin_required=None):
                            True -> returns only admin ResourceManagers
                            False -> returns only non admin ResourceManagers
     """
+    plugin.load_lazy_plugins()
     res_mgrs = discover.itersubclasses(base.ResourceManager)
     if admin_required is not None:
         res_mgrs = filter(lambda cls: cls._admin_required == admin_required,
@@ -216,6 +458,7 @@ def find_resource_managers(names=None, admin_required=None):
     names = set(names or [])
 
     resource_managers = []
+    plugin.load_lazy_plugins()
     for manager in discover.itersubclasses(base.ResourceManager):
         if admin_required is not None:
             if admin_required != manager._admin_required:
@@ -269,17 +512,19 @@ def cleanup(names=None, admin_required=None, admin=None, users=None,
                        ``rally.task.scenario.Scenario`` to cleanup all
                        Scenario resources.
     :param task_id: The UUID of task
+    :returns: list with names of resource managers and timestamps of start
+              and finish of their cleanup
     """
+    plugin.load_lazy_plugins()
     resource_classes = [cls for cls in discover.itersubclasses(superclass)
                         if issubclass(cls, rutils.RandomNameGeneratorMixin)]
     if not resource_classes and issubclass(superclass,
                                            rutils.RandomNameGeneratorMixin):
         resource_classes.append(superclass)
+    scheduler = CleanupScheduler()
     for manager in find_resource_managers(names, admin_required):
-        LOG.debug("Cleaning up %(service)s %(resource)s objects"
-                  % {"service": manager._service,
-                     "resource": manager._resource})
-        SeekAndDestroy(manager, admin, users,
-                       api_versions=api_versions,
-                       resource_classes=resource_classes,
-                       task_id=task_id).exterminate()
+        scheduler.add(SeekAndDestroy(manager, admin, users,
+                                     api_versions=api_versions,
+                                     resource_classes=resource_classes,
+                                     task_id=task_id))
+    return scheduler.run()
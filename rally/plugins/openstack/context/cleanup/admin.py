@@ -30,7 +30,7 @@ class AdminCleanup(base.CleanupMixin, context.Context):
     """Context class for admin resources cleanup."""
 
     def cleanup(self):
-        manager.cleanup(
+        timings = manager.cleanup(
             names=self.config,
             admin_required=True,
             admin=self.context["admin"],
@@ -38,3 +38,4 @@ class AdminCleanup(base.CleanupMixin, context.Context):
             api_versions=self.context["config"].get("api_versions"),
             superclass=scenario.OpenStackScenario,
             task_id=self.get_owner_id())
+        self._save_timings(timings)
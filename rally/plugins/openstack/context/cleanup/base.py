@@ -51,3 +51,20 @@ class CleanupMixin(object):
 
     def setup(self):
         pass
+
+    def _save_timings(self, timings):
+        """Save durations of cleanup of resource managers as atomics.
+
+        Durations of cleanup in each tenant are saved as children of them.
+        """
+        for timing in timings:
+            children = [{"name": ("tenant_%s" % node["tenant_id"]
+                                  if node["tenant_id"] else "admin"),
+                         "started_at": node["started_at"],
+                         "finished_at": node["finished_at"],
+                         "children": []}
+                        for node in timing.get("nodes", [])]
+            self._atomic_actions.append({"name": timing["name"],
+                                         "started_at": timing["started_at"],
+                                         "finished_at": timing["finished_at"],
+                                         "children": children})
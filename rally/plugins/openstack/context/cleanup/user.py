@@ -30,7 +30,7 @@ class UserCleanup(base.CleanupMixin, context.Context):
     """Context class for user resources cleanup."""
 
     def cleanup(self):
-        manager.cleanup(
+        timings = manager.cleanup(
             names=self.config,
             admin_required=False,
             users=self.context.get("users", []),
@@ -38,3 +38,4 @@ class UserCleanup(base.CleanupMixin, context.Context):
             superclass=scenario.OpenStackScenario,
             task_id=self.get_owner_id()
         )
+        self._save_timings(timings)
@@ -18,6 +18,7 @@ from rally.common import utils as rutils
 from rally.common import validation
 from rally import consts
 from rally.plugins.openstack.cleanup import manager as resource_manager
+from rally.plugins.openstack.context import per_tenant
 from rally.plugins.openstack import osclients
 from rally.plugins.openstack.services.image import image
 from rally.task import context
@@ -29,7 +30,7 @@ LOG = logging.getLogger(__name__)
 
 @validation.add("required_platform", platform="openstack", users=True)
 @context.configure(name="images", platform="openstack", order=410)
-class ImageGenerator(context.Context):
+class ImageGenerator(per_tenant.PerTenantSetupMixin, context.Context):
     """Uploads specified Glance images to every tenant."""
 
     CONFIG_SCHEMA = {
@@ -95,6 +96,7 @@ class ImageGenerator(context.Context):
                 "enum": ["qcow2", "raw", "vhd", "vmdk", "vdi", "iso", "aki",
                          "ari", "ami"],
             },
+            "resource_management_workers": per_tenant.WORKERS_SCHEMA
         },
         "oneOf": [{"description": "It is been used since Rally 0.10.0",
                    "required": ["image_url", "disk_format",
@@ -157,15 +159,17 @@ class ImageGenerator(context.Context):
         if "image_name" in self.config and images_per_tenant == 1:
             image_name = self.config["image_name"]
 
-        for user, tenant_id in rutils.iterate_per_tenants(
-                self.context["users"]):
-            current_images = []
+        def setup_tenant(cache, index, user, tenant_id):
+            atomic_actions = []
             clients = osclients.Clients(
                 user["credential"],
                 api_info=self.context["config"].get("api_versions"))
             image_service = image.Image(
-                clients, name_generator=self.generate_random_name)
+                clients, name_generator=self.generate_random_name,
+                atomic_inst=atomic_actions)
 
+            current_images = []
+            self.context["tenants"][tenant_id]["images"] = current_images
             for i in range(images_per_tenant):
                 image_obj = image_service.create_image(
                     image_name=image_name,
@@ -176,8 +180,9 @@ class ImageGenerator(context.Context):
                     min_disk=min_disk,
                     min_ram=min_ram)
                 current_images.append(image_obj.id)
+            return atomic_actions
 
-            self.context["tenants"][tenant_id]["images"] = current_images
+        self._setup_tenants(setup_tenant)
 
     def cleanup(self):
         if self.context.get("admin", {}):
@@ -25,6 +25,7 @@ from rally import consts
 from rally import exceptions
 from rally.plugins.openstack import credential
 from rally.plugins.openstack import osclients
+from rally.plugins.openstack import user_placement
 from rally.plugins.openstack.services.identity import identity
 from rally.plugins.openstack.wrappers import network
 from rally.task import context
@@ -102,6 +103,7 @@ class UserGenerator(context.Context):
 
     def __init__(self, context):
         super(UserGenerator, self).__init__(context)
+        self._errors = []
 
         creds = self.env["platforms"]["openstack"]
         if creds.get("admin"):
@@ -169,7 +171,7 @@ class UserGenerator(context.Context):
             tenants.append(tenant_dict)
 
         # NOTE(msdubov): consume() will fill the tenants list in the closure.
-        broker.run(publish, consume, threads)
+        self._save_errors(broker.run_pipelined(publish, consume, threads))
         tenants_dict = {}
         for t in tenants:
             tenants_dict[t["id"]] = t
@@ -223,9 +225,19 @@ class UserGenerator(context.Context):
                           "tenant_id": tenant_id})
 
         # NOTE(msdubov): consume() will fill the users list in the closure.
-        broker.run(publish, consume, threads)
+        self._save_errors(broker.run_pipelined(publish, consume, threads))
         return list(users)
 
+    def _save_errors(self, jobs):
+        self._errors = [job["error"] for job in jobs if job["error"]]
+
+    def _failure_msg(self, msg):
+        if self._errors:
+            msg = "%s %d errors occurred, the first one: %s: %s" % (
+                msg, len(self._errors), self._errors[0][0],
+                self._errors[0][1])
+        return msg
+
     def _get_consumer_for_deletion(self, func_name):
         def consume(cache, resource_id):
             if "client" not in cache:
@@ -241,8 +253,9 @@ class UserGenerator(context.Context):
             for tenant_id in self.context["tenants"]:
                 queue.append(tenant_id)
 
-        broker.run(publish, self._get_consumer_for_deletion("delete_project"),
-                   threads)
+        broker.run_pipelined(
+            publish, self._get_consumer_for_deletion("delete_project"),
+            threads)
         self.context["tenants"] = {}
 
     def _delete_users(self):
@@ -252,8 +265,8 @@ class UserGenerator(context.Context):
             for user in self.context["users"]:
                 queue.append(user["id"])
 
-        broker.run(publish, self._get_consumer_for_deletion("delete_user"),
-                   threads)
+        broker.run_pipelined(
+            publish, self._get_consumer_for_deletion("delete_user"), threads)
         self.context["users"] = []
 
     def create_users(self):
@@ -267,7 +280,8 @@ class UserGenerator(context.Context):
         if len(self.context["tenants"]) < self.config["tenants"]:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
-                msg="Failed to create the requested number of tenants.")
+                msg=self._failure_msg(
+                    "Failed to create the requested number of tenants."))
 
         users_num = self.config["users_per_tenant"] * self.config["tenants"]
         LOG.debug("Creating %(users)d users using %(threads)s threads"
@@ -279,7 +293,8 @@ class UserGenerator(context.Context):
         if len(self.context["users"]) < users_num:
             raise exceptions.ContextSetupFailure(
                 ctx_name=self.get_name(),
-                msg="Failed to create the requested number of users.")
+                msg=self._failure_msg(
+                    "Failed to create the requested number of users."))
 
     def use_existing_users(self):
         LOG.debug("Using existing users for OpenStack platform.")
@@ -302,6 +317,7 @@ class UserGenerator(context.Context):
             })
 
     def setup(self):
+        self._auth_calls = osclients.auth_calls()
         self.context["users"] = []
         self.context["tenants"] = {}
         self.context["user_choice_method"] = self.config["user_choice_method"]
@@ -310,13 +326,29 @@ class UserGenerator(context.Context):
             self.use_existing_users()
         else:
             self.create_users()
+        self.context["user_placement"] = user_placement.create(self.context)
 
     def cleanup(self):
         """Delete tenants and users, using the broker pattern."""
-        if self.existing_users:
-            # nothing to do here.
-            return
-        else:
-            self._remove_default_security_group()
-            self._delete_users()
-            self._delete_tenants()
+        if hasattr(self, "_auth_calls"):
+            self._auth_calls_made = osclients.auth_calls() - self._auth_calls
+            LOG.info("Task %s | %d authentications in Keystone were made "
+                     "since the setup of users."
+                     % (self.context["task"]["uuid"], self._auth_calls_made))
+        users = list(self.context.get("users", []))
+        try:
+            if not self.existing_users:
+                self._remove_default_security_group()
+                self._delete_users()
+                self._delete_tenants()
+        finally:
+            # NOTE: users are not used anymore, so their cached sessions are
+            #   removed to not keep them in memory till the end of the
+            #   process.
+            for user in users:
+                osclients.forget_sessions(user["credential"])
+
+    def stats(self):
+        if not hasattr(self, "_auth_calls_made"):
+            return {}
+        return {"keystone_auth_calls": self._auth_calls_made}
@@ -14,9 +14,9 @@
 #    under the License.
 
 from rally.common import logging
-from rally.common import utils
 from rally.common import validation
 from rally import consts
+from rally.plugins.openstack.context import per_tenant
 from rally.plugins.openstack import osclients
 from rally.plugins.openstack.wrappers import network as network_wrapper
 from rally.task import context
@@ -29,7 +29,7 @@ LOG = logging.getLogger(__name__)
 @validation.add("required_platform", platform="openstack", admin=True,
                 users=True)
 @context.configure(name="network", platform="openstack", order=350)
-class Network(context.Context):
+class Network(per_tenant.PerTenantSetupMixin, context.Context):
     """Create networking resources.
 
     This creates networks for all tenants, and optionally creates
@@ -80,7 +80,8 @@ class Network(context.Context):
                     }
                 },
                 "additionalProperties": False
-            }
+            },
+            "resource_management_workers": per_tenant.WORKERS_SCHEMA
         },
         "additionalProperties": False
     }
@@ -96,18 +97,22 @@ class Network(context.Context):
     }
 
     def setup(self):
-        # NOTE(rkiran): Some clients are not thread-safe. Thus during
-        #               multithreading/multiprocessing, it is likely the
-        #               sockets are left open. This problem is eliminated by
-        #               creating a connection in setup and cleanup separately.
-        net_wrapper = network_wrapper.wrap(
-            osclients.Clients(self.context["admin"]["credential"]),
-            self, config=self.config)
         kwargs = {}
         if self.config["dns_nameservers"] is not None:
             kwargs["dns_nameservers"] = self.config["dns_nameservers"]
-        for user, tenant_id in (utils.iterate_per_tenants(
-                self.context.get("users", []))):
+
+        def setup_tenant(cache, index, user, tenant_id):
+            # NOTE(rkiran): Some clients are not thread-safe. Thus during
+            #               multithreading/multiprocessing, it is likely the
+            #               sockets are left open. This problem is eliminated
+            #               by creating a connection in setup and cleanup
+            #               separately (and in every thread of setup).
+            if "net_wrapper" not in cache:
+                cache["net_wrapper"] = network_wrapper.wrap(
+                    osclients.Clients(self.context["admin"]["credential"]),
+                    self, config=self.config)
+            net_wrapper = cache["net_wrapper"]
+
             self.context["tenants"][tenant_id]["networks"] = []
             for i in range(self.config["networks_per_tenant"]):
                 # NOTE(amaretskiy): router_create_args and subnets_num take
@@ -122,6 +127,8 @@ class Network(context.Context):
                     **kwargs)
                 self.context["tenants"][tenant_id]["networks"].append(network)
 
+        self._setup_tenants(setup_tenant)
+
     def cleanup(self):
         net_wrapper = network_wrapper.wrap(
             osclients.Clients(self.context["admin"]["credential"]),
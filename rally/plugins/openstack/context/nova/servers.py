@@ -13,9 +13,9 @@
 # under the License.
 
 from rally.common import logging
-from rally.common import utils as rutils
 from rally.common import validation
 from rally.plugins.openstack.cleanup import manager as resource_manager
+from rally.plugins.openstack.context import per_tenant
 from rally.plugins.openstack.scenarios.nova import utils as nova_utils
 from rally.plugins.openstack import types
 from rally.task import context
@@ -26,7 +26,7 @@ LOG = logging.getLogger(__name__)
 
 @validation.add("required_platform", platform="openstack", users=True)
 @context.configure(name="servers", platform="openstack", order=430)
-class ServerGenerator(context.Context):
+class ServerGenerator(per_tenant.PerTenantSetupMixin, context.Context):
     """Creates specified amount of Nova Servers per each tenant."""
 
     CONFIG_SCHEMA = {
@@ -74,7 +74,8 @@ class ServerGenerator(context.Context):
                     }
                 ]},
                 "minItems": 1
-            }
+            },
+            "resource_management_workers": per_tenant.WORKERS_SCHEMA
         },
         "required": ["image", "flavor"],
         "additionalProperties": False
@@ -104,8 +105,7 @@ class ServerGenerator(context.Context):
         flavor_id = types.Flavor(self.context).pre_process(
             resource_spec=flavor, config={})
 
-        for iter_, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
-                self.context["users"])):
+        def setup_tenant(cache, iter_, user, tenant_id):
             LOG.debug("Booting servers for user tenant %s" % user["tenant_id"])
             tmp_context = {"user": user,
                            "tenant": self.context["tenants"][tenant_id],
@@ -121,6 +121,8 @@ class ServerGenerator(context.Context):
                          "flavor_id": flavor_id,
                          "servers_per_tenant": servers_per_tenant})
 
+            # NOTE: servers, which are booted before a failure, are not saved
+            #   to the context, but the cleanup finds them by the owner ID.
             servers = nova_scenario._boot_servers(image_id, flavor_id,
                                                   requests=servers_per_tenant,
                                                   auto_assign_nic=auto_nic,
@@ -132,6 +134,9 @@ class ServerGenerator(context.Context):
 
             self.context["tenants"][tenant_id][
                 "servers"] = current_servers
+            return nova_scenario.atomic_actions()
+
+        self._setup_tenants(setup_tenant)
 
     def cleanup(self):
         resource_manager.cleanup(names=["nova.servers"],
@@ -0,0 +1,104 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+from rally.common import broker
+from rally.common import cfg
+from rally.common import logging
+from rally.common import utils as rutils
+from rally import exceptions
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+WORKERS_SCHEMA = {
+    "type": "integer",
+    "minimum": 1,
+    "description": "The number of concurrent threads to use for creating "
+                   "resources of tenants. Defaults to the "
+                   "tenant_contexts_resource_management_workers option."
+}
+
+
+class PerTenantSetupMixin(object):
+    """Creates resources of tenants concurrently.
+
+    Contexts should add WORKERS_SCHEMA as the "resource_management_workers"
+    property of their config schema and call _setup_tenants() from setup().
+    """
+
+    def _setup_tenants(self, setup_tenant):
+        """Call setup_tenant for every tenant in threads of the broker.
+
+        Resources should be saved to the context as soon as they are created,
+        so the cleanup of the context can remove them if the setup fails.
+        Once any tenant fails, the rest of tenants are not set up and
+        ContextSetupFailure is raised after running tenants are finished.
+
+        :param setup_tenant: function which is called with a cache of the
+            worker thread, the number of the tenant, a user of the tenant and
+            the tenant ID. It can return atomic actions made for the tenant,
+            which are saved as children of its "setup_tenant_<ID>" atomic.
+        """
+        threads = self.config.get(
+            "resource_management_workers",
+            CONF.openstack.tenant_contexts_resource_management_workers)
+        children = {}
+        failed = threading.Event()
+
+        def publish(queue):
+            for i, (user, tenant_id) in enumerate(rutils.iterate_per_tenants(
+                    self.context.get("users", []))):
+                if failed.is_set():
+                    break
+                queue.append((i, user, tenant_id))
+
+        def consume(cache, args):
+            i, user, tenant_id = args
+            if failed.is_set():
+                return
+            try:
+                children[tenant_id] = setup_tenant(cache, i, user, tenant_id)
+            except Exception:
+                failed.set()
+                raise
+
+        LOG.debug("Setting up tenants for context %(ctx)s using %(threads)s "
+                  "threads" % {"ctx": self.get_name(), "threads": threads})
+        jobs = broker.run_pipelined(publish, consume, threads)
+
+        for job in sorted(jobs, key=lambda j: j["started_at"]):
+            tenant_id = job["args"][2]
+            if tenant_id not in children and not job["error"]:
+                # skipped after the failure of another tenant
+                continue
+            atomic_action = {"name": "setup_tenant_%s" % tenant_id,
+                             "started_at": job["started_at"],
+                             "finished_at": job["finished_at"],
+                             "children": children.get(tenant_id) or []}
+            if job["error"]:
+                atomic_action["failed"] = True
+            self._atomic_actions.append(atomic_action)
+
+        errors = [job["error"] for job in jobs if job["error"]]
+        if errors:
+            raise exceptions.ContextSetupFailure(
+                ctx_name=self.get_name(),
+                msg="Failed to set up resources of tenants. %d errors "
+                    "occurred, the first one: %s: %s"
+                    % (len(errors), errors[0][0], errors[0][1]))
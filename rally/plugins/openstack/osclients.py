@@ -14,7 +14,9 @@
 #    under the License.
 
 import abc
+import multiprocessing
 import os
+import threading
 
 from six.moves.urllib import parse
 
@@ -59,6 +61,107 @@ def configure(name, default_version=None, default_service_type=None,
     return wrapper
 
 
+class _SessionsCache(object):
+    """Process-wide cache of authenticated keystone sessions.
+
+    Sessions are shared by all Clients of equal credentials, so iterations
+    of a workload do not authenticate again. keystoneauth refreshes tokens
+    of cached sessions when they are about to expire.
+
+    Sessions hold HTTP connections, so they are not shared between
+    processes: a child process (e.g. a runner worker) creates own sessions,
+    but installs tokens inherited from its parent process into them.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        # NOTE: the counter is in shared memory, so authentications made
+        #   by runner worker processes are counted too.
+        self._auth_calls = multiprocessing.Value("L", 0)
+
+    @staticmethod
+    def _make_key(credential, version):
+        if isinstance(credential, dict):
+            items = credential.items()
+        else:
+            items = vars(credential).items()
+        return (version,) + tuple(sorted(items))
+
+    def _count_auth_calls(self, identity_plugin):
+        get_auth_ref = identity_plugin.get_auth_ref
+
+        def counted_get_auth_ref(*args, **kwargs):
+            with self._auth_calls.get_lock():
+                self._auth_calls.value += 1
+            return get_auth_ref(*args, **kwargs)
+
+        identity_plugin.get_auth_ref = counted_get_auth_ref
+
+    def get(self, credential, version, create):
+        """Return cached session and identity plugin.
+
+        :param credential: credential to authenticate with
+        :param version: keystone version
+        :param create: callable which creates a new pair of session and
+            identity plugin
+        """
+        key = self._make_key(credential, version)
+        pid = os.getpid()
+        with self._lock:
+            cached = self._sessions.get(key)
+        if cached and cached[0] == pid:
+            return cached[1]
+
+        sess, identity_plugin = create()
+        self._count_auth_calls(identity_plugin)
+        if cached:
+            identity_plugin.set_auth_state(cached[1][1].get_auth_state())
+        with self._lock:
+            current = self._sessions.get(key)
+            if current and current[0] == pid:
+                # another thread has been faster
+                return current[1]
+            self._sessions[key] = (pid, (sess, identity_plugin))
+        return sess, identity_plugin
+
+    def auth_calls(self):
+        """Return the number of authentications made by cached sessions."""
+        return self._auth_calls.value
+
+    def forget(self, credential):
+        """Remove cached sessions of the credential."""
+        items = self._make_key(credential, None)[1:]
+        with self._lock:
+            for key in [k for k in self._sessions if k[1:] == items]:
+                del self._sessions[key]
+
+    def clear(self):
+        with self._lock:
+            self._sessions = {}
+
+
+_SESSIONS = _SessionsCache()
+
+
+def auth_calls():
+    """Return the number of authentications in Keystone.
+
+    Authentications made by all processes started after the import of this
+    module are counted.
+    """
+    return _SESSIONS.auth_calls()
+
+
+def forget_sessions(credential):
+    """Remove cached keystone sessions of the credential.
+
+    It should be called when the credential is not used anymore (e.g. users
+    of a workload are deleted), so the sessions are not kept in memory.
+    """
+    _SESSIONS.forget(credential)
+
+
 @plugin.base()
 class OSClient(plugin.Plugin):
     """Base class for openstack clients"""
@@ -227,9 +330,10 @@ class Keystone(OSClient):
     @property
     def auth_ref(self):
         try:
-            if "keystone_auth_ref" not in self.cache:
-                sess, plugin = self.get_session()
-                self.cache["keystone_auth_ref"] = plugin.get_access(sess)
+            sess, plugin = self.get_session()
+            # NOTE: the identity plugin keeps the token and fetches a new one
+            #   only if it is about to expire.
+            return plugin.get_access(sess)
         except Exception as e:
             if logging.is_debug():
                 LOG.exception("Unable to authenticate for user"
@@ -243,54 +347,58 @@ class Keystone(OSClient):
                 url=self.credential.auth_url,
                 etype=e.__class__.__name__,
                 error=str(e))
-        return self.cache["keystone_auth_ref"]
 
     def get_session(self, version=None):
         key = "keystone_session_and_plugin_%s" % version
         if key not in self.cache:
-            from keystoneauth1 import discover
-            from keystoneauth1 import identity
-            from keystoneauth1 import session
-
-            version = self.choose_version(version)
-            auth_url = self.credential.auth_url
-            if version is not None:
-                auth_url = self._remove_url_version()
-
-            password_args = {
-                "auth_url": auth_url,
-                "username": self.credential.username,
-                "password": self.credential.password,
-                "tenant_name": self.credential.tenant_name
-            }
-
-            if version is None:
-                # NOTE(rvasilets): If version not specified than we discover
-                # available version with the smallest number. To be able to
-                # discover versions we need session
-                temp_session = session.Session(
-                    verify=(self.credential.https_cacert or
-                            not self.credential.https_insecure),
-                    timeout=CONF.openstack_client_http_timeout)
-                version = str(discover.Discover(
-                    temp_session,
-                    password_args["auth_url"]).version_data()[0]["version"][0])
-
-            if "v2.0" not in password_args["auth_url"] and (
-                    version != "2"):
-                password_args.update({
-                    "user_domain_name": self.credential.user_domain_name,
-                    "domain_name": self.credential.domain_name,
-                    "project_domain_name": self.credential.project_domain_name
-                })
-            identity_plugin = identity.Password(**password_args)
-            sess = session.Session(
-                auth=identity_plugin,
+            self.cache[key] = _SESSIONS.get(
+                self.credential, version,
+                lambda: self._create_session(version))
+        return self.cache[key]
+
+    def _create_session(self, version=None):
+        from keystoneauth1 import discover
+        from keystoneauth1 import identity
+        from keystoneauth1 import session
+
+        version = self.choose_version(version)
+        auth_url = self.credential.auth_url
+        if version is not None:
+            auth_url = self._remove_url_version()
+
+        password_args = {
+            "auth_url": auth_url,
+            "username": self.credential.username,
+            "password": self.credential.password,
+            "tenant_name": self.credential.tenant_name
+        }
+
+        if version is None:
+            # NOTE(rvasilets): If version not specified than we discover
+            # available version with the smallest number. To be able to
+            # discover versions we need session
+            temp_session = session.Session(
                 verify=(self.credential.https_cacert or
                         not self.credential.https_insecure),
                 timeout=CONF.openstack_client_http_timeout)
-            self.cache[key] = (sess, identity_plugin)
-        return self.cache[key]
+            version = str(discover.Discover(
+                temp_session,
+                password_args["auth_url"]).version_data()[0]["version"][0])
+
+        if "v2.0" not in password_args["auth_url"] and (
+                version != "2"):
+            password_args.update({
+                "user_domain_name": self.credential.user_domain_name,
+                "domain_name": self.credential.domain_name,
+                "project_domain_name": self.credential.project_domain_name
+            })
+        identity_plugin = identity.Password(**password_args)
+        sess = session.Session(
+            auth=identity_plugin,
+            verify=(self.credential.https_cacert or
+                    not self.credential.https_insecure),
+            timeout=CONF.openstack_client_http_timeout)
+        return sess, identity_plugin
 
     def _remove_url_version(self):
         """Remove any version from the auth_url.
@@ -14,13 +14,13 @@
 #    under the License.
 
 import functools
-import random
 
 from osprofiler import profiler
 
 from rally.common import cfg
 from rally.common.plugin import plugin
 from rally.plugins.openstack import osclients
+from rally.plugins.openstack import user_placement
 from rally.task import context
 from rally.task import scenario
 
@@ -71,23 +71,10 @@ class OpenStackScenario(scenario.Scenario):
         We are choosing on each iteration one user
 
         """
-        if context["user_choice_method"] == "random":
-            user = random.choice(context["users"])
-            tenant = context["tenants"][user["tenant_id"]]
-        else:
-            # Second and last case - 'round_robin'.
-            tenants_amount = len(context["tenants"])
-            # NOTE(amaretskiy): iteration is subtracted by `1' because it
-            #                   starts from `1' but we count from `0'
-            iteration = context["iteration"] - 1
-            tenant_index = int(iteration % tenants_amount)
-            tenant_id = sorted(context["tenants"].keys())[tenant_index]
-            tenant = context["tenants"][tenant_id]
-            users = context["tenants"][tenant_id]["users"]
-            user_index = int((iteration / tenants_amount) % len(users))
-            user = users[user_index]
-
-        context["user"], context["tenant"] = user, tenant
+        placement = context.get("user_placement")
+        if placement is None:
+            placement = user_placement.create(context)
+        context["user"], context["tenant"] = placement.choose(context)
 
     def clients(self, client_type, version=None):
         """Returns a python openstack client of the requested type.
@@ -16,6 +16,7 @@ from glanceclient import exc as glance_exc
 
 from rally import exceptions
 from rally.plugins.openstack.services.image import image as image_service
+from rally.plugins.openstack.services.image import image_cache
 from rally.task import atomic
 
 
@@ -55,6 +56,29 @@ class GlanceMixin(object):
             return self._get_client().images.data(image_id,
                                                   do_checksum=do_checksum)
 
+    def _open_cached_image(self, image_location):
+        """Open data of the image from the local cache of images.
+
+        Opening is recorded as the "open_cached_image" atomic action if the
+        image is found in the cache and as "download_image_to_cache" if it
+        is downloaded, so hits and misses of the cache can be counted.
+
+        :param image_location: HTTP(S) URL of the image
+        :returns: read-only file-like object
+        """
+        cache = image_cache.get_cache()
+        key = cache.get_key(image_location)
+        timer = atomic.ActionTimer(
+            self, "glance_v%s.open_cached_image" % self.version)
+        with timer:
+            data, downloaded = cache.open(key, image_location)
+        if downloaded:
+            # NOTE: the cache knows whether the image is downloaded only
+            #   under its file lock, so the action is renamed afterwards.
+            timer.atomic_action["name"] = (
+                "glance_v%s.download_image_to_cache" % self.version)
+        return data
+
 
 class UnifiedGlanceMixin(object):
 
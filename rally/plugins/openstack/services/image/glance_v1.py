@@ -19,6 +19,7 @@ from rally.common import utils as rutils
 from rally.plugins.openstack import service
 from rally.plugins.openstack.services.image import glance_common
 from rally.plugins.openstack.services.image import image
+from rally.plugins.openstack.services.image import image_cache
 from rally.task import atomic
 from rally.task import utils
 
@@ -51,6 +52,8 @@ class GlanceV1Service(service.Service, glance_common.GlanceMixin):
         try:
             if os.path.isfile(image_location):
                 kwargs["data"] = open(image_location)
+            elif image_cache.is_cached(image_location):
+                kwargs["data"] = self._open_cached_image(image_location)
             else:
                 kwargs["copy_from"] = image_location
 
@@ -22,6 +22,7 @@ from rally.common import utils as rutils
 from rally.plugins.openstack import service
 from rally.plugins.openstack.services.image import glance_common
 from rally.plugins.openstack.services.image import image
+from rally.plugins.openstack.services.image import image_cache
 from rally.task import atomic
 from rally.task import utils
 
@@ -44,6 +45,8 @@ class GlanceV2Service(service.Service, glance_common.GlanceMixin):
         try:
             if os.path.isfile(image_location):
                 image_data = open(image_location)
+            elif image_cache.is_cached(image_location):
+                image_data = self._open_cached_image(image_location)
             else:
                 response = requests.get(image_location, stream=True)
                 image_data = response.raw
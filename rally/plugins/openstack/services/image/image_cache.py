@@ -0,0 +1,176 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Local cache of image files downloaded by URLs.
+
+Images created from the same URL are downloaded only once. Files are stored
+by keys made of the URL and the ETag (or Content-MD5, or Last-Modified)
+header of the response to the HEAD request, so a changed image is downloaded
+again. The least recently used files are removed when the size of the cache
+exceeds the limit.
+
+Every file is guarded by a file lock, so concurrent creators of images, both
+threads and processes, wait for a single download.
+"""
+
+import errno
+import fcntl
+import hashlib
+import io
+import mmap
+import os
+import shutil
+
+import requests
+
+from rally.common import cfg
+from rally.common import logging
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+_CHUNK_SIZE = 1024 * 1024
+_SUFFIXES = (".lock", ".part")
+
+
+def is_cached(image_location):
+    """Check whether the image should be taken from the cache."""
+    return (CONF.openstack.glance_image_cache_size > 0 and
+            image_location.startswith(("http://", "https://")))
+
+
+def _map(path):
+    with open(path, "rb") as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty files can not be mapped
+            return io.BytesIO()
+
+
+class ImageCache(object):
+    """Cache of image files in the directory.
+
+    :param path: path to the directory of the cache
+    :param max_size: max size of all files in bytes
+    """
+
+    def __init__(self, path, max_size):
+        self.path = os.path.expanduser(path)
+        self.max_size = max_size
+
+    def get_key(self, url):
+        """Return the key of the current version of the image."""
+        headers = {}
+        try:
+            response = requests.head(url, allow_redirects=True)
+            response.raise_for_status()
+            headers = response.headers
+        except requests.RequestException as e:
+            LOG.debug("Failed to check the version of the image %s, it is "
+                      "cached by URL only: %s" % (url, e))
+        version = (headers.get("ETag") or headers.get("Content-MD5") or
+                   headers.get("Last-Modified") or "")
+        return hashlib.sha1(
+            ("%s\n%s" % (url, version)).encode("utf-8")).hexdigest()
+
+    def _get_path(self, key):
+        return os.path.join(self.path, key)
+
+    def has(self, key):
+        return os.path.isfile(self._get_path(key))
+
+    def open(self, key, url):
+        """Open the cached file, downloading it if it is not cached yet.
+
+        :param key: the key of the image returned by get_key()
+        :param url: URL to download the image from
+        :returns: tuple (data, downloaded), where data is a read-only
+                  file-like object which maps the file to memory and
+                  downloaded is True if the file was not found in the cache
+        """
+        try:
+            os.makedirs(self.path)
+        except OSError as e:
+            if e.errno != errno.EEXIST:
+                raise
+        path = self._get_path(key)
+        with open(path + ".lock", "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            # NOTE: the file is checked under the lock, so creators which
+            #   wait for a download of another one find the file cached.
+            downloaded = not os.path.isfile(path)
+            if downloaded:
+                self._download(url, path)
+            else:
+                os.utime(path, None)
+            # NOTE: the mapping stays valid even if the file is evicted
+            data = _map(path)
+        self._evict(keep=path)
+        return data, downloaded
+
+    def _download(self, url, path):
+        LOG.debug("Downloading the image %s to %s" % (url, path))
+        tmp_path = path + ".part"
+        response = requests.get(url, stream=True)
+        try:
+            response.raise_for_status()
+            with open(tmp_path, "wb") as f:
+                shutil.copyfileobj(response.raw, f, _CHUNK_SIZE)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        finally:
+            response.close()
+        os.rename(tmp_path, path)
+
+    def _evict(self, keep):
+        files = []
+        for name in os.listdir(self.path):
+            if name.endswith(_SUFFIXES):
+                continue
+            path = self._get_path(name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                # removed by another process
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for mtime, size, path in files)
+        for mtime, size, path in sorted(files):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            with open(path + ".lock", "a") as lock:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except (IOError, OSError):
+                    # the file is being opened
+                    continue
+                if os.path.isfile(path):
+                    LOG.debug("Removing the image %s from the cache" % path)
+                    os.remove(path)
+                    total -= size
+
+
+def get_cache():
+    """Return the image cache configured by options."""
+    return ImageCache(CONF.openstack.glance_image_cache_dir,
+                      CONF.openstack.glance_image_cache_size * 1024 * 1024)
@@ -0,0 +1,87 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import abc
+import functools
+import random
+
+import six
+
+from rally.common.plugin import plugin
+
+
+configure = functools.partial(plugin.configure, platform="openstack")
+
+
+@plugin.base()
+@six.add_metaclass(abc.ABCMeta)
+class UserPlacement(plugin.Plugin):
+    """Base class for strategies of choosing users for scenario iterations.
+
+    A strategy is created once, when users are set up, and then it is used
+    by every iteration. All preparations should be done in __init__, so
+    choose() is cheap.
+
+    :param users: list of users of the users context
+    :param tenants: dict of tenants of the users context
+    """
+
+    def __init__(self, users, tenants):
+        self.users = users
+        self.tenants = tenants
+
+    @abc.abstractmethod
+    def choose(self, context):
+        """Return user and tenant for the iteration.
+
+        :param context: context of the scenario iteration. Users and tenants
+            should be taken from it, since it can be a copy of the context
+            which the strategy was created with.
+        :returns: tuple of user and tenant
+        """
+
+
+@configure(name="random")
+class RandomPlacement(UserPlacement):
+    """Choose a random user for every iteration."""
+
+    def choose(self, context):
+        user = random.choice(context["users"])
+        return user, context["tenants"][user["tenant_id"]]
+
+
+@configure(name="round_robin")
+class RoundRobinPlacement(UserPlacement):
+    """Iterate over tenants, and over users of a tenant after each round."""
+
+    def __init__(self, users, tenants):
+        super(RoundRobinPlacement, self).__init__(users, tenants)
+        self._tenant_ids = sorted(tenants.keys())
+
+    def choose(self, context):
+        tenants_amount = len(self._tenant_ids)
+        # NOTE: iteration is subtracted by `1' because it starts from `1'
+        #   but we count from `0'
+        iteration = context["iteration"] - 1
+        tenant = context["tenants"][self._tenant_ids[iteration
+                                                     % tenants_amount]]
+        users = tenant["users"]
+        return users[(iteration // tenants_amount) % len(users)], tenant
+
+
+def create(context):
+    """Create the strategy of choosing users configured in the context."""
+    return UserPlacement.get(context["user_choice_method"])(
+        context["users"], context["tenants"])
@@ -162,6 +162,14 @@ class BaseContext(plugin.Plugin, functional.FunctionalMixin,
         self.context contains information that was passed to scenario
         """
 
+    def stats(self):
+        """Return statistics of the context to store into its results.
+
+        It is called after cleanup(). An empty dict means that the context
+        has no statistics.
+        """
+        return {}
+
     def __enter__(self):
         return self
 
@@ -289,6 +297,9 @@ class ContextManager(object):
                     ctx_data["cleanup"]["started_at"] = timer.timestamp()
                     finished_at = timer.finish_timestamp()
                     ctx_data["cleanup"]["finished_at"] = finished_at
+                    stats = ctx.stats()
+                    if stats:
+                        ctx_data["stats"] = stats
 
     def __enter__(self):
         try:
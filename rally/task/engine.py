@@ -28,6 +28,7 @@ from rally import consts
 from rally import exceptions
 from rally.task import context
 from rally.task import hook
+from rally.task.processing import stats
 from rally.task import runner
 from rally.task import scenario
 from rally.task import sla
@@ -41,6 +42,15 @@ CONF = cfg.CONF
 TASK_ENGINE_OPTS = [
     cfg.IntOpt("raw_result_chunk_size", default=1000, min=1,
                help="Size of raw result chunk in iterations"),
+    cfg.StrOpt("raw_result_chunk_format", default="json",
+               choices=["json", "compact"],
+               help="Format to store raw result chunks in. 'compact' is a "
+                    "compressed columnar format which takes much less space "
+                    "and loads faster than 'json'."),
+    cfg.StrOpt("raw_result_chunk_compression", default="zlib",
+               choices=["zlib", "lz4", "none"],
+               help="Compression of raw result chunks in 'compact' format. "
+                    "'lz4' requires lz4 library to be installed."),
 ]
 
 
@@ -74,6 +84,7 @@ class ResultConsumer(object):
         self.load_started_at = float("inf")
         self.load_finished_at = 0
         self.workload_data_count = 0
+        self.workload_stats = stats.WorkloadStats()
 
         self.sla_checker = sla.SLAChecker(self.workload_cfg)
         self.hook_executor = hook.HookExecutor(self.workload_cfg, self.task)
@@ -106,6 +117,7 @@ class ResultConsumer(object):
                                                self.load_started_at)
                     self.load_finished_at = max(r["duration"] + r["timestamp"],
                                                 self.load_finished_at)
+                    self.workload_stats.add_iteration(r)
                     success = self.sla_checker.add_iteration(r)
                     if (self.abort_on_sla_failure and
                             not success and
@@ -122,14 +134,19 @@ class ResultConsumer(object):
                     results_chunk = self.results[:chunk_size]
                     self.results = self.results[chunk_size:]
                     results_chunk.sort(key=lambda x: x["timestamp"])
-                    self.workload.add_workload_data(self.workload_data_count,
-                                                    {"raw": results_chunk})
-                    self.workload_data_count += 1
+                    self._add_workload_data(results_chunk)
 
             elif self.is_done.isSet():
                 break
             else:
-                time.sleep(0.1)
+                self.runner.result_queue.wait(self.is_done)
+
+    def _add_workload_data(self, results_chunk):
+        self.workload.add_workload_data(
+            self.workload_data_count, {"raw": results_chunk},
+            chunk_format=CONF.raw_result_chunk_format,
+            compression=CONF.raw_result_chunk_compression)
+        self.workload_data_count += 1
 
     def _consume_events(self):
         while not self.is_done.isSet() or self.runner.event_queue:
@@ -138,11 +155,13 @@ class ResultConsumer(object):
                 self.hook_executor.on_event(
                     event_type=event["type"], value=event["value"])
             else:
-                time.sleep(0.01)
+                self.runner.event_queue.wait(self.is_done)
 
     def __exit__(self, exc_type, exc_value, exc_traceback):
         self.finish = time.time()
         self.is_done.set()
+        self.runner.result_queue.notify_all()
+        self.runner.event_queue.notify_all()
         self.aborting_checker.join()
         self.thread.join()
 
@@ -171,8 +190,7 @@ class ResultConsumer(object):
             # NOTE(boris-42): Sort in order of starting
             #                 instead of order of ending
             self.results.sort(key=lambda x: x["timestamp"])
-            self.workload.add_workload_data(self.workload_data_count,
-                                            {"raw": self.results})
+            self._add_workload_data(self.results)
         start_time = (self.load_started_at
                       if self.load_started_at != float("inf") else None)
         self.workload.set_results(load_duration=load_duration,
@@ -180,6 +198,7 @@ class ResultConsumer(object):
                                   sla_results=self.sla_checker.results(),
                                   start_time=start_time,
                                   contexts_results=self._cm.contexts_results(),
+                                  stats=self.workload_stats.to_dict(),
                                   **results)
 
     @staticmethod
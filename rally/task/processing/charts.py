@@ -48,6 +48,7 @@ class Chart(plugin.Plugin):
         self._workload = workload
         self.base_size = self._workload["total_iteration_count"]
         self.zipped_size = zipped_size
+        self._atomic_names = None
 
     def add_iteration(self, iteration):
         """Add iteration data.
@@ -57,7 +58,22 @@ class Chart(plugin.Plugin):
         so chart instance could process unlimited number of iterations,
         with low memory usage.
         """
-        for name, value in self._map_iteration_values(iteration):
+        self._add_values(self._map_iteration_values(iteration))
+
+    def add_atomic_actions(self, iteration, atomic_actions):
+        """Add iteration data with atomic actions merged by the caller.
+
+        It is used instead of add_iteration() to merge atomic actions of
+        the iteration once for all charts which process them.
+
+        :param iteration: iteration data
+        :param atomic_actions: result of atomic.merge_atomic_actions() for
+            atomic actions of the iteration. It should not be modified
+        """
+        self._add_values(self._map_atomic_actions(iteration, atomic_actions))
+
+    def _add_values(self, values):
+        for name, value in values:
             if name not in self._data:
                 self._data[name] = utils.GraphZipper(self.base_size,
                                                      self.zipped_size)
@@ -80,10 +96,10 @@ class Chart(plugin.Plugin):
         due to failures, this method must be used in all cases
         related to atomic actions processing.
         """
-        return list(
-            (name, atomic_actions.get(name, {}).get("duration", 0))
-            for name in self._get_atomic_names()
-        )
+        if self._atomic_names is None:
+            self._atomic_names = self._get_atomic_names()
+        return [(name, atomic_actions.get(name, {}).get("duration", 0))
+                for name in self._atomic_names]
 
     def _get_atomic_names(self):
         duration_stats = self._workload["statistics"]["durations"]
@@ -93,6 +109,10 @@ class Chart(plugin.Plugin):
         """Get values for processing, from given iteration."""
         return iteration
 
+    def _map_atomic_actions(self, iteration, atomic_actions):
+        """Get values for processing, from merged atomic actions."""
+        return self._fix_atomic_actions(atomic_actions)
+
 
 class MainStackedAreaChart(Chart):
 
@@ -118,8 +138,11 @@ class AtomicStackedAreaChart(Chart):
     widget = "StackedArea"
 
     def _map_iteration_values(self, iteration):
-        atomic_actions = atomic.merge_atomic_actions(
-            iteration["atomic_actions"])
+        return self._map_atomic_actions(
+            iteration, atomic.merge_atomic_actions(
+                iteration["atomic_actions"]))
+
+    def _map_atomic_actions(self, iteration, atomic_actions):
         atomics = self._fix_atomic_actions(atomic_actions)
         if self._workload["failed_iteration_count"]:
             if iteration["error"]:
@@ -137,8 +160,8 @@ class AvgChart(Chart):
 
     widget = "Pie"
 
-    def add_iteration(self, iteration):
-        for name, value in self._map_iteration_values(iteration):
+    def _add_values(self, values):
+        for name, value in values:
             if name not in self._data:
                 self._data[name] = streaming.MeanComputation()
             self._data[name].add(value or 0)
@@ -150,9 +173,9 @@ class AvgChart(Chart):
 class AtomicAvgChart(AvgChart):
 
     def _map_iteration_values(self, iteration):
-        atomic_actions = atomic.merge_atomic_actions(
-            iteration["atomic_actions"])
-        return self._fix_atomic_actions(atomic_actions)
+        return self._map_atomic_actions(
+            iteration, atomic.merge_atomic_actions(
+                iteration["atomic_actions"]))
 
 
 class LoadProfileChart(Chart):
@@ -183,8 +206,10 @@ class LoadProfileChart(Chart):
         # NOTE(andreykurilin): There is a "start_time" field in workload
         #   object, but due to transformations in database layer, the
         #   microseconds can be not accurate enough.
-        if self._workload["data"]:
-            self._tstamp_start = self._workload["data"][0]["timestamp"]
+        # NOTE: workload data can be a lazy stream, so do not index it
+        for itr in self._workload["data"]:
+            self._tstamp_start = itr["timestamp"]
+            break
         else:
             self._tstamp_start = self._workload["start_time"]
 
@@ -242,15 +267,15 @@ class HistogramChart(Chart):
                           "x": x_axis, "y": [0] * len(x_axis)})
         return views
 
-    def add_iteration(self, iteration):
-        for name, value in self._map_iteration_values(iteration):
+    def _add_values(self, values):
+        for name, value in values:
             if name not in self._data:
                 raise KeyError("Unexpected histogram name: %s" % name)
-            for i, view in enumerate(self._data[name]["views"]):
-                for bin_i, bin_v in enumerate(view["x"]):
-                    if (value or 0) <= bin_v:
-                        self._data[name]["views"][i]["y"][bin_i] += 1
-                        break
+            for view in self._data[name]["views"]:
+                # the first bin which is not less than the value
+                bin_i = bisect.bisect_left(view["x"], value or 0)
+                if bin_i < len(view["y"]):
+                    view["y"][bin_i] += 1
 
     def render(self):
         data = []
@@ -293,9 +318,9 @@ class AtomicHistogramChart(HistogramChart):
                 "disabled": i}
 
     def _map_iteration_values(self, iteration):
-        atomic_actions = atomic.merge_atomic_actions(
-            iteration["atomic_actions"])
-        return self._fix_atomic_actions(atomic_actions)
+        return self._map_atomic_actions(
+            iteration, atomic.merge_atomic_actions(
+                iteration["atomic_actions"]))
 
 
 @six.add_metaclass(abc.ABCMeta)
@@ -388,19 +413,15 @@ class MainStatsTable(Table):
 
     _DEPTH_OF_PROCESSING = 2
 
-    def __init__(self, *args, **kwargs):
-        super(MainStatsTable, self).__init__(*args, **kwargs)
-        self.iters_num = self._workload["total_iteration_count"]
-
     def _initialize_atomic(self, name, root, real_name=None, count=1):
         real_name = real_name or name
         root[name] = {
             # streaming algorithms
             "sa": [
                 [streaming.MinComputation(), None],
-                [streaming.PercentileComputation(0.5, self.iters_num), None],
-                [streaming.PercentileComputation(0.9, self.iters_num), None],
-                [streaming.PercentileComputation(0.95, self.iters_num), None],
+                [streaming.PercentileComputation(0.5), None],
+                [streaming.PercentileComputation(0.9), None],
+                [streaming.PercentileComputation(0.95), None],
                 [streaming.MaxComputation(), None],
                 [streaming.MeanComputation(), None],
                 [streaming.MeanComputation(),
@@ -439,7 +460,14 @@ class MainStatsTable(Table):
 
     def add_iteration(self, iteration):
         """Add data of a single iteration."""
-        data = atomic.merge_atomic_actions(iteration["atomic_actions"])
+        self.add_atomic_actions(
+            iteration, atomic.merge_atomic_actions(
+                iteration["atomic_actions"]))
+
+    def add_atomic_actions(self, iteration, atomic_actions):
+        # NOTE: merged atomic actions can be shared with other charts, so
+        #   they are copied before adding the total values.
+        data = collections.OrderedDict(atomic_actions)
         # NOTE(andreykurilin): the easiest way to identify the last
         #   atomic is to find the last added key to the OrderedDict. The
         #   most perfect way is to use reversed, since class OrderedDict
@@ -471,6 +499,21 @@ class MainStatsTable(Table):
 
         self._add_data(data)
 
+    def _merge_data(self, data, root):
+        for name, values in data.items():
+            if name not in root:
+                self._initialize_atomic(name, root=root,
+                                        real_name=values["real_name"],
+                                        count=values["count_per_iteration"])
+            for (mine, _), (theirs, _) in zip(root[name]["sa"],
+                                              values["sa"]):
+                mine.merge(theirs)
+            self._merge_data(values["children"], root[name]["children"])
+
+    def merge(self, other):
+        """Merge statistics collected by another instance."""
+        self._merge_data(other._data, self._data)
+
     def _process_result(self, name, values, depth=0):
         row = self._process_row(name, values["sa"])
         children = []
@@ -721,12 +764,11 @@ class OutputStatsTable(OutputTable):
     def add_iteration(self, iteration):
         for name, value in self._map_iteration_values(iteration):
             if name not in self._data:
-                iters_num = self._workload["total_iteration_count"]
                 self._data[name] = [
                     [streaming.MinComputation(), None],
-                    [streaming.PercentileComputation(0.5, iters_num), None],
-                    [streaming.PercentileComputation(0.9, iters_num), None],
-                    [streaming.PercentileComputation(0.95, iters_num), None],
+                    [streaming.PercentileComputation(0.5), None],
+                    [streaming.PercentileComputation(0.9), None],
+                    [streaming.PercentileComputation(0.95), None],
                     [streaming.MaxComputation(), None],
                     [streaming.MeanComputation(), None],
                     [streaming.IncrementComputation(),
@@ -769,7 +811,28 @@ _OUTPUT_SCHEMA = {
     "required": ["title", "chart_plugin", "data"]}
 
 
+# Results of checks of output items. The check depends only on names and
+# types of item values, so items of the same chart plugin are usually
+# checked once.
+_CHECKED_OUTPUTS = {}
+_CHECKED_OUTPUTS_LIMIT = 1000
+
+
 def validate_output(output_type, output):
+    if not isinstance(output, dict):
+        return _validate_output(output_type, output)
+    key = (output_type, tuple(output), tuple(map(type, output.values())))
+    try:
+        return _CHECKED_OUTPUTS[key]
+    except KeyError:
+        pass
+    if len(_CHECKED_OUTPUTS) >= _CHECKED_OUTPUTS_LIMIT:
+        _CHECKED_OUTPUTS.clear()
+    message = _CHECKED_OUTPUTS[key] = _validate_output(output_type, output)
+    return message
+
+
+def _validate_output(output_type, output):
     # TODO(amaretskiy): this validation is simple and must be improved.
     #   Maybe it is worth to add classmethod OutputChart.validate(), so
     #   we could have flexible validation for custom chart plugins
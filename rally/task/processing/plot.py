@@ -18,17 +18,30 @@ import datetime as dt
 import hashlib
 import itertools
 import json
+import multiprocessing
 
 import six
 
+from rally.common import cfg
+from rally.common import db
 from rally.common import objects
 from rally.common.plugin import plugin
 from rally.common import version
 from rally import exceptions
+from rally.task import atomic
 from rally.task.processing import charts
 from rally.task import scenario
 from rally.ui import utils as ui_utils
 
+CONF = cfg.CONF
+
+REPORT_OPTS = [
+    cfg.IntOpt("report_workers", default=1, min=1,
+               help="Number of processes used to process workloads while "
+                    "generating HTML reports and trends. 1 means that "
+                    "workloads are processed in the current process."),
+]
+
 
 def _process_hooks(hooks):
     """Prepare hooks data for report."""
@@ -86,7 +99,16 @@ def _process_hooks(hooks):
     return hooks_ctx
 
 
-def _process_workload(workload, workload_cfg, pos):
+# NOTE: the number of iterations of one workload whose "complete" output
+#   is included into streamed reports. Such output is rendered per iteration,
+#   so it is the biggest part of reports of long workloads.
+COMPLETE_OUTPUT_LIMIT = 1000
+
+_DATA_PLACEHOLDER = "__rally_report_data__"
+
+
+def _process_workload(workload, workload_cfg, pos,
+                      complete_output_limit=None):
     main_area = charts.MainStackedAreaChart(workload)
     main_hist = charts.MainHistogramChart(workload)
     main_stat = charts.MainStatsTable(workload)
@@ -96,16 +118,23 @@ def _process_workload(workload, workload_cfg, pos):
     atomic_hist = charts.AtomicHistogramChart(workload)
 
     errors = []
+    # NOTE: failures of a workload usually have the same few tracebacks, so
+    #   each of them is stored once and errors refer to it by index.
+    tracebacks = {}
     output_errors = []
     additive_output_charts = []
     complete_output = []
+    complete_output_skipped = 0
     for idx, itr in enumerate(workload["data"], 1):
         if itr["error"]:
             typ, msg, trace = itr["error"]
             timestamp = dt.datetime.fromtimestamp(
                 itr["timestamp"]).isoformat(sep="\n")
+            if trace not in tracebacks:
+                tracebacks[trace] = len(tracebacks)
             errors.append({"iteration": idx, "timestamp": timestamp,
-                           "type": typ, "message": msg, "traceback": trace})
+                           "type": typ, "message": msg,
+                           "traceback": tracebacks[trace]})
 
         for i, additive in enumerate(itr["output"]["additive"]):
             try:
@@ -121,16 +150,23 @@ def _process_workload(workload, workload_cfg, pos):
                 chart.add_iteration(additive["data"])
                 additive_output_charts.append(chart)
 
-        complete_charts = []
-        for complete in itr["output"]["complete"]:
-            chart_cls = plugin.Plugin.get(complete["chart_plugin"])
-            complete["widget"] = chart_cls.widget
-            complete_charts.append(chart_cls.render_complete_data(complete))
-        complete_output.append(complete_charts)
-
-        for chart in (main_area, main_hist, main_stat, load_profile,
-                      atomic_pie, atomic_area, atomic_hist):
+        if complete_output_limit is None or idx <= complete_output_limit:
+            complete_charts = []
+            for complete in itr["output"]["complete"]:
+                chart_cls = plugin.Plugin.get(complete["chart_plugin"])
+                complete["widget"] = chart_cls.widget
+                complete_charts.append(
+                    chart_cls.render_complete_data(complete))
+            complete_output.append(complete_charts)
+        elif itr["output"]["complete"]:
+            complete_output_skipped += 1
+
+        for chart in (main_area, main_hist, load_profile):
             chart.add_iteration(itr)
+        # NOTE: atomic actions are merged once for all charts of them
+        atomic_actions = atomic.merge_atomic_actions(itr["atomic_actions"])
+        for chart in (main_stat, atomic_pie, atomic_area, atomic_hist):
+            chart.add_atomic_actions(itr, atomic_actions)
 
     cls, method = workload["name"].split(".")
     additive_output = [chart.render() for chart in additive_output_charts]
@@ -157,9 +193,11 @@ def _process_workload(workload, workload_cfg, pos):
         "table": main_stat.render(),
         "additive_output": additive_output,
         "complete_output": complete_output,
+        "complete_output_skipped": complete_output_skipped,
         "has_output": any(additive_output) or any(complete_output),
         "output_errors": output_errors,
         "errors": errors,
+        "tracebacks": sorted(tracebacks, key=tracebacks.get),
         "load_duration": workload["load_duration"],
         "full_duration": workload["full_duration"],
         "created_at": workload["created_at"],
@@ -169,19 +207,68 @@ def _process_workload(workload, workload_cfg, pos):
     }
 
 
-def _process_workloads(workloads):
-    p_workloads = []
-    position = collections.defaultdict(lambda: -1)
+def _init_worker():
+    # NOTE: a forked worker should not use connections to the database of
+    #   the parent process while it streams raw data of workloads.
+    db.engine_reset()
+
 
+def _map(func, items, workers):
+    """Apply func to every item, preserving the order of items.
+
+    Items are processed by a pool of worker processes if more than one
+    worker is requested, so both func and items should be picklable.
+    """
+    if workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+    pool = multiprocessing.Pool(min(workers, len(items)),
+                                initializer=_init_worker)
+    try:
+        return list(pool.imap(func, items, chunksize=1))
+    finally:
+        pool.close()
+        pool.join()
+
+
+def _process_workload_args(args):
+    return _process_workload(*args)
+
+
+def _order_workloads(workloads):
+    """Return (workload, position) pairs in the order of the report.
+
+    Workloads are ordered by class and method of their scenarios, and the
+    position of a workload is its number among workloads of the same
+    scenario.
+    """
+    position = collections.defaultdict(lambda: -1)
+    ordered = []
     for workload in workloads:
         name = workload["name"]
         position[name] += 1
-        workload_cfg = objects.Workload.to_task(workload)
-        p_workloads.append(_process_workload(workload, workload_cfg,
-                                             position[name]))
+        cls, method = name.split(".")
+        ordered.append(((cls, method, position[name]), workload))
+    ordered.sort(key=lambda w: w[0])
+    return [(workload, key[2]) for key, workload in ordered]
+
+
+def _process_workloads(workloads, workers=1):
+    args = []
+    for workload, pos in _order_workloads(workloads):
+        # NOTE: if raw data is a stream from the database, only the
+        #   reference to it is passed to a worker process and the worker
+        #   reads the data itself.
+        args.append((workload, objects.Workload.to_task(workload), pos))
 
-    return sorted(p_workloads,
-                  key=lambda r: (r["cls"], r["met"], int(r["pos"])))
+    return _map(_process_workload_args, args, workers)
+
+
+def _stream_workloads(workloads, complete_output_limit=None):
+    """Process workloads one by one in the order of the report."""
+    for workload, pos in _order_workloads(workloads):
+        yield _process_workload(workload, objects.Workload.to_task(workload),
+                                pos,
+                                complete_output_limit=complete_output_limit)
 
 
 def _make_source(tasks):
@@ -224,7 +311,16 @@ def _make_source(tasks):
     return json.dumps(source, indent=2)
 
 
-def plot(tasks_results, include_libs=False):
+def plot(tasks_results, include_libs=False, workers=None):
+    """Generate HTML report of tasks.
+
+    :param tasks_results: list of tasks results
+    :param include_libs: whether to embed JS/CSS libraries into the report
+    :param workers: number of processes to process workloads with. Defaults
+        to report_workers option
+    """
+    if workers is None:
+        workers = CONF.report_workers
     source = _make_source(tasks_results)
     tasks = []
     subtasks = []
@@ -236,19 +332,81 @@ def plot(tasks_results, include_libs=False):
         subtasks.extend(tasks[-1].pop("subtasks"))
 
     template = ui_utils.get_template("task/report.html")
-    data = _process_workloads(workloads)
+    data = _process_workloads(workloads, workers=workers)
     return template.render(version=version.version_string(),
                            source=json.dumps(source),
                            data=json.dumps(data),
                            include_libs=include_libs)
 
 
-def trends(tasks):
+def stream(tasks_results, out, include_libs=False,
+           complete_output_limit=COMPLETE_OUTPUT_LIMIT):
+    """Write HTML report into the file-like object workload by workload.
+
+    Unlike plot(), data of all workloads are not kept in memory at once:
+    raw data of a workload is read (from the database, if it is streamed)
+    while the workload is processed, and the processed workload is written
+    out before the next one is taken.
+
+    :param tasks_results: list of tasks results
+    :param out: file-like object opened for writing text
+    :param include_libs: whether to embed JS/CSS libraries into the report
+    :param complete_output_limit: max number of iterations of a workload to
+        include "complete" output of. None means no limit
+    """
+    template = ui_utils.get_template("task/report.html")
+    html = template.render(version=version.version_string(),
+                           source=json.dumps(_make_source(tasks_results)),
+                           data=_DATA_PLACEHOLDER,
+                           include_libs=include_libs)
+    head, tail = html.split(_DATA_PLACEHOLDER, 1)
+
+    workloads = []
+    for task in tasks_results:
+        for subtask in task["subtasks"]:
+            workloads.extend(subtask["workloads"])
+
+    out.write(six.text_type(head))
+    out.write(u"[")
+    for i, workload in enumerate(_stream_workloads(workloads,
+                                                   complete_output_limit)):
+        if i:
+            out.write(u", ")
+        out.write(six.text_type(json.dumps(workload)))
+    out.write(u"]")
+    out.write(six.text_type(tail))
+
+
+def _process_trend(workload):
+    return Trends()._process_result(workload)
+
+
+def trends(tasks, workers=None):
+    """Generate HTML report with trends of workloads of tasks.
+
+    :param tasks: list of tasks results
+    :param workers: number of processes to process workloads with. Defaults
+        to report_workers option
+    """
+    if workers is None:
+        workers = CONF.report_workers
     trends = Trends()
+    results = []
     for task in tasks:
         for workload in itertools.chain(
                 *[s["workloads"] for s in task["subtasks"]]):
-            trends.add_result(task["uuid"], workload)
+            results.append((task["uuid"], workload))
+    if workers > 1:
+        # NOTE: trends do not need raw data, so it is not passed to workers
+        processed = _map(_process_trend,
+                         [dict((k, v) for k, v in w.items() if k != "data")
+                          for _u, w in results],
+                         workers)
+        for (task_uuid, _w), result in zip(results, processed):
+            trends._merge_result(task_uuid, result)
+    else:
+        for task_uuid, workload in results:
+            trends.add_result(task_uuid, workload)
     template = ui_utils.get_template("task/trends.html")
     return template.render(version=version.version_string(),
                            data=json.dumps(trends.get_data()))
@@ -283,7 +441,8 @@ class Trends(object):
     def _make_hash(self, obj):
         return hashlib.md5(self._to_str(obj).encode("utf8")).hexdigest()
 
-    def add_result(self, task_uuid, workload):
+    def _process_result(self, workload):
+        """Extract the part of trends data which the workload gives."""
         workload_cfg = objects.Workload.to_task(workload)
         # NOTE(andreykurilin): workload_cfg is a complite task with one only
         #   one workload. Task format v2 includes such fields like task
@@ -293,22 +452,6 @@ class Trends(object):
         #   workloads with equal configs.
         del workload_cfg["description"]
         w_description = workload_cfg["subtasks"][0].pop("description")
-        key = self._make_hash(workload_cfg)
-        if key not in self._data:
-            self._data[key] = {
-                "actions": {},
-                "sla_failures": 0,
-                "name": workload["name"],
-                "tasks": [],
-                "description": w_description,
-                "config": workload_cfg}
-
-        self._data[key]["tasks"].append(task_uuid)
-        if (self._data[key]["description"] and
-                self._data[key]["description"] != w_description):
-            self._data[key]["description"] = None
-
-        self._data[key]["sla_failures"] += not workload["pass_sla"]
 
         duration_stats = workload["statistics"]["durations"]
         if not workload["start_time"]:
@@ -318,9 +461,49 @@ class Trends(object):
         else:
             ts = int(workload["start_time"] * 1000)
 
+        actions = []
         for action in itertools.chain(duration_stats["atomics"],
                                       [duration_stats["total"]]):
-            action_name = action["display_name"]
+            try:
+                success = float(action["data"]["success"].rstrip("%"))
+            except ValueError:
+                # Got "n/a" for some reason
+                success = 0
+            actions.append(
+                (action["display_name"], success,
+                 dict((tgt, action["data"][tgt])
+                      for tgt in ("min", "median", "90%ile", "95%ile",
+                                  "max", "avg"))))
+
+        return {"key": self._make_hash(workload_cfg),
+                "name": workload["name"],
+                "description": w_description,
+                "config": workload_cfg,
+                "pass_sla": workload["pass_sla"],
+                "ts": ts,
+                "actions": actions}
+
+    def _merge_result(self, task_uuid, result):
+        """Add the result of _process_result() to trends data."""
+        key = result["key"]
+        if key not in self._data:
+            self._data[key] = {
+                "actions": {},
+                "sla_failures": 0,
+                "name": result["name"],
+                "tasks": [],
+                "description": result["description"],
+                "config": result["config"]}
+
+        self._data[key]["tasks"].append(task_uuid)
+        if (self._data[key]["description"] and
+                self._data[key]["description"] != result["description"]):
+            self._data[key]["description"] = None
+
+        self._data[key]["sla_failures"] += not result["pass_sla"]
+
+        ts = result["ts"]
+        for action_name, success, durations in result["actions"]:
             # NOTE(amaretskiy): some atomic actions can be missed due to
             #   failures. We can ignore that because we use NVD3 lineChart()
             #   for displaying trends, which is safe for missed points
@@ -329,18 +512,16 @@ class Trends(object):
                     "durations": {"min": [], "median": [], "90%ile": [],
                                   "95%ile": [], "max": [], "avg": []},
                     "success": []}
-            try:
-                success = float(action["data"]["success"].rstrip("%"))
-            except ValueError:
-                # Got "n/a" for some reason
-                success = 0
 
             self._data[key]["actions"][action_name]["success"].append(
                 (ts, success))
 
             for tgt in ("min", "median", "90%ile", "95%ile", "max", "avg"):
                 d = self._data[key]["actions"][action_name]["durations"]
-                d[tgt].append((ts, action["data"][tgt]))
+                d[tgt].append((ts, durations[tgt]))
+
+    def add_result(self, task_uuid, workload):
+        self._merge_result(task_uuid, self._process_result(workload))
 
     def get_data(self):
         trends = []
@@ -0,0 +1,59 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.common import streaming_algorithms as streaming
+from rally.task.processing import charts
+
+
+class WorkloadStats(object):
+    """Statistics of a workload computed from a stream of iterations.
+
+    Iterations are added one by one as soon as they are received, so the
+    statistics of a workload are ready right after the load is finished
+    and the raw data does not need to be read once again.
+    """
+
+    def __init__(self):
+        self._iterations = streaming.IncrementComputation()
+        self._failures = streaming.IncrementComputation()
+        self._min_duration = streaming.MinComputation()
+        self._max_duration = streaming.MaxComputation()
+        self._durations = charts.MainStatsTable({"total_iteration_count": 0})
+
+    def add_iteration(self, iteration):
+        """Fold a single iteration into the statistics."""
+        self._iterations.add()
+        if iteration.get("error"):
+            self._failures.add()
+        duration = iteration.get("duration", 0)
+        self._min_duration.add(duration)
+        self._max_duration.add(duration)
+        self._durations.add_iteration(iteration)
+
+    def merge(self, other):
+        """Merge statistics collected by another instance."""
+        self._iterations.merge(other._iterations)
+        self._failures.merge(other._failures)
+        self._min_duration.merge(other._min_duration)
+        self._max_duration.merge(other._max_duration)
+        self._durations.merge(other._durations)
+
+    def to_dict(self):
+        """Return values as they are stored in the workload."""
+        return {"total_iteration_count": self._iterations.result(),
+                "failed_iteration_count": self._failures.result(),
+                "min_duration": self._min_duration.result(),
+                "max_duration": self._max_duration.result(),
+                "statistics": {"durations": self._durations.to_dict()}}
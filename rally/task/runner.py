@@ -17,11 +17,15 @@ import abc
 import collections
 import copy
 import multiprocessing
-import time
+import sys
+import threading
 
 import six
+from six.moves import queue as Queue
 
+from rally.common import cfg
 from rally.common import logging
+from rally.common import objects
 from rally.common.plugin import plugin
 from rally.common import utils as rutils
 from rally.common import validation
@@ -33,6 +37,17 @@ from rally.task import utils
 LOG = logging.getLogger(__name__)
 configure = plugin.configure
 
+CONF = cfg.CONF
+
+RUNNER_OPTS = [
+    cfg.BoolOpt("validate_results_in_workers", default=False,
+                help="Check schemas of iteration results in worker "
+                     "processes of runners before sending them to the main "
+                     "process. Results in wrong format are dropped by "
+                     "workers, and the main process does not check them "
+                     "again."),
+]
+
 
 def format_result_on_timeout(exc, timeout):
     return {
@@ -45,7 +60,12 @@ def format_result_on_timeout(exc, timeout):
 
 
 def _get_scenario_context(iteration, context_obj):
-    context_obj = copy.deepcopy(context_obj)
+    if isinstance(context_obj, rutils.LockedDict):
+        # NOTE: nested values of a locked context are read-only, so they
+        #   are shared between iterations and only the top level is copied.
+        context_obj = dict(context_obj)
+    else:
+        context_obj = copy.deepcopy(context_obj)
     context_obj["iteration"] = iteration + 1  # Numeration starts from `1'
     return context_obj
 
@@ -87,10 +107,32 @@ def _run_scenario_once(cls, method_name, context_obj, scenario_kwargs,
                 "atomic_actions": scenario_inst.atomic_actions()}
 
 
+def _check_result_in_worker(result, context_obj):
+    """Check whether the worker should send the iteration result.
+
+    :param result: the iteration result
+    :param context_obj: context of the iteration
+    :returns: False if results are validated by workers and the result has
+        wrong format
+    """
+    if not CONF.validate_results_in_workers:
+        return True
+    message = objects.task.validate_result(result)
+    if message:
+        LOG.warning("Task %(task)s | Iteration result is dropped because of "
+                    "wrong format: %(message)s"
+                    % {"task": context_obj["task"]["uuid"],
+                       "message": message})
+        return False
+    return True
+
+
 def _worker_thread(queue, cls, method_name, context_obj, scenario_kwargs,
                    event_queue):
-    queue.put(_run_scenario_once(cls, method_name, context_obj,
-                                 scenario_kwargs, event_queue))
+    result = _run_scenario_once(cls, method_name, context_obj,
+                                scenario_kwargs, event_queue)
+    if _check_result_in_worker(result, context_obj):
+        queue.put(result)
 
 
 def _log_worker_info(**info):
@@ -136,8 +178,8 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         """
         self.task = task
         self.config = config
-        self.result_queue = collections.deque()
-        self.event_queue = collections.deque()
+        self.result_queue = rutils.WaitableDeque()
+        self.event_queue = rutils.WaitableDeque()
         self.aborted = multiprocessing.Event()
         self.run_duration = 0
         self.batch_size = batch_size
@@ -163,6 +205,10 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
         # NOTE(boris-42): processing @types decorators
         args = types.preprocess(name, context, args)
 
+        # NOTE: the context is not changed by iterations, so it is locked
+        #   once instead of being deep-copied for every iteration.
+        context = rutils.LockedDict(context)
+
         with rutils.Timer() as timer:
             # TODO(boris-42): remove method_name argument, now it's always run
             self._run_scenario(scenario_plugin, "run", context, args)
@@ -196,30 +242,83 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
 
         return process_pool
 
+    @staticmethod
+    def _consume_queue(queue, consumer, errors=None):
+        """Pass items of multiprocessing.Queue to consumer until None comes.
+
+        The queue is not polled: the thread blocks until something arrives
+        and then takes everything that is already available at once.
+
+        If the consumer fails, the rest of items are read and dropped, so
+        processes which write to the queue are not blocked.
+
+        :param queue: multiprocessing.Queue to read from
+        :param consumer: callable which accepts a single item
+        :param errors: list to append sys.exc_info() of the failure to
+        """
+        failed = False
+        while True:
+            batch = [queue.get()]
+            while True:
+                try:
+                    batch.append(queue.get_nowait())
+                except Queue.Empty:
+                    break
+            for item in batch:
+                if item is None:
+                    return
+                if failed:
+                    continue
+                try:
+                    consumer(item)
+                except Exception:
+                    LOG.exception("Failed to process an item of the queue. "
+                                  "The rest of items are dropped.")
+                    failed = True
+                    if errors is not None:
+                        errors.append(sys.exc_info())
+
     def _join_processes(self, process_pool, result_queue, event_queue):
         """Join the processes in the pool and send their results to the queue.
 
+        Results and events are transferred by separate threads as soon as
+        they arrive, while this method waits for the processes to finish.
+        The first error of these threads is re-raised after that.
+
         :param process_pool: pool of processes to join
         :param result_queue: multiprocessing.Queue that receives the results
         :param event_queue: multiprocessing.Queue that receives the events
         """
-        while process_pool:
-            while process_pool and not process_pool[0].is_alive():
-                process_pool.popleft().join()
+        send_result = self._send_result
+        if CONF.validate_results_in_workers:
+            # NOTE: results in wrong format have been dropped by workers
+            send_result = self._store_result
+        errors = []
+        consumers = [
+            threading.Thread(target=self._consume_queue,
+                             args=(result_queue, send_result, errors)),
+            threading.Thread(target=self._consume_queue,
+                             args=(event_queue,
+                                   lambda event: self.send_event(**event),
+                                   errors))]
+        for consumer in consumers:
+            consumer.start()
 
-            if result_queue.empty() and event_queue.empty():
-                # sleep a bit to avoid 100% usage of CPU by this method
-                time.sleep(0.01)
-
-            while not event_queue.empty():
-                self.send_event(**event_queue.get())
+        while process_pool:
+            process_pool.popleft().join()
 
-            while not result_queue.empty():
-                self._send_result(result_queue.get())
+        # NOTE: a finished process has already flushed everything into the
+        #   queues, so None is the last item the consumers receive
+        result_queue.put(None)
+        event_queue.put(None)
+        for consumer in consumers:
+            consumer.join()
 
-        self._flush_results()
         result_queue.close()
         event_queue.close()
+        if errors:
+            six.reraise(*errors[0])
+        self._flush_results()
 
     def _flush_results(self):
         if self.result_batch:
@@ -242,6 +341,10 @@ class ScenarioRunner(plugin.Plugin, validation.ValidatablePluginMixin):
                 % {"task": self.task["uuid"], "runner": self.get_name()})
             return
 
+        self._store_result(result)
+
+    def _store_result(self, result):
+        """Store partial result without checking its schema."""
         self.result_batch.append(result)
 
         if len(self.result_batch) >= self.batch_size:
@@ -18,6 +18,7 @@ import six
 
 from rally.common.plugin import discover
 from rally.common.plugin import meta
+from rally.common.plugin import plugin
 from rally import exceptions
 from rally.task import atomic
 
@@ -305,6 +306,7 @@ class UnifiedService(Service):
         """
 
         # find all classes with unified implementation
+        plugin.load_lazy_plugins()
         impls = {cls: cls._meta_get("impl")
                  for cls in discover.itersubclasses(self.__class__)
                  if (cls._meta_is_inited(raise_exc=False) and
@@ -0,0 +1,247 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Shared poller of statuses of resources.
+
+By default, every call of wait_for_status polls its own resource with a GET
+request. When batched_status_polling is enabled, waiters of one process are
+registered in the shared poller instead. It checks statuses of all resources
+of one batch (e.g. servers of one project) with a single list call and wakes
+up waiters of resources which reached the desired statuses.
+"""
+
+import os
+import threading
+import time
+
+from rally.common import cfg
+from rally.common import logging
+from rally import exceptions
+
+
+LOG = logging.getLogger(__name__)
+
+CONF = cfg.CONF
+
+STATUS_POLLER_OPTS = [
+    cfg.BoolOpt("batched_status_polling", default=False,
+                help="Check statuses of resources, which are waited for by "
+                     "concurrent iterations, with one list call per service "
+                     "and project instead of a GET call per resource. It is "
+                     "used only for resources updated via get_from_manager. "
+                     "Resources are batched by the project of the client "
+                     "or, if the client does not tell it, by the keystone "
+                     "session of the client."),
+]
+
+
+class _Waiter(object):
+    """The resource which is waited for and the result of waiting."""
+
+    def __init__(self, resource, ready_statuses, failure_statuses,
+                 update_resource, status_getter, check_interval,
+                 check_deletion, id_attr):
+        self.resource = resource
+        self.resource_repr = getattr(resource, "name", repr(resource))
+        self.ready_statuses = ready_statuses
+        self.failure_statuses = failure_statuses
+        self.list_resources = update_resource.list_resources
+        self.key = (update_resource.batch_key(resource), id_attr)
+        self.status_getter = status_getter
+        self.check_interval = check_interval
+        self.check_deletion = check_deletion
+        self.id_attr = id_attr
+        self.error = None
+        self.event = threading.Event()
+
+        self._latest_status = status_getter(resource)
+        self._latest_status_update = time.time()
+
+    def update(self, result):
+        """Process the result of the check of the resource.
+
+        :param result: the updated resource or an exception raised while
+            updating it
+        :returns: True if waiting is over
+        """
+        if isinstance(result, Exception):
+            if not (self.check_deletion and
+                    isinstance(result, exceptions.GetResourceNotFound)):
+                self.error = result
+            self.resource = None
+            return True
+
+        self.resource = result
+        status = self.status_getter(result)
+        if status != self._latest_status:
+            current_time = time.time()
+            LOG.debug(
+                "Waiting for resource %(resource)s. Status changed: "
+                "%(latest)s => %(current)s in %(delta)s"
+                % {"resource": self.resource_repr,
+                   "latest": self._latest_status, "current": status,
+                   "delta": current_time - self._latest_status_update})
+            self._latest_status = status
+            self._latest_status_update = current_time
+
+        if status in self.ready_statuses:
+            return True
+        if status in self.failure_statuses:
+            self.error = exceptions.GetResourceErrorStatus(
+                resource=result, status=status,
+                fault="Status in failure list %s"
+                      % str(self.failure_statuses))
+            return True
+        return False
+
+
+class StatusPoller(object):
+    """Checks statuses of resources of all waiters in batches.
+
+    Waiters are grouped by batch keys of their resources. Each group is
+    checked with one list call, not more often than the smallest check
+    interval of its waiters. The polling thread is started by the first
+    waiter and stops when there is nothing to wait for.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._waiters = {}
+        self._next_poll = {}
+        self._thread = None
+        self.list_calls = 0
+        self.checks = 0
+
+    def stats(self):
+        """Return numbers of list calls and saved per-resource calls."""
+        with self._cond:
+            return {"list_calls": self.list_calls,
+                    "checks": self.checks,
+                    "saved_calls": self.checks - self.list_calls}
+
+    def wait(self, resource, ready_statuses, failure_statuses,
+             update_resource, status_getter, timeout, check_interval,
+             check_deletion=False, id_attr="id"):
+        """Wait for the resource to come into one of the ready statuses.
+
+        Arguments have the same meaning as for wait_for_status.
+        update_resource should have list_resources and batch_key attributes
+        like the function created by get_from_manager.
+        """
+        waiter = _Waiter(resource, ready_statuses, failure_statuses,
+                         update_resource, status_getter, check_interval,
+                         check_deletion, id_attr)
+        with self._cond:
+            self._waiters.setdefault(waiter.key, []).append(waiter)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run)
+                self._thread.daemon = True
+                self._thread.start()
+            self._cond.notify()
+
+        try:
+            finished = waiter.event.wait(timeout)
+        finally:
+            # NOTE: the waiter is removed even if waiting is interrupted
+            #   (e.g. by the timeout of the iteration), otherwise its
+            #   resource would be polled till the end of the process.
+            with self._cond:
+                self._remove(waiter)
+        if not finished:
+            # the check can be finished while the waiter was being removed
+            if not waiter.event.is_set():
+                raise exceptions.TimeoutException(
+                    desired_status="('%s')" % "', '".join(ready_statuses),
+                    resource_name=waiter.resource_repr,
+                    resource_type=resource.__class__.__name__,
+                    resource_id=getattr(waiter.resource, id_attr,
+                                        "<no id>"),
+                    resource_status=status_getter(waiter.resource),
+                    timeout=timeout)
+
+        if waiter.error is not None:
+            raise waiter.error
+        return waiter.resource
+
+    def _remove(self, waiter):
+        waiters = self._waiters.get(waiter.key, [])
+        if waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._waiters[waiter.key]
+                self._next_poll.pop(waiter.key, None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while True:
+                    if not self._waiters:
+                        self._thread = None
+                        LOG.debug("Status poller made %(list_calls)d list "
+                                  "calls instead of %(checks)d get calls "
+                                  "(%(saved_calls)d calls saved)."
+                                  % {"list_calls": self.list_calls,
+                                     "checks": self.checks,
+                                     "saved_calls":
+                                         self.checks - self.list_calls})
+                        return
+                    now = time.time()
+                    batches = [(key, list(waiters))
+                               for key, waiters in self._waiters.items()
+                               if self._next_poll.get(key, 0) <= now]
+                    if batches:
+                        break
+                    self._cond.wait(min(self._next_poll[key]
+                                        for key in self._waiters) - now)
+            for key, waiters in batches:
+                self._poll(key, waiters)
+
+    def _poll(self, key, waiters):
+        try:
+            results = waiters[0].list_resources(
+                [w.resource for w in waiters], id_attr=waiters[0].id_attr)
+        except Exception as e:
+            results = [e] * len(waiters)
+
+        finished = [waiter for waiter, result in zip(waiters, results)
+                    if waiter.update(result)]
+
+        with self._cond:
+            self.list_calls += 1
+            self.checks += len(waiters)
+            for waiter in finished:
+                self._remove(waiter)
+            if key in self._waiters:
+                self._next_poll[key] = time.time() + min(
+                    w.check_interval for w in self._waiters[key])
+        for waiter in finished:
+            waiter.event.set()
+
+
+_poller = None
+_poller_pid = None
+_poller_lock = threading.Lock()
+
+
+def get_poller():
+    """Return the status poller of the current process."""
+    global _poller, _poller_pid
+
+    with _poller_lock:
+        # the polling thread does not survive forking of worker processes
+        if _poller is None or _poller_pid != os.getpid():
+            _poller = StatusPoller()
+            _poller_pid = os.getpid()
+        return _poller
@@ -21,13 +21,17 @@ import traceback
 import jsonschema
 import six
 
+from rally.common import cfg
 from rally.common import logging
 from rally import consts
 from rally import exceptions
+from rally.task import status_poller
 
 
 LOG = logging.getLogger(__name__)
 
+CONF = cfg.CONF
+
 
 def get_status(resource, status_attr="status"):
     """Get the status of a given resource object.
@@ -67,17 +71,9 @@ class resource_is(object):
 
 def get_from_manager(error_statuses=None):
     error_statuses = error_statuses or ["ERROR"]
-    error_statuses = map(lambda str: str.upper(), error_statuses)
-
-    def _get_from_manager(resource, id_attr="id"):
-        # catch client side errors
-        try:
-            res = resource.manager.get(getattr(resource, id_attr))
-        except Exception as e:
-            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
-                raise exceptions.GetResourceNotFound(resource=resource)
-            raise exceptions.GetResourceFailure(resource=resource, err=e)
+    error_statuses = [s.upper() for s in error_statuses]
 
+    def _check_resource(res):
         # catch abnormal status, such as "no valid host" for servers
         status = get_status(res)
 
@@ -90,6 +86,62 @@ def get_from_manager(error_statuses=None):
 
         return res
 
+    def _get_from_manager(resource, id_attr="id"):
+        # catch client side errors
+        try:
+            res = resource.manager.get(getattr(resource, id_attr))
+        except Exception as e:
+            if getattr(e, "code", getattr(e, "http_status", 400)) == 404:
+                raise exceptions.GetResourceNotFound(resource=resource)
+            raise exceptions.GetResourceFailure(resource=resource, err=e)
+
+        return _check_resource(res)
+
+    def _list_from_manager(resources, id_attr="id"):
+        """Update resources of one manager with a single list call.
+
+        The list can be limited by the service (e.g. to one page of
+        osapi_max_limit servers), so resources which are not in the list
+        are updated with GET calls instead of being treated as deleted.
+
+        :returns: list with an updated resource or an exception for each of
+            the given resources
+        """
+        try:
+            listed = dict((getattr(res, id_attr), res)
+                          for res in resources[0].manager.list())
+        except Exception as e:
+            return [exceptions.GetResourceFailure(resource=resource, err=e)
+                    for resource in resources]
+
+        results = []
+        for resource in resources:
+            try:
+                res = listed.get(getattr(resource, id_attr))
+                if res is None:
+                    results.append(_get_from_manager(resource, id_attr))
+                else:
+                    results.append(_check_resource(res))
+            except exceptions.RallyException as e:
+                results.append(e)
+        return results
+
+    def _batch_key(resource):
+        manager = resource.manager
+        # NOTE: any user of a project lists all resources of the project,
+        #   so resources of one service and project are checked together.
+        #   Clients which do not tell the project are grouped by their
+        #   keystone session, which is shared by clients of equal
+        #   credentials.
+        try:
+            project_id = manager.api.client.get_project_id()
+        except Exception:
+            client = getattr(getattr(manager, "api", None), "client", None)
+            project_id = id(getattr(client, "session", manager))
+        return type(manager), project_id
+
+    _get_from_manager.list_resources = _list_from_manager
+    _get_from_manager.batch_key = _batch_key
     return _get_from_manager
 
 
@@ -203,6 +255,16 @@ def wait_for_status(resource, ready_statuses, failure_statuses=None,
             "Can't wait for resource's %s status. No update method."
             % resource_repr)
 
+    if (CONF.batched_status_polling
+            and hasattr(update_resource, "list_resources")):
+        return status_poller.get_poller().wait(
+            resource, ready_statuses=ready_statuses,
+            failure_statuses=failure_statuses,
+            update_resource=update_resource,
+            status_getter=lambda r: get_status(r, status_attr),
+            timeout=timeout, check_interval=check_interval,
+            check_deletion=check_deletion, id_attr=id_attr)
+
     start = time.time()
 
     latest_status = get_status(resource, status_attr)
@@ -0,0 +1,69 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Wall time of the broker when both publishing and consuming are slow.
+
+The publisher sleeps before putting every item to the queue (e.g. listing
+of resources page by page) and consumers sleep while processing items.
+broker.run() publishes everything before consuming, run_pipelined() does
+both simultaneously.
+
+    $ python -m tests.benchmarks.broker --items 200 --consumers 20
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from rally.common import broker
+from tests.benchmarks import utils
+
+
+def _measure(run, items, consumers, latency):
+
+    def publish(queue):
+        for i in range(items):
+            time.sleep(latency / consumers)
+            queue.append(i)
+
+    def consume(cache, item):
+        time.sleep(latency)
+
+    started_at = time.time()
+    run(publish, consume, consumers)
+    return time.time() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--consumers", type=int, default=20)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    for title, run in (("run", broker.run),
+                       ("run_pipelined", broker.run_pipelined)):
+        utils.print_stats(
+            "%s, %d items, %d consumers:" % (title, args.items,
+                                             args.consumers),
+            [_measure(run, args.items, args.consumers, args.latency)
+             for i in range(args.repeat)],
+            "s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Wall time of cleanup of several resource managers.
+
+Fake resource managers sleep instead of listing and deleting resources.
+Resources are cleaned up by SeekAndDestroy of one manager at a time (as
+before) and by CleanupScheduler.
+
+    $ python -m tests.benchmarks.cleanup_scheduler --tenants 10 --managers 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from rally import plugins
+from tests.benchmarks import utils
+
+
+class _Credential(object):
+    def clients(self, api_info=None):
+        return None
+
+
+def _make_manager_cls(order, resources, latency):
+    # NOTE: cleanup modules need options, which are registered by
+    #   plugins.load()
+    from rally.plugins.openstack.cleanup import base
+
+    @base.resource("fake%d" % order, "resources", order=order, interval=0,
+                   threads=5)
+    class FakeResourceManager(base.ResourceManager):
+
+        def list(self):
+            time.sleep(latency)
+            return ["%s-%d" % (self.tenant_uuid, i) for i in range(resources)]
+
+        def id(self):
+            return self.raw_resource
+
+        def name(self):
+            return base.NoName(self._resource)
+
+        def delete(self):
+            time.sleep(latency)
+
+        def is_deleted(self):
+            return True
+
+    return FakeResourceManager
+
+
+def _destroyers(managers, users):
+    from rally.plugins.openstack.cleanup import manager
+
+    return [manager.SeekAndDestroy(manager_cls, None, users)
+            for manager_cls in managers]
+
+
+def _sequential(managers, users):
+    started_at = time.time()
+    for destroyer in _destroyers(managers, users):
+        destroyer.exterminate()
+    return time.time() - started_at
+
+
+def _scheduled(managers, users):
+    from rally.plugins.openstack.cleanup import manager
+
+    started_at = time.time()
+    scheduler = manager.CleanupScheduler(workers=20)
+    for destroyer in _destroyers(managers, users):
+        scheduler.add(destroyer)
+    scheduler.run()
+    return time.time() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=10)
+    parser.add_argument("--managers", type=int, default=5)
+    parser.add_argument("--resources", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plugins.load()
+    managers = [_make_manager_cls(order, args.resources, args.latency)
+                for order in range(args.managers)]
+    users = [{"id": "user-%d" % t, "tenant_id": "tenant-%d" % t,
+              "credential": _Credential()} for t in range(args.tenants)]
+
+    for title, func in (("one manager at a time", _sequential),
+                        ("cleanup scheduler", _scheduled)):
+        utils.print_stats(
+            "%d managers x %d tenants x %d resources (%s):"
+            % (args.managers, args.tenants, args.resources, title),
+            [func(managers, users) for i in range(args.repeat)], "s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Wall time of short CLI commands with lazy and full loading of plugins.
+
+Every command is executed in a new process with a temporary database and
+plugins manifest, first with lazy_plugins_loading enabled (the manifest is
+generated beforehand) and then with it disabled.
+
+    $ python -m tests.benchmarks.cli_startup --repeat 5
+"""
+
+from __future__ import print_function
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from tests.benchmarks import utils
+
+
+COMMANDS = [["task", "list"],
+            ["plugin", "show", "Dummy.dummy"]]
+
+
+def _write_config(tmp_dir, lazy):
+    path = os.path.join(tmp_dir, "rally-%s.conf" % ("lazy" if lazy else
+                                                    "full"))
+    with open(path, "w") as f:
+        f.write("[DEFAULT]\n"
+                "lazy_plugins_loading = %s\n"
+                "plugins_manifest_path = %s\n"
+                "[database]\n"
+                "connection = sqlite:///%s\n"
+                % (lazy, os.path.join(tmp_dir, "manifest.json"),
+                   os.path.join(tmp_dir, "rally.sqlite")))
+    return path
+
+
+def _rally(config, args):
+    cmd = [sys.executable, "-m", "rally.cli.main", "--config-file", config]
+    with open(os.devnull, "w") as devnull:
+        started_at = time.time()
+        # NOTE: exit code is ignored, e.g. "task list" fails without
+        #   deployments, but it still goes through the whole startup.
+        subprocess.call(cmd + args, stdout=devnull, stderr=devnull)
+        return time.time() - started_at
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        configs = [("lazy", _write_config(tmp_dir, True)),
+                   ("full", _write_config(tmp_dir, False))]
+        _rally(configs[0][1], ["db", "create"])
+        # generate the manifest
+        _rally(configs[0][1], ["plugin", "show", "Dummy.dummy"])
+
+        for command in COMMANDS:
+            for title, config in configs:
+                utils.print_stats(
+                    "rally %s (%s loading):" % (" ".join(command), title),
+                    [_rally(config, command) for i in range(args.repeat)],
+                    "s")
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time of pushing atomic action documents to ElasticSearch.
+
+Documents are pushed to a local stub of the bulk API, which simulates the
+network with the given latency and bandwidth, first by serial uncompressed
+requests and then by concurrent gzip-compressed ones.
+
+    $ python -m tests.benchmarks.elastic_export --documents 100000
+"""
+
+from __future__ import print_function
+
+import argparse
+import gzip
+import io
+import json
+import threading
+import time
+
+import six
+
+from rally.common import opts
+from rally.plugins.common.exporters.elastic import client
+from rally.plugins.common.exporters.elastic import exporter
+from tests.benchmarks import utils
+
+
+class _Handler(six.moves.BaseHTTPServer.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, data):
+        body = json.dumps(data).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        self._reply({"version": {"number": "5.6.1"}})
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        time.sleep(self.server.latency + len(body) / self.server.bandwidth)
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+        count = body.count(b"\n") // 2
+        with self.server.lock:
+            self.server.received += count
+        self._reply({"errors": False,
+                     "items": [{"index": {"status": 201}}] * count})
+
+
+class _Server(six.moves.socketserver.ThreadingMixIn,
+              six.moves.BaseHTTPServer.HTTPServer):
+    daemon_threads = True
+    lock = threading.Lock()
+
+
+def _documents(count):
+    body = {"deployment_uuid": "deployment-uuid",
+            "deployment_name": "deployment",
+            "action_name": "nova.boot_server",
+            "workload_uuid": "workload-uuid",
+            "scenario_cfg": ["flavor.name=m1.tiny", "image.name=cirros"],
+            "contexts": ["users@openstack.tenants=2"],
+            "runner_name": "constant",
+            "runner_cfg": ["concurrency=10", "times=1000", "type=constant"],
+            "success": True,
+            "duration": 5.123456,
+            "started_at": "2018-01-01T00:00:00",
+            "finished_at": "2018-01-01T00:00:05",
+            "parent": None,
+            "error": None}
+    es_exporter = exporter.ElasticSearchExporter([], "/dev/null")
+    for i in six.moves.range(count):
+        for line in es_exporter._make_index(
+                es_exporter.AA_INDEX, body,
+                doc_id="workload-uuid_iter_%s_action_nova.boot_server_0" % i):
+            yield line
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--documents", type=int, default=100000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05,
+                        help="seconds per request")
+    parser.add_argument("--bandwidth", type=float, default=10,
+                        help="MB/s per request")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    opts.register()
+    server = _Server(("127.0.0.1", 0), _Handler)
+    server.latency = args.latency
+    server.bandwidth = args.bandwidth * 1024 * 1024
+    thread = threading.Thread(target=server.serve_forever)
+    thread.daemon = True
+    thread.start()
+    url = "http://127.0.0.1:%s" % server.server_address[1]
+
+    for title, concurrency, compression in (
+            ("serial, plain", 1, False),
+            ("%d requests, gzip" % args.concurrency, args.concurrency, True)):
+        durations = []
+        for i in range(args.repeat):
+            server.received = 0
+            es = client.ElasticSearchClient(url, concurrency=concurrency,
+                                            compression=compression)
+            started_at = time.time()
+            es.push_documents(_documents(args.documents))
+            durations.append(time.time() - started_at)
+            assert server.received == args.documents
+        utils.print_stats("push of %d documents (%s):"
+                          % (args.documents, title), durations, "s")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time of task syntax validation with and without the plugin registry.
+
+Loads all plugins, builds a task with a lot of workloads and validates its
+syntax. The same validation is repeated with Plugin.get_all replaced by the
+lookup which walks the whole tree of subclasses on each call.
+
+    $ python -m tests.benchmarks.plugin_lookup --workloads 500
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import time
+
+import mock
+
+from rally.common.plugin import discover
+from rally.common.plugin import plugin
+from rally import plugins
+from rally.task import engine
+from tests.benchmarks import utils
+
+
+def _walk_get_all(cls, platform=None, allow_hidden=False, name=None):
+    plugins = []
+    for p in discover.itersubclasses(cls):
+        if not issubclass(p, plugin.Plugin):
+            continue
+        if not p._meta_is_inited(raise_exc=False):
+            continue
+        if name and name != p.get_name():
+            continue
+        if platform and platform != p.get_platform():
+            continue
+        if not allow_hidden and p.is_hidden():
+            continue
+        plugins.append(p)
+    return plugins
+
+
+def _make_task(workloads):
+    workload = {
+        "scenario": {"Dummy.dummy": {"sleep": 0}},
+        "runner": {"constant": {"times": 10, "concurrency": 2}},
+        "contexts": {"dummy_context": {"fail_setup": False}},
+        "sla": {"failure_rate": {"max": 0},
+                "max_avg_duration": 1.0,
+                "max_seconds_per_iteration": 1.0},
+        "hooks": [{"action": {"sys_call": "true"},
+                   "trigger": {"event": {"unit": "iteration",
+                                         "at": [1]}}}]
+    }
+    return engine.TaskConfig({
+        "version": 2,
+        "title": "Plugin lookup benchmark",
+        "subtasks": [{"title": "subtask",
+                      "workloads": [copy.deepcopy(workload)
+                                    for i in range(workloads)]}]
+    })
+
+
+def _measure(config, repeat):
+    eng = engine.TaskEngine(config, mock.MagicMock(), mock.MagicMock())
+    durations = []
+    for i in range(repeat):
+        started_at = time.time()
+        eng._validate_config_syntax(config)
+        durations.append(time.time() - started_at)
+    return durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workloads", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plugins.load()
+    print("%d plugins are loaded"
+          % len(plugin.Plugin.get_all(allow_hidden=True)))
+    config = _make_task(args.workloads)
+
+    utils.print_stats("Syntax validation of %d workloads (registry):"
+                      % args.workloads,
+                      _measure(config, args.repeat), "s")
+    with mock.patch.object(plugin.Plugin, "get_all",
+                           classmethod(_walk_get_all)):
+        utils.print_stats("Syntax validation of %d workloads (tree walk):"
+                          % args.workloads,
+                          _measure(config, args.repeat), "s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time of processing of a workload with a lot of iterations for the report.
+
+Builds a workload with nested atomic actions and measures how long it takes
+to fill all charts of the HTML report with its iterations.
+
+    $ python -m tests.benchmarks.report_charts --iterations 20000
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import time
+
+from rally import plugins
+from rally.task.processing import plot
+from tests.benchmarks import utils
+
+
+def _make_workload(iterations, atomics):
+    started_at = 1500000000.0
+    names = ["action_%d" % i for i in range(atomics)]
+    data = []
+    for i in range(iterations):
+        timestamp = started_at + i * 0.5
+        actions = []
+        for name in names:
+            duration = random.uniform(0.1, 2.0)
+            actions.append({
+                "name": name, "started_at": timestamp,
+                "finished_at": timestamp + duration,
+                "children": [{"name": "child", "started_at": timestamp,
+                              "finished_at": timestamp + duration / 2,
+                              "children": []}] * 2})
+        data.append({
+            "timestamp": timestamp,
+            "duration": atomics * 2.0,
+            "idle_duration": 0.0,
+            "error": ["KeyError", "msg", "Traceback"] if i % 10 == 0 else [],
+            "output": {"additive": [], "complete": []},
+            "atomic_actions": actions})
+    return {
+        "uuid": "workload", "task_uuid": "task", "subtask_uuid": "subtask",
+        "name": "Dummy.dummy", "description": "", "args": {},
+        "contexts": {}, "runner_type": "constant", "position": 0,
+        "runner": {"times": iterations}, "hooks": [], "sla": {},
+        "sla_results": {"sla": []}, "pass_sla": True,
+        "total_iteration_count": iterations,
+        "failed_iteration_count": iterations // 10,
+        "min_duration": 0.0, "max_duration": atomics * 2.0,
+        "start_time": started_at,
+        "load_duration": iterations * 0.5, "full_duration": iterations,
+        "created_at": "2018-01-01T00:00:00",
+        "statistics": {"durations": {
+            "atomics": [{"display_name": name,
+                         "data": {"min": 0.1, "max": 2.0}}
+                        for name in names],
+            "total": {"display_name": "total", "data": {}}}},
+        "data": data}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--atomics", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plugins.load()
+    random.seed(0)
+    workload = _make_workload(args.iterations, args.atomics)
+
+    durations = []
+    for i in range(args.repeat):
+        started_at = time.time()
+        plot._process_workload(workload, {}, 0)
+        durations.append(time.time() - started_at)
+    utils.print_stats("charts of %d iterations with %d atomic actions:"
+                      % (args.iterations, args.atomics), durations, "s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time of HTML report and trends generation with a different workers count.
+
+Builds fake tasks with a lot of iterations and generates the report and
+trends of them serially and with the pool of worker processes. Outputs of
+all runs are checked to be identical.
+
+    $ python -m tests.benchmarks.report_workers --tasks 20 --workers 4
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import time
+
+from rally import plugins
+from rally.task.processing import plot
+from tests.benchmarks import utils
+
+
+def _make_workload(idx, iterations):
+    started_at = 1500000000.0
+    data = []
+    for i in range(iterations):
+        timestamp = started_at + i * 0.5
+        data.append({
+            "timestamp": timestamp,
+            "duration": 1.0 + (i % 7) / 10.0,
+            "idle_duration": 0.0,
+            "error": ["KeyError", "msg", "Traceback"] if i % 10 == 0 else [],
+            "output": {"additive": [], "complete": []},
+            "atomic_actions": [{"name": "action_%d" % (i % 2),
+                                "started_at": timestamp,
+                                "finished_at": timestamp + 0.9,
+                                "children": []}]})
+    total = {"min": 1.0, "median": 1.3, "90%ile": 1.5, "95%ile": 1.6,
+             "max": 1.6, "avg": 1.3, "success": "90.0%"}
+    return {
+        "name": "Dummy.dummy", "description": "", "args": {"sleep": idx % 5},
+        "contexts": {}, "runner_type": "constant",
+        "runner": {"times": iterations}, "hooks": [], "sla": {},
+        "sla_results": {"sla": []}, "pass_sla": True,
+        "total_iteration_count": iterations,
+        "failed_iteration_count": iterations // 10,
+        "min_duration": 1.0, "max_duration": 1.6,
+        "start_time": started_at + idx,
+        "load_duration": iterations * 0.5 + 2, "full_duration": iterations,
+        "created_at": "2018-01-01T00:00:00",
+        "statistics": {"durations": {
+            "atomics": [],
+            "total": {"display_name": "total", "data": total}}},
+        "data": data}
+
+
+def _make_tasks(tasks, workloads, iterations):
+    return [{"uuid": "task-%d" % t, "title": "Task %d" % t, "description": "",
+             "subtasks": [{"title": "subtask", "description": "",
+                           "workloads": [_make_workload(t * workloads + w,
+                                                        iterations)
+                                         for w in range(workloads)]}]}
+            for t in range(tasks)]
+
+
+def _measure(func, tasks, workers):
+    # plot() modifies structure of given tasks
+    tasks = copy.deepcopy(tasks)
+    started_at = time.time()
+    output = func(tasks, workers=workers)
+    return time.time() - started_at, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--workloads", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plugins.load()
+    tasks = _make_tasks(args.tasks, args.workloads, args.iterations)
+
+    for title, func in (("report", plot.plot), ("trends", plot.trends)):
+        outputs = set()
+        for workers in (1, args.workers):
+            durations = []
+            for i in range(args.repeat):
+                duration, output = _measure(func, tasks, workers)
+                durations.append(duration)
+                outputs.add(output)
+            utils.print_stats("%s of %d workloads (%d workers):"
+                              % (title, args.tasks * args.workloads,
+                                 workers),
+                              durations, "s")
+        print("%s outputs are identical: %s" % (title, len(outputs) == 1))
+
+
+if __name__ == "__main__":
+    main()
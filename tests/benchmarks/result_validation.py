@@ -0,0 +1,109 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Throughput of iteration results through ScenarioRunner._send_result.
+
+Results with nested atomic actions and output charts are sent to the runner
+of a real Task object. The schema is checked by the main process as it was
+checked before (deep copy of atomic actions and no cache of output checks),
+as it is checked now, and it is not checked at all, like when results are
+validated by worker processes.
+
+    $ python -m tests.benchmarks.result_validation --results 20000
+"""
+
+from __future__ import print_function
+
+import argparse
+import copy
+import time
+
+import mock
+
+from rally.common import objects
+from rally.plugins.common.runners import serial
+from rally.task.processing import charts
+from tests.benchmarks import utils
+
+
+def _make_result(i):
+    timestamp = 1500000000.0 + i
+
+    def atomic(name, depth):
+        return {"name": name, "started_at": timestamp,
+                "finished_at": timestamp + 1.0,
+                "children": [atomic("%s.%d" % (name, c), depth - 1)
+                             for c in range(2)] if depth else []}
+
+    return {"duration": 1.0, "timestamp": timestamp, "idle_duration": 0.0,
+            "error": [],
+            "output": {
+                "additive": [{"title": "Additive %d" % c,
+                              "chart_plugin": "StackedArea",
+                              "data": [["a", i], ["b", i * 2]]}
+                             for c in range(3)],
+                "complete": [{"title": "Complete", "description": "",
+                              "chart_plugin": "Lines",
+                              "data": [["a", [[1, 2], [2, 3]]]]}]},
+            "atomic_actions": [atomic("action_%d" % a, 3)
+                               for a in range(3)]}
+
+
+def _measure(results, mode):
+    task = objects.Task(temporary=True)
+    runner = serial.SerialScenarioRunner(task, {"times": len(results)},
+                                         batch_size=len(results) + 1)
+    send_result = runner._send_result
+    validate_output = charts.validate_output
+    if mode == "deepcopy":
+        # the former way: atomic actions are deep-copied and every output
+        # item is checked from scratch
+        has_valid_schema = task.result_has_valid_schema
+        task.result_has_valid_schema = lambda r: (
+            copy.deepcopy(r["atomic_actions"]) is not None
+            and has_valid_schema(r))
+        validate_output = charts._validate_output
+    elif mode == "workers":
+        send_result = runner._store_result
+    charts._CHECKED_OUTPUTS.clear()
+
+    with mock.patch.object(charts, "validate_output", validate_output):
+        started_at = time.time()
+        for result in results:
+            send_result(result)
+        duration = time.time() - started_at
+    assert len(runner.result_batch) == len(results)
+    return len(results) / duration
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--results", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = [_make_result(i) for i in range(args.results)]
+
+    for title, mode in (("deep copy, no cache", "deepcopy"),
+                        ("validated by the main process", "main"),
+                        ("validated by workers", "workers")):
+        utils.print_stats(
+            "%d results (%s):" % (args.results, title),
+            [_measure(results, mode) for i in range(args.repeat)],
+            " results/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""End-to-end latency of iteration results.
+
+Runs Dummy.dummy via the rps runner and measures how long it takes for a
+result to reach a ResultConsumer-like reader in the parent process after
+the iteration has finished in a worker process.
+
+    $ python -m tests.benchmarks.results_latency --rps 10000 --times 50000
+"""
+
+from __future__ import print_function
+
+import argparse
+import threading
+import time
+
+import mock
+
+from rally.plugins.common.runners import rps
+from rally.plugins.common.scenarios.dummy import dummy
+from tests.benchmarks import utils
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rps", type=float, default=10000)
+    parser.add_argument("--times", type=int, default=50000)
+    parser.add_argument("--max-concurrency", type=int, default=100)
+    parser.add_argument("--max-cpu-count", type=int)
+    args = parser.parse_args()
+
+    config = {"type": "rps", "rps": args.rps, "times": args.times,
+              "max_concurrency": args.max_concurrency}
+    if args.max_cpu_count:
+        config["max_cpu_count"] = args.max_cpu_count
+    task = mock.MagicMock()
+    task.result_has_valid_schema.return_value = True
+    runner = rps.RPSScenarioRunner(task, config)
+
+    latencies = []
+    done = threading.Event()
+
+    def consume():
+        while True:
+            if runner.result_queue:
+                received_at = time.time()
+                for r in runner.result_queue.popleft():
+                    latencies.append(
+                        received_at - r["timestamp"] - r["duration"] -
+                        r["idle_duration"])
+            elif done.is_set():
+                break
+            else:
+                runner.result_queue.wait(done)
+
+    consumer = threading.Thread(target=consume)
+    consumer.start()
+    started_at = time.time()
+    runner._run_scenario(dummy.Dummy, "run", {"task": {"uuid": "bench"}},
+                         {"sleep": 0})
+    duration = time.time() - started_at
+    done.set()
+    runner.result_queue.notify_all()
+    consumer.join()
+
+    print("%d iterations in %.2fs (%.1f iterations/s)"
+          % (len(latencies), duration, len(latencies) / duration))
+    utils.print_stats("Result latency:", latencies, "s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Iterations per second of the dummy scenario with a large users context.
+
+The serial runner runs Dummy.dummy with a context which looks like one
+created by users and network contexts, first with the locked context shared
+between iterations and then with a deep copy of the context per iteration.
+
+    $ python -m tests.benchmarks.scenario_context --tenants 1000 --users 10
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+import mock
+
+from rally.plugins.common.runners import serial
+from rally import plugins
+from rally.task import scenario
+from tests.benchmarks import utils
+
+
+def _make_context(tenants, users_per_tenant):
+    users = []
+    ctx_tenants = {}
+    for t in range(tenants):
+        tenant_id = "tenant-%d" % t
+        tenant_users = []
+        for u in range(users_per_tenant):
+            user = {"id": "user-%d-%d" % (t, u),
+                    "credential": {"username": "user-%d-%d" % (t, u),
+                                   "password": "secret",
+                                   "auth_url": "http://example.com:5000/v3",
+                                   "tenant_name": tenant_id},
+                    "tenant_id": tenant_id}
+            tenant_users.append(user)
+            users.append(user)
+        ctx_tenants[tenant_id] = {
+            "id": tenant_id, "name": tenant_id, "users": tenant_users,
+            "networks": [{"id": "net-%d" % t, "router_id": "router-%d" % t,
+                          "subnets": ["subnet-%d" % t]}],
+            "servers": ["server-%d-%d" % (t, s) for s in range(5)],
+            "images": ["image-%d" % t]}
+    return {"task": {"uuid": "task-uuid"},
+            "owner_id": "owner-id",
+            "scenario_name": "Dummy.dummy",
+            "config": {"users": {"tenants": tenants,
+                                 "users_per_tenant": users_per_tenant}},
+            "admin": {"credential": {"username": "admin"}},
+            "users": users,
+            "tenants": ctx_tenants,
+            "user_choice_method": "random"}
+
+
+def _measure(context, times, locked):
+    runner = serial.SerialScenarioRunner(mock.MagicMock(), {"times": times})
+    started_at = time.time()
+    if locked:
+        runner.run("Dummy.dummy", context, {"sleep": 0})
+    else:
+        runner._run_scenario(scenario.Scenario.get("Dummy.dummy"), "run",
+                             context, {"sleep": 0})
+    return times / (time.time() - started_at)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--times", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plugins.load()
+    context = _make_context(args.tenants, args.users)
+
+    for title, locked in (("locked context", True),
+                          ("deep copy per iteration", False)):
+        utils.print_stats(
+            "Dummy.dummy, %d tenants x %d users (%s):"
+            % (args.tenants, args.users, title),
+            [_measure(context, args.times, locked)
+             for i in range(args.repeat)],
+            " it/s")
+
+
+if __name__ == "__main__":
+    main()
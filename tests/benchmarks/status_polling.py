@@ -0,0 +1,111 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""API calls made while concurrent iterations wait for statuses of resources.
+
+Every thread waits for its own fake server, which becomes ACTIVE after a
+random time, first with a GET call per resource and then with the shared
+batched status poller.
+
+    $ python -m tests.benchmarks.status_polling --concurrency 100
+"""
+
+from __future__ import print_function
+
+import argparse
+import random
+import threading
+import time
+
+from rally.common import cfg
+from rally import plugins
+from rally.task import status_poller
+from rally.task import utils
+from tests.benchmarks import utils as bench_utils
+
+
+class _Server(object):
+    def __init__(self, manager, boot_time):
+        self.manager = manager
+        self.id = "server-%d" % id(self)
+        self.ready_at = time.time() + boot_time
+
+    @property
+    def status(self):
+        return "ACTIVE" if time.time() >= self.ready_at else "BUILD"
+
+
+class _Manager(object):
+    """Servers manager which counts API calls."""
+
+    def __init__(self):
+        self.servers = {}
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self):
+        with self._lock:
+            self.calls += 1
+
+    def get(self, server_id):
+        self._call()
+        return self.servers[server_id]
+
+    def list(self):
+        self._call()
+        return list(self.servers.values())
+
+
+def _measure(concurrency, max_boot_time, check_interval):
+    manager = _Manager()
+    for i in range(concurrency):
+        server = _Server(manager, random.uniform(0, max_boot_time))
+        manager.servers[server.id] = server
+
+    threads = [threading.Thread(target=utils.wait_for_status,
+                                args=(server, ["ACTIVE"]),
+                                kwargs={"update_resource":
+                                        utils.get_from_manager(),
+                                        "check_interval": check_interval})
+               for server in manager.servers.values()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return manager.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--boot-time", type=float, default=3)
+    parser.add_argument("--check-interval", type=float, default=0.1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    plugins.load()
+    for title, batched in (("GET per resource", False),
+                           ("batched status poller", True)):
+        cfg.CONF.set_override("batched_status_polling", batched)
+        bench_utils.print_stats(
+            "%d servers, %s:" % (args.concurrency, title),
+            [_measure(args.concurrency, args.boot_time, args.check_interval)
+             for i in range(args.repeat)],
+            " calls")
+    print("status poller stats: %s" % status_poller.get_poller().stats())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time of parsing of a large subunit v2 stream of verifier results.
+
+Generates a stream like the one of a tempest run: all tests are listed
+first, then every test is started and finished. Some tests fail with a
+traceback and some test classes are skipped as a whole by setUpClass, so
+their tests are resolved by the class-level event. Measures the parsing of
+the stream and getting of totals and tests by statuses.
+
+    $ python -m tests.benchmarks.subunit_parser --tests 20000
+"""
+
+from __future__ import print_function
+
+import argparse
+import datetime
+import io
+import time
+
+from subunit import iso8601
+from subunit import v2
+
+from rally.common.io import subunit_v2
+from tests.benchmarks import utils
+
+
+def _make_stream(tests, class_size, skipped_every):
+    stream = io.BytesIO()
+    output = v2.StreamResultToBytes(stream)
+    timestamp = datetime.datetime(2018, 1, 1, tzinfo=iso8601.Utc())
+    step = datetime.timedelta(milliseconds=10)
+    classes = []
+    for c in range(tests // class_size):
+        class_id = "tempest.api.module_%d.test_foo.FooTestJSON%d" % (c % 50,
+                                                                     c)
+        test_ids = ["%s.test_%d[id-%d,smoke]" % (class_id, t, c * 1000 + t)
+                    for t in range(class_size)]
+        classes.append((class_id, test_ids))
+        for test_id in test_ids:
+            output.status(test_id=test_id, test_status="exists")
+
+    for c, (class_id, test_ids) in enumerate(classes):
+        if c % skipped_every == 0:
+            output.status(test_id="setUpClass (%s)" % class_id,
+                          test_status="skip", timestamp=timestamp,
+                          file_name="reason", file_bytes=b"Not supported.",
+                          mime_type="text/plain; charset=utf8", eof=True)
+            continue
+        for t, test_id in enumerate(test_ids):
+            output.status(test_id=test_id, test_status="inprogress",
+                          timestamp=timestamp)
+            timestamp += step
+            status = "success"
+            if t % 7 == 0:
+                status = "fail"
+                output.status(test_id=test_id, timestamp=timestamp,
+                              file_name="traceback",
+                              file_bytes=b"Traceback (most recent call "
+                                         b"last):\n  ...\nAssertionError\n",
+                              mime_type="text/x-traceback; charset=utf8",
+                              eof=True)
+            output.status(test_id=test_id, test_status=status,
+                          timestamp=timestamp)
+    return stream.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=20000)
+    parser.add_argument("--class-size", type=int, default=10)
+    parser.add_argument("--skipped-every", type=int, default=20,
+                        help="Every N-th test class is skipped as a whole.")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    data = _make_stream(args.tests, args.class_size, args.skipped_every)
+    print("%d tests, stream of %.1f MiB"
+          % (args.tests, len(data) / 1024.0 / 1024.0))
+
+    parsing, reporting = [], []
+    for i in range(args.repeat):
+        started_at = time.time()
+        results = subunit_v2.parse(io.BytesIO(data))
+        parsing.append(time.time() - started_at)
+
+        started_at = time.time()
+        totals = results.totals
+        for status in ("success", "fail", "skip"):
+            results.filter_tests(status)
+        reporting.append(time.time() - started_at)
+    print("totals: %s" % sorted(totals.items()))
+    utils.print_stats("parsing of the stream:", parsing, "s")
+    utils.print_stats("totals and tests by statuses:", reporting, "s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time and peak memory of `rally task import` of a large results file.
+
+Writes a JSON report of a task with a lot of iterations and imports it into
+a temporary sqlite database, with iterations loaded into memory at once and
+with iterations streamed from the file. Each import runs in a separate
+process, so the peak RSS of the process is the peak of the import.
+
+    $ python -m tests.benchmarks.task_import --iterations 200000
+"""
+
+from __future__ import print_function
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import tempfile
+import time
+
+
+def _make_report(path, workloads, iterations):
+    started_at = 1500000000.0
+    with open(path, "w") as f:
+        f.write('{"info": {"format_version": "1.1"}, "tasks": [{'
+                '"uuid": "task", "title": "", "description": "", '
+                '"status": "finished", "tags": [], "pass_sla": true, '
+                '"created_at": "2018-01-01T00:00:00", '
+                '"updated_at": "2018-01-01T00:00:00", "subtasks": [{'
+                '"uuid": "subtask", "title": "subtask", "description": "", '
+                '"status": "finished", "sla": {}, '
+                '"created_at": "2018-01-01T00:00:00", '
+                '"updated_at": "2018-01-01T00:00:00", "workloads": [')
+        for w in range(workloads):
+            f.write(", " if w else "")
+            f.write('{"uuid": "w%d", "description": "", "runner": '
+                    '{"constant": {"times": %d}}, "hooks": [], '
+                    '"scenario": {"Dummy.dummy": {}}, "min_duration": 1.0, '
+                    '"max_duration": 2.0, "start_time": %s, '
+                    '"load_duration": 1.0, "full_duration": 2.0, '
+                    '"statistics": {}, "data": ['
+                    % (w, iterations, started_at))
+            for i in range(iterations):
+                timestamp = started_at + i * 0.1
+                f.write(", " if i else "")
+                json.dump({"timestamp": timestamp, "duration": 1.5,
+                           "idle_duration": 0.0,
+                           "error": [] if i % 10 else ["E", "msg", "trace"],
+                           "output": {"additive": [], "complete": []},
+                           "atomic_actions": [
+                               {"name": "action_%d" % a,
+                                "started_at": timestamp,
+                                "finished_at": timestamp + 0.5,
+                                "children": []} for a in range(3)]}, f)
+            f.write('], "failed_iteration_count": %d, '
+                    '"total_iteration_count": %d, '
+                    '"created_at": "2018-01-01T00:00:00", '
+                    '"updated_at": "2018-01-01T00:00:00", "contexts": {}, '
+                    '"contexts_results": [], "position": %d, '
+                    '"pass_sla": true, "sla_results": {"sla": []}, '
+                    '"sla": {}}' % (iterations // 10, iterations, w))
+        f.write("]}]}]}")
+
+
+def _import(tmp_dir, report, lazy_data, queue):
+    from rally.cli.commands import task
+    from rally.common import cfg
+    from rally.common import db
+    from rally import api
+
+    rapi = api.API(skip_db_check=True)
+    cfg.CONF.set_override(
+        "connection",
+        "sqlite:///%s" % os.path.join(tmp_dir, "rally%s.sqlite" % lazy_data),
+        "database")
+    db.schema.schema_create()
+    env = db.env_create("bench", "READY", "", {}, {}, {}, [])
+
+    started_at = time.time()
+    commands = task.TaskCommands()
+    for task_results in commands._load_task_results_file(
+            rapi, report, lazy_data=lazy_data):
+        rapi.task.import_results(deployment=env["uuid"],
+                                 task_results=task_results)
+    queue.put((time.time() - started_at,
+               resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--workloads", type=int, default=2)
+    parser.add_argument("--iterations", type=int, default=200000)
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    try:
+        report = os.path.join(tmp_dir, "report.json")
+        _make_report(report, args.workloads, args.iterations)
+        print("%d workloads x %d iterations, report of %.1f MiB"
+              % (args.workloads, args.iterations,
+                 os.path.getsize(report) / 1024.0 / 1024.0))
+        for title, lazy_data in (("loaded at once", False),
+                                 ("streamed", True)):
+            queue = multiprocessing.Queue()
+            process = multiprocessing.Process(
+                target=_import, args=(tmp_dir, report, lazy_data, queue))
+            process.start()
+            process.join()
+            if process.exitcode:
+                raise RuntimeError("Import (%s) has failed." % title)
+            duration, max_rss = queue.get()
+            print("import (%s): %.2fs, peak RSS %.1f MiB"
+                  % (title, duration, max_rss))
+    finally:
+        shutil.rmtree(tmp_dir)
+
+
+if __name__ == "__main__":
+    main()
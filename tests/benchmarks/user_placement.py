@@ -0,0 +1,79 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Time of choosing users for OpenStack scenario iterations.
+
+Users are chosen with the round_robin method for a lot of iterations, first
+with the strategy created once (as the users context does) and then with a
+new strategy per iteration, which sorts tenants every time.
+
+    $ python -m tests.benchmarks.user_placement --tenants 1000 --users 10
+"""
+
+from __future__ import print_function
+
+import argparse
+import time
+
+from rally import plugins
+from rally.plugins.openstack import scenario
+from rally.plugins.openstack import user_placement
+from tests.benchmarks import utils
+
+
+def _make_context(tenants, users_per_tenant):
+    context = {"users": [], "tenants": {},
+               "user_choice_method": "round_robin"}
+    for t in range(tenants):
+        tenant_id = "tenant-%d" % t
+        users = [{"id": "user-%d-%d" % (t, u), "tenant_id": tenant_id}
+                 for u in range(users_per_tenant)]
+        context["users"] += users
+        context["tenants"][tenant_id] = {"id": tenant_id, "users": users}
+    return context
+
+
+def _measure(context, iterations):
+    osscenario = scenario.OpenStackScenario()
+    started_at = time.time()
+    for i in range(1, iterations + 1):
+        context["iteration"] = i
+        osscenario._choose_user(context)
+    return (time.time() - started_at) / iterations * 10 ** 6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tenants", type=int, default=1000)
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--iterations", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    plugins.load()
+    context = _make_context(args.tenants, args.users)
+    shared = dict(context, user_placement=user_placement.create(context))
+
+    for title, ctx in (("created once", shared),
+                       ("created per iteration", context)):
+        utils.print_stats(
+            "round_robin, %d tenants x %d users (%s):"
+            % (args.tenants, args.users, title),
+            [_measure(ctx, args.iterations) for i in range(args.repeat)],
+            " us/iteration")
+
+
+if __name__ == "__main__":
+    main()
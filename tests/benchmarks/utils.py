@@ -0,0 +1,41 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Helpers shared by Rally benchmarks."""
+
+from __future__ import print_function
+
+
+def percentile(values, percent):
+    """Return the nearest-rank percentile of already sorted values."""
+    if not values:
+        return None
+    k = int(round(percent * (len(values) - 1)))
+    return values[k]
+
+
+def print_stats(title, values, units=""):
+    """Print min/median/p90/p99/max of given values."""
+    values = sorted(values)
+    print(title)
+    if not values:
+        print("  no data")
+        return
+    for name, value in (("min", values[0]),
+                        ("median", percentile(values, 0.5)),
+                        ("90%ile", percentile(values, 0.9)),
+                        ("99%ile", percentile(values, 0.99)),
+                        ("max", values[-1])):
+        print("  %-7s %.6f%s" % (name, value, units))
@@ -119,10 +119,14 @@ class PluginCommandsTestCase(test.TestCase):
         with utils.StdOutCapture() as out:
             with mock.patch("rally.cli.commands.plugin.plugin.Plugin."
                             "get_all") as mock_plugin_get_all:
-                mock_plugin_get_all.return_value = [self.Plugin2, self.Plugin3]
+                mock_plugin_get_all.side_effect = [
+                    [], [self.Plugin2, self.Plugin3]]
                 plugin_cmd.PluginCommands().show(None, "p", "p2_ns")
                 self.assertEqual("Multiple plugins found:\n", out.getvalue())
-                mock_plugin_get_all.assert_called_once_with(platform="p2_ns")
+                self.assertEqual(
+                    [mock.call(name="p", platform="p2_ns"),
+                     mock.call(platform="p2_ns")],
+                    mock_plugin_get_all.call_args_list)
 
         mock_plugin_commands__print_plugins_list.assert_called_once_with([
             self.Plugin2, self.Plugin3])
@@ -775,6 +775,13 @@ class TaskCommandsTestCase(test.TestCase):
             deployment=mock_get_global.return_value,
             status=consts.TaskStatus.RUNNING)
 
+    def test_list_with_pagination(self):
+        self.fake_api.task.list.return_value = []
+        self.task.list(self.fake_api, deployment="d", limit=10,
+                       marker="task_uuid")
+        self.fake_api.task.list.assert_called_once_with(
+            deployment="d", limit=10, marker="task_uuid")
+
     def test_list_wrong_status(self):
         self.assertEqual(1, self.task.list(self.fake_api, deployment="fake",
                                            status="wrong non existing status"))
@@ -964,6 +971,18 @@ class TaskCommandsTestCase(test.TestCase):
         )
         mock_open.assert_called_once_with("output_file", "w+")
         mock_fd.return_value.write.assert_called_once_with("content")
+        mock_open_new_tab.assert_called_once_with("output_dest")
+
+        # the file is written by the exporter
+        mock_open.reset_mock()
+        mock_open_new_tab.reset_mock()
+        mock_path.exists.side_effect = None
+        mock_path.exists.return_value = False
+        self.fake_api.task.export.return_value = {"open": "output_dest"}
+        self.task.export(self.fake_api, tasks="uuid", output_type="html",
+                         output_dest="output_dest", open_it=True)
+        self.assertFalse(mock_open.called)
+        mock_open_new_tab.assert_called_once_with("output_dest")
 
         # print
         self.fake_api.task.export.reset_mock()
@@ -1194,6 +1213,34 @@ class TaskCommandsTestCase(test.TestCase):
             }]
         }], ret)
 
+    @mock.patch("rally.cli.commands.task.json_stream")
+    @mock.patch("rally.cli.commands.task.jsonschema.validate")
+    def test__load_task_new_results_file_lazy_data(self, mock_validate,
+                                                   mock_json_stream):
+        workload = {"contexts": "contexts",
+                    "scenario": {"Foo.bar": {}},
+                    "runner": {"constant": {"times": 100}},
+                    "data": mock.Mock()}
+        mock_json_stream.load.return_value = {
+            "tasks": [{"subtasks": [{"workloads": [workload]}]}]}
+
+        ret = self.task._load_task_results_file(
+            self.real_api, "~/task.json", lazy_data=True)
+
+        mock_json_stream.load.assert_called_once_with(
+            os.path.expanduser("~/task.json"),
+            ("tasks", mock_json_stream.ANY, "subtasks", mock_json_stream.ANY,
+             "workloads", mock_json_stream.ANY, "data"))
+        mock_json_stream.stub.assert_called_once_with(
+            mock_json_stream.load.return_value["tasks"][0])
+        mock_validate.assert_called_once_with(
+            mock_json_stream.stub.return_value,
+            self.real_api.task.TASK_SCHEMA)
+        self.assertEqual("Foo.bar",
+                         ret[0]["subtasks"][0]["workloads"][0]["name"])
+        self.assertIs(workload["data"],
+                      ret[0]["subtasks"][0]["workloads"][0]["data"])
+
     @mock.patch("rally.cli.commands.task.open", create=True)
     @mock.patch("rally.cli.commands.task.json.loads")
     def test__load_task_results_file_wrong_format(self, mock_loads, mock_open):
@@ -1221,7 +1268,7 @@ class TaskCommandsTestCase(test.TestCase):
                                  "task_file", tags=["tag"])
 
         self.task._load_task_results_file.assert_called_once_with(
-            self.fake_api, "task_file"
+            self.fake_api, "task_file", lazy_data=True
         )
         self.fake_api.task.import_results.assert_called_once_with(
             deployment="deployment_uuid", task_results="results",
@@ -21,6 +21,7 @@ import mock
 from six import moves
 
 from rally.common import db
+from rally.common.db import compact_data
 from rally import consts
 from rally import exceptions
 from tests.unit import test
@@ -147,6 +148,39 @@ class TasksTestCase(test.DBTestCase):
         self.assertEqual(task_init, get_uuids(INIT))
         self.assertEqual(sorted(task_finished), get_uuids(FINISHED))
 
+    def test_task_list_with_tags_and_pagination(self):
+        uuids = [self._create_task({"tags": ["t%d" % (i % 2), "all"]})["uuid"]
+                 for i in moves.range(5)]
+        db.task_update(uuids[0], {"validation_result": {"trace": "foo"}})
+
+        tasks = db.task_list()
+        self.assertEqual(uuids, [task["uuid"] for task in tasks])
+        self.assertEqual([["all", "t0"], ["all", "t1"]],
+                         [task["tags"] for task in tasks[:2]])
+        self.assertNotIn("validation_result", tasks[0])
+
+        self.assertEqual(uuids[::2], [task["uuid"] for task in
+                                      db.task_list(tags=["t0"])])
+        self.assertEqual(uuids[:2], [task["uuid"] for task in
+                                     db.task_list(limit=2)])
+        self.assertEqual(uuids[2:4], [task["uuid"] for task in
+                                      db.task_list(limit=2,
+                                                   marker=uuids[1])])
+        self.assertEqual([uuids[4]], [task["uuid"] for task in
+                                      db.task_list(tags=["t0"],
+                                                   marker=uuids[2])])
+        self.assertRaises(exceptions.DBRecordNotFound,
+                          db.task_list, marker="non-existing-task")
+
+    def test_task_list_tags_in_chunks(self):
+        uuids = [self._create_task({"tags": ["t%d" % i]})["uuid"]
+                 for i in moves.range(5)]
+        with mock.patch("rally.common.db.api._TAGS_CHUNK_SIZE", 2):
+            tasks = db.task_list()
+        self.assertEqual(uuids, [task["uuid"] for task in tasks])
+        self.assertEqual([["t%d" % i] for i in moves.range(5)],
+                         [task["tags"] for task in tasks])
+
     def test_task_delete(self):
         task1, task2 = self._create_task()["uuid"], self._create_task()["uuid"]
         db.task_delete(task1)
@@ -518,6 +552,37 @@ class WorkloadTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload["task_uuid"])
         self.assertEqual(self.subtask_uuid, workload["subtask_uuid"])
 
+    @mock.patch("rally.common.db.api._workload_data_iterate")
+    def test_workload_set_results_with_stats(self,
+                                             mock__workload_data_iterate):
+        workload = db.workload_create(self.task_uuid, self.subtask_uuid,
+                                      name="foo", description="descr",
+                                      position=0, args={},
+                                      contexts={}, sla={},
+                                      hooks=[], runner={},
+                                      runner_type="foo")
+        stats = {"total_iteration_count": 10,
+                 "failed_iteration_count": 2,
+                 "min_duration": 1.5,
+                 "max_duration": 7.0,
+                 "statistics": {"durations": {"total": {}, "atomics": []}}}
+
+        db.workload_set_results(workload_uuid=workload["uuid"],
+                                subtask_uuid=self.subtask_uuid,
+                                task_uuid=self.task_uuid,
+                                load_duration=13,
+                                full_duration=42,
+                                start_time=33.33,
+                                sla_results=[],
+                                contexts_results=[],
+                                stats=stats)
+        workload = db.workload_get(workload["uuid"])
+
+        self.assertFalse(mock__workload_data_iterate.called)
+        for key in stats:
+            self.assertEqual(stats[key], workload[key])
+        self.assertTrue(workload["pass_sla"])
+
     def test_workload_set_results_empty_raw_data(self):
         workload = db.workload_create(self.task_uuid, self.subtask_uuid,
                                       name="foo", description="descr",
@@ -589,6 +654,68 @@ class WorkloadDataTestCase(test.DBTestCase):
         self.assertEqual(self.task_uuid, workload_data["task_uuid"])
         self.assertEqual(self.workload_uuid, workload_data["workload_uuid"])
 
+    def test_workload_data_create_compact(self):
+        raw = [{"error": [], "duration": 1.0, "timestamp": 2.0,
+                "idle_duration": 0.0, "atomic_actions": [],
+                "output": {"additive": [], "complete": []}},
+               {"error": ["anError"], "duration": 0.0, "timestamp": 1.0,
+                "idle_duration": 0.0, "atomic_actions": [],
+                "output": {"additive": [], "complete": []}}]
+        workload_data = db.workload_data_create(
+            self.task_uuid, self.workload_uuid, 0, {"raw": raw},
+            chunk_format="compact", compression="zlib")
+        self.assertEqual(2, workload_data["iteration_count"])
+        self.assertEqual(1, workload_data["failed_iteration_count"])
+        self.assertEqual({}, workload_data["chunk_data"])
+        self.assertEqual(raw, compact_data.decode(
+            workload_data["compact_chunk_data"]))
+        self.assertGreater(workload_data["chunk_size"], 0)
+        self.assertEqual(len(workload_data["compact_chunk_data"]),
+                         workload_data["compressed_chunk_size"])
+
+        # chunks of both formats are read together
+        db.workload_data_create(self.task_uuid, self.workload_uuid, 1,
+                                {"raw": [{"duration": 3, "timestamp": 0}]})
+        task = db.task_get(self.task_uuid, detailed=True)
+        self.assertEqual(
+            [{"duration": 3, "timestamp": 0}, raw[1], raw[0]],
+            task["subtasks"][0]["workloads"][0]["data"])
+
+    def _create_chunks(self, *chunks):
+        return [db.workload_data_create(self.task_uuid, self.workload_uuid,
+                                        i, {"raw": [{"duration": 1,
+                                                     "timestamp": ts}
+                                                    for ts in chunk]})
+                for i, chunk in enumerate(chunks)]
+
+    def test_workload_data_iterate(self):
+        self._create_chunks([1, 3, 2], [2.5, 10], [100, 101], [5, 103])
+        self.assertEqual(
+            [1, 2, 2.5, 3, 5, 10, 100, 101, 103],
+            [itr["timestamp"]
+             for itr in db.workload_data_iterate(self.workload_uuid)])
+        self.assertEqual([], list(db.workload_data_iterate("unknown")))
+
+    def test__workload_data_lanes(self):
+        chunks = self._create_chunks([1, 3], [2.5, 10], [100], [5], [200])
+        session = db.api.get_session()
+        try:
+            lanes = db.api._workload_data_lanes(session, self.workload_uuid)
+        finally:
+            session.close()
+        self.assertEqual([[chunks[0]["id"], chunks[2]["id"], chunks[4]["id"]],
+                          [chunks[1]["id"]],
+                          [chunks[3]["id"]]], lanes)
+
+    def test_task_get_with_stream_data(self):
+        self._create_chunks([3, 1], [2])
+        task = db.task_get(self.task_uuid, detailed=True, stream_data=True)
+        data = task["subtasks"][0]["workloads"][0]["data"]
+        self.assertIsInstance(data, db.api.WorkloadDataStream)
+        self.assertEqual(3, len(data))
+        for i in range(2):
+            self.assertEqual([1, 2, 3], [itr["timestamp"] for itr in data])
+
     @mock.patch("time.time")
     def test_workload_data_create_empty(self, mock_time):
         mock_time.return_value = 10
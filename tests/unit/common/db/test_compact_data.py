@@ -0,0 +1,105 @@
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import ddt
+import mock
+
+from rally.common.db import compact_data
+from rally import exceptions
+from tests.unit import test
+
+
+def _iteration(timestamp, **kwargs):
+    itr = {"timestamp": timestamp,
+           "duration": 1.5,
+           "idle_duration": 0.25,
+           "error": [],
+           "output": {"additive": [], "complete": []},
+           "atomic_actions": [
+               {"name": "foo", "children": [
+                   {"name": "bar", "children": [],
+                    "started_at": timestamp + 0.1,
+                    "finished_at": timestamp + 0.2}],
+                "started_at": timestamp,
+                "finished_at": timestamp + 0.5},
+               {"name": "bar", "children": [], "failed": True,
+                "started_at": timestamp + 0.5,
+                "finished_at": timestamp + 1.0}]}
+    itr.update(kwargs)
+    return itr
+
+
+@ddt.ddt
+class CompactDataTestCase(test.TestCase):
+
+    @ddt.data("none", "zlib")
+    def test_encode_decode(self, compression):
+        raw = [
+            _iteration(1.0),
+            _iteration(2.0, error=["Exception", "oops", "Traceback"]),
+            _iteration(3.0, output={"additive": [{"title": "t"}],
+                                    "complete": []}),
+            # iterations of unusual shape are stored as is
+            {"timestamp": 4, "duration": 1},
+            _iteration(5.0, atomic_actions=[{"name": "x", "children": [],
+                                             "started_at": 5.0}]),
+            _iteration(6.0, atomic_actions=[]),
+        ]
+        data, size = compact_data.encode(raw, compression=compression)
+
+        self.assertEqual(json.loads(json.dumps(raw)),
+                         compact_data.decode(data))
+        if compression == "none":
+            self.assertEqual(size + 5, len(data))
+
+    def test_encode_decode_empty(self):
+        data, size = compact_data.encode([])
+        self.assertEqual([], compact_data.decode(data))
+
+    def test_compact_is_smaller_than_json(self):
+        raw = [_iteration(float(i)) for i in range(1000)]
+        data, size = compact_data.encode(raw)
+        self.assertLess(len(data) * 5, len(json.dumps(raw)))
+
+    def test_encode_unknown_compression(self):
+        self.assertRaises(exceptions.RallyException,
+                          compact_data.encode, [], compression="foo")
+
+    def test_lz4_is_not_installed(self):
+        data = compact_data._HEADER.pack(compact_data.MAGIC,
+                                         compact_data.VERSION, b"l")
+        with mock.patch.object(compact_data, "lz4_frame", None):
+            self.assertRaises(exceptions.RallyException,
+                              compact_data.encode, [], compression="lz4")
+            self.assertRaises(exceptions.RallyException,
+                              compact_data.decode, data)
+
+    @mock.patch("rally.common.db.compact_data.lz4_frame")
+    def test_lz4(self, mock_lz4_frame):
+        mock_lz4_frame.compress.side_effect = lambda body: body[::-1]
+        mock_lz4_frame.decompress.side_effect = lambda body: body[::-1]
+        raw = [_iteration(1.0)]
+
+        data, size = compact_data.encode(raw, compression="lz4")
+
+        self.assertEqual(raw, compact_data.decode(data))
+        self.assertEqual(1, mock_lz4_frame.compress.call_count)
+
+    def test_decode_wrong_format(self):
+        self.assertRaises(exceptions.RallyException,
+                          compact_data.decode, b"XYZ\x01z")
+        self.assertRaises(exceptions.RallyException,
+                          compact_data.decode, b"RWD\x01?")
@@ -2600,3 +2600,8 @@ class MigrationWalkTestCase(rtest.DBTestCase,
                 conn.execute(
                     env_table.delete().where(
                         env_table.c.uuid == d_uuid))
+
+    def _check_477389580340(self, engine, data):
+        wdata_table = db_utils.get_table(engine, "workloaddata")
+        self.assertIn("compact_chunk_data", wdata_table.c)
+        self.assertTrue(wdata_table.c.compact_chunk_data.nullable)
@@ -157,3 +157,19 @@ class TimeStampTestCase(test.TestCase):
             1498561749.348996,
             sa_types.TimeStamp().process_result_value(1498561749348996,
                                                       dialect=None))
+
+
+class LongBinaryTestCase(test.TestCase):
+
+    def test_load_dialect_impl(self):
+        dialect = mock.MagicMock()
+        dialect.name = "mysql"
+        self.assertEqual(dialect.type_descriptor.return_value,
+                         sa_types.LongBinary().load_dialect_impl(dialect))
+        dialect.type_descriptor.assert_called_once_with(
+            sa_types.mysql_types.LONGBLOB)
+
+        dialect = mock.MagicMock()
+        dialect.name = "sqlite"
+        sa_types.LongBinary().load_dialect_impl(dialect)
+        dialect.type_descriptor.assert_called_once_with(sa.LargeBinary)
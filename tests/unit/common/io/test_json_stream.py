@@ -0,0 +1,120 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+
+import ddt
+import mock
+
+from rally.common.io import json_stream
+from tests.unit import test
+
+
+PATTERN = ("tasks", json_stream.ANY, "workloads", json_stream.ANY, "data")
+
+
+def materialize(document):
+    if isinstance(document, json_stream.LazyArray):
+        return list(document)
+    if isinstance(document, dict):
+        return dict((k, materialize(v)) for k, v in document.items())
+    if isinstance(document, list):
+        return [materialize(v) for v in document]
+    return document
+
+
+@ddt.ddt
+class JSONStreamTestCase(test.TestCase):
+
+    def setUp(self):
+        super(JSONStreamTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "results.json")
+        # small reads make values cross boundaries of the buffer
+        patcher = mock.patch("rally.common.io.json_stream._READ_SIZE", 5)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.document = {
+            "info": {"version": 1.25, "text": "\"[{,}]\""},
+            "tasks": [
+                {"uuid": "t-%d" % t,
+                 "workloads": [
+                     {"name": "w-%d" % w,
+                      "data": [{"i": i, "errors": ["]", "}"]}
+                               for i in range(w * 3)],
+                      "position": 1234567890}
+                     for w in range(3)]}
+                for t in range(2)],
+            "empty": []}
+
+    def _write(self, content):
+        with open(self.path, "w") as f:
+            f.write(content)
+
+    @ddt.data(None, 4)
+    def test_load(self, indent):
+        self._write(json.dumps(self.document, indent=indent))
+
+        document = json_stream.load(self.path, PATTERN)
+
+        data = document["tasks"][1]["workloads"][2]["data"]
+        self.assertIsInstance(data, json_stream.LazyArray)
+        self.assertEqual(("tasks", 1, "workloads", 2, "data"), data.path)
+        self.assertEqual(self.document, materialize(document))
+
+    def test_load_not_matching(self):
+        self._write(json.dumps([self.document, {"tasks": 1}]))
+        self.assertEqual([self.document, {"tasks": 1}],
+                         json_stream.load(self.path, PATTERN))
+
+    def test_iterate_out_of_order(self):
+        self._write(json.dumps(self.document))
+        document = json_stream.load(self.path, PATTERN)
+        arrays = [t["workloads"][w]["data"] for t in document["tasks"]
+                  for w in (2, 1)]
+        expected = [t["workloads"][w]["data"]
+                    for t in self.document["tasks"] for w in (2, 1)]
+
+        self.assertEqual(expected, [list(a) for a in arrays])
+        self.assertEqual(expected[::-1], [list(a) for a in arrays[::-1]])
+
+        # partially consumed arrays are skipped
+        data = iter(arrays[0])
+        self.assertEqual(expected[0][0], next(data))
+        self.assertEqual(expected[1], list(arrays[1]))
+        self.assertEqual(expected[3], list(arrays[3]))
+
+    @ddt.data('{"tasks": [{"workloads": [{"data": [1, 2',
+              '{"tasks": [{"workloads": [{"data": [1 2]}]}]}',
+              '{"tasks": [{1: []}]}',
+              '{"tasks": [')
+    def test_load_invalid(self, content):
+        self._write(content)
+        self.assertRaises(ValueError, json_stream.load, self.path, PATTERN)
+
+    def test_stub(self):
+        self._write(json.dumps(self.document))
+        document = json_stream.load(self.path, PATTERN)
+
+        stub = json_stream.stub(document)
+
+        self.assertEqual([], stub["tasks"][0]["workloads"][1]["data"])
+        self.assertEqual(self.document["info"], stub["info"])
+        self.assertIsInstance(document["tasks"][0]["workloads"][1]["data"],
+                              json_stream.LazyArray)
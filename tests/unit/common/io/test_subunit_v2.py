@@ -11,6 +11,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import datetime
 import os
 
 import mock
@@ -61,14 +62,22 @@ RuntimeError: broken setUp method
                           "timestamp": "2015-06-03T08:46:22+0000"},
                          failed_tests[failed_test])
 
+    def _run_test(self, results, test_id, status):
+        timestamp = datetime.datetime(2018, 1, 1)
+        results.status(test_id=test_id, test_status="inprogress",
+                       timestamp=timestamp)
+        results.status(test_id=test_id, test_status=status,
+                       timestamp=timestamp + datetime.timedelta(seconds=1))
+
     def test_filter_results(self):
         results = subunit_v2.SubunitV2StreamResult()
-        results._tests = {
-            "failed_test_1": {"status": "fail"},
-            "failed_test_2": {"status": "fail"},
-            "passed_test_1": {"status": "success"},
-            "passed_test_2": {"status": "success"},
-            "passed_test_3": {"status": "success"}}
+        for test_id, status in (("failed_test_1", "fail"),
+                                ("failed_test_2", "fail"),
+                                ("passed_test_1", "success"),
+                                ("passed_test_2", "success"),
+                                ("passed_test_3", "success")):
+            results.status(test_id=test_id, test_status="exists")
+            self._run_test(results, test_id, status)
         self.assertEqual({"failed_test_1": results.tests["failed_test_1"],
                           "failed_test_2": results.tests["failed_test_2"]},
                          results.filter_tests("fail"))
@@ -94,6 +103,42 @@ RuntimeError: broken setUp method
 
         self.assertTrue(results._is_parsed)
 
+    def test__parse_unknown_entities(self):
+        results = subunit_v2.SubunitV2StreamResult()
+        for test_id in ("foo.SkippedTestCase.test_1[smoke]",
+                        "foo.SkippedTestCase.test_2",
+                        "foo.SkippedTestCaseTwo.test_1",
+                        "foo.FailedTestCase.test_1",
+                        "foo.FailedTestCase.test_2",
+                        "bar.SkippedTestCase.test_1"):
+            results.status(test_id=test_id, test_status="exists")
+        self._run_test(results, "foo.FailedTestCase.test_1", "success")
+        results.status(test_id="setUpClass (foo.SkippedTestCase)",
+                       test_status="skip", file_name="reason",
+                       file_bytes=b":(")
+        results.status(test_id="tearDown (foo.FailedTestCase)",
+                       test_status="fail", file_name="traceback",
+                       file_bytes=b"Traceback")
+
+        self.assertEqual(
+            {"foo.SkippedTestCase.test_1[smoke]": ("skip", ":("),
+             "foo.SkippedTestCase.test_2": ("skip", ":("),
+             "foo.SkippedTestCaseTwo.test_1": ("init", None),
+             "foo.FailedTestCase.test_1": ("success", "Traceback"),
+             "foo.FailedTestCase.test_2": ("fail", "Traceback"),
+             "bar.SkippedTestCase.test_1": ("init", None)},
+            dict((t_id, (t["status"],
+                         t.get("reason") or t.get("traceback")))
+                 for t_id, t in results.tests.items()))
+        self.assertEqual(
+            {"tests_count": 6, "tests_duration": "1.000",
+             "failures": 1, "skipped": 2, "success": 1,
+             "unexpected_success": 0, "expected_failures": 0},
+            results.totals)
+        self.assertEqual(["foo.SkippedTestCase.test_1[smoke]",
+                          "foo.SkippedTestCase.test_2"],
+                         sorted(results.filter_tests("skip")))
+
     def test_prepare_input_args(self):
         some_mock = mock.MagicMock()
 
@@ -133,6 +178,14 @@ RuntimeError: broken setUp method
         self.assertEqual("Some details about why this test fails",
                          tests[test_1]["reason"])
         self.assertEqual("uxsuccess", tests[test_2]["status"])
+        self.assertEqual({"tests_count": 7,
+                          "tests_duration": "5.007",
+                          "skipped": 1,
+                          "success": 1,
+                          "failures": 2,
+                          "expected_failures": 1,
+                          "unexpected_success": 2}, result.totals)
+        self.assertEqual([test_1], list(result.filter_tests("xfail")))
 
     def test_parse_file_with_skipped_tests(self):
         test_id = "test_foo.SimpleTestCase.test_to_skip"
@@ -65,7 +65,8 @@ class TaskTestCase(test.TestCase):
         mock_task_get.return_value = self.task
         task = objects.Task.get(self.task["uuid"])
         mock_task_get.assert_called_once_with(self.task["uuid"],
-                                              detailed=False)
+                                              detailed=False,
+                                              stream_data=False)
         self.assertEqual(task["uuid"], self.task["uuid"])
 
     @mock.patch("rally.common.objects.task.db.task_get_status")
@@ -106,19 +107,32 @@ class TaskTestCase(test.TestCase):
         mock_task_delete.assert_called_once_with(
             self.task["uuid"], status=consts.TaskStatus.FINISHED)
 
+    @mock.patch("rally.common.objects.task.db.env_get")
     @mock.patch("rally.common.objects.task.db.task_list",
                 return_value=[{"uuid": "a",
                                "created_at": "b",
                                "status": consts.TaskStatus.CRASHED,
-                               "tag": "d",
-                               "deployment_name": "some_name"}])
-    def list(self, mock_db_task_list):
-        tasks = objects.Task.list(status="somestatus")
-        mock_db_task_list.assert_called_once_with("somestatus", None)
+                               "tags": ["d"],
+                               "env_uuid": "env_1"},
+                              {"uuid": "b",
+                               "created_at": "c",
+                               "status": consts.TaskStatus.FINISHED,
+                               "tags": [],
+                               "env_uuid": "env_1"}])
+    def test_list(self, mock_db_task_list, mock_env_get):
+        mock_env_get.return_value = {"name": "some_name"}
+
+        tasks = objects.Task.list(status="somestatus", limit=2, marker="m")
+
+        mock_db_task_list.assert_called_once_with(
+            "somestatus", env=None, tags=None, limit=2, marker="m")
+        mock_env_get.assert_called_once_with("env_1")
         self.assertIs(type(tasks), list)
         self.assertIsInstance(tasks[0], objects.Task)
-        self.assertEqual(mock_db_task_list.return_value["uuis"],
-                         tasks[0]["uuid"])
+        self.assertEqual(["a", "b"], [t["uuid"] for t in tasks])
+        self.assertEqual(["some_name", "some_name"],
+                         [t.to_dict()["deployment_name"] for t in tasks])
+        mock_env_get.assert_called_once_with("env_1")
 
     @mock.patch("rally.common.objects.task.db.task_update")
     @mock.patch("rally.common.objects.task.db.task_create")
@@ -196,7 +210,8 @@ class TaskTestCase(test.TestCase):
             "created_at": dt.datetime.now(),
             "updated_at": dt.datetime.now()}]}
         task_detailed = objects.Task.get("task_id", detailed=True)
-        mock_task_get.assert_called_once_with("task_id", detailed=True)
+        mock_task_get.assert_called_once_with("task_id", detailed=True,
+                                              stream_data=False)
         self.assertEqual(mock_task_get.return_value, task_detailed.task)
 
     @mock.patch("rally.common.objects.task.db.task_update")
@@ -389,6 +404,26 @@ class TaskTestCase(test.TestCase):
                 [mock.call(*args) for args in validate_output_calls],
                 any_order=True)
 
+    def test_validate_result(self):
+        children = [{"name": "bar", "started_at": 2.0, "finished_at": 3.0,
+                     "children": []}]
+        atomics = [{"name": "foo", "started_at": 1.0, "finished_at": 4.0,
+                    "children": children}]
+        result = {"duration": 1.0, "timestamp": 1.0, "idle_duration": 1.0,
+                  "error": [], "output": {"additive": [], "complete": []},
+                  "atomic_actions": atomics}
+
+        self.assertIsNone(objects.task.validate_result(result))
+        self.assertEqual(1, len(atomics))
+        self.assertEqual(1, len(children))
+
+        children.append({"name": "baz", "started_at": 2, "finished_at": 3.0,
+                         "children": []})
+        self.assertEqual(
+            "Atomic action %s has wrong type '%s', should be 'float'"
+            % (children[1], int),
+            objects.task.validate_result(result))
+
 
 class SubtaskTestCase(test.TestCase):
 
@@ -494,7 +529,15 @@ class WorkloadTestCase(test.TestCase):
         workload.add_workload_data(0, {"data": "foo"})
         mock_workload_data_create.assert_called_once_with(
             self.workload["task_uuid"], self.workload["uuid"],
-            0, {"data": "foo"})
+            0, {"data": "foo"}, chunk_format="json", compression="zlib")
+
+        mock_workload_data_create.reset_mock()
+        workload.add_workload_data(1, {"data": "bar"},
+                                   chunk_format="compact",
+                                   compression="lz4")
+        mock_workload_data_create.assert_called_once_with(
+            self.workload["task_uuid"], self.workload["uuid"],
+            1, {"data": "bar"}, chunk_format="compact", compression="lz4")
 
     @mock.patch("rally.common.objects.task.db.workload_set_results")
     @mock.patch("rally.common.objects.task.db.workload_create")
@@ -533,7 +576,7 @@ class WorkloadTestCase(test.TestCase):
             load_duration=load_duration, full_duration=full_duration,
             start_time=start_time, sla_results=sla_results,
             contexts_results=contexts_results,
-            hooks_results=None)
+            hooks_results=None, stats=None)
 
     def test_to_task(self):
         workload = {
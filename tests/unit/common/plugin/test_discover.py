@@ -223,3 +223,19 @@ class LoadExtraModulesTestCase(test.TestCase):
                           mock.call(["/bar"], prefix="plugin2."),
                           mock.call("/xxx", prefix="plugin3.")],
                          mock_walk_packages.call_args_list)
+
+    @mock.patch("%s.pkgutil.walk_packages" % DISCOVER)
+    @mock.patch("%s.pkg_resources" % DISCOVER)
+    def test_import_modules_by_entry_point_without_modules(
+            self, mock_pkg_resources, mock_walk_packages):
+        ep = mock.Mock(module_name="plugin1", attrs=())
+        package = mock.Mock(project_name="plugin1", version="0.1")
+        package.get_entry_map.return_value = {"path": ep}
+        mock_pkg_resources.working_set = [package]
+
+        self.assertEqual(
+            [{"name": "plugin1", "version": "0.1",
+              "plugins_path": "plugin1"}],
+            discover.import_modules_by_entry_point(import_modules=False))
+        ep.load.assert_called_once_with()
+        self.assertFalse(mock_walk_packages.called)
@@ -0,0 +1,256 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import importlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import uuid
+
+import mock
+
+from rally.common import cfg
+from rally.common.plugin import manifest
+from rally.common.plugin import plugin
+from rally import exceptions
+from rally.task import scenario
+from tests.unit import test
+
+
+MANIFEST = "rally.common.plugin.manifest"
+
+
+class ManifestTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ManifestTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.path = os.path.join(self.tmp_dir, "sub", "manifest.json")
+        self.conf = self.useFixture(cfg.fixture.Config())
+
+    def test_fingerprint(self):
+        key = manifest.fingerprint(["rally.plugins.common"])
+        self.assertEqual(key, manifest.fingerprint(["rally.plugins.common"]))
+        self.assertNotEqual(
+            key, manifest.fingerprint(["rally.plugins.common"], ["foo 0.1"]))
+        self.assertNotEqual(
+            key, manifest.fingerprint(["rally.plugins.common",
+                                       "rally.plugins.workload"]))
+
+    @mock.patch("%s.os.path.getmtime" % MANIFEST)
+    def test_fingerprint_depends_on_mtimes(self, mock_getmtime):
+        mock_getmtime.return_value = 1.0
+        key = manifest.fingerprint(["rally.plugins.common"])
+        mock_getmtime.return_value = 2.0
+        self.assertNotEqual(key,
+                            manifest.fingerprint(["rally.plugins.common"]))
+
+    def test_collect(self):
+        records = manifest.collect(["rally.plugins.common"])
+        self.assertIn({"base": "rally.task.scenario.Scenario",
+                       "name": "Dummy.dummy",
+                       "platform": "default",
+                       "module": "rally.plugins.common.scenarios.dummy."
+                                 "dummy"},
+                      records)
+        for record in records:
+            self.assertTrue(
+                record["module"].startswith("rally.plugins.common."))
+
+    def test_write_and_read(self):
+        records = [{"base": "b", "name": "n", "platform": "p",
+                    "module": "m"}]
+        manifest.write(self.path, "key", records)
+
+        self.assertEqual(records, manifest.read(self.path, "key"))
+        self.assertIsNone(manifest.read(self.path, "another_key"))
+        self.assertEqual(["manifest.json"],
+                         os.listdir(os.path.dirname(self.path)))
+
+    def test_read_broken(self):
+        self.assertIsNone(manifest.read(self.path, "key"))
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{")
+        self.assertIsNone(manifest.read(self.path, "key"))
+        with open(self.path, "w") as f:
+            f.write("[]")
+        self.assertIsNone(manifest.read(self.path, "key"))
+
+    @mock.patch("%s.LOG" % MANIFEST)
+    def test_write_fails(self, mock_log):
+        open(os.path.join(self.tmp_dir, "sub"), "w").close()
+        manifest.write(self.path, "key", [])
+        self.assertTrue(mock_log.debug.called)
+
+    @mock.patch("%s.collect" % MANIFEST)
+    @mock.patch("%s.fingerprint" % MANIFEST)
+    def test_load_stale(self, mock_fingerprint, mock_collect):
+        self.addCleanup(plugin.set_lazy_loader,
+                        plugin._registry.lazy_loader)
+        plugin.set_lazy_loader(None)
+        self.conf.config(plugins_manifest_path=self.path)
+        mock_fingerprint.return_value = "key"
+        mock_collect.return_value = [{"name": "n", "module": "m"}]
+        import_all = mock.Mock()
+
+        manifest.load(["foo"], import_all, versions=["bar 1"])
+
+        mock_fingerprint.assert_called_once_with(["foo"], ["bar 1"])
+        import_all.assert_called_once_with()
+        mock_collect.assert_called_once_with(["foo"])
+        self.assertIsNone(plugin._registry.lazy_loader)
+        with open(self.path) as f:
+            self.assertEqual({"key": "key",
+                              "plugins": [{"name": "n", "module": "m"}]},
+                             json.load(f))
+
+    @mock.patch("%s.fingerprint" % MANIFEST, return_value="key")
+    def test_load_lazily(self, mock_fingerprint):
+        self.addCleanup(plugin.set_lazy_loader,
+                        plugin._registry.lazy_loader)
+        self.conf.config(plugins_manifest_path=self.path)
+        manifest.write(self.path, "key", [{"name": "n", "module": "m"}])
+        import_all = mock.Mock()
+
+        manifest.load(["foo"], import_all)
+
+        self.assertFalse(import_all.called)
+        self.assertIsInstance(plugin._registry.lazy_loader,
+                              manifest.LazyLoader)
+
+
+class LazyLoaderTestCase(test.TestCase):
+
+    def setUp(self):
+        super(LazyLoaderTestCase, self).setUp()
+        self.addCleanup(plugin.set_lazy_loader,
+                        plugin._registry.lazy_loader)
+        self.import_all = mock.Mock()
+        self.loader = manifest.LazyLoader(
+            [{"name": "foo", "module": "a"},
+             {"name": "foo", "module": "b"},
+             {"name": "foo", "module": "a"},
+             {"name": "bar", "module": "c"}],
+            self.import_all)
+
+    @mock.patch("%s.importlib.import_module" % MANIFEST)
+    def test_load(self, mock_import_module):
+        self.loader.load("foo")
+        self.loader.load("foo")
+        self.loader.load("unknown")
+
+        self.assertEqual([mock.call("a"), mock.call("b")],
+                         mock_import_module.call_args_list)
+
+    @mock.patch("%s.LOG" % MANIFEST)
+    @mock.patch("%s.importlib.import_module" % MANIFEST)
+    def test_load_fails(self, mock_import_module, mock_log):
+        mock_import_module.side_effect = [ImportError("oops"), None]
+
+        self.loader.load("foo")
+
+        self.assertEqual([mock.call("a"), mock.call("b")],
+                         mock_import_module.call_args_list)
+        self.assertTrue(mock_log.warning.called)
+
+    @mock.patch("%s.importlib.import_module" % MANIFEST)
+    def test_load_all(self, mock_import_module):
+        plugin.set_lazy_loader(self.loader)
+
+        self.loader.load_all()
+        self.loader.load_all()
+        self.loader.load("bar")
+
+        self.import_all.assert_called_once_with()
+        self.assertFalse(mock_import_module.called)
+        self.assertIsNone(plugin._registry.lazy_loader)
+
+
+class LazyLoadingTestCase(test.TestCase):
+    """Plugins of a real package are looked up through the manifest."""
+
+    MODULE = """from rally.task import scenario
+
+
+@scenario.configure(name="%s")
+class Plugin(scenario.Scenario):
+    def run(self):
+        pass
+"""
+
+    def setUp(self):
+        super(LazyLoadingTestCase, self).setUp()
+        self.tmp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmp_dir)
+        self.package = "lazy_plugins_%s" % uuid.uuid4().hex
+        os.makedirs(os.path.join(self.tmp_dir, self.package))
+        open(os.path.join(self.tmp_dir, self.package, "__init__.py"),
+             "w").close()
+        self.plugins = {}
+        for module in ("foo", "bar"):
+            name = "%s.%s" % (self.package, module)
+            self.plugins[name] = "%s.%s" % (self.package, module)
+            with open(os.path.join(self.tmp_dir, self.package,
+                                   "%s.py" % module), "w") as f:
+                f.write(self.MODULE % name)
+        sys.path.insert(0, self.tmp_dir)
+        self.addCleanup(sys.path.remove, self.tmp_dir)
+        self.addCleanup(self._unload)
+        self.addCleanup(plugin.set_lazy_loader,
+                        plugin._registry.lazy_loader)
+        self.useFixture(cfg.fixture.Config()).config(
+            plugins_manifest_path=os.path.join(self.tmp_dir, "manifest"))
+
+    def _import_all(self):
+        for module in self.plugins.values():
+            importlib.import_module(module)
+
+    def _unload(self):
+        """Forget plugins as if a new process was started."""
+        for name, module in self.plugins.items():
+            for p in scenario.Scenario.get_all(name=name, allow_hidden=True):
+                p.unregister()
+            sys.modules.pop(module, None)
+
+    def test_get_on_demand(self):
+        foo, bar = sorted(self.plugins)
+        # the manifest is generated after the full discovery
+        manifest.load([self.package], self._import_all)
+        self.assertEqual(bar, scenario.Scenario.get(bar).get_name())
+        self._unload()
+        import_all = mock.Mock(side_effect=self._import_all)
+
+        manifest.load([self.package], import_all)
+
+        self.assertNotIn(self.plugins[foo], sys.modules)
+        self.assertEqual(self.plugins[foo],
+                         scenario.Scenario.get(foo).__module__)
+        self.assertNotIn(self.plugins[bar], sys.modules)
+        self.assertEqual([self.plugins[bar]],
+                         [p.__module__ for p in scenario.Scenario.get_all(
+                             name=bar)])
+        self.assertRaises(exceptions.PluginNotFound,
+                          scenario.Scenario.get, "%s.unknown" % self.package)
+        self.assertFalse(import_all.called)
+
+        # all plugins are required, so the rest of modules are imported
+        self.assertIn(bar, [p.get_name()
+                            for p in scenario.Scenario.get_all()])
+        import_all.assert_called_once_with()
+        self.assertIsNone(plugin._registry.lazy_loader)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from rally.common.plugin import plugin
 from rally import exceptions
 from tests.unit import test
@@ -261,3 +263,61 @@ class PluginTestCase(test.TestCase):
         self.assertFalse(SomePlugin.is_deprecated())
         self.assertEqual({"reason": "some_reason", "rally_version": "0.1.1"},
                          DeprecatedPlugin.is_deprecated())
+
+    @mock.patch("rally.common.plugin.plugin.discover.itersubclasses",
+                side_effect=plugin.discover.itersubclasses)
+    def test_get_all_uses_registry(self, mock_itersubclasses):
+        plugin._registry.invalidate()
+
+        self.assertEqual(SomePlugin, BasePlugin.get("test_some_plugin"))
+        self.assertEqual(MyPluginInFoo, BasePlugin.get("test_my_plugin@foo"))
+        self.assertEqual(set([MyPluginInDefault, MyPluginInFoo]),
+                         set(BasePlugin.get_all(name="test_my_plugin")))
+        # NOTE: itersubclasses calls itself recursively for children
+        self.assertEqual(
+            1, mock_itersubclasses.call_args_list.count(mock.call(BasePlugin)))
+
+    def test_registry_is_invalidated(self):
+
+        @plugin.configure(name="test_registry_plugin")
+        class RegistryPlugin(BasePlugin):
+            pass
+
+        self.assertEqual(RegistryPlugin,
+                         BasePlugin.get("test_registry_plugin"))
+
+        RegistryPlugin._meta_set("hidden", True)
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "test_registry_plugin")
+        RegistryPlugin._meta_set("hidden", False)
+
+        RegistryPlugin._meta_set("name", "test_registry_plugin_renamed")
+        self.assertEqual(RegistryPlugin,
+                         BasePlugin.get("test_registry_plugin_renamed"))
+        self.assertEqual([], BasePlugin.get_all(name="test_registry_plugin"))
+
+        RegistryPlugin.unregister()
+        self.assertRaises(exceptions.PluginNotFound,
+                          BasePlugin.get, "test_registry_plugin_renamed")
+
+    def test_get_all_with_lazy_loader(self):
+        loader = mock.Mock()
+        self.addCleanup(plugin.set_lazy_loader,
+                        plugin._registry.lazy_loader)
+        plugin.set_lazy_loader(loader)
+
+        self.assertEqual(SomePlugin, BasePlugin.get("test_some_plugin"))
+        loader.load.assert_called_once_with("test_some_plugin")
+        self.assertFalse(loader.load_all.called)
+
+        BasePlugin.get_all()
+        loader.load_all.assert_called_once_with()
+
+    def test_load_lazy_plugins(self):
+        loader = mock.Mock()
+        self.addCleanup(plugin.set_lazy_loader,
+                        plugin._registry.lazy_loader)
+        plugin.set_lazy_loader(loader)
+
+        plugin.load_lazy_plugins()
+        loader.load_all.assert_called_once_with()
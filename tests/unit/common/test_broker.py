@@ -14,6 +14,7 @@
 #    under the License.
 
 import collections
+import threading
 
 import mock
 
@@ -84,3 +85,105 @@ class BrokerTestCase(test.TestCase):
         consumer_count = 2
         broker.run(publish, consume, consumer_count)
         self.assertEqual(set([1, 2, 3]), consumed)
+
+    def test_run_pipelined(self):
+
+        def publish_odd(queue):
+            for i in range(1, 10, 2):
+                queue.append(i)
+
+        def publish_even(queue):
+            for i in range(0, 10, 2):
+                queue.append(i)
+
+        consumed = set()
+
+        def consume(cache, item):
+            cache.setdefault("items", []).append(item)
+            consumed.add(item)
+
+        jobs = broker.run_pipelined([publish_odd, publish_even], consume,
+                                    consumers_count=3)
+
+        self.assertEqual(set(range(10)), consumed)
+        self.assertEqual(set(range(10)), set(job["args"] for job in jobs))
+        for job in jobs:
+            self.assertLessEqual(job["started_at"], job["finished_at"])
+            self.assertIsNone(job["error"])
+
+    @mock.patch("rally.common.broker.LOG")
+    def test_run_pipelined_errors(self, mock_log):
+
+        def publish(queue):
+            queue.append(1)
+            queue.append(2)
+
+        def consume(cache, item):
+            if item == 2:
+                raise KeyError("oops")
+
+        jobs = broker.run_pipelined(publish, consume)
+
+        self.assertEqual([1, 2], [job["args"] for job in jobs])
+        self.assertIsNone(jobs[0]["error"])
+        self.assertEqual(["KeyError", "'oops'"], jobs[1]["error"][:2])
+        self.assertIn("Traceback", jobs[1]["error"][2])
+        self.assertTrue(mock_log.warning.called)
+
+    def test_run_pipelined_consumes_while_publishing(self):
+        consumed = threading.Event()
+
+        def publish(queue):
+            queue.append(1)
+            # the queue is bounded, so the item is consumed before
+            # the next one is accepted
+            queue.append(2)
+            queue.append(3)
+            self.assertTrue(consumed.wait(5))
+
+        def consume(cache, item):
+            consumed.set()
+
+        jobs = broker.run_pipelined(publish, consume, queue_size=1)
+
+        self.assertEqual([1, 2, 3], [job["args"] for job in jobs])
+
+    def test_run_pipelined_consumer_is_killed(self):
+
+        class Killed(BaseException):
+            pass
+
+        published = []
+
+        def publish(queue):
+            for i in range(10):
+                queue.append(i)
+                published.append(i)
+
+        def consume(cache, item):
+            raise Killed()
+
+        jobs = broker.run_pipelined(publish, consume, queue_size=1)
+
+        self.assertEqual([], jobs)
+        self.assertEqual(list(range(10)), published)
+
+    def test__bounded_queue_abort(self):
+        queue = broker._BoundedQueue(1)
+        queue.append(1)
+        appended = threading.Event()
+
+        def append():
+            queue.append(2)
+            appended.set()
+
+        publisher = threading.Thread(target=append)
+        publisher.start()
+        self.assertFalse(appended.wait(0.05))
+
+        queue.abort()
+
+        self.assertTrue(appended.wait(5))
+        publisher.join()
+        queue.append(3)
+        self.assertRaises(StopIteration, queue.get)
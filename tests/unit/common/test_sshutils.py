@@ -15,9 +15,13 @@
 
 import os
 import socket
+import threading
+import time
 
 import ddt
+import fixtures
 import mock
+import paramiko
 
 from rally.common import sshutils
 from rally import exceptions
@@ -33,6 +37,8 @@ class SSHTestCase(test.TestCase):
 
     def setUp(self):
         super(SSHTestCase, self).setUp()
+        self.useFixture(fixtures.MockPatch("rally.common.sshutils._pool",
+                                           sshutils._ConnectionPool()))
         self.ssh = sshutils.SSH("root", "example.net")
 
     @mock.patch("rally.common.sshutils.SSH._get_pkey")
@@ -113,12 +119,41 @@ class SSHTestCase(test.TestCase):
         ]
         self.assertEqual(client_calls, client.mock_calls)
 
+    @mock.patch("rally.common.sshutils.SSH._get_pkey")
+    @mock.patch("rally.common.sshutils.paramiko")
+    def test__get_client_reused(self, mock_paramiko, mock_ssh__get_pkey):
+        mock_ssh__get_pkey.return_value = "key"
+        mock_paramiko.SSHClient.side_effect = [mock.Mock(), mock.Mock(),
+                                               mock.Mock()]
+
+        client = sshutils.SSH("admin", "example.net", pkey="key")._get_client()
+        self.assertEqual(
+            client,
+            sshutils.SSH("admin", "example.net", pkey="key")._get_client())
+        # another user
+        other = sshutils.SSH("root", "example.net", pkey="key")._get_client()
+        self.assertNotEqual(client, other)
+
+        # the connection is broken
+        client.get_transport.return_value.is_active.return_value = False
+        self.assertNotEqual(
+            client,
+            sshutils.SSH("admin", "example.net", pkey="key")._get_client())
+        self.assertEqual(3, mock_paramiko.SSHClient.call_count)
+
     def test_close(self):
         with mock.patch.object(self.ssh, "_client") as m_client:
             self.ssh.close()
         m_client.close.assert_called_once_with()
         self.assertFalse(self.ssh._client)
 
+    def test_close_used(self):
+        with sshutils._get_pool().use(self.ssh._key) as connection:
+            connection.client = self.ssh._client = mock.Mock()
+            self.ssh.close()
+        self.assertFalse(connection.client.close.called)
+        self.assertFalse(self.ssh._client)
+
     @mock.patch("rally.common.sshutils.six.moves.StringIO")
     def test_execute(self, mock_string_io):
         mock_string_io.side_effect = stdio = [mock.Mock(), mock.Mock()]
@@ -164,6 +199,8 @@ class SSHRunTestCase(test.TestCase):
 
     def setUp(self):
         super(SSHRunTestCase, self).setUp()
+        self.useFixture(fixtures.MockPatch("rally.common.sshutils._pool",
+                                           sshutils._ConnectionPool()))
 
         self.fake_client = mock.Mock()
         self.fake_session = mock.Mock()
@@ -214,6 +251,73 @@ class SSHRunTestCase(test.TestCase):
         exit_stat, data = self.ssh.run("cmd")
         self.assertEqual(0, exit_stat)
 
+    @mock.patch("rally.common.sshutils.select")
+    def test_run_data(self, mock_select):
+        mock_select.select.return_value = ([], [], [])
+        self.fake_session.recv_ready.side_effect = [True, True, False]
+        self.fake_session.recv.side_effect = [b"ok1", b"ok2"]
+        self.assertEqual((0, b"ok1ok2"), self.ssh.run("cmd"))
+        self.fake_transport.open_session.assert_called_once_with(timeout=10)
+        self.fake_session.close.assert_called_once_with()
+
+    @mock.patch("rally.common.sshutils.select")
+    def test_run_reconnect(self, mock_select):
+        mock_select.select.return_value = ([], [], [])
+        self.fake_transport.open_session.side_effect = [
+            paramiko.SSHException("broken"), self.fake_session]
+        self.fake_transport.is_active.return_value = False
+        self.assertEqual((0, b""), self.ssh.run("cmd"))
+        self.fake_client.close.assert_called_once_with()
+        self.assertEqual(2, self.ssh._get_client.call_count)
+
+    def test_run_active_connection_error(self):
+        self.fake_transport.open_session.side_effect = paramiko.SSHException(
+            "error")
+        self.fake_transport.is_active.return_value = True
+        self.assertRaises(paramiko.SSHException, self.ssh.run, "cmd")
+        self.assertFalse(self.fake_client.close.called)
+        self.assertEqual(1, self.ssh._get_client.call_count)
+
+    @mock.patch("rally.common.sshutils.select")
+    def test_run_channel_refused(self, mock_select):
+        mock_select.select.return_value = ([], [], [])
+        self.fake_transport.open_session.side_effect = (
+            paramiko.ChannelException(4, "Resource shortage"))
+        extra_client = mock.Mock()
+        extra_client.get_transport.return_value.open_session.return_value = (
+            self.fake_session)
+        self.ssh._connect = mock.Mock(return_value=extra_client)
+
+        self.assertEqual((0, b""), self.ssh.run("cmd"))
+        # the shared connection is kept for the sessions running over it
+        self.assertFalse(self.fake_client.close.called)
+        self.fake_session.close.assert_called_once_with()
+        extra_client.close.assert_called_once_with()
+
+    def test_run_sessions_limit(self):
+        self.useFixture(fixtures.MockPatch(
+            "rally.common.sshutils._MAX_SESSIONS", 2))
+        running = []
+        max_running = []
+
+        def exec_command(cmd):
+            running.append(cmd)
+            max_running.append(len(running))
+            time.sleep(0.1)
+            running.remove(cmd)
+
+        self.fake_session.exec_command.side_effect = exec_command
+        ssh = sshutils.SSH("admin", "example.net")
+        ssh._get_client = self.ssh._get_client
+        threads = [threading.Thread(target=ssh.run, args=("cmd%d" % i,))
+                   for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(5, len(max_running))
+        self.assertEqual(2, max(max_running))
+
     @mock.patch("rally.common.sshutils.select")
     def test_run_nonzero_status(self, mock_select):
         mock_select.select.return_value = ([], [], [])
@@ -232,6 +336,17 @@ class SSHRunTestCase(test.TestCase):
         self.assertEqual([mock.call("ok1"), mock.call("ok2")],
                          stdout.write.mock_calls)
 
+    @mock.patch("rally.common.sshutils.select")
+    def test_run_stdout_split_character(self, mock_select):
+        mock_select.select.return_value = ([], [], [])
+        self.fake_session.recv_ready.side_effect = [True, True, False]
+        data = u"\u0436".encode("utf8")
+        self.fake_session.recv.side_effect = [data[:1], data[1:]]
+        stdout = mock.Mock()
+        self.ssh.run("cmd", stdout=stdout)
+        self.assertEqual([mock.call(u""), mock.call(u"\u0436")],
+                         stdout.write.mock_calls)
+
     @mock.patch("rally.common.sshutils.select")
     def test_run_stderr(self, mock_select):
         mock_select.select.return_value = ([], [], [])
@@ -277,6 +392,7 @@ class SSHRunTestCase(test.TestCase):
         mock_select.select.return_value = ([], [], [])
         self.fake_session.exit_status_ready.return_value = False
         self.assertRaises(exceptions.SSHTimeout, self.ssh.run, "cmd")
+        self.fake_session.close.assert_called_once_with()
 
     @mock.patch("rally.common.sshutils.open", create=True)
     def test__put_file_shell(self, mock_open):
@@ -319,3 +435,216 @@ class SSHRunTestCase(test.TestCase):
         self.ssh.put_file("foo", "bar", 42)
         self.ssh._put_file_sftp.assert_called_once_with("foo", "bar", mode=42)
         self.ssh._put_file_shell.assert_called_once_with("foo", "bar", mode=42)
+
+
+class ConnectionPoolTestCase(test.TestCase):
+
+    def test_use(self):
+        pool = sshutils._ConnectionPool(max_idle=2)
+        clients = {}
+        for key in ("foo", "bar", "baz"):
+            with pool.use(key) as connection:
+                connection.client = clients[key] = mock.Mock()
+                self.assertEqual(1, connection.sessions)
+
+        # the least recently used connection is closed
+        clients["foo"].close.assert_called_once_with()
+        self.assertFalse(clients["bar"].close.called)
+
+        with pool.use("bar") as connection:
+            self.assertEqual(clients["bar"], connection.client)
+            with pool.use("foo") as connection:
+                self.assertIsNone(connection.client)
+                connection.client = clients["foo"] = mock.Mock()
+                with pool.use("qux"):
+                    pass
+            # used connections are not closed
+            self.assertFalse(clients["bar"].close.called)
+            clients["baz"].close.assert_called_once_with()
+
+    def test_discard(self):
+        pool = sshutils._ConnectionPool()
+        with pool.use("foo") as connection:
+            connection.client = "client"
+            self.assertFalse(pool.discard("foo", "client"))
+            self.assertTrue(pool.discard("foo", "other_client"))
+        self.assertTrue(pool.discard("foo", "client"))
+        with pool.use("foo") as connection:
+            self.assertIsNone(connection.client)
+
+    @mock.patch("rally.common.sshutils.os.getpid")
+    def test__get_pool(self, mock_getpid):
+        mock_getpid.return_value = 42
+        pool = sshutils._get_pool()
+        self.assertIs(pool, sshutils._get_pool())
+        mock_getpid.return_value = 43
+        self.assertIsNot(pool, sshutils._get_pool())
+
+
+class RunManyTestCase(test.TestCase):
+
+    def test_run_many(self):
+        hosts = [mock.Mock(host="host%d" % i) for i in range(5)]
+        hosts[3].execute.side_effect = exceptions.SSHTimeout("timeout")
+
+        results = sshutils.run_many(hosts, ["cmd", "arg"], stdin="data",
+                                    timeout=5, concurrency=2)
+
+        for i, host in enumerate(hosts):
+            host.execute.assert_called_once_with(["cmd", "arg"],
+                                                 stdin="data", timeout=5)
+            if i == 3:
+                self.assertIsInstance(results[i], exceptions.SSHTimeout)
+            else:
+                self.assertEqual(host.execute.return_value, results[i])
+
+    def test_run_many_no_hosts(self):
+        self.assertEqual([], sshutils.run_many([], "cmd"))
+
+
+class StubSSHServer(paramiko.ServerInterface):
+    """Local SSH server which executes a few commands.
+
+    Commands are "echo <text>", "cat" (copies stdin to stdout), "sleep
+    <seconds>", "yes <bytes>" (prints the number of bytes) and "fail"
+    (prints to stderr and exits with 1).
+    """
+
+    _host_key = None
+
+    def __init__(self):
+        if StubSSHServer._host_key is None:
+            StubSSHServer._host_key = paramiko.RSAKey.generate(1024)
+        self._socket = socket.socket()
+        self._socket.bind(("127.0.0.1", 0))
+        self._socket.listen(100)
+        self.port = self._socket.getsockname()[1]
+        self.transports = []
+        # the number of next channel requests to refuse
+        self.refuse_channels = 0
+        self._thread = threading.Thread(target=self._serve)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _serve(self):
+        while True:
+            try:
+                sock, addr = self._socket.accept()
+            except socket.error:
+                return
+            transport = paramiko.Transport(sock)
+            transport.add_server_key(self._host_key)
+            self.transports.append(transport)
+            transport.start_server(event=threading.Event(), server=self)
+
+    def close(self):
+        self._socket.close()
+        for transport in self.transports:
+            transport.close()
+
+    def get_allowed_auths(self, username):
+        return "password"
+
+    def check_auth_password(self, username, password):
+        if password == "secret":
+            return paramiko.AUTH_SUCCESSFUL
+        return paramiko.AUTH_FAILED
+
+    def check_channel_request(self, kind, chanid):
+        if kind == "session":
+            if self.refuse_channels:
+                self.refuse_channels -= 1
+                return paramiko.OPEN_FAILED_RESOURCE_SHORTAGE
+            return paramiko.OPEN_SUCCEEDED
+        return paramiko.OPEN_FAILED_ADMINISTRATIVELY_PROHIBITED
+
+    def check_channel_exec_request(self, channel, command):
+        thread = threading.Thread(target=self._execute,
+                                  args=(channel, command.decode("utf8")))
+        thread.daemon = True
+        thread.start()
+        return True
+
+    def _execute(self, channel, command):
+        name, _sep, arg = command.partition(" ")
+        status = 0
+        try:
+            if name == "echo":
+                channel.sendall(arg + "\n")
+            elif name == "cat":
+                data = channel.recv(1024)
+                while data:
+                    channel.sendall(data)
+                    data = channel.recv(1024)
+            elif name == "sleep":
+                time.sleep(float(arg))
+            elif name == "yes":
+                channel.sendall(b"y" * int(arg))
+            else:
+                channel.sendall_stderr("error")
+                status = 1
+            # NOTE: the channel is closed by the client, since closing it
+            #   here can outrun the reply to the exec request.
+            channel.send_exit_status(status)
+            channel.shutdown_write()
+        except (EOFError, socket.error):
+            # the session is closed by the client
+            pass
+
+
+class StubSSHServerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StubSSHServerTestCase, self).setUp()
+        self.useFixture(fixtures.MockPatch("rally.common.sshutils._pool",
+                                           sshutils._ConnectionPool()))
+        self.server = StubSSHServer()
+        self.addCleanup(self.server.close)
+
+    def _ssh(self, user="user"):
+        return sshutils.SSH(user, "127.0.0.1", port=self.server.port,
+                            password="secret")
+
+    def test_execute(self):
+        ssh = self._ssh()
+        self.assertEqual((0, "foo\n", ""), ssh.execute("echo foo"))
+        self.assertEqual((0, "bar", ""), ssh.execute("cat", stdin="bar"))
+        self.assertEqual((1, "", "error"), ssh.execute("fail"))
+        self.assertEqual((0, "y" * 1000000, ""),
+                         ssh.execute("yes 1000000"))
+        self.assertRaises(exceptions.SSHError, ssh.run, "fail")
+        self.assertEqual(1, len(self.server.transports))
+
+    def test_run_many(self):
+        hosts = [self._ssh("user%d" % (i % 3)) for i in range(30)]
+        hosts.append(self._ssh("slow"))
+        results = sshutils.run_many(hosts[:-1], "echo ok")
+        self.assertEqual([(0, "ok\n", "")] * 30, results)
+
+        # sessions of the same user share the connection
+        self.assertEqual(3, len(self.server.transports))
+
+        started_at = time.time()
+        results = sshutils.run_many(hosts, ["sleep", "3"], timeout=0.5)
+        self.assertLess(time.time() - started_at, 3)
+        self.assertEqual(31, len(results))
+        for result in results:
+            self.assertIsInstance(result, exceptions.SSHTimeout)
+        self.assertEqual(4, len(self.server.transports))
+
+    def test_run_channel_refused(self):
+        ssh = self._ssh()
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(ssh.execute("sleep 0.5")))
+        thread.start()
+        time.sleep(0.2)
+
+        self.server.refuse_channels = 1
+        self.assertEqual((0, "foo\n", ""), ssh.execute("echo foo"))
+        thread.join()
+        # the running session is not broken by the refused one
+        self.assertEqual([(0, "", "")], results)
+        self.assertEqual(2, len(self.server.transports))
+        self.assertEqual((0, "bar\n", ""), ssh.execute("echo bar"))
+        self.assertEqual(2, len(self.server.transports))
@@ -13,6 +13,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
 import math
 
 import ddt
@@ -221,11 +222,6 @@ class PercentileComputationTestCase(test.TestCase):
         {"stream": "mixed50", "percent": 0.50, "expected": 51.89},
         {"stream": "mixed50", "percent": 0.90, "expected":
             82.81300000000002},
-        {"stream": "mixed5000", "percent": 0.25, "expected":
-            35.54600000000001},
-        {"stream": "mixed5000", "percent": 0.50, "expected": 48.351},
-        {"stream": "mixed5000", "percent": 0.90, "expected":
-            66.05880000000437},
         {"stream": "range5000", "percent": 0.25, "expected": 1249.75},
         {"stream": "range5000", "percent": 0.50, "expected": 2499.5},
         {"stream": "range5000", "percent": 0.90, "expected": 4499.1})
@@ -236,6 +232,57 @@ class PercentileComputationTestCase(test.TestCase):
         [comp.add(i) for i in getattr(self, stream)]
         self.assertEqual(expected, comp.result())
 
+    @ddt.data("mixed1", "mixed6", "mixed16", "mixed50", "range5000")
+    def test_length_is_not_required(self, stream):
+        stream = getattr(self, stream)
+        comp = algo.PercentileComputation(0.9, length=len(stream))
+        comp_unknown = algo.PercentileComputation(0.9)
+        for i in stream:
+            comp.add(i)
+            comp_unknown.add(i)
+        self.assertEqual(comp.result(), comp_unknown.result())
+
+    @ddt.data(0.25, 0.5, 0.9, 0.99)
+    def test_add_and_result_long_stream(self, percent):
+        comp = algo.PercentileComputation(percent, relative_error=0.01)
+        for i in self.mixed5000:
+            comp.add(i)
+        self.assertIsNone(comp._values)
+
+        exact = algo.PercentileComputation(percent,
+                                           exact_size=len(self.mixed5000))
+        for i in self.mixed5000:
+            exact.add(i)
+        self.assertIsNone(exact._sketch)
+        self.assertAlmostEqual(exact.result(), comp.result(),
+                               delta=exact.result() * 0.01)
+
+    @ddt.data((0, 1), (2, 3), (5, 0), (3, 10))
+    @ddt.unpack
+    def test_merge(self, size1, size2):
+        comps = [algo.PercentileComputation(0.5, exact_size=4)
+                 for i in range(3)]
+        for i in range(size1):
+            comps[0].add(i)
+            comps[2].add(i)
+        for i in range(size2):
+            comps[1].add(i * 2)
+            comps[2].add(i * 2)
+        comps[0].merge(comps[1])
+        self.assertEqual(comps[2].result(), comps[0].result())
+
+    def test_to_dict_and_from_dict(self):
+        for size in (3, 30):
+            comp = algo.PercentileComputation(0.9, exact_size=10)
+            for i in range(size):
+                comp.add(i)
+            data = json.loads(json.dumps(comp.to_dict()))
+            restored = algo.PercentileComputation.from_dict(data)
+            self.assertEqual(comp.result(), restored.result())
+            restored.add(1000)
+            comp.add(1000)
+            self.assertEqual(comp.result(), restored.result())
+
     def test_add_raises(self):
         comp = algo.PercentileComputation(0.50, 100)
         self.assertRaises(TypeError, comp.add)
@@ -246,6 +293,94 @@ class PercentileComputationTestCase(test.TestCase):
         self.assertIsNone(comp.result())
 
 
+@ddt.ddt
+class QuantileSketchTestCase(test.TestCase):
+
+    def _exact(self, values, q):
+        values = sorted(values)
+        k = (len(values) - 1) * q
+        f, c = int(math.floor(k)), int(math.ceil(k))
+        return values[f] * (c - k) + values[c] * (k - f) if f != c else (
+            values[f])
+
+    @ddt.data(0.001, 0.1, 0.5, 0.9, 0.99, 0.999)
+    def test_quantile(self, q):
+        values = [1.07 ** (i % 300) * 0.001 for i in range(20000)]
+        sketch = algo.QuantileSketch(relative_error=0.02)
+        for value in values:
+            sketch.add(value)
+        expected = self._exact(values, q)
+        self.assertAlmostEqual(expected, sketch.quantile(q),
+                               delta=expected * 0.02)
+        self.assertEqual(20000, sketch.count)
+        self.assertLessEqual(len(sketch._positive), 300)
+
+    def test_quantile_with_zeros_and_negatives(self):
+        values = [-5.0, -1.0, 0, 0, 1.0, 2.0, 100.0]
+        sketch = algo.QuantileSketch()
+        for value in values:
+            sketch.add(value)
+        self.assertEqual(-5.0, sketch.quantile(0))
+        self.assertAlmostEqual(-1.0, sketch.quantile(1 / 6.0), delta=0.01)
+        self.assertEqual(0, sketch.quantile(0.5))
+        self.assertAlmostEqual(2.0, sketch.quantile(5 / 6.0), delta=0.02)
+        self.assertEqual(100.0, sketch.quantile(1))
+
+    def test_quantile_after_every_value(self):
+        values = [((i * 7919) % 1000 - 300) / 10.0 for i in range(2000)]
+        sketch = algo.QuantileSketch(max_buckets=100)
+        other = algo.QuantileSketch()
+        other.add(55.5)
+        for i, value in enumerate(values):
+            sketch.add(value)
+            if i == 1000:
+                sketch.merge(other)
+            for q in (0, 0.05, 0.5, 0.95, 1):
+                # the same sketch without the cached positions of ranks
+                restored = algo.QuantileSketch.from_dict(sketch.to_dict())
+                self.assertEqual(restored.quantile(q), sketch.quantile(q))
+
+    def test_quantile_empty(self):
+        self.assertIsNone(algo.QuantileSketch().quantile(0.5))
+
+    def test_init_raises(self):
+        self.assertRaises(ValueError, algo.QuantileSketch, 0)
+        self.assertRaises(ValueError, algo.QuantileSketch, 1)
+
+    def test_max_buckets(self):
+        sketch = algo.QuantileSketch(relative_error=0.01, max_buckets=10)
+        for i in range(1, 1001):
+            sketch.add(float(i))
+        self.assertEqual(10, len(sketch._positive))
+        self.assertEqual(1000, sketch.count)
+        self.assertAlmostEqual(990, sketch.quantile(0.99), delta=10)
+
+    def test_merge(self):
+        single = algo.QuantileSketch()
+        sketches = [algo.QuantileSketch() for i in range(3)]
+        for i in range(-100, 1000):
+            single.add(i / 7.0)
+            sketches[i % 3].add(i / 7.0)
+        merged = sketches[0]
+        merged.merge(sketches[1])
+        merged.merge(sketches[2])
+        self.assertEqual(single.to_dict(), merged.to_dict())
+
+    def test_merge_raises(self):
+        self.assertRaises(ValueError, algo.QuantileSketch(0.01).merge,
+                          algo.QuantileSketch(0.02))
+
+    def test_to_dict_and_from_dict(self):
+        sketch = algo.QuantileSketch()
+        for value in (-1, 0, 0.5, 3, 3, 42):
+            sketch.add(value)
+        data = json.loads(json.dumps(sketch.to_dict()))
+        restored = algo.QuantileSketch.from_dict(data)
+        self.assertEqual(sketch.to_dict(), restored.to_dict())
+        for q in (0, 0.3, 0.5, 0.9, 1):
+            self.assertEqual(sketch.quantile(q), restored.quantile(q))
+
+
 class IncrementComputationTestCase(test.TestCase):
 
     def test_add_and_result(self):
@@ -14,6 +14,8 @@
 
 from __future__ import print_function
 import collections
+import copy
+import pickle
 import string
 import sys
 import threading
@@ -494,6 +496,30 @@ class TimeoutThreadTestCase(test.TestCase):
         self.assertLess(time_elapsed, 11,
                         "Thread killed too late (%s seconds)" % time_elapsed)
 
+    def test_cancel_thread_termination(self):
+        ready = threading.Event()
+        gate = threading.Event()
+        errors = []
+
+        def wait():
+            ready.set()
+            try:
+                gate.wait()
+            except exceptions.ThreadTimeoutException as e:
+                errors.append(e)
+
+        test_thread = threading.Thread(target=wait)
+        test_thread.start()
+        ready.wait()
+        # the exception can not be raised while the thread is blocked
+        time.sleep(0.1)
+        utils.terminate_thread(test_thread.ident)
+        utils.cancel_thread_termination(test_thread.ident)
+        gate.set()
+        test_thread.join()
+
+        self.assertEqual([], errors)
+
 
 class LockedDictTestCase(test.TestCase):
 
@@ -509,10 +535,13 @@ class LockedDictTestCase(test.TestCase):
         self.assertEqual({}, d)
 
         d = utils.LockedDict(foo="bar", spam={"a": ["b", {"c": "d"}]})
-        self.assertEqual({"foo": "bar", "spam": {"a": ("b", {"c": "d"})}}, d)
+        self.assertEqual({"foo": "bar", "spam": {"a": ["b", {"c": "d"}]}}, d)
         self.assertIsInstance(d["spam"], utils.LockedDict)
+        self.assertIsInstance(d["spam"]["a"], utils.LockedList)
         self.assertIsInstance(d["spam"]["a"][1], utils.LockedDict)
         self.assertRaises(RuntimeError, setitem, d, 123, 456)
+        self.assertRaises(RuntimeError, d["spam"]["a"].append, "c")
+        self.assertRaises(RuntimeError, setitem, d["spam"]["a"], 0, "c")
         self.assertRaises(RuntimeError, delitem, d, "foo")
         self.assertRaises(RuntimeError, setitem, d["spam"]["a"][1], 123, 456)
         self.assertRaises(RuntimeError, delitem, d["spam"]["a"][1], "c")
@@ -521,7 +550,7 @@ class LockedDictTestCase(test.TestCase):
         self.assertRaises(RuntimeError, d.pop, "foo")
         self.assertRaises(RuntimeError, d.popitem)
         self.assertRaises(RuntimeError, d.clear)
-        self.assertEqual({"foo": "bar", "spam": {"a": ("b", {"c": "d"})}}, d)
+        self.assertEqual({"foo": "bar", "spam": {"a": ["b", {"c": "d"}]}}, d)
 
         with d.unlocked():
             d["spam"] = 42
@@ -546,18 +575,79 @@ class LockedDictTestCase(test.TestCase):
         d = utils.LockedDict(foo="bar", spam={"a": ["b", {"c": "d"}]})
         args, kw = d.__deepcopy__()
         self.assertEqual({"memo": None}, kw)
-        self.assertEqual(({"foo": "bar", "spam": {"a": ("b", {"c": "d"})}},),
+        self.assertEqual(({"foo": "bar", "spam": {"a": ["b", {"c": "d"}]}},),
                          args)
         self.assertEqual(dict, type(args[0]))
         self.assertEqual(dict, type(args[0]["spam"]))
+        self.assertEqual(list, type(args[0]["spam"]["a"]))
         self.assertEqual(dict, type(args[0]["spam"]["a"][1]))
 
         mock_deepcopy.reset_mock()
         args, kw = d.__deepcopy__("foo_memo")
-        self.assertEqual(({"foo": "bar", "spam": {"a": ("b", {"c": "d"})}},),
+        self.assertEqual(({"foo": "bar", "spam": {"a": ["b", {"c": "d"}]}},),
                          args)
         self.assertEqual({"memo": "foo_memo"}, kw)
 
+    def test_init_keeps_order_of_ordered_dicts(self):
+        items = [(str(i), i) for i in range(20, 0, -1)]
+        d = utils.LockedDict(spam=collections.OrderedDict(items))
+
+        self.assertIsInstance(d["spam"], utils.LockedOrderedDict)
+        self.assertEqual(items, list(d["spam"].items()))
+        self.assertRaises(RuntimeError, d["spam"].__setitem__, "a", 1)
+        with d["spam"].unlocked():
+            d["spam"]["a"] = 1
+        self.assertEqual(items + [("a", 1)], list(d["spam"].items()))
+
+        copied = copy.deepcopy(d)
+        self.assertEqual(collections.OrderedDict, type(copied["spam"]))
+        self.assertEqual(list(d["spam"].items()), list(copied["spam"].items()))
+
+    def test_locked_list(self):
+        lst = utils.LockedList([1, 2])
+
+        self.assertEqual([1, 2], lst)
+        self.assertEqual([1, 2, 3], lst + [3])
+        for method, args in (("append", (3,)), ("extend", ([3],)),
+                             ("insert", (0, 3)), ("pop", ()),
+                             ("remove", (1,)), ("reverse", ()),
+                             ("sort", ()), ("__setitem__", (0, 3)),
+                             ("__delitem__", (0,)), ("__iadd__", ([3],))):
+            self.assertRaises(RuntimeError, getattr(lst, method), *args)
+        self.assertEqual([1, 2], lst)
+
+        copied = copy.deepcopy(lst)
+        self.assertEqual(list, type(copied))
+        self.assertEqual([1, 2], copied)
+
+    def test_init_keeps_dict_subclasses(self):
+
+        class Credential(dict):
+            pass
+
+        credential = Credential(username="foo")
+        d = utils.LockedDict(user={"credential": credential},
+                             users=[{"credential": credential}])
+        self.assertIs(credential, d["user"]["credential"])
+        self.assertIs(credential, d["users"][0]["credential"])
+
+    def test_pickle(self):
+        d = utils.LockedDict(foo="bar", spam={"a": ["b", {"c": "d"}]})
+        loaded = pickle.loads(pickle.dumps(d))
+        self.assertEqual(d, loaded)
+        self.assertIsInstance(loaded, utils.LockedDict)
+        self.assertIsInstance(loaded["spam"]["a"], utils.LockedList)
+        self.assertIsInstance(loaded["spam"]["a"][1], utils.LockedDict)
+        self.assertRaises(RuntimeError, loaded.__setitem__, "foo", 42)
+
+    def test_pickle_ordered(self):
+        items = [(str(i), i) for i in range(20, 0, -1)]
+        d = utils.LockedOrderedDict(items)
+        loaded = pickle.loads(pickle.dumps(d))
+        self.assertIsInstance(loaded, utils.LockedOrderedDict)
+        self.assertEqual(items, list(loaded.items()))
+        self.assertRaises(RuntimeError, loaded.__setitem__, "foo", 42)
+
 
 class DequeAsQueueTestCase(test.TestCase):
 
@@ -585,6 +675,45 @@ class DequeAsQueueTestCase(test.TestCase):
         self.assertTrue(self.deque_as_queue.empty())
 
 
+class WaitableDequeTestCase(test.TestCase):
+
+    def test_append_wakes_up_waiter(self):
+        deque = utils.WaitableDeque()
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(deque.wait(timeout=10)))
+        waiter.start()
+        deque.append(42)
+        waiter.join()
+        self.assertEqual([True], results)
+        self.assertEqual([42], list(deque))
+
+    def test_wait_with_items(self):
+        deque = utils.WaitableDeque([1])
+        self.assertTrue(deque.wait())
+
+    def test_wait_stopped(self):
+        deque = utils.WaitableDeque()
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertFalse(deque.wait(stop_event))
+
+    def test_notify_all_wakes_up_waiter(self):
+        deque = utils.WaitableDeque()
+        stop_event = threading.Event()
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(deque.wait(stop_event, 10)))
+        waiter.start()
+        stop_event.set()
+        deque.notify_all()
+        waiter.join()
+        self.assertEqual([False], results)
+
+    def test_timeout(self):
+        self.assertFalse(utils.WaitableDeque().wait(timeout=0.01))
+
+
 class StopwatchTestCase(test.TestCase):
 
     @mock.patch("rally.common.utils.interruptable_sleep")
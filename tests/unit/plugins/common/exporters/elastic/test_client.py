@@ -13,8 +13,14 @@
 #    under the License.
 
 import copy
+import gzip
+import io
+import json
+import threading
 
+import ddt
 import mock
+import six
 
 from rally import exceptions
 from rally.plugins.common.exporters.elastic import client
@@ -24,6 +30,84 @@ from tests.unit import test
 PATH = "rally.plugins.common.exporters.elastic.client"
 
 
+class StubElasticSearch(object):
+    """ElasticSearch 5.x cluster with the bulk API only, for tests.
+
+    It rejects every document with an odd ID for the first time with
+    the 429 status, like an overloaded cluster does.
+    """
+
+    def __init__(self):
+        self.documents = set()
+        self.rejected = set()
+        self.compressed = False
+        self.connections = set()
+        self._lock = threading.Lock()
+        stub = self
+
+        class Handler(six.moves.BaseHTTPServer.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, data):
+                body = json.dumps(data).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_GET(self):
+                self._reply({"version": {"number": "5.6.1"}})
+
+            def do_POST(self):
+                length = int(self.headers["Content-Length"])
+                body = self.rfile.read(length)
+                if self.headers.get("Content-Encoding") == "gzip":
+                    stub.compressed = True
+                    body = gzip.GzipFile(fileobj=io.BytesIO(body)).read()
+                lines = body.decode("utf-8").splitlines()
+                self._reply({"errors": False,
+                             "items": stub.process(self.client_address,
+                                                   lines)})
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self.url = "http://127.0.0.1:%s" % self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        kwargs={"poll_interval": 0.01})
+        self._thread.daemon = True
+        self._thread.start()
+
+    def process(self, client_address, lines):
+        items = []
+        with self._lock:
+            self.connections.add(client_address)
+            for i in range(0, len(lines), 2):
+                doc_id = json.loads(lines[i])["index"]["_id"]
+                if int(doc_id) % 2 and doc_id not in self.rejected:
+                    self.rejected.add(doc_id)
+                    status = 429
+                else:
+                    self.documents.add(doc_id)
+                    status = 201
+                items.append({"index": {"_id": doc_id, "status": status}})
+        return items
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ThreadingHTTPServer(six.moves.socketserver.ThreadingMixIn,
+                          six.moves.BaseHTTPServer.HTTPServer):
+    pass
+
+
+@ddt.ddt
 class ElasticSearchClientTestCase(test.TestCase):
     def test_check_response(self):
         es = client.ElasticSearchClient(None)
@@ -61,8 +145,9 @@ class ElasticSearchClientTestCase(test.TestCase):
         self.assertIsNone(es.version())
         mock_info.assert_called_once_with()
 
-    @mock.patch("%s.requests.get" % PATH)
-    def test_info(self, mock_requests_get):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_info(self, mock_requests_session):
+        mock_requests_get = mock_requests_session.return_value.get
         resp = mock_requests_get.return_value
         resp.status_code = 200
         data = {"version": {"number": "5.6.1"}}
@@ -85,8 +170,9 @@ class ElasticSearchClientTestCase(test.TestCase):
             es.info())
 
     @mock.patch("%s.ElasticSearchClient._check_response" % PATH)
-    @mock.patch("%s.requests.get" % PATH)
-    def test_info_fails(self, mock_requests_get, mock__check_response):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_info_fails(self, mock_requests_session, mock__check_response):
+        mock_requests_get = mock_requests_session.return_value.get
         es = client.ElasticSearchClient(None)
 
         # case #1 - _check_response raises exception. it should not be caught
@@ -119,8 +205,10 @@ class ElasticSearchClientTestCase(test.TestCase):
                       e.format_message())
 
     @mock.patch("%s.ElasticSearchClient._check_response" % PATH)
-    @mock.patch("%s.requests.head" % PATH)
-    def test_check_document(self, mock_requests_head, mock__check_response):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_check_document(self, mock_requests_session,
+                            mock__check_response):
+        mock_requests_head = mock_requests_session.return_value.head
         es = client.ElasticSearchClient(None)
         resp = mock_requests_head.return_value
 
@@ -140,28 +228,163 @@ class ElasticSearchClientTestCase(test.TestCase):
         self.assertIsNone(es.check_document("foo", "bar"))
         mock__check_response.assert_called_once_with(resp, mock.ANY)
 
-    @mock.patch("%s.requests.post" % PATH)
-    def test_push_documents(self, mock_requests_post):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_push_documents(self, mock_requests_session):
+        mock_requests_post = mock_requests_session.return_value.post
         mock_requests_post.return_value.status_code = 200
-        es = client.ElasticSearchClient(None)
+        mock_requests_post.return_value.json.return_value = {"items": []}
+        es = client.ElasticSearchClient(None, concurrency=1,
+                                        compression=False)
         # decrease the size of chunks to not generate 10_001 number of docs
         es.CHUNK_LENGTH = 2
 
-        documents = ["doc1", "doc2", "doc3"]
+        documents = iter(["doc1", "doc2", "doc3"])
 
         es.push_documents(documents)
 
         self.assertEqual(
             [mock.call("http://localhost:9200/_bulk",
-                       data="doc1\ndoc2\n"),
+                       data=b"doc1\ndoc2\n", headers={}),
              mock.call("http://localhost:9200/_bulk",
-                       data="doc3\n")],
+                       data=b"doc3\n", headers={})],
             mock_requests_post.call_args_list
         )
 
+    @ddt.data({"version": "5.6.1", "compressed": True},
+              {"version": "2.4.3", "compressed": False})
+    @ddt.unpack
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_push_documents_compressed(self, mock_requests_session,
+                                       version, compressed):
+        mock_requests_post = mock_requests_session.return_value.post
+        mock_requests_post.return_value.status_code = 200
+        mock_requests_post.return_value.json.return_value = {"items": []}
+        es = client.ElasticSearchClient(None, compression=True)
+        es._version = version
+
+        es.push_documents(["action", "doc"])
+
+        kwargs = mock_requests_post.call_args[1]
+        if compressed:
+            self.assertEqual({"Content-Encoding": "gzip"}, kwargs["headers"])
+            self.assertEqual(b"action\ndoc\n", gzip.GzipFile(
+                fileobj=io.BytesIO(kwargs["data"])).read())
+        else:
+            self.assertEqual({}, kwargs["headers"])
+            self.assertEqual(b"action\ndoc\n", kwargs["data"])
+
+    @mock.patch("%s.ElasticSearchClient._push_chunk" % PATH)
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_push_documents_fails(self, mock_requests_session,
+                                  mock__push_chunk):
+        mock__push_chunk.side_effect = exceptions.RallyException("Oops")
+        es = client.ElasticSearchClient(None, concurrency=1,
+                                        compression=False)
+        es.CHUNK_LENGTH = 2
+        documents = ["doc%s" % i for i in range(10)]
+
+        e = self.assertRaises(exceptions.RallyException,
+                              es.push_documents, iter(documents))
+        self.assertEqual("Oops", e.format_message())
+        # the rest of documents is not pushed after the failure
+        self.assertLess(mock__push_chunk.call_count, 5)
+
+    @mock.patch("%s.time.sleep" % PATH)
+    @mock.patch("%s.requests.Session" % PATH)
+    def test__push_chunk(self, mock_requests_session, mock_sleep):
+        mock_requests_post = mock_requests_session.return_value.post
+        resps = [mock.Mock(status_code=503),
+                 mock.Mock(status_code=200),
+                 mock.Mock(status_code=200)]
+        resps[1].json.return_value = {"items": [
+            {"index": {"_id": "1", "status": 201}},
+            {"index": {"_id": "2", "status": 429}},
+            {"index": {"_id": "3", "status": 200}}]}
+        resps[2].json.return_value = {"items": [
+            {"index": {"_id": "2", "status": 201}}]}
+        mock_requests_post.side_effect = resps
+        es = client.ElasticSearchClient(None, retries=3)
+        lines = ["a1", "d1", "a2", "d2", "a3", "d3"]
+
+        self.assertEqual(3, es._push_chunk(lines, compress=False))
+
+        self.assertEqual(
+            [mock.call("http://localhost:9200/_bulk",
+                       data=b"a1\nd1\na2\nd2\na3\nd3\n", headers={}),
+             mock.call("http://localhost:9200/_bulk",
+                       data=b"a1\nd1\na2\nd2\na3\nd3\n", headers={}),
+             mock.call("http://localhost:9200/_bulk",
+                       data=b"a2\nd2\n", headers={})],
+            mock_requests_post.call_args_list)
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         mock_sleep.call_args_list)
+
+    @mock.patch("%s.time.sleep" % PATH)
+    @mock.patch("%s.requests.Session" % PATH)
+    def test__push_chunk_fails(self, mock_requests_session, mock_sleep):
+        mock_requests_post = mock_requests_session.return_value.post
+        resp = mock_requests_post.return_value
+        resp.status_code = 200
+        es = client.ElasticSearchClient(None, retries=2)
+
+        # case #1: documents are rejected after all retries
+        resp.json.return_value = {"items": [
+            {"index": {"_id": "1", "status": 429}}]}
+        e = self.assertRaises(exceptions.RallyException,
+                              es._push_chunk, ["a1", "d1"], False)
+        self.assertEqual("Failed to push 1 documents to ElasticSearch "
+                         "cluster: they are rejected after 2 retries.",
+                         e.format_message())
+        self.assertEqual(3, mock_requests_post.call_count)
+
+        # case #2: the document is invalid
+        mock_requests_post.reset_mock()
+        resp.json.return_value = {"items": [
+            {"index": {"_id": "1", "status": 400,
+                       "error": {"reason": "failed to parse"}}}]}
+        e = self.assertRaises(exceptions.RallyException,
+                              es._push_chunk, ["a1", "d1"], False)
+        self.assertEqual("[HTTP 400] Failed to push the document 1 to "
+                         "ElasticSearch cluster: failed to parse",
+                         e.format_message())
+        self.assertEqual(1, mock_requests_post.call_count)
+
+        # case #3: the cluster is unavailable
+        mock_requests_post.reset_mock()
+        resp.status_code = 503
+        resp.json.return_value = {"error": "unavailable"}
+        e = self.assertRaises(exceptions.RallyException,
+                              es._push_chunk, ["a1", "d1"], False)
+        self.assertEqual("[HTTP 503] Failed to push documents to "
+                         "ElasticSearch cluster: unavailable",
+                         e.format_message())
+        self.assertEqual(3, mock_requests_post.call_count)
+
+    def test_push_documents_to_server(self):
+        server = StubElasticSearch()
+        self.addCleanup(server.stop)
+        es = client.ElasticSearchClient(server.url, concurrency=3)
+        es.CHUNK_LENGTH = 4
+        es.RETRY_INTERVAL = 0
+
+        documents = []
+        for i in range(50):
+            documents.append(json.dumps({"index": {"_id": str(i)}}))
+            documents.append(json.dumps({"value": i}))
+
+        es.push_documents(iter(documents))
+
+        self.assertEqual(set(str(i) for i in range(50)), server.documents)
+        # every second document is rejected once
+        self.assertEqual(25, len(server.rejected))
+        self.assertTrue(server.compressed)
+        # connections are reused by requests
+        self.assertLessEqual(len(server.connections), 3)
+
     @mock.patch("%s.ElasticSearchClient._check_response" % PATH)
-    @mock.patch("%s.requests.get" % PATH)
-    def test_list_indices(self, mock_requests_get, mock__check_response):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_list_indices(self, mock_requests_session, mock__check_response):
+        mock_requests_get = mock_requests_session.return_value.get
         mock_requests_get.return_value.text = "foo bar\n"
         es = client.ElasticSearchClient(None)
 
@@ -174,9 +397,10 @@ class ElasticSearchClientTestCase(test.TestCase):
 
     @mock.patch("%s.json.dumps" % PATH)
     @mock.patch("%s.ElasticSearchClient._check_response" % PATH)
-    @mock.patch("%s.requests.put" % PATH)
-    def test_create_index_es_3(self, mock_requests_put, mock__check_response,
-                               mock_json_dumps):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_create_index_es_3(self, mock_requests_session,
+                               mock__check_response, mock_json_dumps):
+        mock_requests_put = mock_requests_session.return_value.put
         es = client.ElasticSearchClient(None)
         es._version = "3"
         i_name = "foo"
@@ -197,9 +421,10 @@ class ElasticSearchClientTestCase(test.TestCase):
 
     @mock.patch("%s.json.dumps" % PATH)
     @mock.patch("%s.ElasticSearchClient._check_response" % PATH)
-    @mock.patch("%s.requests.put" % PATH)
-    def test_create_index_es_2(self, mock_requests_put, mock__check_response,
-                               mock_json_dumps):
+    @mock.patch("%s.requests.Session" % PATH)
+    def test_create_index_es_2(self, mock_requests_session,
+                               mock__check_response, mock_json_dumps):
+        mock_requests_put = mock_requests_session.return_value.put
         es = client.ElasticSearchClient(None)
         es._version = "2.4.3"
         i_name = "foo"
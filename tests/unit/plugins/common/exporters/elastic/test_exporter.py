@@ -168,7 +168,7 @@ class ElasticSearchExporterTestCase(test.TestCase):
                                                            "xxx": "yyy"}})))
 
     @ddt.data(None, "/home/bar", "https://example.com")
-    def test__add_index(self, destination):
+    def test__make_index(self, destination):
 
         index = "foo"
         doc_type = "bar"
@@ -180,20 +180,22 @@ class ElasticSearchExporterTestCase(test.TestCase):
 
         exporter = elastic.ElasticSearchExporter([], destination)
 
-        exporter._add_index(index=index,
-                            body=body,
-                            doc_id=doc_id,
-                            doc_type=doc_type)
+        lines = exporter._make_index(index=index,
+                                     body=body,
+                                     doc_id=doc_id,
+                                     doc_type=doc_type)
 
-        self.assertEqual(2, len(exporter._report))
+        self.assertEqual(2, len(lines))
         self.assertEqual({"index": {"_index": index,
                                     "_type": doc_type,
                                     "_id": doc_id}},
-                         json.loads(exporter._report[0]))
+                         json.loads(lines[0]))
+        self.assertEqual(body, json.loads(lines[1]))
 
     @ddt.data(True, False)
-    @mock.patch("%s.ElasticSearchExporter._add_index" % PATH)
-    def test__process_atomic_actions(self, known_fail, mock__add_index):
+    @mock.patch("%s.ElasticSearchExporter._make_index" % PATH)
+    def test__process_atomic_actions(self, known_fail, mock__make_index):
+        mock__make_index.return_value = ["action", "document"]
         es_exporter = elastic.ElasticSearchExporter({}, None)
 
         itr_data = {"id": "foo_bar_uuid",
@@ -221,10 +223,10 @@ class ElasticSearchExporterTestCase(test.TestCase):
             atomic_actions[-1]["failed"] = True
             atomic_actions[-1]["children"][-1]["failed"] = True
 
-        es_exporter._process_atomic_actions(
+        lines = list(es_exporter._process_atomic_actions(
             deployment_uuid="dep_uuid", deployment_name="dep_name",
             atomic_actions=atomic_actions, itr=itr_data,
-            workload_id="wid", workload=workload)
+            workload_id="wid", workload=workload))
 
         expected_calls = [
             mock.call(
@@ -302,7 +304,8 @@ class ElasticSearchExporterTestCase(test.TestCase):
                     "workload_uuid": "wid"},
                 doc_id="foo_bar_uuid_action_no-name-action_0"))
 
-        self.assertEqual(expected_calls, mock__add_index.call_args_list)
+        self.assertEqual(expected_calls, mock__make_index.call_args_list)
+        self.assertEqual(["action", "document"] * len(expected_calls), lines)
 
     def test_generate_fails_on_doc_exists(self):
         destination = "http://example.com"
@@ -324,6 +327,32 @@ class ElasticSearchExporterTestCase(test.TestCase):
         exporter.api.deployment.get.assert_called_once_with(
             "deployment-uuu-iii-iii-ddd")
 
+    def test_generate_push_fails(self):
+        destination = "http://example.com"
+        client = self.es_cls.return_value
+        client.check_document.return_value = False
+        pushed = []
+
+        def push_documents(documents):
+            pushed.extend(json.loads(line) for line in documents)
+            # one of the last chunks is failed to push
+            raise exceptions.RallyException("Failed to push")
+
+        client.push_documents.side_effect = push_documents
+
+        exporter = elastic.ElasticSearchExporter(get_tasks_results(),
+                                                 destination)
+        exporter.api = mock.MagicMock()
+        exporter.api.deployment.get.return_value = {"name": "nice_name"}
+
+        self.assertRaises(exceptions.RallyException, exporter.generate)
+        # the task is not pushed, so the export can be retried
+        self.assertEqual(1, client.push_documents.call_count)
+        self.assertEqual(
+            ["rally_atomic_action_data_v1", "rally_workload_data_v1"],
+            sorted(set(l["index"]["_index"] for l in pushed
+                       if "index" in l)))
+
     def test__ensure_indices(self):
         es = mock.MagicMock()
         exporter = elastic.ElasticSearchExporter([], None)
@@ -386,7 +415,9 @@ class ElasticSearchExporterTestCase(test.TestCase):
                  mock.call("rally_task_data_v1", second_task["uuid"])],
                 client.check_document.call_args_list
             )
-            client.push_documents.assert_called_once_with(exporter._report)
+            self.assertEqual(2, client.push_documents.call_count)
+            lines = [line for call in client.push_documents.call_args_list
+                     for line in call[0][0]]
             client.list_indices.assert_called_once_with()
             self.assertEqual(3, client.create_index.call_count)
         else:
@@ -397,25 +428,11 @@ class ElasticSearchExporterTestCase(test.TestCase):
             data = result["files"][destination].split("\n")
             # the should be always empty line in the end
             self.assertEqual("", data[-1])
+            lines = data[:-1]
 
-        data = [json.loads(l) for l in exporter._report]
+        data = [json.loads(l) for l in lines]
         self.assertIsInstance(data, list)
         expected = [
-            {
-                "index": {"_id": "2fa4f5ff-7d23-4bb0-9b1f-8ee235f7f1c8",
-                          "_index": "rally_task_data_v1",
-                          "_type": "data"}
-            },
-            {
-                "title": "foo",
-                "description": "bar",
-                "deployment_uuid": "deployment-uuu-iii-iii-ddd",
-                "deployment_name": "nice_name",
-                "status": "ok",
-                "pass_sla": "yup",
-                "task_uuid": "2fa4f5ff-7d23-4bb0-9b1f-8ee235f7f1c8",
-                "tags": ["tag-1", "tag-2"]
-            },
             {
                 "index": {"_id": "4dcd88a5-164b-4431-8b44-3979868116dd",
                           "_index": "rally_workload_data_v1",
@@ -508,6 +525,22 @@ class ElasticSearchExporterTestCase(test.TestCase):
                 "success": False,
                 "workload_uuid": "4dcd88a5-164b-4431-8b44-3979868116dd"
             },
+            # documents of tasks are the last ones
+            {
+                "index": {"_id": "2fa4f5ff-7d23-4bb0-9b1f-8ee235f7f1c8",
+                          "_index": "rally_task_data_v1",
+                          "_type": "data"}
+            },
+            {
+                "title": "foo",
+                "description": "bar",
+                "deployment_uuid": "deployment-uuu-iii-iii-ddd",
+                "deployment_name": "nice_name",
+                "status": "ok",
+                "pass_sla": "yup",
+                "task_uuid": "2fa4f5ff-7d23-4bb0-9b1f-8ee235f7f1c8",
+                "tags": ["tag-1", "tag-2"]
+            },
             {
                 "index": {"_id": "2fa4f5ff-7d23-4bb0-9b1f-8ee235f7f1c8",
                           "_index": "rally_task_data_v1",
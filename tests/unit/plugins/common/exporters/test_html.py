@@ -140,3 +140,35 @@ class HTMLExporterTestCase(test.TestCase):
             }],
             reporter._generate_results()
         )
+
+
+class HTMLStreamExporterTestCase(test.TestCase):
+
+    @mock.patch("%s.plot.stream" % PATH)
+    def test_generate_print(self, mock_stream):
+        mock_stream.side_effect = lambda results, out, include_libs: (
+            out.write(u"html"))
+        reporter = html.HTMLStreamExporter(get_tasks_results(), None)
+        reporter._generate_results = mock.MagicMock()
+
+        self.assertEqual({"print": "html"}, reporter.generate())
+
+        mock_stream.assert_called_once_with(
+            reporter._generate_results.return_value, mock.ANY,
+            include_libs=False)
+
+    @mock.patch("%s.io.open" % PATH)
+    @mock.patch("%s.plot.stream" % PATH)
+    def test_generate_file(self, mock_stream, mock_io_open):
+        reporter = html.HTMLStreamExporter(get_tasks_results(), "path")
+        reporter._generate_results = mock.MagicMock()
+
+        self.assertEqual({"open": "file://" + os.path.abspath("path")},
+                         reporter.generate())
+
+        mock_io_open.assert_called_once_with(os.path.abspath("path"), "w",
+                                             encoding="utf-8")
+        mock_stream.assert_called_once_with(
+            reporter._generate_results.return_value,
+            mock_io_open.return_value.__enter__.return_value,
+            include_libs=False)
@@ -14,9 +14,11 @@
 
 import collections
 import datetime as dt
+import json
 
 import mock
 
+from rally.common import db
 from rally.common import version as rally_version
 from rally.plugins.common.exporters import json_exporter
 from tests.unit.plugins.common.exporters import test_html
@@ -81,9 +83,9 @@ class JSONExporterTestCase(test.TestCase):
                 ])
             ])], reporter._generate_tasks())
 
-    @mock.patch("%s.json.dumps" % PATH, return_value="json")
+    @mock.patch("%s.JSONExporter._dumps" % PATH, return_value="json")
     @mock.patch("%s.dt" % PATH)
-    def test_generate(self, mock_dt, mock_json_dumps):
+    def test_generate(self, mock_dt, mock_json_exporter__dumps):
         mock_dt.datetime.utcnow.return_value = dt.datetime.utcnow()
         tasks_results = test_html.get_tasks_results()
 
@@ -101,12 +103,46 @@ class JSONExporterTestCase(test.TestCase):
             mock_dt.datetime.utcnow.return_value,
             json_exporter.TIMEFORMAT)
         reporter._generate_tasks.assert_called_once_with()
-        mock_json_dumps.assert_called_once_with(results,
-                                                sort_keys=False,
-                                                indent=4)
+        mock_json_exporter__dumps.assert_called_once_with(results)
 
         # export to file
         reporter = json_exporter.JSONExporter(tasks_results,
                                               output_destination="path")
         self.assertEqual({"files": {"path": "json"},
                           "open": "file://path"}, reporter.generate())
+
+    def test__dumps(self):
+        class Stream(db.WorkloadDataStream):
+            def __init__(self, data):
+                self.data = data
+
+            def __iter__(self):
+                return iter(self.data)
+
+        data = [{"timestamp": 1, "error": [], "atomic_actions": [
+                 {"name": "foo", "children": []}]},
+                {"timestamp": 2, "error": ["e", "m", "t"],
+                 "atomic_actions": []}]
+        results = collections.OrderedDict([
+            ("info", {"a": "b"}),
+            ("tasks", [collections.OrderedDict([
+                ("uuid", "uuid"),
+                ("workloads", [
+                    collections.OrderedDict([("data", data), ("x", 1)]),
+                    collections.OrderedDict([("data", []), ("x", 2)]),
+                    collections.OrderedDict([("data", data[:1])])])])]),
+            ("keys", {2: [], None: {}, 1.5: (), True: "",
+                      u"\u043a": u"\u0437\u043d\u0430\u0447"})])
+        expected = json.dumps(results, indent=4)
+
+        workloads = results["tasks"][0]["workloads"]
+        workloads[0]["data"] = Stream(data)
+        workloads[1]["data"] = Stream([])
+        self.assertEqual(expected, json_exporter.JSONExporter._dumps(results))
+        self.assertEqual(Stream, type(workloads[0]["data"]))
+
+    def test__dumps_not_serializable(self):
+        self.assertRaises(TypeError, json_exporter.JSONExporter._dumps,
+                          {"tasks": [{"foo": object()}]})
+        self.assertRaises(TypeError, json_exporter.JSONExporter._dumps,
+                          {"tasks": {(1, 2): "foo"}})
@@ -13,9 +13,16 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
+
 import ddt
+import fixtures
 import mock
+from six.moves import queue as Queue
 
+from rally.common import utils
+from rally import exceptions
 from rally.plugins.common.runners import constant
 from rally.task import runner
 from tests.unit import fakes
@@ -42,6 +49,9 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
                 "concurrency": 2,
                 "timeout": 2,
                 "max_cpu_count": 2}, True),
+              ({"times": 4,
+                "concurrency": 2,
+                "thread_pool": True}, True),
               ({"times": 4,
                 "concurrency": 5,
                 "timeout": 2,
@@ -110,6 +120,164 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             )
             self.assertIn(call, mock_thread.mock_calls)
 
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pool_worker_thread(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        mock_aborted = mock.MagicMock(is_set=mock.MagicMock(
+            return_value=False))
+        timeout_queue = mock.MagicMock()
+        context = {"task": {"uuid": "uuid"}}
+
+        constant._pool_worker_thread(
+            mock_queue, iter(range(10)), 3, 2, timeout_queue, context,
+            "Dummy", "dummy", (), mock_event_queue, mock_aborted)
+
+        self.assertEqual(
+            [mock.call(i, context) for i in range(3)],
+            mock_runner._get_scenario_context.call_args_list)
+        self.assertEqual(3, mock_runner._run_scenario_once.call_count)
+        self.assertEqual(
+            [mock.call(mock_runner._run_scenario_once.return_value)] * 3,
+            mock_queue.put.call_args_list)
+        self.assertEqual(3, timeout_queue.put.call_count)
+        for call in timeout_queue.put.call_args_list:
+            watcher, deadline = call[0][0]
+            self.assertFalse(watcher._running)
+            self.assertFalse(watcher._terminated)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pool_worker_thread_aborted(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_aborted = mock.MagicMock(is_set=mock.MagicMock(
+            return_value=True))
+
+        constant._pool_worker_thread(
+            mock_queue, iter(range(10)), 3, 0, None, {}, "Dummy", "dummy",
+            (), mock.MagicMock(), mock_aborted)
+
+        self.assertFalse(mock_runner._run_scenario_once.called)
+        self.assertFalse(mock_queue.put.called)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pool_worker_thread_timeout_after_iteration(self, mock_runner):
+        mock_queue = mock.MagicMock()
+        mock_aborted = mock.MagicMock(is_set=mock.MagicMock(
+            return_value=False))
+        mock_runner._run_scenario_once.side_effect = (
+            exceptions.ThreadTimeoutException())
+
+        constant._pool_worker_thread(
+            mock_queue, iter(range(10)), 1, 2, None, {}, "Dummy", "dummy",
+            (), mock.MagicMock(), mock_aborted)
+
+        mock_queue.put.assert_called_once_with(
+            mock_runner.format_result_on_timeout.return_value)
+
+    @mock.patch(RUNNERS + "constant.utils")
+    def test__iteration_watcher(self, mock_utils):
+        ident = threading.current_thread().ident
+        watcher = constant._IterationWatcher()
+        self.assertEqual(ident, watcher.ident)
+
+        self.assertFalse(watcher.isAlive())
+        mock_utils.terminate_thread.assert_called_once_with(ident)
+        # the iteration is interrupted only once
+        self.assertFalse(watcher.isAlive())
+        self.assertEqual(1, mock_utils.terminate_thread.call_count)
+        watcher.finish()
+        mock_utils.cancel_thread_termination.assert_called_once_with(ident)
+
+        mock_utils.reset_mock()
+        watcher = constant._IterationWatcher()
+        watcher.finish()
+        self.assertFalse(watcher.isAlive())
+        self.assertFalse(mock_utils.terminate_thread.called)
+        self.assertFalse(mock_utils.cancel_thread_termination.called)
+
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__pool_worker_thread_timeout_before_finish(self, mock_runner):
+        # the timeout expires when the scenario has returned, but the
+        # iteration is not finished yet
+        results = [{"iteration": 0}, {"iteration": 1}]
+        second_started = threading.Event()
+
+        def run_scenario_once(*args):
+            if mock_runner._run_scenario_once.call_count == 2:
+                second_started.set()
+                time.sleep(0.2)
+            return results[mock_runner._run_scenario_once.call_count - 1]
+
+        mock_runner._run_scenario_once.side_effect = run_scenario_once
+        mock_runner._check_result_in_worker.return_value = True
+        timeout_queue = Queue.Queue()
+        finishing = threading.Event()
+        checked = threading.Event()
+
+        class Watcher(constant._IterationWatcher):
+            def finish(self):
+                if not checked.is_set():
+                    finishing.set()
+                    checked.wait()
+                super(Watcher, self).finish()
+
+        self.useFixture(fixtures.MockPatch(
+            RUNNERS + "constant._IterationWatcher", Watcher))
+        mock_queue = mock.MagicMock()
+        mock_aborted = mock.MagicMock(is_set=mock.MagicMock(
+            return_value=False))
+
+        thread = threading.Thread(
+            target=constant._pool_worker_thread,
+            args=(mock_queue, iter(range(10)), 2, 1, timeout_queue, {},
+                  "Dummy", "dummy", (), mock.MagicMock(), mock_aborted))
+        thread.start()
+        watcher = timeout_queue.get()[0]
+        finishing.wait()
+        # the same steps as `utils.timeout_thread` does, but the thread
+        # is allowed to go on between reading of ident and terminating
+        if watcher.isAlive():
+            ident = watcher.ident
+            checked.set()
+            second_started.wait(5)
+            utils.terminate_thread(ident)
+        else:
+            checked.set()
+        thread.join()
+
+        # the late timeout affects neither the iteration, nor the next one
+        self.assertEqual([mock.call(r) for r in results],
+                         mock_queue.put.call_args_list)
+        self.assertFalse(mock_runner.format_result_on_timeout.called)
+
+    @mock.patch(RUNNERS + "constant.threading.Thread")
+    @mock.patch(RUNNERS + "constant.runner")
+    def test__worker_process_with_pool(self, mock_runner, mock_thread):
+        mock_queue = mock.MagicMock()
+        mock_event_queue = mock.MagicMock()
+        mock_aborted = mock.MagicMock()
+        iteration_gen = iter(range(10))
+        context = {"task": {"uuid": "uuid"}}
+        info = {"processes_to_start": 1, "processes_counter": 1}
+
+        constant._worker_process_with_pool(
+            mock_queue, iteration_gen, 1, 3, 4, context, "Dummy", "dummy",
+            (), mock_event_queue, mock_aborted, info)
+
+        # one timeout collector and 3 threads of the pool
+        self.assertEqual(4, mock_thread.call_count)
+        self.assertEqual(4, mock_thread.return_value.start.call_count)
+        self.assertEqual(4, mock_thread.return_value.join.call_count)
+        pool_calls = [c for c in mock_thread.call_args_list
+                      if c[1]["target"] == constant._pool_worker_thread]
+        self.assertEqual(3, len(pool_calls))
+        for c in pool_calls:
+            self.assertEqual(
+                (mock_queue, iteration_gen, 4, 1), c[1]["args"][:4])
+            self.assertEqual(
+                (context, "Dummy", "dummy", (), mock_event_queue,
+                 mock_aborted), c[1]["args"][5:])
+
     @mock.patch(RUNNERS_BASE + "_run_scenario_once")
     def test__worker_thread(self, mock__run_scenario_once):
         mock_queue = mock.MagicMock()
@@ -136,6 +304,18 @@ class ConstantScenarioRunnerTestCase(test.TestCase):
             for result in result_batch:
                 self.assertIsNotNone(result)
 
+    def test__run_scenario_with_thread_pool(self):
+        self.config["thread_pool"] = True
+        runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
+
+        runner_obj._run_scenario(
+            fakes.FakeScenario, "do_it", self.context, self.args)
+        self.assertEqual(self.config["times"], len(runner_obj.result_queue))
+        for result_batch in runner_obj.result_queue:
+            for result in result_batch:
+                self.assertIsNotNone(result)
+                self.assertEqual([], result["error"])
+
     def test__run_scenario_exception(self):
         runner_obj = constant.ConstantScenarioRunner(self.task, self.config)
 
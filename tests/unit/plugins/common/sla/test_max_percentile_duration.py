@@ -0,0 +1,96 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+
+import ddt
+
+from rally.plugins.common.sla import max_percentile_duration
+from rally.task import sla
+from tests.unit import test
+
+
+@ddt.ddt
+class MaxPercentileDurationTestCase(test.TestCase):
+
+    @ddt.data(({"percentile": 99, "max": 1}, True),
+              ({"percentile": 99.9, "max": 0.5}, True),
+              ({"percentile": 0, "max": 1}, False),
+              ({"percentile": 100, "max": 1}, True),
+              ({"percentile": 101, "max": 1}, False),
+              ({"percentile": 50, "max": 0}, False),
+              ({"percentile": 50}, False),
+              ({"max": 1}, False),
+              ({"percentile": 50, "max": 1, "foo": 2}, False))
+    @ddt.unpack
+    def test_validate(self, config, valid):
+        results = sla.SLA.validate("max_percentile_duration", None, None,
+                                   config)
+        if valid:
+            self.assertEqual([], results)
+        else:
+            self.assertEqual(1, len(results))
+
+    def test_result(self):
+        sla1 = max_percentile_duration.MaxPercentileDuration(
+            {"percentile": 90, "max": 9.0})
+        sla2 = max_percentile_duration.MaxPercentileDuration(
+            {"percentile": 50, "max": 9.5})
+        for sla_inst in [sla1, sla2]:
+            for duration in range(1, 11):
+                sla_inst.add_iteration({"duration": float(duration)})
+            sla_inst.add_iteration({"duration": 100.0, "error": ["e"]})
+        self.assertFalse(sla1.result()["success"])
+        self.assertTrue(sla2.result()["success"])
+        self.assertEqual("Failed", sla1.status())
+        self.assertEqual("Passed", sla2.status())
+        self.assertIn("90%ile duration of one iteration",
+                      sla1.result()["detail"])
+
+    def test_result_no_iterations(self):
+        sla_inst = max_percentile_duration.MaxPercentileDuration(
+            {"percentile": 99, "max": 1})
+        self.assertTrue(sla_inst.result()["success"])
+
+    def test_add_iteration(self):
+        sla_inst = max_percentile_duration.MaxPercentileDuration(
+            {"percentile": 50, "max": 4.0})
+        self.assertTrue(sla_inst.add_iteration({"duration": 3.5}))
+        self.assertFalse(sla_inst.add_iteration({"duration": 5.0}))
+        self.assertTrue(sla_inst.add_iteration({"duration": 1.0}))
+        self.assertTrue(sla_inst.add_iteration({"duration": 7.0,
+                                                "error": ["error"]}))
+
+    @ddt.data([[1.0, 2.0, 1.5, 4.3],
+               [2.1, 3.4, 1.2, 6.3, 7.2, 7.0, 1.],
+               [1.1, 1.1, 2.2, 2.2, 3.3, 4.3]])
+    def test_merge(self, durations):
+        config = {"percentile": 75, "max": 4.0}
+        single_sla = max_percentile_duration.MaxPercentileDuration(config)
+        for dd in durations:
+            for d in dd:
+                single_sla.add_iteration({"duration": d})
+
+        slas = [max_percentile_duration.MaxPercentileDuration(config)
+                for _ in durations]
+        for idx, sla_inst in enumerate(slas):
+            for duration in durations[idx]:
+                sla_inst.add_iteration({"duration": duration})
+
+        merged_sla = slas[0]
+        for sla_inst in slas[1:]:
+            merged_sla.merge(sla_inst)
+
+        self.assertEqual(single_sla.success, merged_sla.success)
+        self.assertEqual(single_sla.duration, merged_sla.duration)
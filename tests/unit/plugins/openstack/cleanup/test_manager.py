@@ -283,17 +283,114 @@ class SeekAndDestroyTestCase(test.TestCase):
         mock__delete_single_resource.assert_called_once_with(
             mock_mgr.return_value)
 
-    @mock.patch("%s.broker.run" % BASE)
-    def test_exterminate(self, mock_broker_run):
+    @mock.patch("%s.CleanupScheduler" % BASE)
+    def test_exterminate(self, mock_cleanup_scheduler):
         manager_cls = mock.MagicMock(_threads=5)
         cleaner = manager.SeekAndDestroy(manager_cls, None, None)
-        cleaner._publisher = mock.Mock()
-        cleaner._consumer = mock.Mock()
-        cleaner.exterminate()
+        scheduler = mock_cleanup_scheduler.return_value
 
-        mock_broker_run.assert_called_once_with(cleaner._publisher,
-                                                cleaner._consumer,
-                                                consumers_count=5)
+        self.assertEqual(scheduler.run.return_value, cleaner.exterminate())
+
+        mock_cleanup_scheduler.assert_called_once_with(workers=5)
+        scheduler.add.assert_called_once_with(cleaner)
+        scheduler.run.assert_called_once_with()
+
+
+class CleanupSchedulerTestCase(test.TestCase):
+
+    def _destroyer(self, name, order, tenants, threads=20):
+        destroyer = mock.Mock()
+        destroyer.manager_cls = mock.Mock(_service=name, _resource="r",
+                                          _order=order, _threads=threads)
+        destroyer._list_managers.return_value = [
+            ("admin", tenant_id and {"tenant_id": tenant_id}, "manager")
+            for tenant_id in tenants]
+        return destroyer
+
+    def test__build(self):
+        scheduler = manager.CleanupScheduler(workers=1)
+        first = self._destroyer("first", 1, ["t1", "t2"])
+        same_order = self._destroyer("same_order", 1, ["t1"])
+        second = self._destroyer("second", 2, ["t1", "t1", "t2"])
+        admin = self._destroyer("admin", 3, [None])
+        last = self._destroyer("last", 4, ["t2"])
+        for destroyer in (last, admin, second, same_order, first):
+            scheduler.add(destroyer)
+
+        nodes = dict(((n.destroyer.manager_cls._service,
+                       n.listers[0][1] and n.listers[0][1]["tenant_id"]), n)
+                     for n in scheduler._build())
+
+        self.assertEqual(
+            {("first", "t1"), ("first", "t2"), ("same_order", "t1"),
+             ("second", "t1"), ("second", "t2"), ("admin", None),
+             ("last", "t2")},
+            set(nodes))
+        self.assertEqual(2, len(nodes[("second", "t1")].listers))
+        self.assertEqual(dict((key, key[1]) for key in nodes),
+                         dict((key, n.tenant_id) for key, n in nodes.items()))
+        self.assertEqual(
+            {("first", "t1"): 0, ("first", "t2"): 0, ("same_order", "t1"): 0,
+             ("second", "t1"): 2, ("second", "t2"): 1, ("admin", None): 2,
+             ("last", "t2"): 1},
+            dict((key, n.waits_for) for key, n in nodes.items()))
+        self.assertEqual(
+            [nodes[("second", "t1")]],
+            nodes[("first", "t1")].successors)
+        self.assertEqual([nodes[("admin", None)]],
+                         nodes[("second", "t1")].successors)
+        self.assertEqual([nodes[("last", "t2")]],
+                         nodes[("admin", None)].successors)
+
+    def test_run(self):
+        events = []
+
+        def publish(admin, user, mgr, queue):
+            events.append(("list", mgr))
+            for i in range(3):
+                queue.append((admin, user, "%s-%s" % (mgr, i)))
+
+        def consume(cache, args):
+            events.append(("delete", args[2]))
+
+        scheduler = manager.CleanupScheduler(workers=4)
+        destroyers = [self._destroyer("a", 1, ["t1", "t2"], threads=1),
+                      self._destroyer("b", 2, [None])]
+        for destroyer in destroyers:
+            destroyer._list_managers.return_value = [
+                (admin, user, "%s-%s" % (destroyer.manager_cls._service,
+                                         user and user["tenant_id"]))
+                for admin, user, mgr in destroyer._list_managers()]
+            destroyer._publish.side_effect = publish
+            destroyer._consumer.side_effect = consume
+            scheduler.add(destroyer)
+
+        timings = scheduler.run()
+
+        self.assertEqual(["a", "b"], [t["name"].split(".")[0]
+                                      for t in timings])
+        self.assertLessEqual(timings[0]["finished_at"],
+                             timings[1]["started_at"])
+        self.assertEqual(["t1", "t2"],
+                         [n["tenant_id"] for n in timings[0]["nodes"]])
+        self.assertEqual([None], [n["tenant_id"] for n in timings[1]["nodes"]])
+        for timing in timings:
+            self.assertEqual(min(n["started_at"] for n in timing["nodes"]),
+                             timing["started_at"])
+            self.assertEqual(max(n["finished_at"] for n in timing["nodes"]),
+                             timing["finished_at"])
+            for node in timing["nodes"]:
+                self.assertLessEqual(node["started_at"], node["finished_at"])
+        deleted = [args for event, args in events if event == "delete"]
+        self.assertEqual(9, len(deleted))
+        self.assertEqual(["b-None-%s" % i for i in range(3)], deleted[-3:])
+        self.assertEqual({"a-t1-0", "a-t1-1", "a-t1-2",
+                          "a-t2-0", "a-t2-1", "a-t2-2"}, set(deleted[:6]))
+
+    def test_run_without_resources(self):
+        scheduler = manager.CleanupScheduler(workers=4)
+        scheduler.add(self._destroyer("a", 1, []))
+        self.assertEqual([], scheduler.run())
 
 
 class ResourceManagerTestCase(test.TestCase):
@@ -362,11 +459,12 @@ class ResourceManagerTestCase(test.TestCase):
                                                         admin_required=False))
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.CleanupScheduler" % BASE)
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     def test_cleanup(self, mock_find_resource_managers, mock_seek_and_destroy,
-                     mock_itersubclasses):
+                     mock_cleanup_scheduler, mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
             pass
 
@@ -375,10 +473,10 @@ class ResourceManagerTestCase(test.TestCase):
 
         mock_itersubclasses.return_value = [A, B]
 
-        manager.cleanup(names=["a", "b"], admin_required=True,
-                        admin="admin", users=["user"],
-                        superclass=A,
-                        task_id="task_id")
+        result = manager.cleanup(names=["a", "b"], admin_required=True,
+                                 admin="admin", users=["user"],
+                                 superclass=A,
+                                 task_id="task_id")
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
 
@@ -386,20 +484,24 @@ class ResourceManagerTestCase(test.TestCase):
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=None,
                       resource_classes=[A], task_id="task_id"),
-            mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=None,
-                      resource_classes=[A], task_id="task_id"),
-            mock.call().exterminate()
+                      resource_classes=[A], task_id="task_id")
         ])
+        scheduler = mock_cleanup_scheduler.return_value
+        self.assertEqual([mock.call(mock_seek_and_destroy.return_value)] * 2,
+                         scheduler.add.call_args_list)
+        self.assertEqual(scheduler.run.return_value, result)
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.CleanupScheduler" % BASE)
     @mock.patch("%s.SeekAndDestroy" % BASE)
     @mock.patch("%s.find_resource_managers" % BASE,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     def test_cleanup_with_api_versions(self,
                                        mock_find_resource_managers,
                                        mock_seek_and_destroy,
+                                       mock_cleanup_scheduler,
                                        mock_itersubclasses):
         class A(utils.RandomNameGeneratorMixin):
             pass
@@ -410,11 +512,11 @@ class ResourceManagerTestCase(test.TestCase):
         mock_itersubclasses.return_value = [A, B]
 
         api_versions = {"cinder": {"version": "1", "service_type": "volume"}}
-        manager.cleanup(names=["a", "b"], admin_required=True,
-                        admin="admin", users=["user"],
-                        api_versions=api_versions,
-                        superclass=utils.RandomNameGeneratorMixin,
-                        task_id="task_id")
+        result = manager.cleanup(names=["a", "b"], admin_required=True,
+                                 admin="admin", users=["user"],
+                                 api_versions=api_versions,
+                                 superclass=utils.RandomNameGeneratorMixin,
+                                 task_id="task_id")
 
         mock_find_resource_managers.assert_called_once_with(["a", "b"], True)
 
@@ -422,9 +524,11 @@ class ResourceManagerTestCase(test.TestCase):
             mock.call(mock_find_resource_managers.return_value[0], "admin",
                       ["user"], api_versions=api_versions,
                       resource_classes=[A], task_id="task_id"),
-            mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1], "admin",
                       ["user"], api_versions=api_versions,
-                      resource_classes=[A], task_id="task_id"),
-            mock.call().exterminate()
+                      resource_classes=[A], task_id="task_id")
         ])
+        scheduler = mock_cleanup_scheduler.return_value
+        self.assertEqual([mock.call(mock_seek_and_destroy.return_value)] * 2,
+                         scheduler.add.call_args_list)
+        self.assertEqual(scheduler.run.return_value, result)
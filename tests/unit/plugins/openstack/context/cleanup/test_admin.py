@@ -45,11 +45,12 @@ class AdminCleanupTestCase(test.TestCase):
             self.assertGreater(len(results), 0)
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.manager.CleanupScheduler" % ADMIN)
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers,
-                     mock_itersubclasses):
+                     mock_cleanup_scheduler, mock_itersubclasses):
         class ResourceClass(utils.RandomNameGeneratorMixin):
             pass
 
@@ -75,23 +76,26 @@ class AdminCleanupTestCase(test.TestCase):
                       api_versions=None,
                       resource_classes=[ResourceClass],
                       task_id="task_id"),
-            mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       ctx["admin"],
                       ctx["users"],
                       api_versions=None,
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
-            mock.call().exterminate()
+                      task_id="task_id")
         ])
+        scheduler = mock_cleanup_scheduler.return_value
+        self.assertEqual([mock.call(mock_seek_and_destroy.return_value)] * 2,
+                         scheduler.add.call_args_list)
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.manager.CleanupScheduler" % ADMIN)
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup_admin_with_api_versions(self,
                                              mock_seek_and_destroy,
                                              mock_find_resource_managers,
+                                             mock_cleanup_scheduler,
                                              mock_itersubclasses):
         class ResourceClass(utils.RandomNameGeneratorMixin):
             pass
@@ -126,12 +130,10 @@ class AdminCleanupTestCase(test.TestCase):
                       api_versions=ctx["config"]["api_versions"],
                       resource_classes=[ResourceClass],
                       task_id=ctx["task"]["uuid"]),
-            mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       ctx["admin"],
                       ctx["users"],
                       api_versions=ctx["config"]["api_versions"],
                       resource_classes=[ResourceClass],
-                      task_id=ctx["task"]["uuid"]),
-            mock.call().exterminate()
+                      task_id=ctx["task"]["uuid"])
         ])
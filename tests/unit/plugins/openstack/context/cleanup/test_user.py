@@ -45,11 +45,12 @@ class UserCleanupTestCase(test.TestCase):
             self.assertGreater(len(results), 0)
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.manager.CleanupScheduler" % ADMIN)
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
     def test_cleanup(self, mock_seek_and_destroy, mock_find_resource_managers,
-                     mock_itersubclasses):
+                     mock_cleanup_scheduler, mock_itersubclasses):
 
         class ResourceClass(utils.RandomNameGeneratorMixin):
             pass
@@ -62,6 +63,14 @@ class UserCleanupTestCase(test.TestCase):
             "task": {"uuid": "task_id"}
         }
 
+        mock_cleanup_scheduler.return_value.run.return_value = [
+            {"name": "a.b", "started_at": 1, "finished_at": 2},
+            {"name": "c.d", "started_at": 2, "finished_at": 5,
+             "nodes": [{"tenant_id": "t1", "started_at": 2,
+                        "finished_at": 4},
+                       {"tenant_id": None, "started_at": 4,
+                        "finished_at": 5}]}]
+
         admin_cleanup = user.UserCleanup(ctx)
         admin_cleanup.setup()
         admin_cleanup.cleanup()
@@ -72,14 +81,25 @@ class UserCleanupTestCase(test.TestCase):
             mock.call(mock_find_resource_managers.return_value[0],
                       None, ctx["users"], api_versions=None,
                       resource_classes=[ResourceClass], task_id="task_id"),
-            mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       None, ctx["users"], api_versions=None,
-                      resource_classes=[ResourceClass], task_id="task_id"),
-            mock.call().exterminate()
+                      resource_classes=[ResourceClass], task_id="task_id")
         ])
+        scheduler = mock_cleanup_scheduler.return_value
+        self.assertEqual([mock.call(mock_seek_and_destroy.return_value)] * 2,
+                         scheduler.add.call_args_list)
+        self.assertEqual([{"name": "a.b", "started_at": 1, "finished_at": 2,
+                           "children": []},
+                          {"name": "c.d", "started_at": 2, "finished_at": 5,
+                           "children": [
+                               {"name": "tenant_t1", "started_at": 2,
+                                "finished_at": 4, "children": []},
+                               {"name": "admin", "started_at": 4,
+                                "finished_at": 5, "children": []}]}],
+                         admin_cleanup.atomic_actions())
 
     @mock.patch("rally.common.plugin.discover.itersubclasses")
+    @mock.patch("%s.manager.CleanupScheduler" % ADMIN)
     @mock.patch("%s.manager.find_resource_managers" % ADMIN,
                 return_value=[mock.MagicMock(), mock.MagicMock()])
     @mock.patch("%s.manager.SeekAndDestroy" % ADMIN)
@@ -87,6 +107,7 @@ class UserCleanupTestCase(test.TestCase):
             self,
             mock_seek_and_destroy,
             mock_find_resource_managers,
+            mock_cleanup_scheduler,
             mock_itersubclasses):
 
         class ResourceClass(utils.RandomNameGeneratorMixin):
@@ -122,12 +143,13 @@ class UserCleanupTestCase(test.TestCase):
                       api_versions=ctx["config"]["api_versions"],
                       resource_classes=[ResourceClass],
                       task_id="task_id"),
-            mock.call().exterminate(),
             mock.call(mock_find_resource_managers.return_value[1],
                       None,
                       ctx["users"],
                       api_versions=ctx["config"]["api_versions"],
                       resource_classes=[ResourceClass],
-                      task_id="task_id"),
-            mock.call().exterminate()
+                      task_id="task_id")
         ])
+        scheduler = mock_cleanup_scheduler.return_value
+        self.assertEqual([mock.call(mock_seek_and_destroy.return_value)] * 2,
+                         scheduler.add.call_args_list)
@@ -19,6 +19,7 @@ from rally import consts
 from rally import exceptions
 from rally.plugins.openstack.context.keystone import users
 from rally.plugins.openstack import credential as oscredential
+from rally.plugins.openstack import user_placement
 from tests.unit import test
 
 CTX = "rally.plugins.openstack.context.keystone.users"
@@ -121,6 +122,40 @@ class UserGeneratorBaseTestCase(test.ScenarioTestCase):
         user_generator.use_existing_users.assert_called_once_with()
         self.assertFalse(user_generator.create_users.called)
 
+    @mock.patch("%s.LOG" % CTX)
+    def test_cleanup_logs_auth_calls(self, mock_log):
+        self.osclients.auth_calls.side_effect = [3, 10]
+        user_generator = users.UserGenerator(self.context)
+        user_generator.existing_users = [mock.Mock()]
+        user_generator.use_existing_users = mock.Mock()
+
+        user_generator.setup()
+        user_generator.cleanup()
+
+        mock_log.info.assert_called_once_with(
+            "Task task_id | 7 authentications in Keystone were made since "
+            "the setup of users.")
+        self.assertEqual({"keystone_auth_calls": 7}, user_generator.stats())
+
+    def test_stats_without_setup(self):
+        self.assertEqual({}, users.UserGenerator(self.context).stats())
+
+    def test_cleanup_forgets_sessions(self):
+        user_generator = users.UserGenerator(self.context)
+        user_generator.existing_users = []
+        user_generator._remove_default_security_group = mock.Mock()
+        user_generator._delete_tenants = mock.Mock()
+        user_generator._delete_users = mock.Mock(
+            side_effect=lambda: self.context.update(users=[]))
+        self.context["users"] = [{"credential": "cred1"},
+                                 {"credential": "cred2"}]
+
+        user_generator.cleanup()
+
+        self.assertEqual(
+            [mock.call("cred1"), mock.call("cred2")],
+            self.osclients.forget_sessions.call_args_list)
+
     def test_cleanup(self):
         user_generator = users.UserGenerator(self.context)
         user_generator._remove_default_security_group = mock.Mock()
@@ -411,6 +446,8 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
                              len(ctx.context["tenants"]))
 
             self.assertEqual("random", ctx.context["user_choice_method"])
+            self.assertIsInstance(ctx.context["user_placement"],
+                                  user_placement.RandomPlacement)
 
         # Cleanup (called by content manager)
         self.assertEqual(0, len(ctx.context["users"]))
@@ -430,6 +467,20 @@ class UserGeneratorForNewUsersTestCase(test.ScenarioTestCase):
         # Ensure that tenants get deleted anyway
         self.assertEqual(0, len(ctx.context["tenants"]))
 
+    @mock.patch("rally.common.broker.LOG.warning")
+    @mock.patch("%s.identity" % CTX)
+    def test_create_users_failure_message(self, mock_identity,
+                                          mock_log_warning):
+        identity_service = mock_identity.Identity.return_value
+        identity_service.create_user.side_effect = Exception("oops")
+        user_generator = users.UserGenerator(self.context)
+
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              user_generator.create_users)
+        self.assertIn("Failed to create the requested number of users. "
+                      "%d errors occurred, the first one: Exception: oops"
+                      % (self.tenants_num * self.users_per_tenant), str(e))
+
     @mock.patch("%s.identity" % CTX)
     def test_users_and_tenants_in_context(self, mock_identity):
         identity_service = mock_identity.Identity.return_value
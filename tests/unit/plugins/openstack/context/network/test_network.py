@@ -17,6 +17,7 @@ import ddt
 import mock
 import netaddr
 
+from rally import exceptions
 from rally.plugins.openstack.context.network import networks as network_context
 from tests.unit import test
 
@@ -57,7 +58,7 @@ class NetworkTestCase(test.TestCase):
         self.assertEqual("foo_cidr", context.config["start_cidr"])
         self.assertEqual({"fakearg": "fake"},
                          context.config["network_create_args"])
-        self.assertEqual(("1.2.3.4", "5.6.7.8"),
+        self.assertEqual(["1.2.3.4", "5.6.7.8"],
                          context.config["dns_nameservers"])
 
     @ddt.data({},
@@ -65,14 +66,9 @@ class NetworkTestCase(test.TestCase):
               {"dns_nameservers": ["1.2.3.4", "5.6.7.8"]})
     @ddt.unpack
     @mock.patch(NET + "wrap")
-    @mock.patch("rally.plugins.openstack.context.network.networks.utils")
     @mock.patch("rally.plugins.openstack.osclients.Clients")
-    def test_setup(self, mock_clients, mock_utils, mock_wrap, **dns_kwargs):
-        mock_utils.iterate_per_tenants.return_value = [
-            ("foo_user", "foo_tenant"),
-            ("bar_user", "bar_tenant")]
+    def test_setup(self, mock_clients, mock_wrap, **dns_kwargs):
         mock_create = mock.Mock(side_effect=lambda t, **kw: t + "-net")
-        mock_utils.generate_random_name = mock.Mock()
         mock_wrap.return_value = mock.Mock(create_network=mock_create)
         nets_per_tenant = 2
         net_context = network_context.Network(
@@ -82,19 +78,15 @@ class NetworkTestCase(test.TestCase):
 
         net_context.setup()
 
-        if "dns_nameservers" in dns_kwargs:
-            dns_kwargs["dns_nameservers"] = tuple(
-                dns_kwargs["dns_nameservers"])
         create_calls = [
             mock.call(tenant, dualstack=False,
                       subnets_num=1, network_create_args={"fakearg": "fake"},
                       router_create_args={"external": True},
                       **dns_kwargs)
-            for user, tenant in mock_utils.iterate_per_tenants.return_value]
-        mock_create.assert_has_calls(create_calls)
+            for tenant in ("foo_tenant", "bar_tenant")]
+        mock_create.assert_has_calls(create_calls, any_order=True)
+        self.assertEqual(4, mock_create.call_count)
 
-        mock_utils.iterate_per_tenants.assert_called_once_with(
-            net_context.context["users"])
         expected_networks = ["bar_tenant-net",
                              "foo_tenant-net"] * nets_per_tenant
         actual_networks = []
@@ -102,6 +94,27 @@ class NetworkTestCase(test.TestCase):
             actual_networks.extend(tenant_ctx["networks"])
         self.assertSequenceEqual(sorted(expected_networks),
                                  sorted(actual_networks))
+        self.assertEqual(
+            ["setup_tenant_bar_tenant", "setup_tenant_foo_tenant"],
+            sorted(a["name"] for a in net_context.atomic_actions()))
+
+    @mock.patch(NET + "wrap")
+    @mock.patch("rally.plugins.openstack.osclients.Clients")
+    def test_setup_fails(self, mock_clients, mock_wrap):
+        mock_create = mock.Mock(side_effect=["foo_tenant-net",
+                                             Exception("Conflict")])
+        mock_wrap.return_value = mock.Mock(create_network=mock_create)
+        net_context = network_context.Network(
+            self.get_context(networks_per_tenant=2,
+                             resource_management_workers=1))
+
+        self.assertRaises(exceptions.ContextSetupFailure, net_context.setup)
+
+        # the created network is kept in the context for the cleanup
+        self.assertEqual(["foo_tenant-net"],
+                         net_context.context["tenants"]["foo_tenant"][
+                             "networks"])
+        self.assertEqual(2, mock_create.call_count)
 
     @mock.patch("rally.plugins.openstack.osclients.Clients")
     @mock.patch(NET + "wrap")
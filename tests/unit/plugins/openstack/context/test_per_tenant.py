@@ -0,0 +1,138 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from rally.common import cfg
+from rally import exceptions
+from rally.plugins.openstack.context import per_tenant
+from rally.task import context
+from tests.unit import test
+
+
+CONF = cfg.CONF
+
+
+class PerTenantSetupMixinTestCase(test.TestCase):
+
+    def setUp(self):
+        super(PerTenantSetupMixinTestCase, self).setUp()
+
+        @context.configure(self.id(), platform="openstack", order=1)
+        class DummyContext(per_tenant.PerTenantSetupMixin, context.Context):
+
+            CONFIG_SCHEMA = {
+                "type": "object",
+                "properties": {
+                    "resource_management_workers": per_tenant.WORKERS_SCHEMA
+                },
+                "additionalProperties": False
+            }
+
+            def setup(self):
+                pass
+
+            def cleanup(self):
+                pass
+
+        self.addCleanup(DummyContext.unregister)
+        self.DummyContext = DummyContext
+
+    def get_context(self, tenants=3, **config):
+        return {"task": {"uuid": "task_uuid"},
+                "owner_id": "task_uuid",
+                "config": {self.id(): config},
+                "users": [{"id": "user_%s" % i, "tenant_id": "tenant_%s" % i}
+                          for i in range(tenants)],
+                "tenants": dict(("tenant_%s" % i, {"name": "tenant_%s" % i})
+                                for i in range(tenants))}
+
+    def test__setup_tenants(self):
+        ctx = self.DummyContext(
+            self.get_context(resource_management_workers=3))
+        barrier = threading.Event()
+        called = []
+
+        def setup_tenant(cache, index, user, tenant_id):
+            called.append((index, user["id"], tenant_id))
+            if len(called) == 3:
+                barrier.set()
+            # all tenants are set up at the same time
+            self.assertTrue(barrier.wait(5))
+            ctx.context["tenants"][tenant_id]["foo"] = index
+            return [{"name": "foo", "started_at": 1, "finished_at": 2,
+                     "children": []}]
+
+        ctx._setup_tenants(setup_tenant)
+
+        self.assertEqual([(0, "user_0", "tenant_0"),
+                          (1, "user_1", "tenant_1"),
+                          (2, "user_2", "tenant_2")], sorted(called))
+        for i in range(3):
+            self.assertEqual(i,
+                             ctx.context["tenants"]["tenant_%s" % i]["foo"])
+        atomic_actions = ctx.atomic_actions()
+        self.assertEqual(["setup_tenant_tenant_0", "setup_tenant_tenant_1",
+                          "setup_tenant_tenant_2"],
+                         sorted(a["name"] for a in atomic_actions))
+        for atomic_action in atomic_actions:
+            self.assertEqual([{"name": "foo", "started_at": 1,
+                               "finished_at": 2, "children": []}],
+                             atomic_action["children"])
+            self.assertLessEqual(atomic_action["started_at"],
+                                 atomic_action["finished_at"])
+            self.assertNotIn("failed", atomic_action)
+
+    @mock.patch("rally.plugins.openstack.context.per_tenant.broker")
+    def test__setup_tenants_default_workers(self, mock_broker):
+        mock_broker.run_pipelined.return_value = []
+        CONF.set_override("tenant_contexts_resource_management_workers", 7,
+                          "openstack")
+        self.addCleanup(CONF.clear_override,
+                        "tenant_contexts_resource_management_workers",
+                        "openstack")
+        ctx = self.DummyContext(self.get_context())
+
+        ctx._setup_tenants(mock.Mock())
+
+        mock_broker.run_pipelined.assert_called_once_with(
+            mock.ANY, mock.ANY, 7)
+
+    def test__setup_tenants_fails(self):
+        ctx = self.DummyContext(
+            self.get_context(tenants=4, resource_management_workers=1))
+        called = []
+
+        def setup_tenant(cache, index, user, tenant_id):
+            called.append(tenant_id)
+            if index == 1:
+                raise KeyError("foo")
+            return None
+
+        e = self.assertRaises(exceptions.ContextSetupFailure,
+                              ctx._setup_tenants, setup_tenant)
+
+        self.assertIn("1 errors occurred, the first one: KeyError: 'foo'",
+                      "%s" % e)
+        # the rest of tenants are skipped after the failure
+        self.assertEqual(["tenant_0", "tenant_1"], called)
+        atomic_actions = ctx.atomic_actions()
+        self.assertEqual(["setup_tenant_tenant_0", "setup_tenant_tenant_1"],
+                         [a["name"] for a in atomic_actions])
+        self.assertEqual([], atomic_actions[0]["children"])
+        self.assertNotIn("failed", atomic_actions[0])
+        self.assertTrue(atomic_actions[1]["failed"])
@@ -24,6 +24,9 @@ from rally.plugins.openstack.services.image import image
 from tests.unit import test
 
 
+PATH = "rally.plugins.openstack.services.image.glance_common"
+
+
 class FullGlance(service.Service, glance_common.GlanceMixin):
     """Implementation of GlanceMixin with Service base class."""
     pass
@@ -68,6 +71,25 @@ class GlanceMixinTestCase(test.TestCase):
         self.glance.images.data.assert_called_once_with(image_id,
                                                         do_checksum=True)
 
+    @mock.patch("%s.image_cache.get_cache" % PATH)
+    def test__open_cached_image(self, mock_get_cache):
+        cache = mock_get_cache.return_value
+        url = "http://example.com/image"
+
+        data = mock.Mock()
+
+        cache.open.return_value = (data, False)
+        self.assertEqual(data, self.service._open_cached_image(url))
+        cache.get_key.assert_called_once_with(url)
+        cache.open.assert_called_once_with(cache.get_key.return_value, url)
+
+        cache.open.return_value = (data, True)
+        self.assertEqual(data, self.service._open_cached_image(url))
+        self.assertEqual(
+            ["glance_vsome.open_cached_image",
+             "glance_vsome.download_image_to_cache"],
+            [a["name"] for a in self.service._atomic_actions])
+
 
 class FullUnifiedGlance(glance_common.UnifiedGlanceMixin,
                         service.Service):
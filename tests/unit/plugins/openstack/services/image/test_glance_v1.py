@@ -78,6 +78,24 @@ class GlanceV1ServiceTestCase(test.TestCase):
         self.gc.images.create.assert_called_once_with(**call_args)
         self.assertEqual(image, self.mock_wait_for_status.mock.return_value)
 
+    @mock.patch("rally.plugins.openstack.services.image.glance_v1."
+                "GlanceV1Service._open_cached_image")
+    def test_create_image_cached(self, mock__open_cached_image):
+        location = "https://example.com/image"
+
+        self.service.create_image(image_name="image_name",
+                                  container_format="container_format",
+                                  image_location=location,
+                                  disk_format="disk_format")
+
+        mock__open_cached_image.assert_called_once_with(location)
+        image_data = mock__open_cached_image.return_value
+        self.gc.images.create.assert_called_once_with(
+            container_format="container_format",
+            disk_format="disk_format", is_public=True, name="image_name",
+            min_disk=0, min_ram=0, properties=None, data=image_data)
+        image_data.close.assert_called_once_with()
+
     @ddt.data({"image_name": None},
               {"image_name": "test_image_name"})
     @ddt.unpack
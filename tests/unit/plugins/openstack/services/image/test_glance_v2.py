@@ -60,6 +60,18 @@ class GlanceV2ServiceTestCase(test.TestCase):
             self.gc.images.upload.assert_called_once_with(
                 image_id, mock_requests_get.return_value.raw)
 
+    @mock.patch("%s.glance_v2.GlanceV2Service._open_cached_image" % PATH)
+    def test_upload_cached(self, mock__open_cached_image):
+        image_id = "foo"
+        location = "http://example.com/image"
+
+        self.service.upload_data(image_id, image_location=location)
+
+        mock__open_cached_image.assert_called_once_with(location)
+        image_data = mock__open_cached_image.return_value
+        self.gc.images.upload.assert_called_once_with(image_id, image_data)
+        image_data.close.assert_called_once_with()
+
     @mock.patch("%s.glance_v2.GlanceV2Service.upload_data" % PATH)
     def test_create_image(self, mock_upload_data):
         image_name = "image_name"
@@ -0,0 +1,175 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import fcntl
+import hashlib
+import io
+import os
+import threading
+import time
+
+import ddt
+import mock
+import requests
+
+from rally.common import cfg
+from rally.plugins.openstack.services.image import image_cache
+from tests.unit import test
+
+
+CONF = cfg.CONF
+PATH = "rally.plugins.openstack.services.image.image_cache"
+
+
+@ddt.ddt
+class ImageCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(ImageCacheTestCase, self).setUp()
+        self.cache = image_cache.ImageCache("~/.rally/image_cache", 100)
+
+    def _set_option(self, name, value):
+        CONF.set_override(name, value, "openstack")
+        self.addCleanup(CONF.clear_override, name, "openstack")
+
+    @ddt.data({"location": "http://example.com/image", "expected": True},
+              {"location": "https://example.com/image", "expected": True},
+              {"location": "ftp://example.com/image", "expected": False},
+              {"location": "image_location", "expected": False},
+              {"location": "http://example.com/image", "size": 0,
+               "expected": False})
+    @ddt.unpack
+    def test_is_cached(self, location, expected, size=None):
+        if size is not None:
+            self._set_option("glance_image_cache_size", size)
+        self.assertEqual(expected, image_cache.is_cached(location))
+
+    @ddt.data({"headers": {"ETag": "foo"}, "version": "foo"},
+              {"headers": {"Content-MD5": "bar", "Last-Modified": "baz"},
+               "version": "bar"},
+              {"headers": {"Last-Modified": "baz"}, "version": "baz"},
+              {"headers": {}, "version": ""},
+              {"headers": {"ETag": "foo"}, "version": "", "fails": True})
+    @ddt.unpack
+    @mock.patch("%s.requests.head" % PATH)
+    def test_get_key(self, mock_head, headers, version, fails=False):
+        mock_head.return_value.headers = headers
+        if fails:
+            mock_head.side_effect = requests.ConnectionError()
+
+        key = self.cache.get_key("http://example.com/image")
+
+        mock_head.assert_called_once_with("http://example.com/image",
+                                          allow_redirects=True)
+        self.assertEqual(
+            hashlib.sha1(
+                b"http://example.com/image\n" + version.encode()).hexdigest(),
+            key)
+
+    @mock.patch("%s.requests.get" % PATH)
+    def test_open(self, mock_get):
+        mock_get.return_value.raw = io.BytesIO(b"image data")
+
+        self.assertFalse(self.cache.has("key"))
+        data, downloaded = self.cache.open("key", "http://example.com/image")
+
+        self.assertTrue(downloaded)
+        self.assertEqual(b"image data", data.read())
+        data.close()
+        self.assertTrue(self.cache.has("key"))
+        mock_get.assert_called_once_with("http://example.com/image",
+                                         stream=True)
+        mock_get.return_value.close.assert_called_once_with()
+
+        data, downloaded = self.cache.open("key", "http://example.com/image")
+
+        self.assertFalse(downloaded)
+        self.assertEqual(b"image data", data.read())
+        data.close()
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch("%s.requests.get" % PATH)
+    def test_open_concurrently(self, mock_get):
+        def get(url, stream):
+            time.sleep(0.1)
+            return mock.Mock(raw=io.BytesIO(b"image data"))
+
+        mock_get.side_effect = get
+        url = "http://example.com/image"
+        results = []
+
+        def open_image():
+            data, downloaded = self.cache.open("key", url)
+            results.append((data.read(), downloaded))
+            data.close()
+
+        threads = [threading.Thread(target=open_image) for i in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # the creators which waited for the download find the image cached
+        self.assertEqual([(b"image data", True), (b"image data", False),
+                          (b"image data", False)],
+                         sorted(results, key=lambda r: not r[1]))
+        self.assertEqual(1, mock_get.call_count)
+
+    @mock.patch("%s.requests.get" % PATH)
+    def test_open_empty(self, mock_get):
+        mock_get.return_value.raw = io.BytesIO(b"")
+
+        data, downloaded = self.cache.open("key", "http://example.com/image")
+
+        self.assertEqual(b"", data.read())
+
+    @mock.patch("%s.requests.get" % PATH)
+    def test_open_fails(self, mock_get):
+        mock_get.return_value.raise_for_status.side_effect = (
+            requests.HTTPError("404"))
+
+        self.assertRaises(requests.HTTPError, self.cache.open,
+                          "key", "http://example.com/image")
+
+        self.assertFalse(self.cache.has("key"))
+        self.assertEqual(["key.lock"], os.listdir(self.cache.path))
+        mock_get.return_value.close.assert_called_once_with()
+
+    @mock.patch("%s.requests.get" % PATH)
+    def test_open_evicts(self, mock_get):
+        os.makedirs(self.cache.path)
+        for i, name in enumerate(("old", "used", "recent")):
+            with open(os.path.join(self.cache.path, name), "wb") as f:
+                f.write(b"x" * 40)
+            os.utime(os.path.join(self.cache.path, name), (i, i))
+        mock_get.return_value.raw = io.BytesIO(b"y" * 40)
+
+        with open(os.path.join(self.cache.path, "used.lock"), "a") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            self.cache.open("new", "http://example.com/image")[0].close()
+
+        # the opened file is kept
+        self.assertEqual(["new", "used"],
+                         sorted(name for name in os.listdir(self.cache.path)
+                                if not name.endswith(".lock")))
+
+    def test_get_cache(self):
+        self._set_option("glance_image_cache_size", 3)
+        self._set_option("glance_image_cache_dir", "/foo/bar")
+
+        cache = image_cache.get_cache()
+
+        self.assertEqual("/foo/bar", cache.path)
+        self.assertEqual(3 * 1024 * 1024, cache.max_size)
@@ -56,6 +56,7 @@ class OSClientTestCaseUtils(object):
         self.ksc_module.client = self.ksc_client
         self.ksa_auth.identity = self.ksa_identity
         self.ksa_auth.session = self.ksa_session
+        self.addCleanup(osclients._SESSIONS.clear)
 
     def make_auth_args(self):
         auth_kwargs = {
@@ -263,6 +264,29 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
              mock.call(auth=self.ksa_identity_plugin, timeout=180.0,
                        verify=True)])
 
+    def test_keystone_get_session_is_shared(self):
+        self.set_up_keystone_mocks()
+        self.ksa_session.Session.side_effect = lambda **kw: mock.Mock()
+        session, plugin = osclients.Keystone(
+            self.credential, {}, {}).get_session(version="3")
+
+        self.assertEqual(
+            (session, plugin),
+            osclients.Keystone(
+                oscredential.OpenStackCredential(
+                    "http://auth_url/v2.0", "user", "pass", "tenant"),
+                {}, {}).get_session(version="3"))
+        self.assertNotEqual(
+            session,
+            osclients.Keystone(
+                oscredential.OpenStackCredential(
+                    "http://auth_url/v2.0", "user2", "pass", "tenant"),
+                {}, {}).get_session(version="3")[0])
+        self.assertNotEqual(
+            session,
+            osclients.Keystone(self.credential, {}, {}).get_session(
+                version="2")[0])
+
     def test_keystone_property(self):
         keystone = osclients.Keystone(None, None, None)
         self.assertRaises(exceptions.RallyException, lambda: keystone.keystone)
@@ -277,12 +301,10 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
 
         self.assertEqual(auth_plugin.get_access.return_value,
                          keystone.auth_ref)
-        self.assertEqual(auth_plugin.get_access.return_value,
-                         cache["keystone_auth_ref"])
-
-        # check that auth_ref was cached.
+        # check that expiration of the token is checked every time
         keystone.auth_ref
-        mock_keystone_get_session.assert_called_once_with()
+        self.assertEqual([mock.call(session), mock.call(session)],
+                         auth_plugin.get_access.call_args_list)
 
     @mock.patch("keystoneauth1.identity.base.BaseIdentityPlugin.get_access")
     def test_auth_ref_fails(self, mock_get_access):
@@ -318,11 +340,87 @@ class TestCreateKeystoneClient(test.TestCase, OSClientTestCaseUtils):
         mock_is_debug.assert_called_once_with()
 
 
+class SessionsCacheTestCase(test.TestCase):
+
+    def setUp(self):
+        super(SessionsCacheTestCase, self).setUp()
+        self.cache = osclients._SessionsCache()
+        self.credential = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "user", "pass", "tenant")
+
+    def test_get(self):
+        create = mock.Mock(side_effect=lambda: (mock.Mock(), mock.Mock()))
+
+        sess, plugin = self.cache.get(self.credential, "3", create)
+
+        self.assertEqual((sess, plugin),
+                         self.cache.get(dict(self.credential), "3", create))
+        create.assert_called_once_with()
+        self.assertFalse(plugin.set_auth_state.called)
+
+    @mock.patch("%s.os.getpid" % PATH)
+    def test_get_in_child_process(self, mock_getpid):
+        mock_getpid.return_value = 1
+        parent_plugin = mock.Mock()
+        self.cache.get(self.credential, "3",
+                       lambda: (mock.Mock(), parent_plugin))
+        mock_getpid.return_value = 2
+        sess = mock.Mock()
+        plugin = mock.Mock()
+
+        self.assertEqual(
+            (sess, plugin),
+            self.cache.get(self.credential, "3", lambda: (sess, plugin)))
+        plugin.set_auth_state.assert_called_once_with(
+            parent_plugin.get_auth_state.return_value)
+
+    def test_auth_calls(self):
+        plugin = mock.Mock()
+        get_auth_ref = plugin.get_auth_ref
+        self.cache.get(self.credential, "3", lambda: (mock.Mock(), plugin))
+
+        self.assertEqual(0, self.cache.auth_calls())
+        self.assertEqual(get_auth_ref.return_value,
+                         plugin.get_auth_ref("session"))
+        plugin.get_auth_ref("session")
+        self.assertEqual(2, self.cache.auth_calls())
+        get_auth_ref.assert_called_with("session")
+
+    def test_forget(self):
+        create = mock.Mock(side_effect=lambda: (mock.Mock(), mock.Mock()))
+        other = oscredential.OpenStackCredential(
+            "http://auth_url/v3", "other", "pass", "tenant")
+        self.cache.get(self.credential, "2", create)
+        self.cache.get(self.credential, "3", create)
+        self.cache.get(other, "3", create)
+
+        self.cache.forget(dict(self.credential))
+        self.cache.get(self.credential, "2", create)
+        self.cache.get(self.credential, "3", create)
+        self.cache.get(other, "3", create)
+
+        self.assertEqual(5, create.call_count)
+
+    @mock.patch("%s._SESSIONS" % PATH)
+    def test_forget_sessions(self, mock__sessions):
+        osclients.forget_sessions("credential")
+        mock__sessions.forget.assert_called_once_with("credential")
+
+    def test_clear(self):
+        create = mock.Mock(side_effect=lambda: (mock.Mock(), mock.Mock()))
+        self.cache.get(self.credential, "3", create)
+        self.cache.clear()
+        self.cache.get(self.credential, "3", create)
+
+        self.assertEqual(2, create.call_count)
+
+
 @ddt.ddt
 class OSClientsTestCase(test.TestCase):
 
     def setUp(self):
         super(OSClientsTestCase, self).setUp()
+        self.addCleanup(osclients._SESSIONS.clear)
         self.credential = oscredential.OpenStackCredential(
             "http://auth_url/v2.0", "user", "pass", "tenant")
         self.clients = osclients.Clients(self.credential, {})
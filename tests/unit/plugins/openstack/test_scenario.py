@@ -167,3 +167,15 @@ class OpenStackScenarioTestCase(test.TestCase):
         self.assertEqual(self.context["tenants"][tenant_id],
                          self.context["tenant"])
         self.assertEqual(expected_tenant_id, tenant_id)
+
+    def test__choose_user_with_placement(self):
+        placement = mock.Mock()
+        placement.choose.return_value = ("user", "tenant")
+        self.context["user_placement"] = placement
+
+        scenario = base_scenario.OpenStackScenario()
+        scenario._choose_user(self.context)
+
+        placement.choose.assert_called_once_with(self.context)
+        self.assertEqual("user", self.context["user"])
+        self.assertEqual("tenant", self.context["tenant"])
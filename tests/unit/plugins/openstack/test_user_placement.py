@@ -0,0 +1,84 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import ddt
+
+from rally.plugins.openstack import user_placement
+from tests.unit import test
+
+
+def _make_context(tenants=("foo", "bar"), users_per_tenant=2):
+    context = {"users": [], "tenants": {}}
+    for tid in tenants:
+        users = [{"id": "%s-%s" % (tid, i), "tenant_id": tid}
+                 for i in range(users_per_tenant)]
+        context["users"] += users
+        context["tenants"][tid] = {"name": tid, "users": users}
+    return context
+
+
+@ddt.ddt
+class UserPlacementTestCase(test.TestCase):
+
+    @ddt.data(("random", user_placement.RandomPlacement),
+              ("round_robin", user_placement.RoundRobinPlacement))
+    @ddt.unpack
+    def test_create(self, method, cls):
+        context = _make_context()
+        context["user_choice_method"] = method
+
+        placement = user_placement.create(context)
+
+        self.assertIsInstance(placement, cls)
+        self.assertEqual(context["users"], placement.users)
+        self.assertEqual(context["tenants"], placement.tenants)
+
+    def test_random(self):
+        context = _make_context()
+        placement = user_placement.RandomPlacement(context["users"],
+                                                   context["tenants"])
+
+        for i in range(10):
+            user, tenant = placement.choose(context)
+            self.assertIn(user, context["users"])
+            self.assertEqual(context["tenants"][user["tenant_id"]], tenant)
+
+    def test_round_robin(self):
+        context = _make_context(tenants=("c", "a", "b"), users_per_tenant=2)
+        placement = user_placement.RoundRobinPlacement(context["users"],
+                                                       context["tenants"])
+
+        chosen = []
+        for iteration in range(1, 8):
+            context["iteration"] = iteration
+            user, tenant = placement.choose(context)
+            self.assertEqual(context["tenants"][user["tenant_id"]], tenant)
+            chosen.append(user["id"])
+
+        self.assertEqual(["a-0", "b-0", "c-0", "a-1", "b-1", "c-1", "a-0"],
+                         chosen)
+
+    def test_round_robin_uses_given_context(self):
+        context = _make_context()
+        placement = user_placement.RoundRobinPlacement(context["users"],
+                                                       context["tenants"])
+        # e.g. a copy of the context made by the runner
+        copied = _make_context()
+        copied["iteration"] = 1
+
+        user, tenant = placement.choose(copied)
+
+        self.assertIs(copied["tenants"]["bar"], tenant)
+        self.assertIs(copied["tenants"]["bar"]["users"][0], user)
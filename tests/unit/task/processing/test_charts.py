@@ -14,11 +14,13 @@
 #    under the License.
 
 import collections
+import copy
 
 import ddt
 import mock
 
 from rally.common.plugin import plugin
+from rally.task import atomic
 from rally.task.processing import charts
 from tests.unit import test
 
@@ -215,31 +217,38 @@ class AtomicStackedAreaChartTestCase(test.TestCase):
         expected = [("bar", [[1, 0], [2, 1.2], [3, 1.2]]),
                     ("failed_duration", [[1, 0], [2, 39.7], [3, 6.8]]),
                     ("foo", [[1, 1.1], [2, 1.1], [3, 0]])]
-        chart = charts.AtomicStackedAreaChart(
-            {"total_iteration_count": 3, "failed_iteration_count": 2,
-             "statistics": {
-                 "durations": {
-                     "total": {"name": "total",
-                               "display_name": "total",
-                               "duration": 4,
-                               "count": 1,
-                               "children": []},
-                     "atomics": [
-                         {"name": "foo",
-                          "display_name": "foo",
-                          "duration": 2,
-                          "count": 1,
-                          "children": []},
-                         {"name": "bar",
-                          "display_name": "bar",
-                          "duration": 2,
-                          "count": 1,
-                          "children": []}
-                     ]}}}, 10)
+        workload = {
+            "total_iteration_count": 3, "failed_iteration_count": 2,
+            "statistics": {
+                "durations": {
+                    "total": {"name": "total",
+                              "display_name": "total",
+                              "duration": 4,
+                              "count": 1,
+                              "children": []},
+                    "atomics": [
+                        {"name": "foo",
+                         "display_name": "foo",
+                         "duration": 2,
+                         "count": 1,
+                         "children": []},
+                        {"name": "bar",
+                         "display_name": "bar",
+                         "duration": 2,
+                         "count": 1,
+                         "children": []}
+                    ]}}}
+        chart = charts.AtomicStackedAreaChart(workload, 10)
         self.assertIsInstance(chart, charts.Chart)
         [chart.add_iteration(iteration) for iteration in iterations]
         self.assertEqual(expected, sorted(chart.render()))
 
+        chart = charts.AtomicStackedAreaChart(workload, 10)
+        for iteration in iterations:
+            chart.add_atomic_actions(iteration, atomic.merge_atomic_actions(
+                iteration["atomic_actions"]))
+        self.assertEqual(expected, sorted(chart.render()))
+
 
 class AvgChartTestCase(test.TestCase):
 
@@ -380,6 +389,15 @@ class HistogramChartTestCase(test.TestCase):
                       {"id": 2, "name": "Rice Rule"}]}
         self.assertEqual(expected, chart.render())
 
+    def test_add_iteration_out_of_bins(self):
+        chart = self.HistogramChart({"total_iteration_count": 3})
+        [chart.add_iteration({"foo": x}) for x in ({"bar": 0},
+                                                   {"bar": None},
+                                                   {"bar": 4.3})]
+        # values above the last bin are not counted
+        self.assertEqual([{"x": 2.7, "y": 2}, {"x": 4.2, "y": 0}],
+                         chart.render()["data"][0][0]["values"])
+
     @ddt.data(
         {"base_size": 2, "min_value": 1, "max_value": 4,
          "expected": [{"bins": 2, "view": "Square Root Choice",
@@ -769,6 +787,23 @@ class MainStatsTableTestCase(test.TestCase):
                     "styles": expected_styles}
         self.assertEqual(expected, table.render())
 
+    def test_add_atomic_actions(self):
+        data = [generate_iteration(1.6, True, ("foo", 1.2)),
+                generate_iteration(12.3, False, ("foo", 4.2), ("bar", 5.6))]
+        table = charts.MainStatsTable({"total_iteration_count": 2})
+        for el in data:
+            table.add_iteration(el)
+        expected = table.render()
+
+        table = charts.MainStatsTable({"total_iteration_count": 2})
+        for el in data:
+            atomic_actions = atomic.merge_atomic_actions(el["atomic_actions"])
+            merged = copy.deepcopy(atomic_actions)
+            table.add_atomic_actions(el, atomic_actions)
+            # merged atomic actions can be shared with other charts
+            self.assertEqual(merged, atomic_actions)
+        self.assertEqual(expected, table.render())
+
     def test_to_dict(self):
         table = charts.MainStatsTable({"total_iteration_count": 4})
         data = [generate_iteration(1.6, True, ("foo", 1.2)),
@@ -842,6 +877,25 @@ class MainStatsTableTestCase(test.TestCase):
                       }
         }, table.to_dict())
 
+    def test_merge(self):
+        data = [generate_iteration(1.6, True, ("foo", 1.2)),
+                generate_iteration(5.2, False, ("foo", 1.2)),
+                generate_iteration(5.0, True, ("bar", 4.8)),
+                generate_iteration(12.3, False, ("foo", 4.2), ("bar", 5.6))]
+        single_table = charts.MainStatsTable({"total_iteration_count": 4})
+        for el in data:
+            single_table.add_iteration(el)
+
+        table = charts.MainStatsTable({"total_iteration_count": 4})
+        other_table = charts.MainStatsTable({"total_iteration_count": 4})
+        for el in data[:2]:
+            table.add_iteration(el)
+        for el in data[2:]:
+            other_table.add_iteration(el)
+        table.merge(other_table)
+
+        self.assertEqual(single_table.to_dict(), table.to_dict())
+
 
 class OutputChartTestCase(test.TestCase):
 
@@ -1038,3 +1092,30 @@ class ModuleTestCase(test.TestCase):
     @ddt.unpack
     def test_validate_output(self, args, expected=None):
         self.assertEqual(expected, charts.validate_output(*args))
+
+    @mock.patch("rally.task.processing.charts._validate_output")
+    def test_validate_output_cached(self, mock__validate_output):
+        self.addCleanup(charts._CHECKED_OUTPUTS.clear)
+        charts._CHECKED_OUTPUTS.clear()
+        mock__validate_output.side_effect = lambda t, o: "%s %s" % (t, o)
+        foo = {"title": "foo", "chart_plugin": "Lines", "data": []}
+        bar = {"title": "bar", "chart_plugin": "Pie", "data": []}
+        baz = {"title": "baz", "chart_plugin": "Pie", "data": {}}
+
+        self.assertEqual("additive %s" % foo,
+                         charts.validate_output("additive", foo))
+        self.assertEqual("additive %s" % foo,
+                         charts.validate_output("additive", bar))
+        self.assertEqual("complete %s" % bar,
+                         charts.validate_output("complete", bar))
+        self.assertEqual("complete %s" % baz,
+                         charts.validate_output("complete", baz))
+        self.assertEqual("complete 42", charts.validate_output("complete", 42))
+        self.assertEqual("complete 42", charts.validate_output("complete", 42))
+
+        self.assertEqual([mock.call("additive", foo),
+                          mock.call("complete", bar),
+                          mock.call("complete", baz),
+                          mock.call("complete", 42),
+                          mock.call("complete", 42)],
+                         mock__validate_output.call_args_list)
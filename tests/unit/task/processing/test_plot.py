@@ -18,7 +18,9 @@ import json
 
 import ddt
 import mock
+import six
 
+from rally.common import db
 from rally.task.processing import plot
 from tests.unit import test
 
@@ -45,7 +47,9 @@ class PlotTestCase(test.TestCase):
             {"timestamp": i + 2, "error": [],
              "duration": i + 5, "idle_duration": i,
              "output": {"additive": [], "complete": []},
-             "atomic_actions": {"foo_action": i + 10}} for i in range(10)]
+             "atomic_actions": [{"name": "foo_action", "started_at": i,
+                                 "finished_at": 2 * i + 10,
+                                 "children": []}]} for i in range(10)]
         workload = {
             "data": iterations,
             "sla_results": {"sla": {}}, "pass_sla": True,
@@ -80,10 +84,53 @@ class PlotTestCase(test.TestCase):
              "load_profile": "load_profile",
              "additive_output": [],
              "complete_output": [[], [], [], [], [], [], [], [], [], []],
+             "complete_output_skipped": 0,
              "has_output": False,
              "output_errors": [],
+             "tracebacks": [],
              "sla": {}, "sla_success": True, "table": "main_stats"},
             result)
+        for chart in (mock_charts.MainStatsTable, mock_charts.AtomicAvgChart,
+                      mock_charts.AtomicStackedAreaChart,
+                      mock_charts.AtomicHistogramChart):
+            self.assertEqual(
+                [mock.call(itr, {"foo_action": {"duration": i + 10,
+                                                "count": 1,
+                                                "children": {}}})
+                 for i, itr in enumerate(iterations)],
+                chart.return_value.add_atomic_actions.call_args_list)
+            self.assertFalse(chart.return_value.add_iteration.called)
+
+    @mock.patch(PLOT + "charts")
+    def test__process_workload_errors_and_complete_output(self, mock_charts):
+        complete = {"title": "Foo", "chart_plugin": "Table",
+                    "data": {"cols": ["a"], "rows": [[1]]}}
+        iterations = [
+            {"timestamp": i, "duration": i + 5, "idle_duration": i,
+             "error": ["Error", "msg %d" % i, "trace %d" % (i % 2)],
+             "output": {"additive": [], "complete": [dict(complete)]},
+             "atomic_actions": []} for i in range(5)]
+        workload = {
+            "data": iterations,
+            "sla_results": {"sla": {}}, "pass_sla": True,
+            "name": "Foo.bar", "runner_type": "constant",
+            "full_duration": 40, "load_duration": 32,
+            "total_iteration_count": 5,
+            "created_at": "xxx_time",
+            "hooks": []}
+
+        result = plot._process_workload(workload, "!!!CONF!!!", 0,
+                                        complete_output_limit=2)
+
+        self.assertEqual(["trace 0", "trace 1"], result["tracebacks"])
+        self.assertEqual([0, 1, 0, 1, 0],
+                         [e["traceback"] for e in result["errors"]])
+        self.assertEqual(["msg %d" % i for i in range(5)],
+                         [e["message"] for e in result["errors"]])
+        self.assertEqual(2, len(result["complete_output"]))
+        self.assertEqual(3, result["complete_output_skipped"])
+        self.assertEqual([("success", 0), ("errors", 5)],
+                         result["iterations"]["pie"])
 
     @ddt.data(
         {"hooks": [], "expected": []},
@@ -215,6 +262,39 @@ class PlotTestCase(test.TestCase):
             {"cls": "Foo.bar_3_cls", "met": "dummy", "name": "0", "pos": "0"}],
             p_workloads)
 
+    @mock.patch(PLOT + "objects.Workload.to_task")
+    @mock.patch(PLOT + "_process_workload")
+    def test__stream_workloads(self, mock__process_workload,
+                               mock_workload_to_task):
+        workloads = [{"name": name} for name in ("Foo.b", "Foo.a", "Bar.c",
+                                                 "Foo.b")]
+        mock__process_workload.side_effect = (
+            lambda w, cfg, pos, complete_output_limit: (w["name"], pos))
+
+        result = plot._stream_workloads(workloads, complete_output_limit=3)
+
+        self.assertFalse(mock__process_workload.called)
+        self.assertEqual([("Bar.c", 0), ("Foo.a", 0), ("Foo.b", 0),
+                          ("Foo.b", 1)], list(result))
+        mock__process_workload.assert_has_calls([
+            mock.call(workloads[2], mock_workload_to_task.return_value, 0,
+                      complete_output_limit=3),
+            mock.call(workloads[1], mock_workload_to_task.return_value, 0,
+                      complete_output_limit=3),
+            mock.call(workloads[0], mock_workload_to_task.return_value, 0,
+                      complete_output_limit=3),
+            mock.call(workloads[3], mock_workload_to_task.return_value, 1,
+                      complete_output_limit=3)])
+
+    def test__order_workloads(self):
+        workloads = [{"name": name} for name in ("Foo.b", "Foo.a", "Bar.c",
+                                                 "Foo.b", "Foo.a", "Foo.b")]
+
+        self.assertEqual([(workloads[2], 0), (workloads[1], 0),
+                          (workloads[4], 1), (workloads[0], 0),
+                          (workloads[3], 1), (workloads[5], 2)],
+                         plot._order_workloads(workloads))
+
     def test__make_source(self):
         tasks = [{"title": "task title",
                   "uuid": "task1",
@@ -332,9 +412,59 @@ class PlotTestCase(test.TestCase):
 
         self.assertEqual(esource, plot._make_source(tasks))
 
+    @mock.patch(PLOT + "objects.Workload.to_task")
+    @mock.patch(PLOT + "_map")
+    def test__process_workloads_with_workers(self, mock__map,
+                                             mock_workload_to_task):
+        stream = db.WorkloadDataStream("uuid", 2)
+        workloads = [{"name": "Foo.bar", "data": stream},
+                     {"name": "Foo.bar", "data": []}]
+        mock_workload_to_task.side_effect = ["cfg1", "cfg2"]
+
+        p_workloads = plot._process_workloads(workloads, workers=4)
+
+        self.assertEqual(mock__map.return_value, p_workloads)
+        mock__map.assert_called_once_with(
+            plot._process_workload_args,
+            [({"name": "Foo.bar", "data": stream}, "cfg1", 0),
+             ({"name": "Foo.bar", "data": []}, "cfg2", 1)],
+            4)
+
+    @mock.patch(PLOT + "_process_workload")
+    def test__process_workload_args(self, mock__process_workload):
+        self.assertEqual(mock__process_workload.return_value,
+                         plot._process_workload_args(("w", "cfg", 2)))
+        mock__process_workload.assert_called_once_with("w", "cfg", 2)
+
+    @ddt.data(1, 0)
+    def test__map_serial(self, workers):
+        self.assertEqual([1, 2, 3], plot._map(abs, [-1, 2, -3], workers))
+
+    @mock.patch(PLOT + "db.engine_reset")
+    def test__init_worker(self, mock_engine_reset):
+        plot._init_worker()
+        mock_engine_reset.assert_called_once_with()
+
+    @mock.patch(PLOT + "multiprocessing.Pool")
+    def test__map(self, mock_pool):
+        pool = mock_pool.return_value
+        pool.imap.return_value = iter([1, 2])
+
+        self.assertEqual([1, 2], plot._map(abs, [-1, 2], 4))
+
+        mock_pool.assert_called_once_with(2, initializer=plot._init_worker)
+        pool.imap.assert_called_once_with(abs, [-1, 2], chunksize=1)
+        pool.close.assert_called_once_with()
+        pool.join.assert_called_once_with()
+
+    def test__map_keeps_order(self):
+        items = list(range(-20, 20))
+        self.assertEqual([abs(i) for i in items], plot._map(abs, items, 3))
+
     @ddt.data({},
               {"include_libs": True},
-              {"include_libs": False})
+              {"include_libs": False},
+              {"workers": 3})
     @ddt.unpack
     @mock.patch(PLOT + "_make_source")
     @mock.patch(PLOT + "_process_workloads")
@@ -353,7 +483,8 @@ class PlotTestCase(test.TestCase):
 
         self.assertEqual("tasks_html", html)
         mock_get_template.assert_called_once_with("task/report.html")
-        mock__process_workloads.assert_called_once_with(["foo", "bar"])
+        mock__process_workloads.assert_called_once_with(
+            ["foo", "bar"], workers=ddt_kwargs.get("workers", 1))
         if "include_libs" in ddt_kwargs:
             mock_get_template.return_value.render.assert_called_once_with(
                 version="42.0", data="\"scenarios\"",
@@ -364,6 +495,47 @@ class PlotTestCase(test.TestCase):
                 version="42.0", data="\"scenarios\"",
                 source="\"source\"", include_libs=False)
 
+    @mock.patch(PLOT + "_make_source", return_value="source")
+    @mock.patch(PLOT + "_stream_workloads")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    @mock.patch("rally.common.version.version_string", return_value="42.0")
+    def test_stream(self, mock_version_string, mock_get_template,
+                    mock__stream_workloads, mock__make_source):
+        tasks = [{"subtasks": [{"workloads": ["foo", "bar"]}]},
+                 {"subtasks": [{"workloads": ["baz"]}]}]
+        template = mock_get_template.return_value
+        template.render.return_value = "<%s>" % plot._DATA_PLACEHOLDER
+        mock__stream_workloads.return_value = iter([{"foo": 1}, {"bar": 2}])
+        out = six.StringIO()
+
+        plot.stream(tasks, out, include_libs=True, complete_output_limit=5)
+
+        self.assertEqual(
+            "<%s>" % json.dumps([{"foo": 1}, {"bar": 2}]), out.getvalue())
+        mock_get_template.assert_called_once_with("task/report.html")
+        template.render.assert_called_once_with(
+            version="42.0", source="\"source\"",
+            data=plot._DATA_PLACEHOLDER, include_libs=True)
+        mock__make_source.assert_called_once_with(tasks)
+        mock__stream_workloads.assert_called_once_with(["foo", "bar", "baz"],
+                                                       5)
+
+    @mock.patch(PLOT + "_make_source", return_value="source")
+    @mock.patch(PLOT + "_stream_workloads", return_value=iter([]))
+    @mock.patch(PLOT + "ui_utils.get_template")
+    def test_stream_without_workloads(self, mock_get_template,
+                                      mock__stream_workloads,
+                                      mock__make_source):
+        mock_get_template.return_value.render.return_value = (
+            plot._DATA_PLACEHOLDER)
+        out = six.StringIO()
+
+        plot.stream([], out)
+
+        self.assertEqual("[]", out.getvalue())
+        mock__stream_workloads.assert_called_once_with(
+            [], plot.COMPLETE_OUTPUT_LIMIT)
+
     @mock.patch(PLOT + "objects.Task")
     @mock.patch(PLOT + "Trends")
     @mock.patch(PLOT + "ui_utils.get_template")
@@ -391,6 +563,32 @@ class PlotTestCase(test.TestCase):
         template.render.assert_called_once_with(version="42.0",
                                                 data="[\"foo\", \"bar\"]")
 
+    @mock.patch(PLOT + "_map")
+    @mock.patch(PLOT + "Trends")
+    @mock.patch(PLOT + "ui_utils.get_template")
+    def test_trends_with_workers(self, mock_get_template, mock_trends,
+                                 mock__map):
+        tasks = [{"uuid": "task1",
+                  "subtasks": [{"workloads": [{"name": "foo", "data": []}]},
+                               {"workloads": [{"name": "bar"}]}]},
+                 {"uuid": "task2",
+                  "subtasks": [{"workloads": [{"name": "baz",
+                                               "data": ["itr"]}]}]}]
+        trends = mock_trends.return_value
+        trends.get_data.return_value = []
+        mock__map.return_value = ["r1", "r2", "r3"]
+
+        plot.trends(tasks, workers=2)
+
+        mock__map.assert_called_once_with(
+            plot._process_trend,
+            [{"name": "foo"}, {"name": "bar"}, {"name": "baz"}], 2)
+        self.assertEqual(
+            [mock.call("task1", "r1"), mock.call("task1", "r2"),
+             mock.call("task2", "r3")],
+            trends._merge_result.mock_calls)
+        self.assertFalse(trends.add_result.called)
+
 
 @ddt.ddt
 class TrendsTestCase(test.TestCase):
@@ -677,6 +875,30 @@ class TrendsTestCase(test.TestCase):
 
         self.assertEqual(expected, actual)
 
+    @mock.patch(PLOT + "objects.Workload.to_task")
+    def test__process_trend(self, mock_workload_to_task):
+        mock_workload_to_task.side_effect = lambda w: {
+            "description": "foo", "subtasks": [{"description": "descr"}]}
+        result = self._make_result(1, sla_success=False)
+
+        processed = plot._process_trend(result)
+
+        trends = plot.Trends()
+        trends._merge_result("task_uuid", processed)
+        expected = plot.Trends()
+        expected.add_result("task_uuid", result)
+        self.assertEqual(expected._data, trends._data)
+        self.assertEqual(
+            [("a", 100.0, {"min": 0.7, "median": 0.85, "90%ile": 0.9,
+                           "95%ile": 0.87, "max": 1.25, "avg": 0.67}),
+             ("b", 100.0, {"min": 0.5, "median": 0.75, "90%ile": 0.85,
+                           "95%ile": 0.9, "max": 1.1, "avg": 0.58}),
+             ("total", 100.0, {"min": 1.2, "median": 1.55, "90%ile": 1.7,
+                               "95%ile": 1.8, "max": 1.5, "avg": 0.8})],
+            processed["actions"])
+        self.assertFalse(processed["pass_sla"])
+        self.assertEqual(123457789, processed["ts"])
+
     def test_get_data_no_results_added(self):
         trends = plot.Trends()
         self.assertEqual([], trends.get_data())
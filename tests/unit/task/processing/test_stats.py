@@ -0,0 +1,74 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from rally.task.processing import charts
+from rally.task.processing import stats
+from tests.unit import test
+
+
+def _iteration(duration, error=None, atomic_duration=None):
+    atomic_duration = duration if atomic_duration is None else atomic_duration
+    return {"duration": duration, "idle_duration": 0, "timestamp": 1,
+            "error": error or [],
+            "atomic_actions": [{"name": "foo", "started_at": 1,
+                                "finished_at": 1 + atomic_duration,
+                                "children": []}]}
+
+
+class WorkloadStatsTestCase(test.TestCase):
+
+    def test_to_dict(self):
+        iterations = [_iteration(3), _iteration(1, error=["E", "m", "t"]),
+                      _iteration(2, atomic_duration=1.5)]
+        workload_stats = stats.WorkloadStats()
+        table = charts.MainStatsTable({"total_iteration_count": 3})
+        for itr in iterations:
+            workload_stats.add_iteration(itr)
+            table.add_iteration(itr)
+
+        self.assertEqual(
+            {"total_iteration_count": 3,
+             "failed_iteration_count": 1,
+             "min_duration": 1,
+             "max_duration": 3,
+             "statistics": {"durations": table.to_dict()}},
+            workload_stats.to_dict())
+
+    def test_merge(self):
+        iterations = [_iteration(3), _iteration(1, error=["E", "m", "t"]),
+                      _iteration(2, atomic_duration=1.5), _iteration(4)]
+        single_stats = stats.WorkloadStats()
+        for itr in iterations:
+            single_stats.add_iteration(itr)
+
+        workload_stats = stats.WorkloadStats()
+        other_stats = stats.WorkloadStats()
+        for itr in iterations[:1]:
+            workload_stats.add_iteration(itr)
+        for itr in iterations[1:]:
+            other_stats.add_iteration(itr)
+        workload_stats.merge(other_stats)
+
+        self.assertEqual(single_stats.to_dict(), workload_stats.to_dict())
+
+    def test_to_dict_without_iterations(self):
+        self.assertEqual(
+            {"total_iteration_count": 0,
+             "failed_iteration_count": 0,
+             "min_duration": None,
+             "max_duration": None,
+             "statistics": {"durations": charts.MainStatsTable(
+                 {"total_iteration_count": 0}).to_dict()}},
+            stats.WorkloadStats().to_dict())
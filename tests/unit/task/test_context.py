@@ -118,6 +118,10 @@ class BaseContextTestCase(test.TestCase):
         ins = fakes.FakeContext(ctx)
         self.assertEqual("foo_uuid", ins.get_owner_id())
 
+    def test_stats(self):
+        ctx = {"config": {"fake": {"test": 10}}, "task": {"uuid": "task_uuid"}}
+        self.assertEqual({}, fakes.FakeContext(ctx).stats())
+
 
 class ContextManagerTestCase(test.TestCase):
     @mock.patch("rally.task.context.ContextManager._get_sorted_context_lst")
@@ -318,6 +322,41 @@ class ContextManagerTestCase(test.TestCase):
                 "finished_at": mock.ANY}}],
             ctx_manager.contexts_results())
 
+    def test_cleanup_stores_stats(self):
+
+        @context.configure("with_stats", platform="foo", order=1)
+        class A(context.Context):
+
+            def setup(self):
+                pass
+
+            def cleanup(self):
+                self.calls = 3
+
+            def stats(self):
+                return {"calls": self.calls}
+
+        self.addCleanup(A.unregister)
+
+        @context.configure("without_stats", platform="foo", order=2)
+        class B(A):
+
+            def stats(self):
+                return {}
+
+        self.addCleanup(B.unregister)
+        ctx_object = {"config": {"with_stats@foo": [],
+                                 "without_stats@foo": []},
+                      "task": {"uuid": "uuid"}}
+        ctx_manager = context.ContextManager(ctx_object)
+        ctx_manager.setup()
+
+        ctx_manager.cleanup()
+
+        results = ctx_manager.contexts_results()
+        self.assertEqual({"calls": 3}, results[0]["stats"])
+        self.assertNotIn("stats", results[1])
+
     @mock.patch("rally.task.context.ContextManager.cleanup")
     @mock.patch("rally.task.context.ContextManager.setup")
     def test_with_statement(
@@ -21,6 +21,7 @@ import threading
 import mock
 
 from rally.common import objects
+from rally.common import utils
 from rally import consts
 from rally import exceptions
 from rally.task import context
@@ -593,12 +594,13 @@ class TaskEngineTestCase(test.TestCase):
 
 class ResultConsumerTestCase(test.TestCase):
 
+    @mock.patch("rally.task.engine.stats.WorkloadStats")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
     def test_consume_results(
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
-            mock_task_get_status):
+            mock_task_get_status, mock_workload_stats):
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -613,8 +615,8 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 2, "timestamp": 2}]
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -630,7 +632,16 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertEqual([{"duration": 2, "timestamp": 2},
                           {"duration": 1, "timestamp": 3}],
                          consumer_obj.results)
+        mock_workload_stats.return_value.add_iteration.assert_has_calls([
+            mock.call({"duration": 1, "timestamp": 3}),
+            mock.call({"duration": 2, "timestamp": 2})])
+        workload.set_results.assert_called_once_with(
+            full_duration=mock.ANY, load_duration=2,
+            sla_results=mock_sla_instance.results.return_value,
+            start_time=2, contexts_results=ctx_manager.contexts_results(),
+            stats=mock_workload_stats.return_value.to_dict.return_value)
 
+    @mock.patch("rally.task.engine.stats.WorkloadStats")
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.engine.time.time")
@@ -639,7 +650,8 @@ class ResultConsumerTestCase(test.TestCase):
     @mock.patch("rally.task.sla.SLAChecker")
     def test_consume_results_no_iteration(
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
-            mock_task_get_status, mock_time, mock_log, mock_hook_executor):
+            mock_task_get_status, mock_time, mock_log, mock_hook_executor,
+            mock_workload_stats):
         mock_time.side_effect = [0, 1]
         mock_sla_instance = mock.MagicMock()
         mock_sla_results = mock.MagicMock()
@@ -653,8 +665,8 @@ class ResultConsumerTestCase(test.TestCase):
         runner = mock.MagicMock()
 
         results = []
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -667,14 +679,18 @@ class ResultConsumerTestCase(test.TestCase):
         workload.set_results.assert_called_once_with(
             full_duration=1, sla_results=mock_sla_results, load_duration=0,
             start_time=None,
-            contexts_results=ctx_manager.contexts_results())
+            contexts_results=ctx_manager.contexts_results(),
+            stats=mock_workload_stats.return_value.to_dict.return_value)
+        self.assertFalse(
+            mock_workload_stats.return_value.add_iteration.called)
 
+    @mock.patch("rally.task.engine.stats.WorkloadStats")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
     def test_consume_results_sla_failure_abort(
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
-            mock_task_get_status):
+            mock_task_get_status, mock_workload_stats):
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_sla_instance.add_iteration.side_effect = [True, True, False,
@@ -685,7 +701,7 @@ class ResultConsumerTestCase(test.TestCase):
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
 
-        runner.result_queue = collections.deque(
+        runner.result_queue = utils.WaitableDeque(
             [[{"duration": 1, "timestamp": 1},
               {"duration": 2, "timestamp": 2}]] * 4)
         ctx_manager = mock.MagicMock()
@@ -709,7 +725,7 @@ class ResultConsumerTestCase(test.TestCase):
                                             mock_event, mock_thread,
                                             mock_task_get_status,
                                             mock_hook_executor):
-        runner = mock.MagicMock(result_queue=False)
+        runner = mock.MagicMock(result_queue=utils.WaitableDeque())
 
         is_done = mock.MagicMock()
         is_done.isSet.side_effect = (False, True)
@@ -736,10 +752,12 @@ class ResultConsumerTestCase(test.TestCase):
         mocked_set_aborted = mock_sla_checker.return_value.set_aborted_manually
         mocked_set_aborted.assert_called_once_with()
 
+    @mock.patch("rally.task.engine.stats.WorkloadStats")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.sla.SLAChecker")
     def test_consume_results_sla_failure_continue(self, mock_sla_checker,
-                                                  mock_task_get_status):
+                                                  mock_task_get_status,
+                                                  mock_workload_stats):
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.CRASHED
@@ -750,9 +768,9 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque(
+        runner.result_queue = utils.WaitableDeque(
             [[{"duration": 1, "timestamp": 4}]] * 4)
-        runner.event_queue = collections.deque()
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -777,8 +795,8 @@ class ResultConsumerTestCase(test.TestCase):
         subtask = mock.Mock(spec=objects.Subtask)
         workload = mock.Mock(spec=objects.Workload)
         runner = mock.MagicMock()
-        runner.result_queue = collections.deque([1])
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque([1])
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
         exc = MyException()
         try:
@@ -795,14 +813,17 @@ class ResultConsumerTestCase(test.TestCase):
         mock_sla_instance.set_unexpected_failure.assert_has_calls(
             [mock.call(exc)])
 
+    @mock.patch("rally.task.engine.stats.WorkloadStats")
     @mock.patch("rally.task.engine.CONF")
     @mock.patch("rally.common.objects.Task.get_status")
     @mock.patch("rally.task.engine.ResultConsumer.wait_and_abort")
     @mock.patch("rally.task.sla.SLAChecker")
     def test_consume_results_chunked(
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
-            mock_task_get_status, mock_conf):
+            mock_task_get_status, mock_conf, mock_workload_stats):
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_chunk_format = "compact"
+        mock_conf.raw_result_chunk_compression = "lz4"
         mock_sla_instance = mock.MagicMock()
         mock_sla_checker.return_value = mock_sla_instance
         mock_task_get_status.return_value = consts.TaskStatus.RUNNING
@@ -822,8 +843,8 @@ class ResultConsumerTestCase(test.TestCase):
             [{"duration": 7, "timestamp": 1}],
         ]
 
-        runner.result_queue = collections.deque(results)
-        runner.event_queue = collections.deque()
+        runner.result_queue = utils.WaitableDeque(results)
+        runner.event_queue = utils.WaitableDeque()
         ctx_manager = mock.MagicMock()
 
         with engine.ResultConsumer(workload_cfg, task=task, subtask=subtask,
@@ -844,15 +865,17 @@ class ResultConsumerTestCase(test.TestCase):
         self.assertEqual([{"duration": 7, "timestamp": 1}],
                          consumer_obj.results)
 
+        kw = {"chunk_format": "compact", "compression": "lz4"}
         workload.add_workload_data.assert_has_calls([
             mock.call(0, {"raw": [{"duration": 2, "timestamp": 2},
-                                  {"duration": 1, "timestamp": 3}]}),
+                                  {"duration": 1, "timestamp": 3}]}, **kw),
             mock.call(1, {"raw": [{"duration": 4, "timestamp": 2},
-                                  {"duration": 3, "timestamp": 3}]}),
+                                  {"duration": 3, "timestamp": 3}]}, **kw),
             mock.call(2, {"raw": [{"duration": 6, "timestamp": 2},
-                                  {"duration": 5, "timestamp": 3}]}),
-            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]})])
+                                  {"duration": 5, "timestamp": 3}]}, **kw),
+            mock.call(3, {"raw": [{"duration": 7, "timestamp": 1}]}, **kw)])
 
+    @mock.patch("rally.task.engine.stats.WorkloadStats")
     @mock.patch("rally.task.engine.LOG")
     @mock.patch("rally.task.hook.HookExecutor")
     @mock.patch("rally.task.engine.time.time")
@@ -861,7 +884,8 @@ class ResultConsumerTestCase(test.TestCase):
     @mock.patch("rally.task.sla.SLAChecker")
     def test_consume_events(
             self, mock_sla_checker, mock_result_consumer_wait_and_abort,
-            mock_task_get_status, mock_time, mock_hook_executor, mock_log):
+            mock_task_get_status, mock_time, mock_hook_executor, mock_log,
+            mock_workload_stats):
         mock_time.side_effect = [0, 1]
         mock_sla_instance = mock_sla_checker.return_value
         mock_sla_results = mock_sla_instance.results.return_value
@@ -879,8 +903,8 @@ class ResultConsumerTestCase(test.TestCase):
             {"type": "iteration", "value": 2},
             {"type": "iteration", "value": 3}
         ]
-        runner.result_queue = collections.deque()
-        runner.event_queue = collections.deque(events)
+        runner.result_queue = utils.WaitableDeque()
+        runner.event_queue = utils.WaitableDeque(events)
 
         ctx_manager = mock.MagicMock()
         consumer_obj = engine.ResultConsumer(
@@ -910,7 +934,8 @@ class ResultConsumerTestCase(test.TestCase):
             sla_results=mock_sla_results,
             hooks_results=mock_hook_results,
             start_time=None,
-            contexts_results=ctx_manager.contexts_results())
+            contexts_results=ctx_manager.contexts_results(),
+            stats=mock_workload_stats.return_value.to_dict.return_value)
 
     @mock.patch("rally.task.engine.threading.Thread")
     @mock.patch("rally.task.engine.threading.Event")
@@ -18,7 +18,10 @@ import multiprocessing
 
 import ddt
 import mock
+from six.moves import queue as six_queue
 
+from rally.common import cfg
+from rally.common import utils as rutils
 from rally.plugins.common.runners import serial
 from rally.task import runner
 from tests.unit import fakes
@@ -50,6 +53,19 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         context_obj = {"foo": "bar"}
         result = runner._get_scenario_context(13, context_obj)
         self.assertEqual({"foo": "bar", "iteration": 14}, result)
+        self.assertEqual({"foo": "bar"}, context_obj)
+
+    def test_get_scenario_context_locked(self):
+        context_obj = rutils.LockedDict(foo="bar", users=[{"id": "u1"}])
+        result = runner._get_scenario_context(13, context_obj)
+
+        self.assertEqual({"foo": "bar", "users": [{"id": "u1"}],
+                          "iteration": 14}, result)
+        self.assertNotIn("iteration", context_obj)
+        self.assertIs(context_obj["users"], result["users"])
+        result["user"] = result["users"][0]
+        self.assertRaises(RuntimeError,
+                          result["user"].__setitem__, "id", "u2")
 
     def test_run_scenario_once_internal_logic(self):
         context = runner._get_scenario_context(
@@ -111,6 +127,42 @@ class ScenarioRunnerHelpersTestCase(test.TestCase):
         }
         self.assertEqual(expected_result, result)
 
+    @mock.patch(BASE + "LOG")
+    @mock.patch(BASE + "objects.task.validate_result")
+    def test__check_result_in_worker(self, mock_validate_result, mock_log):
+        context = {"task": {"uuid": "foo_uuid"}}
+        result = {"timestamp": 42}
+        self.assertTrue(runner._check_result_in_worker(result, context))
+        self.assertFalse(mock_validate_result.called)
+
+        self.useFixture(cfg.fixture.Config()).config(
+            validate_results_in_workers=True)
+        mock_validate_result.return_value = None
+        self.assertTrue(runner._check_result_in_worker(result, context))
+        self.assertFalse(mock_log.warning.called)
+
+        mock_validate_result.return_value = "oops"
+        self.assertFalse(runner._check_result_in_worker(result, context))
+        mock_validate_result.assert_called_with(result)
+        self.assertTrue(mock_log.warning.called)
+
+    @mock.patch(BASE + "_check_result_in_worker")
+    @mock.patch(BASE + "_run_scenario_once")
+    def test__worker_thread(self, mock__run_scenario_once,
+                            mock__check_result_in_worker):
+        queue = mock.MagicMock()
+        args = ("cls", "method", {"task": {"uuid": "foo_uuid"}}, {},
+                mock.MagicMock())
+        mock__check_result_in_worker.side_effect = [True, False]
+
+        runner._worker_thread(queue, *args)
+        runner._worker_thread(queue, *args)
+
+        queue.put.assert_called_once_with(
+            mock__run_scenario_once.return_value)
+        mock__check_result_in_worker.assert_called_with(
+            mock__run_scenario_once.return_value, args[2])
+
     @mock.patch(BASE + "rutils.Timer", side_effect=fakes.FakeTimer)
     def test_run_scenario_once_exception(self, mock_timer):
         result = runner._run_scenario_once(
@@ -154,6 +206,8 @@ class ScenarioRunnerTestCase(test.TestCase):
 
         runner_obj._run_scenario.assert_called_once_with(
             scenario_class, "run", context_obj, {"foo": 11, "bar": "spam"})
+        self.assertIsInstance(runner_obj._run_scenario.call_args[0][2],
+                              rutils.LockedDict)
 
     def test_abort(self):
         runner_obj = serial.SerialScenarioRunner(
@@ -181,25 +235,118 @@ class ScenarioRunnerTestCase(test.TestCase):
         for process in process_pool:
             self.assertIsInstance(process, multiprocessing.Process)
 
+    @mock.patch(BASE + "ScenarioRunner.send_event")
     @mock.patch(BASE + "ScenarioRunner._send_result")
-    def test__join_processes(self, mock_scenario_runner__send_result):
+    def test__join_processes(self, mock_scenario_runner__send_result,
+                             mock_scenario_runner_send_event):
         process = mock.MagicMock(is_alive=mock.MagicMock(return_value=False))
         processes = 10
         process_pool = collections.deque([process] * processes)
-        mock_result_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
-        mock_event_queue = mock.MagicMock(
-            empty=mock.MagicMock(return_value=True))
+        result_queue = six_queue.Queue()
+        result_queue.close = mock.MagicMock()
+        for i in range(3):
+            result_queue.put({"timestamp": i})
+        event_queue = six_queue.Queue()
+        event_queue.close = mock.MagicMock()
+        event_queue.put({"type": "iteration", "value": 1})
 
         runner_obj = serial.SerialScenarioRunner(
             mock.MagicMock(),
             mock.MagicMock())
 
         runner_obj._join_processes(
-            process_pool, mock_result_queue, mock_event_queue)
+            process_pool, result_queue, event_queue)
 
         self.assertEqual(processes, process.join.call_count)
-        mock_result_queue.close.assert_called_once_with()
+        self.assertEqual(
+            [mock.call({"timestamp": i}) for i in range(3)],
+            mock_scenario_runner__send_result.call_args_list)
+        mock_scenario_runner_send_event.assert_called_once_with(
+            type="iteration", value=1)
+        self.assertTrue(result_queue.empty())
+        self.assertTrue(event_queue.empty())
+        result_queue.close.assert_called_once_with()
+        event_queue.close.assert_called_once_with()
+
+    @mock.patch(BASE + "ScenarioRunner._store_result")
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_with_validation_in_workers(
+            self, mock_scenario_runner__send_result,
+            mock_scenario_runner__store_result):
+        self.useFixture(cfg.fixture.Config()).config(
+            validate_results_in_workers=True)
+        result_queue = six_queue.Queue()
+        result_queue.close = mock.MagicMock()
+        result_queue.put({"timestamp": 1})
+        event_queue = six_queue.Queue()
+        event_queue.close = mock.MagicMock()
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        runner_obj._join_processes(
+            collections.deque(), result_queue, event_queue)
+
+        mock_scenario_runner__store_result.assert_called_once_with(
+            {"timestamp": 1})
+        self.assertFalse(mock_scenario_runner__send_result.called)
+
+    def test__consume_queue(self):
+        queue = six_queue.Queue()
+        for item in (1, 2, None, 3):
+            queue.put(item)
+        consumer = mock.MagicMock()
+
+        runner.ScenarioRunner._consume_queue(queue, consumer)
+
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         consumer.call_args_list)
+
+    def test__consume_queue_fails(self):
+        queue = six_queue.Queue()
+        for item in (1, 2, 3, None):
+            queue.put(item)
+        consumer = mock.MagicMock(side_effect=[None, KeyError("foo")])
+        errors = []
+
+        runner.ScenarioRunner._consume_queue(queue, consumer, errors)
+
+        # the queue is drained after the failure
+        self.assertTrue(queue.empty())
+        self.assertEqual([mock.call(1), mock.call(2)],
+                         consumer.call_args_list)
+        self.assertEqual(1, len(errors))
+        self.assertIsInstance(errors[0][1], KeyError)
+
+    @mock.patch(BASE + "ScenarioRunner.send_event")
+    @mock.patch(BASE + "ScenarioRunner._send_result")
+    def test__join_processes_fails(self, mock_scenario_runner__send_result,
+                                   mock_scenario_runner_send_event):
+        mock_scenario_runner_send_event.side_effect = KeyError("foo")
+        process = mock.MagicMock()
+        result_queue = six_queue.Queue()
+        result_queue.close = mock.MagicMock()
+        result_queue.put({"timestamp": 1})
+        event_queue = six_queue.Queue()
+        event_queue.close = mock.MagicMock()
+        for i in range(3):
+            event_queue.put({"type": "iteration", "value": i})
+
+        runner_obj = serial.SerialScenarioRunner(
+            mock.MagicMock(),
+            mock.MagicMock())
+
+        self.assertRaises(KeyError, runner_obj._join_processes,
+                          collections.deque([process]), result_queue,
+                          event_queue)
+
+        process.join.assert_called_once_with()
+        mock_scenario_runner__send_result.assert_called_once_with(
+            {"timestamp": 1})
+        self.assertTrue(event_queue.empty())
+        result_queue.close.assert_called_once_with()
+        event_queue.close.assert_called_once_with()
 
     def _get_runner(self, task="mock_me", config="mock_me", batch_size=0):
         class ScenarioRunner(runner.ScenarioRunner):
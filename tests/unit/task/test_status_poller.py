@@ -0,0 +1,129 @@
+# Copyright 2018: Mirantis Inc.
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+
+import mock
+
+from rally import exceptions
+from rally.task import status_poller
+from rally.task import utils
+from tests.unit import fakes
+from tests.unit import test
+
+
+class StatusPollerTestCase(test.TestCase):
+
+    def setUp(self):
+        super(StatusPollerTestCase, self).setUp()
+        self.poller = status_poller.StatusPoller()
+        self.manager = fakes.FakeManager()
+        self.update_resource = utils.get_from_manager()
+        self.update_resource.list_resources = mock.Mock(
+            side_effect=self.update_resource.list_resources)
+
+    def _wait(self, resource, **kwargs):
+        kwargs.setdefault("ready_statuses", {"ACTIVE"})
+        kwargs.setdefault("failure_statuses", {"FAILED"})
+        kwargs.setdefault("timeout", 5)
+        kwargs.setdefault("check_interval", 0.01)
+        return self.poller.wait(resource, update_resource=self.update_resource,
+                                status_getter=utils.get_status, **kwargs)
+
+    def _create(self, status):
+        return self.manager._cache(
+            fakes.FakeResource(manager=self.manager, status=status))
+
+    def test_wait(self):
+        resource = self._create("BUILD")
+        self.manager.get = mock.Mock()
+        threading.Timer(0.05, setattr, (resource, "status", "ACTIVE")).start()
+
+        self.assertEqual(resource, self._wait(resource))
+
+        self.assertFalse(self.manager.get.called)
+        self.assertTrue(self.update_resource.list_resources.called)
+
+    def test_wait_batches_resources(self):
+        resources = [self._create("BUILD") for i in range(10)]
+        results = {}
+
+        def wait(resource):
+            results[resource.id] = self._wait(resource, check_interval=0.1)
+
+        threads = [threading.Thread(target=wait, args=(r,))
+                   for r in resources]
+        for thread in threads:
+            thread.start()
+        for resource in resources:
+            resource.status = "ACTIVE"
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(dict((r.id, r) for r in resources), results)
+        stats = self.poller.stats()
+        self.assertEqual(self.update_resource.list_resources.call_count,
+                         stats["list_calls"])
+        self.assertLess(stats["list_calls"], stats["checks"])
+        self.assertEqual(stats["checks"] - stats["list_calls"],
+                         stats["saved_calls"])
+
+    def test_wait_failure_status(self):
+        resource = self._create("FAILED")
+        self.assertRaises(exceptions.GetResourceErrorStatus,
+                          self._wait, resource)
+
+    def test_wait_not_found(self):
+        resource = fakes.FakeResource(manager=self.manager)
+        not_found = Exception()
+        not_found.code = 404
+        self.manager.get = mock.Mock(side_effect=not_found)
+        self.assertRaises(exceptions.GetResourceNotFound,
+                          self._wait, resource)
+        self.assertIsNone(self._wait(resource, check_deletion=True))
+
+    def test_wait_timeout(self):
+        resource = self._create("BUILD")
+        self.assertRaises(exceptions.TimeoutException,
+                          self._wait, resource, timeout=0.05)
+        self.assertEqual({}, self.poller._waiters)
+
+    def test_wait_interrupted(self):
+        resource = self._create("BUILD")
+
+        class Interrupted(BaseException):
+            pass
+
+        waiter_cls = status_poller._Waiter
+
+        def make_waiter(*args):
+            waiter = waiter_cls(*args)
+            waiter.event = mock.Mock()
+            waiter.event.wait.side_effect = Interrupted
+            return waiter
+
+        with mock.patch("rally.task.status_poller._Waiter",
+                        side_effect=make_waiter):
+            self.assertRaises(Interrupted, self._wait, resource)
+        self.assertEqual({}, self.poller._waiters)
+
+    @mock.patch("rally.task.status_poller.os.getpid")
+    def test_get_poller(self, mock_getpid):
+        mock_getpid.return_value = 1
+        poller = status_poller.get_poller()
+        self.assertIs(poller, status_poller.get_poller())
+
+        mock_getpid.return_value = 2
+        self.assertIsNot(poller, status_poller.get_poller())
@@ -21,6 +21,7 @@ from jsonschema import exceptions as schema_exceptions
 import mock
 import six
 
+from rally.common import cfg
 from rally import exceptions
 from rally.task import utils
 from tests.unit import fakes
@@ -154,6 +155,68 @@ class TaskUtilsTestCase(test.TestCase):
         self.assertRaises(exceptions.GetResourceFailure,
                           get_from_manager, resource)
 
+    def test_get_from_manager_list_resources(self):
+        get_from_manager = utils.get_from_manager()
+        manager = fakes.FakeManager()
+        ready = manager._cache(fakes.FakeResource(manager=manager))
+        failed = manager._cache(fakes.FakeResource(manager=manager,
+                                                   status="ERROR"))
+        deleted = manager._cache(fakes.FakeResource(manager=manager,
+                                                    status="DELETED"))
+        # NOTE: the resource exists, but it is not on the listed page
+        unlisted = fakes.FakeResource(manager=manager)
+        missing = fakes.FakeResource(manager=manager)
+
+        def get(uuid):
+            if uuid == unlisted.uuid:
+                return unlisted
+            e = Exception()
+            e.code = 404
+            raise e
+
+        manager.get = mock.Mock(side_effect=get)
+
+        results = get_from_manager.list_resources(
+            [ready, failed, deleted, unlisted, missing], id_attr="uuid")
+
+        self.assertEqual(ready, results[0])
+        self.assertIsInstance(results[1], exceptions.GetResourceErrorStatus)
+        self.assertIsInstance(results[2], exceptions.GetResourceNotFound)
+        self.assertEqual(unlisted, results[3])
+        self.assertIsInstance(results[4], exceptions.GetResourceNotFound)
+        self.assertEqual([mock.call(unlisted.uuid), mock.call(missing.uuid)],
+                         manager.get.call_args_list)
+
+    def test_get_from_manager_list_resources_fails(self):
+        get_from_manager = utils.get_from_manager()
+        manager = mock.MagicMock()
+        manager.list.side_effect = Exception
+        resources = [fakes.FakeResource(manager=manager) for i in range(2)]
+
+        results = get_from_manager.list_resources(resources)
+
+        self.assertEqual(2, len(results))
+        for result in results:
+            self.assertIsInstance(result, exceptions.GetResourceFailure)
+
+    def test_get_from_manager_batch_key(self):
+        get_from_manager = utils.get_from_manager()
+        manager = mock.MagicMock()
+        manager.api.client.get_project_id.return_value = "project"
+        self.assertEqual(
+            (type(manager), "project"),
+            get_from_manager.batch_key(fakes.FakeResource(manager=manager)))
+
+        manager.api.client.get_project_id.side_effect = AttributeError
+        self.assertEqual(
+            (type(manager), id(manager.api.client.session)),
+            get_from_manager.batch_key(fakes.FakeResource(manager=manager)))
+
+        manager = fakes.FakeManager()
+        self.assertEqual(
+            (fakes.FakeManager, id(manager)),
+            get_from_manager.batch_key(fakes.FakeResource(manager=manager)))
+
 
 class WaitForTestCase(test.TestCase):
 
@@ -493,6 +556,42 @@ class WaitForStatusTestCase(test.TestCase):
                           resource=res, ready_statuses=["ready"],
                           update_resource=upd, timeout=2, id_attr="uuid")
 
+    @mock.patch("rally.task.utils.status_poller.get_poller")
+    def test_wait_batched(self, mock_get_poller):
+        self.useFixture(cfg.fixture.Config()).config(
+            batched_status_polling=True)
+        res = fakes.FakeResource(status="not_ready")
+        upd = utils.get_from_manager()
+        poller = mock_get_poller.return_value
+
+        ret = utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                                    failure_statuses=["error"],
+                                    update_resource=upd, timeout=2,
+                                    check_interval=3, id_attr="uuid")
+
+        self.assertEqual(poller.wait.return_value, ret)
+        poller.wait.assert_called_once_with(
+            res, ready_statuses={"READY"}, failure_statuses={"ERROR"},
+            update_resource=upd, status_getter=mock.ANY, timeout=2,
+            check_interval=3, check_deletion=False, id_attr="uuid")
+        status_getter = poller.wait.call_args[1]["status_getter"]
+        self.assertEqual("NOT_READY", status_getter(res))
+
+    @mock.patch("rally.task.utils.status_poller.get_poller")
+    def test_wait_batched_without_list_resources(self, mock_get_poller):
+        self.useFixture(cfg.fixture.Config()).config(
+            batched_status_polling=True)
+        res = {"status": "ready"}
+
+        def update_resource(resource):
+            return resource
+
+        ret = utils.wait_for_status(resource=res, ready_statuses=["ready"],
+                                    update_resource=update_resource)
+
+        self.assertEqual(res, ret)
+        self.assertFalse(mock_get_poller.called)
+
 
 @ddt.ddt
 class WrapperForAtomicActionsTestCase(test.TestCase):
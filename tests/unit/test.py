@@ -23,6 +23,7 @@ import testtools
 
 from rally.common import cfg
 from rally.common import db
+from rally.common.plugin import plugin
 from rally import plugins
 from tests.unit import fakes
 
@@ -64,8 +65,13 @@ class TestCase(testtools.TestCase):
     def setUp(self):
         super(TestCase, self).setUp()
         self.addCleanup(mock.patch.stopall)
-        plugins.load()
+        # NOTE: the plugins manifest is written to $HOME, so it is replaced
+        #   before plugins are loaded.
         self.useFixture(TempHomeDir())
+        plugins.load()
+        # NOTE: tests patch modules with plugins, so all of them should be
+        #   imported beforehand instead of being imported on demand.
+        plugin.load_lazy_plugins()
 
     def _test_atomic_action_timer(self, atomic_actions, name, count=1,
                                   parent=[]):
@@ -480,8 +480,9 @@ class TaskAPITestCase(test.TestCase):
             reporter,
             [t.to_dict.return_value for t in tasks] + [{"uuid": "uuid-3"}],
             output_dest, api=self.task_inst.api)
-        self.assertEqual([mock.call(u, detailed=True) for u in tasks_id],
-                         mock_task_get.call_args_list)
+        self.assertEqual(
+            [mock.call(u, detailed=True, stream_data=True) for u in tasks_id],
+            mock_task_get.call_args_list)
 
     @mock.patch("rally.api.objects.Task")
     def test_get_detailed(self, mock_task):
@@ -502,9 +503,11 @@ class TaskAPITestCase(test.TestCase):
         tasks = self.task_inst.list()
         self.assertEqual([self.task], tasks)
 
+    @mock.patch("rally.api.stats.WorkloadStats")
     @mock.patch("rally.api.objects.Task")
     @mock.patch("rally.api.objects.Deployment.get")
-    def test_import_results(self, mock_deployment_get, mock_task):
+    def test_import_results(self, mock_deployment_get, mock_task,
+                            mock_workload_stats):
         mock_deployment_get.return_value = fakes.FakeDeployment(
             uuid="deployment_uuid", admin="fake_admin", users=["fake_user"],
             status=consts.DeployStatus.DEPLOY_FINISHED)
@@ -527,7 +530,7 @@ class TaskAPITestCase(test.TestCase):
                     "statistics": {},
                     "total_iteration_count": 3,
                     "failed_iteration_count": 0,
-                    "data": ["data-raw"]}
+                    "data": [{"timestamp": 1}]}
 
         task_results = {"subtasks": [
             {"title": "subtask-title",
@@ -562,20 +565,26 @@ class TaskAPITestCase(test.TestCase):
             consts.SubtaskStatus.FINISHED)
         work_load = sub_task.add_workload.return_value
         work_load.add_workload_data.assert_called_once_with(
-            0, {"raw": workload["data"]})
+            0, {"raw": workload["data"]}, chunk_format="json",
+            compression="zlib")
         work_load.set_results.assert_called_once_with(
             full_duration=workload["full_duration"],
             load_duration=workload["load_duration"],
             sla_results=workload["sla_results"]["sla"],
             contexts_results=workload["contexts_results"],
-            hooks_results=workload["hooks"], start_time=workload["start_time"])
+            hooks_results=workload["hooks"], start_time=workload["start_time"],
+            stats=mock_workload_stats.return_value.to_dict.return_value)
+        mock_workload_stats.assert_called_once_with()
+        mock_workload_stats.return_value.add_iteration.assert_called_once_with(
+            {"timestamp": 1})
 
+    @mock.patch("rally.api.stats.WorkloadStats")
     @mock.patch("rally.api.objects.Task")
     @mock.patch("rally.api.objects.Deployment.get")
     @mock.patch("rally.api.CONF")
     def test_import_results_chunk_size(self, mock_conf,
                                        mock_deployment_get,
-                                       mock_task):
+                                       mock_task, mock_workload_stats):
         mock_deployment_get.return_value = fakes.FakeDeployment(
             uuid="deployment_uuid", admin="fake_admin", users=["fake_user"],
             status=consts.DeployStatus.DEPLOY_FINISHED)
@@ -604,6 +613,8 @@ class TaskAPITestCase(test.TestCase):
         task_results = {"subtasks": [{"title": "scen-subtasks",
                                       "workloads": [workload]}]}
         mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_chunk_format = "compact"
+        mock_conf.raw_result_chunk_compression = "none"
 
         self.assertEqual(
             mock_task.return_value.to_dict(),
@@ -636,15 +647,18 @@ class TaskAPITestCase(test.TestCase):
             consts.SubtaskStatus.FINISHED)
         work_load = sub_task.add_workload.return_value
         self.assertEqual(
-            [mock.call(0, {"raw": [{"timestamp": 1}, {"timestamp": 2}]}),
-             mock.call(1, {"raw": [{"timestamp": 3}]})],
+            [mock.call(0, {"raw": [{"timestamp": 1}, {"timestamp": 2}]},
+                       chunk_format="compact", compression="none"),
+             mock.call(1, {"raw": [{"timestamp": 3}]},
+                       chunk_format="compact", compression="none")],
             work_load.add_workload_data.call_args_list)
         work_load.set_results.assert_called_once_with(
             full_duration=workload["full_duration"],
             load_duration=workload["load_duration"],
             sla_results=workload["sla_results"]["sla"],
             contexts_results=workload["contexts_results"],
-            hooks_results=workload["hooks"], start_time=workload["start_time"])
+            hooks_results=workload["hooks"], start_time=workload["start_time"],
+            stats=mock_workload_stats.return_value.to_dict.return_value)
 
     @mock.patch("rally.api.objects.Deployment.get")
     def test_import_results_with_inconsistent_deployment(
@@ -671,14 +685,58 @@ class TaskAPITestCase(test.TestCase):
         mock_task.return_value.result_has_valid_schema = mock.MagicMock(
             return_value=False)
 
+        workload = {"name": "test_scenario", "description": "",
+                    "position": 0, "runner": {}, "runner_type": "",
+                    "contexts": {}, "hooks": [], "sla": {}, "args": {},
+                    "data": [{"a": 1}]}
         task_results = {"subtasks": [{"title": "subtask-title",
-                                      "workloads": [{"data": [{"a": 1}]}]
-                                      }]}
+                                      "workloads": [workload]}]}
 
         self.assertRaises(exceptions.RallyException,
                           self.task_inst.import_results,
                           deployment="deployment_uuid",
                           task_results=task_results)
+        mock_task.return_value.set_failed.assert_called_once_with(
+            "RallyException", mock.ANY, mock.ANY)
+        sub_task = mock_task.return_value.add_subtask.return_value
+        work_load = sub_task.add_workload.return_value
+        self.assertFalse(work_load.add_workload_data.called)
+
+    @mock.patch("rally.api.stats.WorkloadStats")
+    @mock.patch("rally.api.objects.Task")
+    @mock.patch("rally.api.objects.Deployment.get")
+    @mock.patch("rally.api.CONF")
+    def test_import_results_from_iterator(self, mock_conf,
+                                          mock_deployment_get, mock_task,
+                                          mock_workload_stats):
+        mock_deployment_get.return_value = fakes.FakeDeployment(
+            uuid="deployment_uuid", status=consts.DeployStatus.DEPLOY_FINISHED)
+        mock_conf.raw_result_chunk_size = 2
+        mock_conf.raw_result_chunk_format = "json"
+        mock_conf.raw_result_chunk_compression = "zlib"
+        workload = {"name": "test_scenario", "description": "",
+                    "position": 0, "runner": {}, "runner_type": "",
+                    "contexts": {}, "hooks": [], "sla": {}, "args": {},
+                    "sla_results": {}, "start_time": 1, "full_duration": 3,
+                    "load_duration": 2, "contexts_results": [],
+                    "data": ({"timestamp": t} for t in (2, 1, 4, 3))}
+        task_results = {"subtasks": [{"title": "subtask-title",
+                                      "workloads": [workload]}]}
+
+        self.task_inst.import_results(deployment="deployment_uuid",
+                                      task_results=task_results)
+
+        sub_task = mock_task.return_value.add_subtask.return_value
+        work_load = sub_task.add_workload.return_value
+        self.assertEqual(
+            [mock.call(0, {"raw": [{"timestamp": 1}, {"timestamp": 2}]},
+                       chunk_format="json", compression="zlib"),
+             mock.call(1, {"raw": [{"timestamp": 3}, {"timestamp": 4}]},
+                       chunk_format="json", compression="zlib")],
+            work_load.add_workload_data.call_args_list)
+        self.assertEqual(
+            4, mock_workload_stats.return_value.add_iteration.call_count)
+        self.assertFalse(mock_task.return_value.set_failed.called)
 
 
 class BaseDeploymentTestCase(test.TestCase):
@@ -12,6 +12,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import fixtures
 import mock
 
 from rally import exceptions
@@ -41,6 +42,21 @@ class ExceptionTestCase(test.TestCase):
         exc_instance = exceptions.find_exception(mock_response)
         self.assertEqual(exc_instance, exc_class.return_value)
 
+    @mock.patch("rally.common.plugin.plugin.load_lazy_plugins")
+    def test_find_exception_loads_plugins(self, mock_load_lazy_plugins):
+        self.useFixture(fixtures.MockPatch("rally.exceptions._exception_map",
+                                           None))
+        mock_response = mock.Mock()
+        mock_response.status_code = 515
+        mock_response.json.return_value = {
+            "error": {"args": None, "msg": "msg"}
+        }
+
+        exc_instance = exceptions.find_exception(mock_response)
+
+        mock_load_lazy_plugins.assert_called_once_with()
+        self.assertIsInstance(exc_instance, exceptions.ThreadTimeoutException)
+
     def test_make_exception(self):
         exc = exceptions.RallyException("exc")
         self.assertEqual(exc, exceptions.make_exception(exc))